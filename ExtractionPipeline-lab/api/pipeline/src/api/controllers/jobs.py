@@ -15,7 +15,7 @@ import tempfile
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
@@ -43,6 +43,9 @@ class JobCreateRequest(BaseModel):
     sleep_between_batches: Optional[float] = Field(None, description="Sleep duration between batches")
     local_mode: Optional[bool] = Field(False, description="Run in local mode (skip DB writes)")
     skip_upload: Optional[bool] = Field(False, description="Skip S3 frame upload")
+    extract_mode: Optional[Literal["scene", "keyframes", "sparse"]] = Field(
+        None, description="Scene extraction profile: 'scene', 'keyframes' or 'sparse' (default: from config)"
+    )
 
 class JobResponse(BaseModel):
     job_id: str
@@ -87,6 +90,8 @@ async def run_pipeline_job(job_id: str, request: JobCreateRequest):
             env["VP_BATCH_SIZE"] = str(request.batch_size)
         if request.sleep_between_batches:
             env["VP_SLEEP_BETWEEN_BATCHES"] = str(request.sleep_between_batches)
+        if request.extract_mode:
+            env["VP_EXTRACT_MODE"] = request.extract_mode
         env["LOCAL_MODE"] = "1" if request.local_mode else "0"
         env["SKIP_UPLOAD"] = "1" if request.skip_upload else "0"
         
@@ -127,31 +127,36 @@ async def process_batches(config: Config, state_manager: StateManager, api_clien
     
     logger.info(f"Processing {len(unprocessed_codes)} unprocessed codes in batches of {batch_limit}")
     
-    for code in unprocessed_codes:
+    # Bulk pre-check: one facet request per chunk instead of one HTTP session per code
+    check_chunk = max(batch_limit, 1000)
+    for start in range(0, len(unprocessed_codes), check_chunk):
         # Check for shutdown signal
         if shutdown_event.is_set():
             logger.info("Shutdown signal received, stopping processing")
             break
         
-        # Check if video is already extracted in Qdrant
+        chunk = unprocessed_codes[start:start + check_chunk]
         try:
-            is_extracted = await qdrant_utils.is_video_extracted(code)
-            if not is_extracted:
-                current_batch.append(code)
-                logger.debug(f"Added {code} to current batch (size: {len(current_batch)})")
+            already_extracted = await qdrant_utils.extracted_codes(chunk)
         except Exception as e:
-            logger.warning(f"Error checking if video {code} is extracted: {e}, adding to batch anyway")
-            current_batch.append(code)
+            logger.warning(f"Error checking {len(chunk)} codes in Qdrant: {e}, adding them to batches anyway")
+            already_extracted = set()
         
-        # Step 3: When batch is full, dispatch it
-        if len(current_batch) >= batch_limit:
-            try:
-                await dispatch_batch(current_batch, batch_number, api_client, config, active_jobs)
-                current_batch = []
-                batch_number += 1
-            except Exception as e:
-                logger.error(f"Error dispatching batch {batch_number}: {e}")
-                # Continue processing, but log the error
+        for code in chunk:
+            if code in already_extracted:
+                continue
+            current_batch.append(code)
+            logger.debug(f"Added {code} to current batch (size: {len(current_batch)})")
+            
+            # Step 3: When batch is full, dispatch it
+            if len(current_batch) >= batch_limit:
+                try:
+                    await dispatch_batch(current_batch, batch_number, api_client, config, active_jobs)
+                    current_batch = []
+                    batch_number += 1
+                except Exception as e:
+                    logger.error(f"Error dispatching batch {batch_number}: {e}")
+                    # Continue processing, but log the error
     
     # Step 4: Dispatch remainder if any
     if current_batch and not shutdown_event.is_set():
@@ -327,6 +332,8 @@ async def main():
         except Exception as e:
             logger.error(f"Error during graceful shutdown: {e}", exc_info=True)
         
+        await qdrant_utils.close()
+        
         # Ensure state is saved in finally block
         if state_manager:
             try:
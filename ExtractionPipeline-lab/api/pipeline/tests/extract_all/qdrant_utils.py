@@ -5,7 +5,7 @@ Qdrant utilities for connectivity checks and collection management.
 """
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set
 import aiohttp
 import json
 from retry_utils import qdrant_retry
@@ -23,6 +23,23 @@ class QdrantUtils:
         self.headers = {'Content-Type': 'application/json'}
         if config.qdrant_key:
             self.headers['Authorization'] = f'Bearer {config.qdrant_key}'
+        
+        # One pooled HTTP session for every request (created lazily inside the event loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, opening it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     @qdrant_retry()
     async def check_connection(self) -> bool:
@@ -30,25 +47,25 @@ class QdrantUtils:
         try:
             self.logger.info(f"Checking Qdrant connection to: {self.config.qdrant_url}")
             
-            async with aiohttp.ClientSession() as session:
-                # Check service health
-                health_url = f"{self.config.qdrant_url}/health"
-                async with session.get(health_url, headers=self.headers) as response:
-                    if response.status == 200:
-                        self.logger.info("Qdrant service is healthy")
-                    else:
-                        raise Exception(f"Qdrant health check failed: {response.status}")
+            session = await self._get_session()
+            # Check service health
+            health_url = f"{self.config.qdrant_url}/health"
+            async with session.get(health_url, headers=self.headers) as response:
+                if response.status == 200:
+                    self.logger.info("Qdrant service is healthy")
+                else:
+                    raise Exception(f"Qdrant health check failed: {response.status}")
                 
-                # Check collections endpoint
-                collections_url = f"{self.config.qdrant_url}/collections"
-                async with session.get(collections_url, headers=self.headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.logger.info(f"Connected to Qdrant. Available collections: {len(data.get('result', {}).get('collections', []))}")
-                    else:
-                        raise Exception(f"Failed to fetch collections: {response.status}")
+            # Check collections endpoint
+            collections_url = f"{self.config.qdrant_url}/collections"
+            async with session.get(collections_url, headers=self.headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self.logger.info(f"Connected to Qdrant. Available collections: {len(data.get('result', {}).get('collections', []))}")
+                else:
+                    raise Exception(f"Failed to fetch collections: {response.status}")
                 
-                return True
+            return True
                 
         except aiohttp.ClientError as e:
             self.logger.error(f"Qdrant connection error: {e}")
@@ -73,17 +90,17 @@ class QdrantUtils:
         try:
             self.logger.info(f"Checking if collection '{collection_name}' exists")
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.qdrant_url}/collections/{collection_name}"
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        self.logger.info(f"Collection '{collection_name}' exists")
-                        return True
-                    elif response.status == 404:
-                        self.logger.info(f"Collection '{collection_name}' does not exist")
-                        return False
-                    else:
-                        raise Exception(f"Failed to check collection: {response.status}")
+            session = await self._get_session()
+            url = f"{self.config.qdrant_url}/collections/{collection_name}"
+            async with session.get(url, headers=self.headers) as response:
+                if response.status == 200:
+                    self.logger.info(f"Collection '{collection_name}' exists")
+                    return True
+                elif response.status == 404:
+                    self.logger.info(f"Collection '{collection_name}' does not exist")
+                    return False
+                else:
+                    raise Exception(f"Failed to check collection: {response.status}")
                         
         except Exception as e:
             self.logger.error(f"Error checking collection existence: {e}")
@@ -105,26 +122,26 @@ class QdrantUtils:
         try:
             self.logger.info(f"Getting info for collection '{collection_name}'")
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.qdrant_url}/collections/{collection_name}"
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        result = data.get('result', {})
+            session = await self._get_session()
+            url = f"{self.config.qdrant_url}/collections/{collection_name}"
+            async with session.get(url, headers=self.headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    result = data.get('result', {})
                         
-                        info = {
-                            'name': collection_name,
-                            'status': result.get('status'),
-                            'points_count': result.get('points_count', 0),
-                            'segments_count': result.get('segments_count', 0),
-                            'config': result.get('config', {}),
-                            'payload_schema': result.get('payload_schema', {})
-                        }
+                    info = {
+                        'name': collection_name,
+                        'status': result.get('status'),
+                        'points_count': result.get('points_count', 0),
+                        'segments_count': result.get('segments_count', 0),
+                        'config': result.get('config', {}),
+                        'payload_schema': result.get('payload_schema', {})
+                    }
                         
-                        self.logger.info(f"Collection '{collection_name}' has {info['points_count']} points")
-                        return info
-                    else:
-                        raise Exception(f"Failed to get collection info: {response.status}")
+                    self.logger.info(f"Collection '{collection_name}' has {info['points_count']} points")
+                    return info
+                else:
+                    raise Exception(f"Failed to get collection info: {response.status}")
                         
         except Exception as e:
             self.logger.error(f"Error getting collection info: {e}")
@@ -151,19 +168,19 @@ class QdrantUtils:
                 "with_vectors": False
             }
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.qdrant_url}/collections/{self.config.qdrant_collection}/points/search"
-                async with session.post(url, 
-                                      headers=self.headers,
-                                      json=search_payload) as response:
+            session = await self._get_session()
+            url = f"{self.config.qdrant_url}/collections/{self.config.qdrant_collection}/points/search"
+            async with session.post(url, 
+                                  headers=self.headers,
+                                  json=search_payload) as response:
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get('result', [])
-                        self.logger.info(f"Found {len(results)} similar documents")
-                        return results
-                    else:
-                        raise Exception(f"Search failed: {response.status}")
+                if response.status == 200:
+                    data = await response.json()
+                    results = data.get('result', [])
+                    self.logger.info(f"Found {len(results)} similar documents")
+                    return results
+                else:
+                    raise Exception(f"Search failed: {response.status}")
                         
         except Exception as e:
             self.logger.error(f"Error searching similar documents: {e}")
@@ -247,19 +264,19 @@ class QdrantUtils:
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.qdrant_url}/collections/{collection_name}"
-                async with session.put(url, 
-                                     headers=self.headers,
-                                     json=collection_config) as response:
+            session = await self._get_session()
+            url = f"{self.config.qdrant_url}/collections/{collection_name}"
+            async with session.put(url, 
+                                 headers=self.headers,
+                                 json=collection_config) as response:
                     
-                    if response.status == 200:
-                        self.logger.info(f"Collection '{collection_name}' created successfully")
-                        return True
-                    else:
-                        response_text = await response.text()
-                        self.logger.error(f"Failed to create collection: {response.status} - {response_text}")
-                        return False
+                if response.status == 200:
+                    self.logger.info(f"Collection '{collection_name}' created successfully")
+                    return True
+                else:
+                    response_text = await response.text()
+                    self.logger.error(f"Failed to create collection: {response.status} - {response_text}")
+                    return False
                         
         except Exception as e:
             self.logger.error(f"Error creating collection: {e}")
@@ -306,28 +323,92 @@ class QdrantUtils:
                 "with_vectors": False
             }
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.config.qdrant_url}/collections/{collection_name}/points/search"
-                async with session.post(url, 
-                                      headers=self.headers,
-                                      json=search_payload) as response:
+            session = await self._get_session()
+            url = f"{self.config.qdrant_url}/collections/{collection_name}/points/search"
+            async with session.post(url, 
+                                  headers=self.headers,
+                                  json=search_payload) as response:
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get('result', [])
-                        is_extracted = len(results) > 0
+                if response.status == 200:
+                    data = await response.json()
+                    results = data.get('result', [])
+                    is_extracted = len(results) > 0
                         
-                        self.logger.debug(f"Video '{code}' extraction status: {'already extracted' if is_extracted else 'not extracted'}")
-                        return is_extracted
-                    elif response.status == 404:
-                        # Collection doesn't exist, so video is not extracted
-                        self.logger.debug(f"Collection '{collection_name}' does not exist, video '{code}' not extracted")
-                        return False
-                    else:
-                        response_text = await response.text()
-                        self.logger.warning(f"Failed to check video extraction status: {response.status} - {response_text}")
-                        return False
+                    self.logger.debug(f"Video '{code}' extraction status: {'already extracted' if is_extracted else 'not extracted'}")
+                    return is_extracted
+                elif response.status == 404:
+                    # Collection doesn't exist, so video is not extracted
+                    self.logger.debug(f"Collection '{collection_name}' does not exist, video '{code}' not extracted")
+                    return False
+                else:
+                    response_text = await response.text()
+                    self.logger.warning(f"Failed to check video extraction status: {response.status} - {response_text}")
+                    return False
                         
         except Exception as e:
             self.logger.error(f"Error checking if video '{code}' is extracted: {e}")
             return False
+    
+    @qdrant_retry()
+    async def _facet_video_codes(self, codes: List[str], collection_name: str) -> Optional[Set[str]]:
+        """One facet request on the video_code index; None when the server cannot facet."""
+        payload = {
+            "key": "video_code",
+            "filter": {
+                "must": [
+                    {"key": "platform", "match": {"value": "instagram"}},
+                    {"key": "video_code", "match": {"any": codes}}
+                ]
+            },
+            "limit": len(codes),
+            "exact": True
+        }
+        session = await self._get_session()
+        url = f"{self.config.qdrant_url}/collections/{collection_name}/facet"
+        async with session.post(url, headers=self.headers, json=payload) as response:
+            if response.status == 200:
+                data = await response.json()
+                hits = data.get('result', {}).get('hits', [])
+                return {str(h['value']) for h in hits if h.get('count', 0) > 0}
+            response_text = await response.text()
+            self.logger.warning(f"Facet on video_code unavailable: {response.status} - {response_text}")
+            return None
+    
+    async def extracted_codes(self, codes: List[str], collection_name: Optional[str] = None,
+                              chunk_size: int = 1000) -> Set[str]:
+        """
+        Bulk variant of `is_video_extracted`: the subset of `codes` that already
+        has points in Qdrant.
+        
+        Uses one facet request per `chunk_size` codes; servers without the facet
+        API fall back to concurrent per-code checks on the shared session.
+        
+        Args:
+            codes: Video codes to check
+            collection_name: Name of the collection. Defaults to config collection.
+            chunk_size: Codes per facet request
+        
+        Returns:
+            Set of codes that are already extracted
+        """
+        if collection_name is None:
+            collection_name = self.config.qdrant_collection
+        
+        extracted: Set[str] = set()
+        use_facet = True
+        for i in range(0, len(codes), chunk_size):
+            chunk = codes[i:i + chunk_size]
+            found = None
+            if use_facet:
+                try:
+                    found = await self._facet_video_codes(chunk, collection_name)
+                except Exception as e:
+                    self.logger.warning(f"Facet request failed: {e}")
+                use_facet = found is not None
+            if found is None:
+                flags = await asyncio.gather(*(self.is_video_extracted(c, collection_name) for c in chunk))
+                found = {c for c, ok in zip(chunk, flags) if ok}
+            extracted |= found
+        
+        self.logger.info(f"{len(extracted)}/{len(codes)} codes already extracted in '{collection_name}'")
+        return extracted
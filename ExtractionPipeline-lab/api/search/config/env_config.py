@@ -44,6 +44,7 @@ class Settings:
     s3_bucket_name: str = os.getenv("S3_BUCKET_NAME", "oriane-contents")
     s3_app_bucket: str = os.getenv("S3_APP_BUCKET", "oriane-app")
     s3_frames_bucket: str = os.getenv("S3_FRAMES_BUCKET", "oriane-frames")
+    s3_max_workers: int = int(os.getenv("S3_MAX_WORKERS", 16))  # concurrent uploads off the event loop
 
     ## ───────────── AWS Batch ────────────────────────────────────────
     BATCH_JOB_QUEUE: str = os.getenv("BATCH_JOB_QUEUE", "")
@@ -53,6 +54,14 @@ class Settings:
     sample_fps: float = float(os.getenv("VP_SAMPLE_FPS", 0.1))
     max_workers: int = int(os.getenv("VP_MAX_WORKERS", 4))
     batch_size: int = int(os.getenv("VP_BATCH_SIZE", 8))
+    # query-by-clip: frames sampled per upload, upload cap, sampled frame short side
+    clip_max_frames: int = int(os.getenv("CLIP_MAX_FRAMES", 16))
+    clip_max_mb: float = float(os.getenv("CLIP_MAX_MB", 50))
+    clip_frame_side: int = int(os.getenv("CLIP_FRAME_SIDE", 448))
+    # multi-image batch search: queries (images + vectors) per request
+    batch_max_queries: int = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", 64))
+    # /get-embeddings/bulk: ids per request
+    embeddings_bulk_max: int = int(os.getenv("EMBEDDINGS_BULK_MAX", 5000))
 
     ## ───────────── feature switches ────────────────────────────────
     crop_enabled: bool = os.getenv("VP_ENABLE_CROP", "1") != "0"
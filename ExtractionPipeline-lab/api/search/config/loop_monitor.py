@@ -0,0 +1,67 @@
+"""
+Event-loop lag monitor
+
+A background task sleeps for ``interval`` seconds and records how late it
+wakes up.  Anything that blocks the loop (a synchronous model forward, a
+blocking Qdrant / S3 call, heavy CPU work in a handler) shows up directly as
+lag, so the numbers tell whether the routes really only orchestrate.
+
+    monitor = LoopLagMonitor()
+    await monitor.start()        # on startup
+    monitor.stats()              # {"p50_ms", "p99_ms", "max_ms", "samples", ...}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Samples event-loop scheduling delay over a sliding window."""
+
+    def __init__(self, interval: float = 0.1, window: int = 600, warn_ms: float = 100.0):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - t0 - self.interval) * 1000)
+            self._lags.append(lag_ms)
+            if lag_ms > self.warn_ms:
+                logger.warning(f"Event loop blocked for {lag_ms:.0f} ms")
+
+    def stats(self) -> Dict[str, float]:
+        lags = sorted(self._lags)
+        if not lags:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(lags),
+            "interval_ms": self.interval * 1000,
+            "p50_ms": statistics.median(lags),
+            "p99_ms": lags[int(0.99 * (len(lags) - 1))],
+            "max_ms": lags[-1],
+        }
+
+
+loop_monitor = LoopLagMonitor()  # process-wide instance, started by the app
@@ -11,14 +11,21 @@ from auth.apikey import verify_api_key
 from auth.basic import verify_credentials
 from config.env_config import settings
 from config.logging_config import configure_logging
+from config.loop_monitor import loop_monitor
 from src.controllers.add_content import image as add_image_controller
 from src.controllers.add_content import video as add_video_controller
 from src.controllers.get_embeddings import embeddings as get_embeddings_controller
+from src.controllers.search_by import clip as search_clip_controller
 from src.controllers.search_by import image as search_image_controller
 from src.controllers.search_by import text as search_text_controller
 from src.controllers.search_by_user_content import image as search_user_image_controller
 from src.controllers.search_by_user_content import video as search_user_video_controller
 
+try:
+    from services import embeddings_service, qdrant_service  # when 'services' is on PYTHONPATH
+except ImportError:  # pragma: no cover
+    from src.services import embeddings_service, qdrant_service
+
 log = configure_logging()
 
 app = FastAPI(
@@ -29,6 +36,17 @@ app = FastAPI(
     openapi_url=None,
 )
 
+# --- Event-loop lag monitor ---
+@app.on_event("startup")
+async def start_loop_monitor():
+    await loop_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
+
 # --- CORS Middleware ---
 app.add_middleware(
     CORSMiddleware,
@@ -67,6 +85,13 @@ app.include_router(
     dependencies=[Depends(verify_api_key)],
 )
 
+app.include_router(
+    search_clip_controller.router,
+    prefix="/search-by/clip",
+    tags=["Search"],
+    dependencies=[Depends(verify_api_key)],
+)
+
 # Search By User Content Routes
 app.include_router(
     search_user_image_controller.router,
@@ -110,6 +135,17 @@ def debug_settings():
     }
 
 
+@app.get("/debug/loop-lag", tags=["Debug"])
+def debug_loop_lag():
+    """Event-loop scheduling delay over the last minute (should stay near 0 under load)."""
+    return {
+        "loop_lag": loop_monitor.stats(),
+        "embedding_batches": embeddings_service.batching_stats(),
+        "embedding_cache": embeddings_service.cache_stats(),
+        "search_cache": qdrant_service.search_cache_stats(),
+    }
+
+
 # Custom Swagger UI Route
 @app.get("/api/docs", dependencies=[Depends(verify_credentials)])
 def custom_swagger_ui():
@@ -95,7 +95,7 @@ async def upload_image(
     try:
         # 1️⃣ Upload image to S3
         logger.info(f"Uploading image to S3: {s3_object_key}")
-        upload_to_s3_service.upload_file_to_s3(
+        await upload_to_s3_service.aupload_file_to_s3(
             file_bytes=image_bytes, object_name=s3_object_key, bucket_name=settings.s3_app_bucket
         )
 
@@ -104,7 +104,7 @@ async def upload_image(
 
         # 2️⃣ Generate embedding for the image
         logger.info(f"Generating embeddings for image {image_id}")
-        vector = embeddings_service.get_image_embedding(image)
+        vector = await embeddings_service.aget_image_embedding(image)
 
         # 3️⃣ Prepare payload with metadata for user_images collection
         payload = {
@@ -124,13 +124,11 @@ async def upload_image(
         logger.info(f"Storing metadata in Qdrant user_images collection for image {image_id}")
         from qdrant_client import models
 
-        client = qdrant_service._client()
-
         # Create point for insertion
         point = models.PointStruct(id=image_id, vector=vector, payload=payload)
 
         # Insert the point into user_images collection
-        client.upsert(collection_name="user_images", points=[point])
+        await qdrant_service.aupsert(collection="user_images", points=[point])
 
         logger.info(f"Successfully processed image {image_id} for user {user_id}")
 
@@ -202,7 +200,7 @@ async def upload_images_batch(
             s3_object_key = f"users/{user_id}/img/{image_id}.png"
 
             # Upload image to S3
-            upload_to_s3_service.upload_file_to_s3(
+            await upload_to_s3_service.aupload_file_to_s3(
                 file_bytes=image_bytes,
                 object_name=s3_object_key,
                 bucket_name=settings.s3_app_bucket,
@@ -212,7 +210,7 @@ async def upload_images_batch(
             image_url = f"https://{settings.s3_app_bucket}.s3.{settings.aws_region}.amazonaws.com/{s3_object_key}"
 
             # Generate embedding
-            vector = embeddings_service.get_image_embedding(image)
+            vector = await embeddings_service.aget_image_embedding(image)
 
             # Prepare payload with metadata for user_images collection
             payload = {
@@ -232,13 +230,11 @@ async def upload_images_batch(
             # Store in Qdrant user_images collection
             from qdrant_client import models
 
-            client = qdrant_service._client()
-
             # Create point for insertion
             point = models.PointStruct(id=image_id, vector=vector, payload=payload)
 
             # Insert the point into user_images collection
-            client.upsert(collection_name="user_images", points=[point])
+            await qdrant_service.aupsert(collection="user_images", points=[point])
 
             successful_uploads.append(
                 {"image_id": image_id, "image_url": image_url, "filename": file.filename}
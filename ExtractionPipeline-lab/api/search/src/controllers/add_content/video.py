@@ -7,7 +7,9 @@ utilities that live under `core/py/pipeline/src` so that the API layer
 can stay agnostic of the underlying module layout.
 """
 
+import asyncio
 import datetime
+import functools
 import logging
 import uuid
 
@@ -21,8 +23,10 @@ except ImportError:
     from ...services import upload_to_s3_service, video_processing_service
 
 try:
+    from config.concurrency_manager import get_concurrency_manager
     from config.env_config import settings
 except ImportError:
+    from ...config.concurrency_manager import get_concurrency_manager
     from ...config.env_config import settings
 
 logger = logging.getLogger(__name__)
@@ -80,7 +84,7 @@ async def upload_video(
     try:
         # Step 1: Upload video to S3
         logger.info(f"Uploading video to S3: {s3_object_key}")
-        upload_to_s3_service.upload_file_to_s3(
+        await upload_to_s3_service.aupload_file_to_s3(
             file_bytes=video_bytes, object_name=s3_object_key, bucket_name=settings.s3_app_bucket
         )
 
@@ -92,11 +96,16 @@ async def upload_video(
         # Step 2: Process video (extract frames, generate embeddings, store in Qdrant)
         try:
             logger.info(f"Starting video processing for {video_id}")
-            processing_result = video_processing_service.process_user_video(
-                video_s3_path=s3_object_key,
-                user_id=user_id,
-                video_folder=video_id,  # Use video_id as the video_folder identifier
-                video_id=video_id,
+            # Frame extraction + CLIP run on the bounded pipeline executor, not the event loop
+            processing_result = await asyncio.get_running_loop().run_in_executor(
+                get_concurrency_manager().executor,
+                functools.partial(
+                    video_processing_service.process_user_video,
+                    video_s3_path=s3_object_key,
+                    user_id=user_id,
+                    video_folder=video_id,  # Use video_id as the video_folder identifier
+                    video_id=video_id,
+                ),
             )
 
             status_message = f"Video uploaded and processed successfully. "
@@ -1,14 +1,20 @@
 import logging
+import uuid
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Header, HTTPException, Response
+from pydantic import BaseModel, Field
 
 # Local services for Qdrant operations
 try:
-    from services import qdrant_service
+    from services import qdrant_service, vector_codec
 except ImportError:
-    from ...services import qdrant_service
+    from ...services import qdrant_service, vector_codec
+
+try:
+    from config.env_config import settings
+except ImportError:  # pragma: no cover
+    from ...config.env_config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -21,22 +27,67 @@ router = APIRouter()
 class GetEmbeddingsRequest(BaseModel):
     collection_name: str
     embedding_id: str
+    encoding: vector_codec.Encoding = "json"
 
 
 class EmbeddingsResponse(BaseModel):
     embedding_id: str
     collection_name: str
-    vector: List[float]
+    vector: List[float] | str  # base64 unless encoding is "json"
     payload: Dict[str, Any]
+    encoding: vector_codec.Encoding = "json"
+
+
+class BulkEmbeddingsRequest(BaseModel):
+    collection_name: str
+    embedding_ids: List[str] = Field(..., min_length=1)
+    encoding: vector_codec.Encoding = "json"
+    with_payload: bool = False
+
+
+class EmbeddingItem(BaseModel):
+    embedding_id: str
+    vector: List[float] | str
+    payload: Dict[str, Any] | None = None
+
+
+class BulkEmbeddingsResponse(BaseModel):
+    collection_name: str
+    encoding: vector_codec.Encoding
+    embeddings: List[EmbeddingItem]  # request order, missing ids skipped
+    missing: List[str]
+
+
+def _check_collection(collection_name: str) -> None:
+    if collection_name not in ALLOWED_COLLECTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid collection name. Must be one of: {', '.join(ALLOWED_COLLECTIONS)}",
+        )
+
+
+def _npy_response(
+    rows: List[List[float] | None], dim: int, encoding: str, headers: Dict[str, str] | None = None
+) -> Response:
+    return Response(
+        content=vector_codec.to_npy(rows, dim, encoding),
+        media_type=vector_codec.OCTET_STREAM,
+        headers=headers,
+    )
 
 
 @router.post("/", response_model=EmbeddingsResponse)
-async def get_embeddings(request: GetEmbeddingsRequest) -> EmbeddingsResponse:
+async def get_embeddings(
+    request: GetEmbeddingsRequest, accept: str | None = Header(None)
+) -> EmbeddingsResponse:
     """
     Retrieve embeddings by collection name and embedding ID.
 
     Args:
-        request (GetEmbeddingsRequest): Contains collection_name and embedding_id
+        request (GetEmbeddingsRequest): Contains collection_name, embedding_id and the
+            vector encoding ("json" floats, or base64 "float32" / "float16")
+        accept: ``application/octet-stream`` returns the vector alone as a
+            ``(1, dim)`` ``.npy`` array instead of JSON
 
     Returns:
         EmbeddingsResponse: Response with the embedding vector and payload
@@ -48,11 +99,7 @@ async def get_embeddings(request: GetEmbeddingsRequest) -> EmbeddingsResponse:
     """
 
     # Validate collection name
-    if request.collection_name not in ALLOWED_COLLECTIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid collection name. Must be one of: {', '.join(ALLOWED_COLLECTIONS)}",
-        )
+    _check_collection(request.collection_name)
 
     # Validate embedding id is not empty
     if not request.embedding_id.strip():
@@ -60,9 +107,7 @@ async def get_embeddings(request: GetEmbeddingsRequest) -> EmbeddingsResponse:
 
     try:
         # Fetch the embedding by ID from the specified collection
-        client = qdrant_service._client()
-
-        points = client.retrieve(
+        points = await qdrant_service._aclient().retrieve(
             collection_name=request.collection_name,
             ids=[request.embedding_id],
             with_payload=True,
@@ -76,17 +121,22 @@ async def get_embeddings(request: GetEmbeddingsRequest) -> EmbeddingsResponse:
             )
 
         point = points[0]
+        vector = qdrant_service.full_vector(point.vector)
 
-        if not point.vector:
+        if not vector:
             raise HTTPException(
                 status_code=404, detail=f"No vector found for embedding ID {request.embedding_id}"
             )
 
+        if vector_codec.wants_binary(accept):
+            return _npy_response([vector], len(vector), request.encoding)
+
         return EmbeddingsResponse(
             embedding_id=request.embedding_id,
             collection_name=request.collection_name,
-            vector=point.vector,
+            vector=vector_codec.encode(vector, request.encoding),
             payload=point.payload or {},
+            encoding=request.encoding,
         )
 
     except HTTPException:
@@ -97,3 +147,77 @@ async def get_embeddings(request: GetEmbeddingsRequest) -> EmbeddingsResponse:
             f"Failed to fetch embedding ID {request.embedding_id} from collection {request.collection_name}: {exc}"
         )
         raise HTTPException(status_code=500, detail=f"Failed to retrieve embeddings: {str(exc)}")
+
+
+def _point_id(embedding_id: str) -> int | str:
+    """Qdrant point id: unsigned integer or (canonical) UUID."""
+    raw = embedding_id.strip()
+    if raw.isdigit():
+        return int(raw)
+    try:
+        return str(uuid.UUID(raw))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid embedding ID {embedding_id!r}: expected an unsigned integer or a UUID.",
+        )
+
+
+@router.post("/bulk", response_model=BulkEmbeddingsResponse)
+async def get_embeddings_bulk(
+    request: BulkEmbeddingsRequest, accept: str | None = Header(None)
+) -> BulkEmbeddingsResponse:
+    """
+    Retrieve many embeddings of one collection in a single Qdrant request.
+
+    JSON lists the found embeddings in request order plus the ``missing`` ids.
+    With ``Accept: application/octet-stream`` the body is an ``(n, dim)``
+    ``.npy`` array with one row per requested id, in request order – rows of
+    missing ids are NaN (counted in ``X-Missing-Count``); payloads are not
+    included.
+    """
+
+    _check_collection(request.collection_name)
+    if len(request.embedding_ids) > settings.embeddings_bulk_max:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.embeddings_bulk_max} embedding IDs per request.",
+        )
+
+    point_ids = [_point_id(embedding_id) for embedding_id in request.embedding_ids]
+    try:
+        found = await qdrant_service.aretrieve_vectors(
+            collection=request.collection_name,
+            ids=list(dict.fromkeys(point_ids)),
+            with_payload=request.with_payload,
+        )
+    except Exception as exc:
+        logger.error(f"Failed to fetch {len(point_ids)} embeddings from {request.collection_name}: {exc}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve embeddings: {str(exc)}")
+
+    rows = [found.get(str(point_id)) for point_id in point_ids]
+    missing = [eid for eid, row in zip(request.embedding_ids, rows) if row is None]
+
+    if vector_codec.wants_binary(accept):
+        dim = next((len(row[0]) for row in rows if row), settings.dim)
+        return _npy_response(
+            [row[0] if row else None for row in rows],
+            dim,
+            request.encoding,
+            headers={"X-Missing-Count": str(len(missing))},
+        )
+
+    return BulkEmbeddingsResponse(
+        collection_name=request.collection_name,
+        encoding=request.encoding,
+        embeddings=[
+            EmbeddingItem(
+                embedding_id=embedding_id,
+                vector=vector_codec.encode(row[0], request.encoding),
+                payload=(row[1] or {}) if request.with_payload else None,
+            )
+            for embedding_id, row in zip(request.embedding_ids, rows)
+            if row is not None
+        ],
+        missing=missing,
+    )
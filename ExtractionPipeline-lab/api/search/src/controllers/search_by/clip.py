@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""Query-by-clip controller
+
+Search watched videos with a short uploaded clip without storing it: frames
+are sampled in memory, embedded together, searched in one batched Qdrant
+request and fused per indexed video.  Nothing is written to S3 or Qdrant.
+"""
+
+from typing import List
+
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from pydantic import BaseModel
+
+try:
+    from services import clip_sampler, embeddings_service, qdrant_service, video_fusion
+except ImportError:  # pragma: no cover – fallback for package-relative layout
+    from ...services import clip_sampler, embeddings_service, qdrant_service, video_fusion
+
+try:
+    from config.env_config import settings
+except ImportError:  # pragma: no cover
+    from ...config.env_config import settings
+
+router = APIRouter()
+
+
+class ClipFrameMatch(BaseModel):
+    query_second: float  # timestamp of the sampled clip frame
+    frame_id: str
+    score: float
+    payload: dict
+
+
+class ClipVideoResult(BaseModel):
+    video_code: str
+    score: float
+    total_frames: int
+    frame_results: List[ClipFrameMatch]
+
+
+@router.post("/", response_model=List[ClipVideoResult])
+async def search_by_clip(
+    file: UploadFile = File(..., description="A short video clip to search with."),
+    limit: int = Query(10, ge=1, le=100),
+    frame_limit: int = Query(20, ge=1, le=200),
+    max_frames: int | None = Query(None, ge=1, description="Frames to sample (capped at CLIP_MAX_FRAMES)."),
+    fusion: video_fusion.Fusion = "mean_topk",
+    top_k: int = Query(3, ge=1),
+    threshold: float = 0.8,
+    precision: qdrant_service.Precision | None = None,
+) -> List[ClipVideoResult]:
+    """Rank watched videos against an uploaded clip, entirely in memory."""
+
+    if not file.content_type or not file.content_type.startswith("video/"):
+        raise HTTPException(status_code=400, detail="File must be a video.")
+
+    data = await file.read(int(settings.clip_max_mb * 1024 * 1024) + 1)
+    if len(data) > settings.clip_max_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"Clip larger than {settings.clip_max_mb:g} MB.")
+
+    # 1️⃣ Sample frames in memory
+    max_frames = min(max_frames or settings.clip_max_frames, settings.clip_max_frames)
+    try:
+        frames = await clip_sampler.asample_frames(
+            data, max_frames=max_frames, side=settings.clip_frame_side
+        )
+    except clip_sampler.ClipError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid video clip: {exc}")
+
+    # 2️⃣ Embed all frames together (shared forwards on the image batcher)
+    try:
+        vectors = await embeddings_service.aget_image_embeddings([image for _, image in frames])
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Failed to generate frame embeddings: {exc}")
+
+    # 3️⃣ One batched search, then video-level fusion
+    try:
+        hits_per_frame = await qdrant_service.asearch_batch(
+            vectors=vectors, limit=frame_limit, precision=precision
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Search failed: {exc}")
+
+    matches = video_fusion.fuse_video_hits(
+        hits_per_frame, fusion=fusion, top_k=top_k, threshold=threshold, limit=limit
+    )
+    return [
+        ClipVideoResult(
+            video_code=match.video,
+            score=match.score,
+            total_frames=len(match.frames),
+            frame_results=[
+                ClipFrameMatch(
+                    query_second=frames[index][0],
+                    frame_id=str(hit.id),
+                    score=hit.score,
+                    payload=hit.payload or {},
+                )
+                for index, hit in sorted(match.frames.items())
+            ],
+        )
+        for match in matches
+    ]
@@ -1,21 +1,37 @@
+import asyncio
 import io
-from typing import List
+import json
+import time
+from typing import List, Literal
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
 from PIL import Image
 from pydantic import BaseModel
 
 # Local services that wrap the heavy-lifting implementation details
 try:
-    from services import embeddings_service, qdrant_service  # when 'services' is on PYTHONPATH
+    from services import embeddings_service, qdrant_service, vector_codec  # when 'services' is on PYTHONPATH
 except ImportError:  # pragma: no cover – fallback for package-relative layout
-    from ...services import embeddings_service, qdrant_service
+    from ...services import embeddings_service, qdrant_service, vector_codec
+
+try:
+    from config.env_config import settings
+except ImportError:  # pragma: no cover
+    from ...config.env_config import settings
+
+try:
+    from controllers import search_filters
+    from controllers.search_filters import SearchFilters, filter_params
+except ImportError:  # pragma: no cover
+    from .. import search_filters
+    from ..search_filters import SearchFilters, filter_params
 
 router = APIRouter()
 
 
 class ImageSearchRequest(BaseModel):
     limit: int = 5
+    precision: qdrant_service.Precision | None = None
 
 
 class SearchResult(BaseModel):
@@ -24,49 +40,261 @@ class SearchResult(BaseModel):
     payload: dict
 
 
-@router.post("/", response_model=List[SearchResult])
-async def search_by_image(
-    file: UploadFile = File(..., description="The image file to search with."), limit: int = 5
-) -> List[SearchResult]:
-    """Search the **watched_frames** Qdrant collection by an uploaded image."""
+class VideoGroupResult(BaseModel):
+    video_code: str
+    score: float  # best frame
+    frames: List[SearchResult]
+
+
+class QueryTimings(BaseModel):
+    decode_ms: float | None = None  # images only
+    embed_ms: float | None = None  # whole batch: all images share the forwards
+    search_ms: float  # whole batch: one Qdrant round trip
+
+
+class BatchQueryResult(BaseModel):
+    index: int  # position in the request: files first, then vectors
+    source: Literal["image", "vector"]
+    filename: str | None = None
+    results: List[SearchResult]
+    debug: QueryTimings | None = None
+
+
+def _decode(image_bytes: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(image_bytes))
+    # Convert to RGB if necessary (handles RGBA, grayscale, etc.)
+    return image if image.mode == "RGB" else image.convert("RGB")
+
+
+async def _load_image(file: UploadFile) -> Image.Image:
+    """Validate the upload and decode it (off the event loop)."""
 
     # Validate file type
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image.")
 
+    # Read and validate image
+    image_bytes = await file.read()
+    if not image_bytes:
+        raise HTTPException(status_code=400, detail="Empty image file.")
+
     try:
-        # Read and validate image
-        image_bytes = await file.read()
-        if not image_bytes:
-            raise HTTPException(status_code=400, detail="Empty image file.")
+        return await asyncio.to_thread(_decode, image_bytes)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid image file: {str(exc)}")
 
-        # Convert bytes to PIL Image for processing
-        image = Image.open(io.BytesIO(image_bytes))
 
-        # Convert to RGB if necessary (handles RGBA, grayscale, etc.)
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+async def _image_vector(file: UploadFile) -> List[float]:
+    """Validate the upload and embed it with the central model."""
 
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Invalid image file: {str(exc)}")
+    image = await _load_image(file)
 
     # 1️⃣ Convert the image to a CLIP embedding using the central model
     try:
-        vector = embeddings_service.get_image_embedding(image)
+        vector = await embeddings_service.aget_image_embedding(image)
     except Exception as exc:
         raise HTTPException(
             status_code=500, detail=f"Failed to generate image embedding: {str(exc)}"
         )
+    return vector
+
+
+@router.post("/", response_model=List[SearchResult])
+async def search_by_image(
+    response: Response,
+    file: UploadFile = File(..., description="The image file to search with."),
+    limit: int = 5,
+    precision: qdrant_service.Precision | None = None,
+    filters: SearchFilters = Depends(filter_params),
+    offset: int = 0,
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page."),
+    fields: List[str] | None = Query(None, description="Payload fields to return (repeatable)."),
+) -> List[SearchResult]:
+    """Search the **watched_frames** Qdrant collection by an uploaded image.
+
+    ``precision`` (fast | balanced | exact) trades latency for recall; the
+    filter parameters narrow the candidates in Qdrant, and pages continue
+    with ``offset`` or the ``X-Next-Cursor`` response header.
+    """
+
+    offset = search_filters.page_offset(offset, cursor)
+    vector = await _image_vector(file)
 
     # 2️⃣ Run semantic search against Qdrant
     try:
-        hits = qdrant_service.search(vector=vector, limit=limit)
+        hits = await qdrant_service.asearch(
+            vector=vector,
+            limit=limit,
+            precision=precision,
+            query_filter=filters.to_qdrant(),
+            offset=offset,
+            with_payload=search_filters.payload_fields(fields),
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(exc)}")
 
+    if next_page := search_filters.next_cursor(offset, limit, len(hits)):
+        response.headers[search_filters.NEXT_CURSOR_HEADER] = next_page
+
     # 3️⃣ Normalise the raw ScoredPoint objects to the API schema
     results: List[SearchResult] = [
         SearchResult(id=str(hit.id), score=hit.score, payload=hit.payload or {}) for hit in hits
     ]
 
     return results
+
+
+@router.post("/videos", response_model=List[VideoGroupResult])
+async def search_videos_by_image(
+    file: UploadFile = File(..., description="The image file to search with."),
+    videos: int = Query(10, ge=1, le=100),
+    frames_per_video: int = Query(3, ge=1, le=20),
+    precision: qdrant_service.Precision | None = None,
+    filters: SearchFilters = Depends(filter_params),
+    fields: List[str] | None = Query(None, description="Payload fields to return (repeatable)."),
+) -> List[VideoGroupResult]:
+    """Top videos for an uploaded image, each with its best-matching frames (grouped by ``video_code``)."""
+
+    vector = await _image_vector(file)
+
+    try:
+        groups = await qdrant_service.asearch_groups(
+            vector=vector,
+            groups=videos,
+            group_size=frames_per_video,
+            precision=precision,
+            query_filter=filters.to_qdrant(),
+            with_payload=search_filters.payload_fields(fields),
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(exc)}")
+
+    return [
+        VideoGroupResult(
+            video_code=str(group.id),
+            score=group.hits[0].score,
+            frames=[
+                SearchResult(id=str(hit.id), score=hit.score, payload=hit.payload or {})
+                for hit in group.hits
+            ],
+        )
+        for group in groups
+    ]
+
+
+def _parse_vectors(raw: str | None, encoding: vector_codec.Encoding) -> List[List[float]]:
+    if not raw:
+        return []
+    try:
+        if encoding != "json":
+            return vector_codec.decode(raw, encoding, settings.dim)
+        vectors = json.loads(raw)
+        if not isinstance(vectors, list) or not all(isinstance(v, list) for v in vectors):
+            raise ValueError("expected a JSON array of arrays")
+        vectors = [[float(x) for x in v] for v in vectors]
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid vectors: {exc}")
+    for i, vector in enumerate(vectors):
+        if len(vector) != settings.dim:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Vector {i} has {len(vector)} dimensions, expected {settings.dim}.",
+            )
+    return vectors
+
+
+async def _file_vectors(file: UploadFile | None) -> List[List[float]]:
+    if file is None:
+        return []
+    try:
+        return vector_codec.from_bytes(await file.read(), settings.dim)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid vectors file: {exc}")
+
+
+async def _timed_load(file: UploadFile) -> tuple[Image.Image, float]:
+    start = time.perf_counter()
+    image = await _load_image(file)
+    return image, (time.perf_counter() - start) * 1000
+
+
+@router.post("/batch", response_model=List[BatchQueryResult])
+async def search_by_images_batch(
+    files: List[UploadFile] = File(None, description="Images to search with."),
+    vectors: str | None = Form(None, description="Precomputed query vectors (see vector_encoding)."),
+    vector_encoding: vector_codec.Encoding = Form(
+        "json", description="json: array of arrays; float32 / float16: base64 of the concatenated rows."
+    ),
+    vectors_file: UploadFile | None = File(
+        None, description="Query vectors as an (n, dim) .npy array or raw little-endian float32 rows."
+    ),
+    limit: int = Query(5, ge=1, le=100),
+    precision: qdrant_service.Precision | None = None,
+    filters: SearchFilters = Depends(filter_params),
+    fields: List[str] | None = Query(None, description="Payload fields to return (repeatable)."),
+    debug: bool = Query(False, description="Add per-query timings."),
+) -> List[BatchQueryResult]:
+    """Search with many images and/or precomputed vectors in one request.
+
+    The images are embedded together on the image batcher and every query
+    goes to Qdrant in one batched request; results come back per query, in
+    request order (files first, then ``vectors``, then ``vectors_file`` rows).
+    """
+
+    files = files or []
+    query_vectors = _parse_vectors(vectors, vector_encoding) + await _file_vectors(vectors_file)
+    total = len(files) + len(query_vectors)
+    if not total:
+        raise HTTPException(status_code=400, detail="Send at least one image or vector.")
+    if total > settings.batch_max_queries:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.batch_max_queries} queries per request."
+        )
+
+    # 1️⃣ Decode all uploads, then embed them together
+    loaded = await asyncio.gather(*(_timed_load(file) for file in files))
+    embed_ms = None
+    if loaded:
+        start = time.perf_counter()
+        try:
+            image_vectors = await embeddings_service.aget_image_embeddings([img for img, _ in loaded])
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"Failed to generate image embeddings: {exc}")
+        embed_ms = (time.perf_counter() - start) * 1000
+        query_vectors = [*image_vectors, *query_vectors]
+
+    # 2️⃣ One batched Qdrant search for every query
+    start = time.perf_counter()
+    try:
+        hits_per_query = await qdrant_service.asearch_batch(
+            vectors=query_vectors,
+            limit=limit,
+            precision=precision,
+            query_filter=filters.to_qdrant(),
+            with_payload=search_filters.payload_fields(fields),
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Search failed: {exc}")
+    search_ms = (time.perf_counter() - start) * 1000
+
+    results = []
+    for index, hits in enumerate(hits_per_query):
+        is_image = index < len(files)
+        timings = QueryTimings(
+            decode_ms=loaded[index][1] if is_image else None,
+            embed_ms=embed_ms if is_image else None,
+            search_ms=search_ms,
+        )
+        results.append(
+            BatchQueryResult(
+                index=index,
+                source="image" if is_image else "vector",
+                filename=files[index].filename if is_image else None,
+                results=[
+                    SearchResult(id=str(hit.id), score=hit.score, payload=hit.payload or {})
+                    for hit in hits
+                ],
+                debug=timings if debug else None,
+            )
+        )
+    return results
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, Field
 
 # Local services that wrap the heavy-lifting implementation details
 # from ...services import embeddings_service, qdrant_service
@@ -8,12 +8,24 @@ try:
 except ImportError:  # pragma: no cover – fallback for package-relative layout
     from ...services import embeddings_service, qdrant_service
 
+try:
+    from controllers import search_filters
+    from controllers.search_filters import SearchFilters
+except ImportError:  # pragma: no cover
+    from .. import search_filters
+    from ..search_filters import SearchFilters
+
 router = APIRouter()
 
 
 class TextSearchRequest(BaseModel):
     prompt: str
     limit: int = 5
+    precision: qdrant_service.Precision | None = None  # fast | balanced | exact
+    filters: SearchFilters | None = None
+    offset: int = 0
+    cursor: str | None = None  # X-Next-Cursor of the previous page (overrides offset)
+    fields: list[str] | None = None  # payload fields to return (default: all)
 
 
 class SearchResult(BaseModel):
@@ -22,25 +34,89 @@ class SearchResult(BaseModel):
     payload: dict
 
 
+class TextVideoSearchRequest(BaseModel):
+    prompt: str
+    videos: int = Field(10, ge=1, le=100)  # groups returned
+    frames_per_video: int = Field(3, ge=1, le=20)
+    precision: qdrant_service.Precision | None = None
+    filters: SearchFilters | None = None
+    fields: list[str] | None = None
+
+
+class VideoGroupResult(BaseModel):
+    video_code: str
+    score: float  # best frame
+    frames: list[SearchResult]
+
+
 @router.post("/", response_model=list[SearchResult])
-async def search_by_text(request: TextSearchRequest) -> list[SearchResult]:
-    """Search the **watched_frames** Qdrant collection by a text *prompt*."""
+async def search_by_text(request: TextSearchRequest, response: Response) -> list[SearchResult]:
+    """Search the **watched_frames** Qdrant collection by a text *prompt*.
+
+    ``filters`` narrows the candidates in Qdrant; pages continue with
+    ``offset`` or the ``X-Next-Cursor`` response header.
+    """
 
     if not request.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt must not be empty.")
+    offset = search_filters.page_offset(request.offset, request.cursor)
 
     # 1️⃣  Convert the raw prompt to a CLIP embedding using the central model.
-    vector = embeddings_service.get_text_embedding(request.prompt)
+    vector = await embeddings_service.aget_text_embedding(request.prompt)
 
     # 2️⃣  Run semantic search against Qdrant.
     try:
-        hits = qdrant_service.search(vector=vector, limit=request.limit)
+        hits = await qdrant_service.asearch(
+            vector=vector,
+            limit=request.limit,
+            precision=request.precision,
+            query_filter=request.filters.to_qdrant() if request.filters else None,
+            offset=offset,
+            with_payload=search_filters.payload_fields(request.fields),
+        )
     except Exception as exc:  # pragma: no cover – we just forward the error
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    if cursor := search_filters.next_cursor(offset, request.limit, len(hits)):
+        response.headers[search_filters.NEXT_CURSOR_HEADER] = cursor
+
     # 3️⃣  Normalise the raw ScoredPoint objects to the API schema.
     results: list[SearchResult] = [
         SearchResult(id=str(hit.id), score=hit.score, payload=hit.payload or {}) for hit in hits
     ]
 
     return results
+
+
+@router.post("/videos", response_model=list[VideoGroupResult])
+async def search_videos_by_text(request: TextVideoSearchRequest) -> list[VideoGroupResult]:
+    """Top videos for a text *prompt*, each with its best-matching frames (grouped by ``video_code``)."""
+
+    if not request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt must not be empty.")
+
+    vector = await embeddings_service.aget_text_embedding(request.prompt)
+
+    try:
+        groups = await qdrant_service.asearch_groups(
+            vector=vector,
+            groups=request.videos,
+            group_size=request.frames_per_video,
+            precision=request.precision,
+            query_filter=request.filters.to_qdrant() if request.filters else None,
+            with_payload=search_filters.payload_fields(request.fields),
+        )
+    except Exception as exc:  # pragma: no cover – we just forward the error
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    return [
+        VideoGroupResult(
+            video_code=str(group.id),
+            score=group.hits[0].score,
+            frames=[
+                SearchResult(id=str(hit.id), score=hit.score, payload=hit.payload or {})
+                for hit in group.hits
+            ],
+        )
+        for group in groups
+    ]
@@ -16,6 +16,7 @@ class UserImageSearchRequest(BaseModel):
     user_id: str
     image_id: str
     limit: int = 5
+    precision: qdrant_service.Precision | None = None
 
 
 class SearchResult(BaseModel):
@@ -30,7 +31,7 @@ async def search_by_user_image(request: UserImageSearchRequest) -> List[SearchRe
 
     # Retrieve the image embedding from the user_images collection
     try:
-        embedding, _ = qdrant_service.fetch_embedding(
+        embedding, _ = await qdrant_service.afetch_embedding(
             collection="user_images", user_id=request.user_id, entry_id=request.image_id
         )
     except Exception as exc:
@@ -38,8 +39,11 @@ async def search_by_user_image(request: UserImageSearchRequest) -> List[SearchRe
 
     # Run semantic search against Qdrant
     try:
-        hits = qdrant_service.search(
-            vector=embedding, limit=request.limit, collection="watched_frames"
+        hits = await qdrant_service.asearch(
+            vector=embedding,
+            limit=request.limit,
+            collection="watched_frames",
+            precision=request.precision,
         )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(exc)}")
@@ -1,14 +1,13 @@
-from collections import defaultdict
-from typing import Any, Dict, List
+from typing import List
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Local services for embeddings and Qdrant search
 try:
-    from services import qdrant_service
+    from services import qdrant_service, video_fusion
 except ImportError:  # pragma: no cover
-    from ...services import qdrant_service
+    from ...services import qdrant_service, video_fusion
 
 router = APIRouter()
 
@@ -16,7 +15,12 @@ router = APIRouter()
 class UserVideoSearchRequest(BaseModel):
     user_id: str
     video_id: str
-    limit: int = 5
+    limit: int = 5  # videos returned
+    frame_limit: int = Field(20, ge=1, le=200)  # hits fetched per query frame
+    precision: qdrant_service.Precision | None = None
+    fusion: video_fusion.Fusion = "max"  # max | mean_topk | count
+    top_k: int = Field(3, ge=1)  # mean_topk: query frames averaged
+    threshold: float = 0.8  # count: minimum frame score
 
 
 class FrameSearchResult(BaseModel):
@@ -30,17 +34,18 @@ class FrameSearchResult(BaseModel):
 
 class VideoSearchResult(BaseModel):
     video_id: str
+    score: float
     total_frames: int
     frame_results: List[FrameSearchResult]
 
 
-@router.post("/user-video", response_model=List[FrameSearchResult])
-async def search_by_user_video(request: UserVideoSearchRequest) -> List[FrameSearchResult]:
-    """Search watched_frames collection for embeddings matching a user's video frames."""
+@router.post("/user-video", response_model=List[VideoSearchResult])
+async def search_by_user_video(request: UserVideoSearchRequest) -> List[VideoSearchResult]:
+    """Rank watched videos against all frames of a user's video (one batched search)."""
 
     # Retrieve all frame embeddings for the video from the user_videos collection
     try:
-        frame_embeddings = qdrant_service.fetch_all_video_embeddings(
+        frame_embeddings = await qdrant_service.afetch_all_video_embeddings(
             collection="user_videos", user_id=request.user_id, video_id=request.video_id
         )
     except Exception as exc:
@@ -51,41 +56,41 @@ async def search_by_user_video(request: UserVideoSearchRequest) -> List[FrameSea
     if not frame_embeddings:
         raise HTTPException(status_code=404, detail=f"No frames found for video {request.video_id}")
 
-    # Search watched_frames for each frame embedding
-    all_results = []
-
-    for frame_vector, frame_metadata in frame_embeddings:
-        try:
-            hits = qdrant_service.search(
-                vector=frame_vector, limit=request.limit, collection="watched_frames"
+    # All query frames go to watched_frames in a single batched request
+    try:
+        hits_per_frame = await qdrant_service.asearch_batch(
+            vectors=[vector for vector, _ in frame_embeddings],
+            limit=request.frame_limit,
+            collection="watched_frames",
+            precision=request.precision,
+        )
+    except Exception as exc:  # pragma: no cover – we just forward the error
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    matches = video_fusion.fuse_video_hits(
+        hits_per_frame,
+        fusion=request.fusion,
+        top_k=request.top_k,
+        threshold=request.threshold,
+        limit=request.limit,
+    )
+    return [_video_result(match, frame_embeddings) for match in matches]
+
+
+def _video_result(match: video_fusion.VideoMatch, frame_embeddings) -> VideoSearchResult:
+    frames = []
+    for index, hit in sorted(match.frames.items()):
+        metadata = frame_embeddings[index][1] or {}
+        frames.append(
+            FrameSearchResult(
+                frame_id=str(hit.id),
+                frame_number=metadata.get("frame_number", 0),
+                frame_second=metadata.get("frame_second", 0.0),
+                score=hit.score,
+                payload=hit.payload or {},
+                source_video_id=match.video,
             )
-
-            # Add frame metadata to each result
-            for hit in hits:
-                all_results.append(
-                    FrameSearchResult(
-                        frame_id=str(hit.id),
-                        frame_number=(
-                            frame_metadata.get("frame_number", 0) if frame_metadata else 0
-                        ),
-                        frame_second=(
-                            frame_metadata.get("frame_second", 0.0) if frame_metadata else 0.0
-                        ),
-                        score=hit.score,
-                        payload=hit.payload or {},
-                        source_video_id=hit.payload.get("video_id", "unknown") if hit.payload else "unknown",
-                    )
-                )
-
-        except Exception as exc:
-            # Log error but continue with other frames
-            print(f"Error searching with frame {frame_metadata}: {exc}")
-            continue
-
-    if not all_results:
-        return []
-
-    # Sort all results by score (highest to lowest - most similar to least similar)
-    all_results.sort(key=lambda x: x.score, reverse=True)
-
-    return all_results
+        )
+    return VideoSearchResult(
+        video_id=match.video, score=match.score, total_frames=len(frames), frame_results=frames
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+"""Search filters, pagination and payload projection
+
+Shared by the ``/search-by/*`` controllers:
+
+* ``SearchFilters`` – platform, ``created_at`` range and include / exclude
+  ``video_code`` lists, turned into a Qdrant filter on the indexed fields
+  (JSON bodies use the model, multipart routes the ``filter_params``
+  dependency built from query parameters).  A ``created_at`` range never
+  matches points without that field – frames ingested before the pipeline
+  stamped it need a ``qdrant/scripts/fix_wrong_points.py`` pass.
+* ``page_offset`` – ``offset`` or an opaque ``cursor`` (returned in the
+  ``X-Next-Cursor`` header of the previous page) → hits to skip.
+* ``payload_fields`` – optional whitelist of payload fields to return.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+try:
+    from services import qdrant_service
+except ImportError:  # pragma: no cover – fallback for package-relative layout
+    from ..services import qdrant_service
+
+MAX_OFFSET = 10_000  # deep pages get expensive: Qdrant still scores offset + limit hits
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SearchFilters(BaseModel):
+    platforms: List[str] | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    include_codes: List[str] | None = None
+    exclude_codes: List[str] | None = None
+
+    def to_qdrant(self):
+        return qdrant_service.payload_filter(**self.model_dump())
+
+
+def filter_params(
+    platform: List[str] | None = Query(None, description="Only these platforms (repeatable)."),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include_code: List[str] | None = Query(None, description="Only these video codes (repeatable)."),
+    exclude_code: List[str] | None = Query(None, description="Never these video codes (repeatable)."),
+) -> SearchFilters:
+    """`SearchFilters` from query parameters (routes whose body is a file upload)."""
+    return SearchFilters(
+        platforms=platform,
+        created_from=created_from,
+        created_to=created_to,
+        include_codes=include_code,
+        exclude_codes=exclude_code,
+    )
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode().rstrip("=")
+
+
+def page_offset(offset: int = 0, cursor: str | None = None) -> int:
+    """Hits to skip: from *cursor* when given, else *offset*."""
+    if cursor:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            offset = int(json.loads(base64.urlsafe_b64decode(padded))["offset"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if not 0 <= offset <= MAX_OFFSET:
+        raise HTTPException(status_code=400, detail=f"Offset must be between 0 and {MAX_OFFSET}.")
+    return offset
+
+
+def next_cursor(offset: int, limit: int, returned: int) -> str | None:
+    """Cursor of the following page, or None when this page was the last one."""
+    if returned < limit or offset + limit > MAX_OFFSET:
+        return None
+    return encode_cursor(offset + limit)
+
+
+def payload_fields(fields: List[str] | None) -> qdrant_service.Payload:
+    """``with_payload`` for Qdrant: the whitelist, or the whole payload."""
+    return list(fields) if fields else True
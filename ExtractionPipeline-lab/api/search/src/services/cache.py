@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+"""Small caches for the search API
+
+``TTLCache``  – thread-safe in-process LRU with a per-entry time-to-live and
+                hit / miss counters.
+``DiskCache`` – optional shared layer: one SQLite file (WAL mode) that every
+                worker process on the host can read and write, so an entry
+                computed by one worker is a hit for the others.
+
+Values in ``DiskCache`` are float vectors, stored as packed float32.
+"""
+
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache of at most ``maxsize`` entries, each valid for ``ttl`` seconds.
+
+    ``maxsize=0`` disables it (every ``get`` misses, ``put`` is a no-op).
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class DiskCache:
+    """Vectors shared between worker processes through one SQLite file."""
+
+    def __init__(self, path: str | Path, ttl: float = 86400.0) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._local = threading.local()  # sqlite connections are per thread
+        self.hits = 0
+        self.misses = 0
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, created REAL, vec BLOB)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[List[float]]:
+        row = self._conn().execute(
+            "SELECT vec FROM vectors WHERE key = ? AND created >= ?", (key, time.time() - self.ttl)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return array("f", row[0]).tolist()
+
+    def put(self, key: str, vector: List[float]) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO vectors (key, created, vec) VALUES (?, ?, ?)",
+                (key, time.time(), array("f", vector).tobytes()),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": str(self.path), "ttl_s": self.ttl, "hits": self.hits, "misses": self.misses}
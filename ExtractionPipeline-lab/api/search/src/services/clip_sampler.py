@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""In-memory frame sampling for query clips
+
+``asample_frames(data, max_frames=..., side=...)`` turns the bytes of an
+uploaded video into at most ``max_frames`` evenly spaced RGB frames without
+persisting anything: the upload lives in a tmpfs file (``/dev/shm``, so it
+never touches disk) only while ffprobe / ffmpeg read it – MP4s keep their
+index at the end, which ffmpeg can't reach through a pipe – and the frames
+come back over ffmpeg's stdout as a BMP stream, already downscaled to a
+short side of ``side`` px.  Both tools run as asyncio subprocesses, so the
+event loop only awaits.
+"""
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import struct
+import tempfile
+from typing import List, Tuple
+
+from PIL import Image
+
+FFMPEG = shutil.which("ffmpeg") or "ffmpeg"
+FFPROBE = shutil.which("ffprobe") or "ffprobe"
+_TMPFS = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class ClipError(ValueError):
+    """The upload could not be decoded as a video."""
+
+
+def sample_times(duration: float, count: int) -> List[float]:
+    """Timestamps of the frames the ``fps=count/duration`` filter emits."""
+    if duration <= 0:
+        return [float(i) for i in range(count)]  # unknown duration: 1 fps
+    return [i * duration / count for i in range(count)]
+
+
+def split_bmp_stream(data: bytes) -> List[bytes]:
+    """Cut ffmpeg's ``image2pipe`` BMP output into single files (size field at offset 2)."""
+    frames, pos = [], 0
+    while pos < len(data):
+        if data[pos : pos + 2] != b"BM" or pos + 6 > len(data):
+            raise ClipError("corrupt frame stream")
+        (size,) = struct.unpack_from("<I", data, pos + 2)
+        if size < 26 or pos + size > len(data):
+            raise ClipError("truncated frame stream")
+        frames.append(data[pos : pos + size])
+        pos += size
+    return frames
+
+
+async def _run(*args: str, timeout: float) -> bytes:
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise ClipError(f"{os.path.basename(args[0])} timed out after {timeout:.0f}s")
+    if proc.returncode:
+        lines = err.decode(errors="replace").strip().splitlines()
+        raise ClipError(lines[-1] if lines else f"{os.path.basename(args[0])} failed")
+    return out
+
+
+def _scale(side: int) -> str:
+    # short side -> `side` (never upscaled), long side keeps the aspect ratio (even px)
+    return (
+        f"scale=w='if(lt(iw,ih),min({side},iw),-2)'"
+        f":h='if(lt(iw,ih),-2,min({side},ih))'"
+    )
+
+
+async def asample_frames(
+    data: bytes, *, max_frames: int, side: int, timeout: float = 30.0
+) -> List[Tuple[float, Image.Image]]:
+    """Up to *max_frames* evenly spaced ``(second, RGB image)`` pairs of the video in *data*."""
+    if not data:
+        raise ClipError("empty upload")
+    with tempfile.NamedTemporaryFile(dir=_TMPFS, suffix=".clip") as tmp:
+        await asyncio.to_thread(tmp.write, data)
+        await asyncio.to_thread(tmp.flush)
+
+        probe = await _run(
+            FFPROBE, "-v", "error", "-show_entries", "format=duration", "-of", "json", tmp.name,
+            timeout=timeout,
+        )
+        duration = float(json.loads(probe or b"{}").get("format", {}).get("duration") or 0)
+        rate = max_frames / duration if duration > 0 else 1.0
+
+        stream = await _run(
+            FFMPEG, "-nostdin", "-v", "error", "-i", tmp.name, "-an", "-sn",
+            "-vf", f"fps={rate:.6f},{_scale(side)}",
+            "-frames:v", str(max_frames),
+            "-f", "image2pipe", "-c:v", "bmp", "-pix_fmt", "bgr24", "pipe:1",
+            timeout=timeout,
+        )
+
+    frames = split_bmp_stream(stream)
+    if not frames:
+        raise ClipError("no decodable video frames")
+    times = sample_times(duration, max_frames)
+    return [
+        (times[i], Image.open(io.BytesIO(frame)).convert("RGB")) for i, frame in enumerate(frames)
+    ]
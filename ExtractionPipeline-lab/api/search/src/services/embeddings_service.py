@@ -5,12 +5,44 @@ from __future__ import annotations
 Provides thin convenience wrappers around the central CLIP embedding
 utilities that live under `core/py/pipeline/src` so that the API layer
 can stay agnostic of the underlying module layout.
+
+Single-query calls go through a `MicroBatcher` per modality: queries that
+arrive concurrently within ``EMBED_MAX_WAIT_MS`` are encoded in one
+forward of up to ``EMBED_MAX_BATCH`` items.  ``EMBED_MAX_BATCH=1`` turns
+batching off.  The model always runs on the batcher's worker thread; async
+routes use the ``aget_*`` variants, which only await the result.
+
+Text embeddings are cached, keyed by the normalised query (NFKC, collapsed
+whitespace – case is kept, the text tower is case-sensitive) plus model
+name and dim: an in-process LRU/TTL layer (``EMBED_CACHE_SIZE``,
+``EMBED_CACHE_TTL_S``) and, with ``EMBED_CACHE_PATH`` set, a SQLite file
+shared by the workers on the host.  A hit never reaches the model, and
+concurrent misses for the same query share one encode.
 """
 
+import asyncio
+import hashlib
+import os
 import sys
+import threading
+import unicodedata
+from concurrent.futures import Future
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
+
+try:
+    from services.cache import DiskCache, TTLCache
+    from services.micro_batch import MicroBatcher
+except ImportError:  # pragma: no cover – fallback for package-relative layout
+    from .cache import DiskCache, TTLCache
+    from .micro_batch import MicroBatcher
+
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", 32))
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", 5.0))
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", 4096))
+EMBED_CACHE_TTL_S = float(os.getenv("EMBED_CACHE_TTL_S", 86400))
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "")
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -35,6 +67,84 @@ def _ensure_pipeline_on_path() -> None:
         sys.path.insert(0, str(pipeline_root))
 
 
+def normalize_query(prompt: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", prompt).split())
+
+
+def _text_key(text: str) -> str:
+    model = os.getenv("CLIP_MODEL", "jinaai/jina-clip-v2")
+    dim = os.getenv("QDRANT_DIM", "512")
+    return f"{model}:{dim}:" + hashlib.sha1(text.encode()).hexdigest()
+
+
+_text_cache: TTLCache[str, List[float]] = TTLCache(EMBED_CACHE_SIZE, EMBED_CACHE_TTL_S)
+_disk_cache: DiskCache | None = DiskCache(EMBED_CACHE_PATH, EMBED_CACHE_TTL_S) if EMBED_CACHE_PATH else None
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _encode_texts(prompts: List[str]) -> List[List[float]]:
+    # runs on the batcher worker: the shared disk layer is read / written here, off the loop
+    cached = [_disk_cache.get(_text_key(p)) for p in prompts] if _disk_cache else [None] * len(prompts)
+    todo = [p for p, vec in zip(prompts, cached) if vec is None]
+    if todo:
+        _ensure_pipeline_on_path()
+
+        # Import lazily so that heavy model initialisation only happens when
+        # embeddings are actually requested.
+        from src.infer_embeds import encode_text_batch  # pylint: disable=import-error
+
+        fresh = iter(encode_text_batch(todo, batch_size=len(todo)))
+        cached = [vec if vec is not None else next(fresh) for vec in cached]
+        if _disk_cache:
+            for p, vec in zip(prompts, cached):
+                if p in todo:
+                    _disk_cache.put(_text_key(p), vec)
+    return cached
+
+
+def _encode_images(images: List[Any]) -> List[List[float]]:
+    _ensure_pipeline_on_path()
+
+    from src.infer_embeds import encode_image_batch  # pylint: disable=import-error
+
+    return encode_image_batch(images, batch_size=len(images))
+
+
+_text_batcher = MicroBatcher(
+    _encode_texts, max_batch=EMBED_MAX_BATCH, max_wait_ms=EMBED_MAX_WAIT_MS, name="embed-text"
+)
+_image_batcher = MicroBatcher(
+    _encode_images, max_batch=EMBED_MAX_BATCH, max_wait_ms=EMBED_MAX_WAIT_MS, name="embed-image"
+)
+
+
+def _text_future(prompt: str) -> "Future[List[float]]":
+    """Cached vector, the in-flight encode of the same query, or a new one."""
+    text = normalize_query(prompt)
+    key = _text_key(text)
+    vector = _text_cache.get(key)
+    if vector is not None:
+        done: Future = Future()
+        done.set_result(vector)
+        return done
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        new = fut is None
+        if new:
+            fut = _inflight[key] = _text_batcher.submit(text)
+    if new:  # outside the lock: the callback runs inline if the encode already finished
+        fut.add_done_callback(lambda f: _settle(key, f))
+    return fut
+
+
+def _settle(key: str, fut: Future) -> None:
+    with _inflight_lock:
+        _inflight.pop(key, None)
+    if fut.exception() is None:
+        _text_cache.put(key, fut.result())
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -42,13 +152,7 @@ def _ensure_pipeline_on_path() -> None:
 
 def get_text_embedding(prompt: str) -> List[float]:
     """Return a single CLIP embedding for *prompt* (L2-normalised)."""
-    _ensure_pipeline_on_path()
-
-    # Import lazily so that heavy model initialisation only happens when
-    # embeddings are actually requested.
-    from src.infer_embeds import encode_text_batch  # pylint: disable=import-error
-
-    return encode_text_batch([prompt])[0]
+    return list(_text_future(prompt).result())
 
 
 def get_image_embedding(image) -> List[float]:
@@ -60,10 +164,34 @@ def get_image_embedding(image) -> List[float]:
     Returns:
         List[float]: The embedding vector for the image
     """
-    _ensure_pipeline_on_path()
+    return _image_batcher(image)
+
+
+async def aget_text_embedding(prompt: str) -> List[float]:
+    """`get_text_embedding` for async routes – the event loop only awaits."""
+    return list(await asyncio.wrap_future(_text_future(prompt)))
+
+
+async def aget_image_embedding(image) -> List[float]:
+    """`get_image_embedding` for async routes – the event loop only awaits."""
+    return await asyncio.wrap_future(_image_batcher.submit(image))
+
+
+async def aget_image_embeddings(images: List[Any]) -> List[List[float]]:
+    """Embed several images; queued together, they share batched forwards."""
+    futures = [_image_batcher.submit(image) for image in images]
+    return [await asyncio.wrap_future(fut) for fut in futures]
+
+
+def batching_stats() -> Dict[str, Dict[str, Any]]:
+    """Batch counters per modality (for /debug and load tests)."""
+    return {"text": _text_batcher.stats(), "image": _image_batcher.stats()}
 
-    # Import lazily so that heavy model initialisation only happens when
-    # embeddings are actually requested.
-    from src.infer_embeds import encode_image_batch  # pylint: disable=import-error
 
-    return encode_image_batch([image])[0]
+def cache_stats() -> Dict[str, Any]:
+    """Hit / miss counters of the text embedding cache layers."""
+    return {
+        "memory": _text_cache.stats(),
+        "disk": _disk_cache.stats() if _disk_cache else None,
+        "inflight": len(_inflight),
+    }
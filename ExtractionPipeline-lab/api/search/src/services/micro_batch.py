@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+"""Micro-batching queue
+
+Collects single-item calls made concurrently from several threads and runs
+them as one batched call: a worker thread waits for the first item, keeps
+collecting for at most ``max_wait_ms`` (or until ``max_batch`` items are
+queued), calls ``fn(items)`` once and resolves every caller's future with
+its own result.
+
+Used by the embeddings service so that concurrent search requests share one
+``model.encode`` forward instead of running a series of batch-of-1 passes.
+A lone request pays at most ``max_wait_ms`` extra latency.  The worker is
+also the dedicated inference thread: async callers await the future
+(``asyncio.wrap_future``) and the event loop never runs the model.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Generic, List, Sequence, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce concurrent ``__call__(item)`` into ``fn([items])`` calls.
+
+    ``max_batch=1`` disables batching (one call per item, still on the
+    worker); ``max_wait_ms=0`` only batches what is already queued.  If a
+    batched call raises, the items are retried one by one so that a single
+    bad input (e.g. a corrupt image) only fails its own request.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[T]], Sequence[R]],
+        *,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batch",
+    ) -> None:
+        self.fn = fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue: "queue.Queue[Tuple[T, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self.batches = 0
+        self.items = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, item: T) -> "Future[R]":
+        """Queue *item* and return a future for its result."""
+        fut: Future = Future()
+        self._ensure_worker()
+        self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item: T) -> R:
+        return self.submit(item).result()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> List[Tuple[T, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            self.batches += 1
+            self.items += len(items)
+            try:
+                results = self.fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{len(results)} results for {len(items)} items")
+            except Exception as exc:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    continue
+                log.warning(f"[{self.name}] batch of {len(batch)} failed ({exc}); retrying one by one")
+                for item, fut in batch:
+                    try:
+                        fut.set_result(self.fn([item])[0])
+                    except Exception as one_exc:
+                        fut.set_exception(one_exc)
+                continue
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
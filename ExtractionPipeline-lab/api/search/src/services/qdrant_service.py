@@ -4,35 +4,337 @@ from __future__ import annotations
 
 Centralised helper for connecting to Qdrant and performing common
 operations (currently limited to *search* for the API needs).
+
+Every search runs under a precision profile that trades latency for recall:
+
+* ``fast``     – small ``hnsw_ef``, quantized scores only (interactive UI)
+* ``balanced`` – default; larger ``hnsw_ef``, oversample + rescore with the
+  original vectors
+* ``exact``    – brute force on the original vectors (offline audits)
+
+Collections in the named ``full`` + ``mini`` layout (see
+qdrant/collections/watched_frames_v2.json) are searched in two stages: the
+Matryoshka prefix vector ``mini`` finds the candidates, the ``full`` vector
+re-scores them.  Single-vector collections keep the one-stage search.
+
+Every helper has an ``a``-prefixed twin (``asearch``, ``afetch_embedding``,
+…) on ``AsyncQdrantClient`` for the async routes; both build their requests
+with the same code.
+
+Search results are cached per (collection, vector digest, limit, precision,
+filter) and tagged with the collection's *write version*: a token every
+writer (``aupsert`` / ``bump_write_version`` here, ``store_embeds`` in the
+pipeline via ``lib.write_version``) replaces after a write.  A cached entry
+is only served while its collection's version is unchanged; other processes'
+writes are noticed within ``SEARCH_VERSION_POLL_S``.
 """
 
+import hashlib
+import logging
+import math
+
 import os
+import time
+import uuid
+from array import array
+from datetime import datetime
 from functools import lru_cache
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable, List, Literal, Sequence, Tuple
+
+try:
+    from services.cache import TTLCache
+except ImportError:  # pragma: no cover – package-relative layout
+    from .cache import TTLCache
 
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 
 # Attempt to load a .env file at repo root so local development works out of
 # the box. We silence failures because in production these vars are expected
 # to be present in the environment already.
 load_dotenv(dotenv_path=os.getenv("DOTENV_PATH", ".env"), override=False)
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # Client initialisation (singleton)
 # ---------------------------------------------------------------------------
 
 
-@lru_cache(maxsize=1)
-def _client() -> QdrantClient:
-    """Return a cached *QdrantClient* instance based on env-vars."""
+def _connection() -> Dict[str, Any]:
     url = os.getenv("QDRANT_URL")
     key = os.getenv("QDRANT_KEY")
     if not url or not key:
         raise RuntimeError("QDRANT_URL and QDRANT_KEY must be set in the environment or .env file.")
+    return {"url": url.rstrip("/"), "api_key": key, "prefer_grpc": True}
+
+
+@lru_cache(maxsize=1)
+def _client() -> QdrantClient:
+    """Return a cached *QdrantClient* instance based on env-vars."""
+    return QdrantClient(**_connection())
+
+
+@lru_cache(maxsize=1)
+def _aclient() -> AsyncQdrantClient:
+    """Return a cached *AsyncQdrantClient* instance based on env-vars."""
+    return AsyncQdrantClient(**_connection())
+
+
+# ---------------------------------------------------------------------------
+# Precision profiles
+# ---------------------------------------------------------------------------
+
+Precision = Literal["fast", "balanced", "exact"]
+PRECISIONS: tuple[str, ...] = ("fast", "balanced", "exact")
+
+
+@lru_cache(maxsize=None)
+def search_params(precision: Precision | None = None) -> models.SearchParams:
+    """Map a precision profile (default: ``SEARCH_PRECISION``) to Qdrant search params.
+
+    On collections without quantization the ``quantization`` block is ignored
+    by Qdrant, so the profiles then only differ in ``hnsw_ef`` / ``exact``.
+    """
+    precision = precision or os.getenv("SEARCH_PRECISION", "balanced")
+    if precision == "fast":
+        return models.SearchParams(
+            hnsw_ef=int(os.getenv("SEARCH_FAST_EF", 32)),
+            quantization=models.QuantizationSearchParams(rescore=False),
+        )
+    if precision == "balanced":
+        return models.SearchParams(
+            hnsw_ef=int(os.getenv("SEARCH_BALANCED_EF", 128)),
+            quantization=models.QuantizationSearchParams(
+                rescore=True, oversampling=float(os.getenv("SEARCH_OVERSAMPLING", 2.0))
+            ),
+        )
+    if precision == "exact":
+        return models.SearchParams(
+            exact=True, quantization=models.QuantizationSearchParams(ignore=True)
+        )
+    raise ValueError(f"Unknown search precision {precision!r}; expected one of {PRECISIONS}")
+
+
+# ---------------------------------------------------------------------------
+# Vector layout (single vs. full + mini)
+# ---------------------------------------------------------------------------
+
+FULL_VECTOR = os.getenv("QDRANT_FULL_VECTOR", "full")
+MINI_VECTOR = os.getenv("QDRANT_MINI_VECTOR", "mini")
+
+
+Layout = Tuple[str, str, int] | None
+
+_alayouts: Dict[str, Layout] = {}  # async twin of the _vector_layout cache
+
+
+def _layout(vectors: Any) -> Layout:
+    if isinstance(vectors, dict) and FULL_VECTOR in vectors and MINI_VECTOR in vectors:
+        return FULL_VECTOR, MINI_VECTOR, vectors[MINI_VECTOR].size
+    return None
+
+
+@lru_cache(maxsize=None)
+def _vector_layout(collection: str) -> Layout:
+    """``(full name, mini name, mini dim)`` for two-stage collections, else None."""
+    return _layout(_client().get_collection(collection).config.params.vectors)
+
+
+async def _avector_layout(collection: str) -> Layout:
+    if collection not in _alayouts:
+        info = await _aclient().get_collection(collection)
+        _alayouts[collection] = _layout(info.config.params.vectors)
+    return _alayouts[collection]
+
+
+def _prefix(vector: List[float], dim: int) -> List[float]:
+    """Matryoshka prefix of *vector*, L2-normalised (same as lib.matryoshka)."""
+    head = [float(x) for x in vector[:dim]]
+    norm = math.sqrt(sum(x * x for x in head)) or 1.0
+    return [x / norm for x in head]
+
+
+def full_vector(vector: Any) -> Any:
+    """The full embedding of a stored point, whatever the collection layout."""
+    if isinstance(vector, dict):
+        return vector.get(FULL_VECTOR) or vector.get("")
+    return vector
+
+
+# ---------------------------------------------------------------------------
+# Payload filters
+# ---------------------------------------------------------------------------
+
+Payload = bool | List[str]  # with_payload: everything, nothing, or a field whitelist
+
+
+def payload_filter(
+    *,
+    platforms: Sequence[str] | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include_codes: Sequence[str] | None = None,
+    exclude_codes: Sequence[str] | None = None,
+) -> models.Filter | None:
+    """Filter on the indexed ``platform`` / ``video_code`` / ``created_at`` fields (None = no filter)."""
+    must: List[models.Condition] = []
+    must_not: List[models.Condition] = []
+    if platforms:
+        must.append(models.FieldCondition(key="platform", match=models.MatchAny(any=list(platforms))))
+    if include_codes:
+        must.append(
+            models.FieldCondition(key="video_code", match=models.MatchAny(any=list(include_codes)))
+        )
+    if exclude_codes:
+        must_not.append(
+            models.FieldCondition(key="video_code", match=models.MatchAny(any=list(exclude_codes)))
+        )
+    if created_from or created_to:
+        must.append(
+            models.FieldCondition(
+                key="created_at", range=models.DatetimeRange(gte=created_from, lte=created_to)
+            )
+        )
+    if not (must or must_not):
+        return None
+    return models.Filter(must=must or None, must_not=must_not or None)
+
+
+# ---------------------------------------------------------------------------
+# Write versions + result cache
+# ---------------------------------------------------------------------------
+
+VERSIONS_COLLECTION = os.getenv("QDRANT_VERSIONS_COLLECTION", "_write_versions")
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 2048))  # 0 disables
+SEARCH_CACHE_TTL_S = float(os.getenv("SEARCH_CACHE_TTL_S", 300))
+SEARCH_VERSION_POLL_S = float(os.getenv("SEARCH_VERSION_POLL_S", 1.0))
+
+_result_cache: TTLCache[Hashable, List[models.ScoredPoint]] = TTLCache(
+    SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_S
+)
+_versions: Dict[str, Tuple[float, str]] = {}  # collection -> (read at, shared token)
+_local_writes: Dict[str, int] = {}  # this process's writes, visible before the next poll
+
+
+def _version_id(collection: str) -> str:
+    """Point id of *collection*'s version record (same scheme as lib.write_version)."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"qdrant-write-version/{collection}"))
+
+
+def _version_point(collection: str) -> Tuple[models.PointStruct, str]:
+    token = f"{time.time_ns():x}-{uuid.uuid4().hex[:8]}"
+    payload = {"collection": collection, "version": token}
+    return models.PointStruct(id=_version_id(collection), vector={}, payload=payload), token
+
+
+def _token(records: List[models.Record]) -> str:
+    return str((records[0].payload or {}).get("version", "")) if records else ""
+
+
+def _poll_due(collection: str) -> bool:
+    seen = _versions.get(collection)
+    return seen is None or time.monotonic() - seen[0] >= SEARCH_VERSION_POLL_S
+
+
+def _tag(collection: str) -> Tuple[int, str]:
+    return _local_writes.get(collection, 0), _versions[collection][1]
+
+
+def _read_version(collection: str) -> str:
+    client = _client()
+    try:
+        return _token(client.retrieve(VERSIONS_COLLECTION, ids=[_version_id(collection)]))
+    except Exception:
+        if client.collection_exists(VERSIONS_COLLECTION):
+            raise
+        return ""  # nothing was ever written through a versioned path
+
+
+async def _aread_version(collection: str) -> str:
+    client = _aclient()
+    try:
+        return _token(await client.retrieve(VERSIONS_COLLECTION, ids=[_version_id(collection)]))
+    except Exception:
+        if await client.collection_exists(VERSIONS_COLLECTION):
+            raise
+        return ""
+
+
+def write_version(collection: str) -> Tuple[int, str] | None:
+    """Current write version of *collection* (None if it can't be read: don't cache)."""
+    try:
+        if _poll_due(collection):
+            _versions[collection] = (time.monotonic(), _read_version(collection))
+        return _tag(collection)
+    except Exception as exc:
+        logger.warning(f"Write version of {collection} unavailable ({exc}); not caching")
+        return None
+
+
+async def awrite_version(collection: str) -> Tuple[int, str] | None:
+    """Async `write_version`."""
+    try:
+        if _poll_due(collection):
+            _versions[collection] = (time.monotonic(), await _aread_version(collection))
+        return _tag(collection)
+    except Exception as exc:
+        logger.warning(f"Write version of {collection} unavailable ({exc}); not caching")
+        return None
+
+
+def _local_bump(collection: str) -> None:
+    _local_writes[collection] = _local_writes.get(collection, 0) + 1
+
+
+def bump_write_version(collection: str) -> None:
+    """Invalidate cached searches on *collection* here and in every other API worker."""
+    _local_bump(collection)
+    point, token = _version_point(collection)
+    client = _client()
+    try:
+        if not client.collection_exists(VERSIONS_COLLECTION):
+            client.create_collection(collection_name=VERSIONS_COLLECTION, vectors_config={})
+        client.upsert(collection_name=VERSIONS_COLLECTION, points=[point], wait=True)
+        _versions[collection] = (time.monotonic(), token)
+    except Exception as exc:
+        logger.warning(f"Write version bump for {collection} failed ({exc}); other workers expire by TTL")
+
+
+async def abump_write_version(collection: str) -> None:
+    """Async `bump_write_version`."""
+    _local_bump(collection)
+    point, token = _version_point(collection)
+    client = _aclient()
+    try:
+        if not await client.collection_exists(VERSIONS_COLLECTION):
+            await client.create_collection(collection_name=VERSIONS_COLLECTION, vectors_config={})
+        await client.upsert(collection_name=VERSIONS_COLLECTION, points=[point], wait=True)
+        _versions[collection] = (time.monotonic(), token)
+    except Exception as exc:
+        logger.warning(f"Write version bump for {collection} failed ({exc}); other workers expire by TTL")
+
+
+def _cache_key(
+    collection: str,
+    vector: List[float],
+    limit: int,
+    precision: Precision | None,
+    query_filter: models.Filter | None,
+    version: Tuple[int, str],
+    offset: int = 0,
+    with_payload: Payload = True,
+) -> Hashable:
+    digest = hashlib.sha1(array("f", vector).tobytes()).hexdigest()
+    flt = query_filter.model_dump_json(exclude_none=True) if query_filter is not None else ""
+    precision = precision or os.getenv("SEARCH_PRECISION", "balanced")
+    fields = tuple(with_payload) if isinstance(with_payload, list) else with_payload
+    return collection, version, digest, limit, offset, precision, flt, fields
 
-    return QdrantClient(url=url.rstrip("/"), api_key=key, prefer_grpc=True)
+
+def search_cache_stats() -> Dict[str, Any]:
+    return {**_result_cache.stats(), "version_poll_s": SEARCH_VERSION_POLL_S}
 
 
 # ---------------------------------------------------------------------------
@@ -40,33 +342,318 @@ def _client() -> QdrantClient:
 # ---------------------------------------------------------------------------
 
 
+def _collection_name(collection: str | None) -> str:
+    return collection or os.getenv("QDRANT_COLLECTION", "watched_frames")
+
+
+def _query(
+    collection_name: str,
+    vector: List[float],
+    limit: int,
+    precision: Precision | None,
+    layout: Layout,
+    query_filter: models.Filter | None = None,
+    offset: int = 0,
+    with_payload: Payload = True,
+) -> Dict[str, Any]:
+    """``query_points`` kwargs for one search (shared by the sync and async clients)."""
+    params = search_params(precision)
+    request: Dict[str, Any] = {
+        "collection_name": collection_name,
+        "query": vector,
+        "query_filter": query_filter,
+        "limit": limit,
+        "offset": offset or None,
+        "search_params": params,
+        "with_payload": with_payload,
+        "with_vectors": False,
+    }
+    if layout is None:
+        return request
+
+    full, mini, mini_dim = layout
+    request["using"] = full
+    if not params.exact:
+        # stage 1: candidates from the small in-RAM vector; stage 2: full-vector rerank
+        candidates = max((offset + limit) * 4, int(os.getenv("SEARCH_PREFETCH", 100)))
+        request["prefetch"] = models.Prefetch(
+            query=_prefix(vector, mini_dim),
+            using=mini,
+            limit=candidates,
+            params=params,
+            filter=query_filter,
+        )
+    return request
+
+
+def _as_request(query: Dict[str, Any]) -> models.QueryRequest:
+    """`_query` kwargs as one entry of a ``query_batch_points`` request."""
+    return models.QueryRequest(
+        query=query["query"],
+        using=query.get("using"),
+        prefetch=query.get("prefetch"),
+        filter=query["query_filter"],
+        params=query["search_params"],
+        limit=query["limit"],
+        offset=query["offset"],
+        with_payload=query["with_payload"],
+        with_vector=query["with_vectors"],
+    )
+
+
+def _cached_batch(
+    collection_name: str,
+    vectors: List[List[float]],
+    limit: int,
+    precision: Precision | None,
+    query_filter: models.Filter | None,
+    version: Tuple[int, str] | None,
+    with_payload: Payload = True,
+) -> Tuple[List[Hashable], List[List[models.ScoredPoint] | None], List[int]]:
+    """Cache keys, cached hits (None = miss) and the indices still to query."""
+    keys = [
+        version
+        and _cache_key(
+            collection_name, v, limit, precision, query_filter, version, with_payload=with_payload
+        )
+        for v in vectors
+    ]
+    cached = [_result_cache.get(k) if k else None for k in keys]
+    return keys, cached, [i for i, hits in enumerate(cached) if hits is None]
+
+
+def _fill(
+    cached: List[List[models.ScoredPoint] | None],
+    keys: List[Hashable],
+    todo: List[int],
+    responses: List[models.QueryResponse],
+) -> List[List[models.ScoredPoint]]:
+    for i, response in zip(todo, responses):
+        cached[i] = response.points
+        if keys[i]:
+            _result_cache.put(keys[i], response.points)
+    return [list(hits or []) for hits in cached]
+
+
 def search(
-    *, vector: List[float], limit: int = 5, collection: str | None = None
+    *,
+    vector: List[float],
+    limit: int = 5,
+    collection: str | None = None,
+    precision: Precision | None = None,
+    query_filter: models.Filter | None = None,
+    offset: int = 0,
+    with_payload: Payload = True,
 ) -> List[models.ScoredPoint]:
-    """Search *collection* for *vector* and return the raw hits list."""
-    collection_name = collection or os.getenv("QDRANT_COLLECTION", "watched_frames")
-    client = _client()
+    """Search *collection* for *vector* and return the raw hits list (cached per write version).
 
-    return client.search(
-        collection_name=collection_name,
-        query_vector=vector,
-        limit=limit,
-        with_payload=True,
-        with_vectors=False,
+    ``offset`` skips the first hits (pagination); ``with_payload`` may be a
+    list of payload fields to return instead of the whole payload.
+    """
+    collection_name = _collection_name(collection)
+    version = write_version(collection_name)
+    key = version and _cache_key(
+        collection_name, vector, limit, precision, query_filter, version, offset, with_payload
     )
+    if key and (hits := _result_cache.get(key)) is not None:
+        return list(hits)
 
+    layout = _vector_layout(collection_name)
+    request = _query(
+        collection_name, vector, limit, precision, layout, query_filter, offset, with_payload
+    )
+    hits = _client().query_points(**request).points
+    if key:
+        _result_cache.put(key, hits)
+    return list(hits)
 
-def fetch_embedding(
-    *, collection: str, user_id: str, entry_id: str
-) -> tuple[List[float], Dict[str, Any] | None]:
-    """Fetch a specific embedding vector and payload from the specified collection."""
-    client = _client()
 
-    # Fetch the point by ID
-    points = client.retrieve(
-        collection_name=collection, ids=[entry_id], with_payload=True, with_vectors=True
+async def asearch(
+    *,
+    vector: List[float],
+    limit: int = 5,
+    collection: str | None = None,
+    precision: Precision | None = None,
+    query_filter: models.Filter | None = None,
+    offset: int = 0,
+    with_payload: Payload = True,
+) -> List[models.ScoredPoint]:
+    """Async `search`."""
+    collection_name = _collection_name(collection)
+    version = await awrite_version(collection_name)
+    key = version and _cache_key(
+        collection_name, vector, limit, precision, query_filter, version, offset, with_payload
+    )
+    if key and (hits := _result_cache.get(key)) is not None:
+        return list(hits)
+
+    layout = await _avector_layout(collection_name)
+    request = _query(
+        collection_name, vector, limit, precision, layout, query_filter, offset, with_payload
+    )
+    hits = (await _aclient().query_points(**request)).points
+    if key:
+        _result_cache.put(key, hits)
+    return list(hits)
+
+
+GROUP_BY = os.getenv("SEARCH_GROUP_BY", "video_code")  # indexed payload field naming a frame's video
+
+
+def _groups_query(
+    collection_name: str,
+    vector: List[float],
+    groups: int,
+    group_size: int,
+    precision: Precision | None,
+    layout: Layout,
+    query_filter: models.Filter | None,
+    group_by: str,
+    with_payload: Payload,
+) -> Dict[str, Any]:
+    # size the two-stage prefetch for every frame that may end up in a group
+    frames = groups * group_size
+    request = _query(collection_name, vector, frames, precision, layout, query_filter)
+    del request["offset"]  # groups have no offset
+    request.update(limit=groups, group_size=group_size, group_by=group_by, with_payload=with_payload)
+    return request
+
+
+def search_groups(
+    *,
+    vector: List[float],
+    groups: int = 10,
+    group_size: int = 3,
+    collection: str | None = None,
+    precision: Precision | None = None,
+    query_filter: models.Filter | None = None,
+    group_by: str = GROUP_BY,
+    with_payload: Payload = True,
+) -> List[models.PointGroup]:
+    """Top *groups* videos (``group_by`` values), each with its *group_size* best frames."""
+    collection_name = _collection_name(collection)
+    version = write_version(collection_name)
+    key = version and (
+        _cache_key(
+            collection_name, vector, groups, precision, query_filter, version, 0, with_payload
+        ),
+        group_by,
+        group_size,
+    )
+    if key and (cached := _result_cache.get(key)) is not None:
+        return list(cached)
+
+    layout = _vector_layout(collection_name)
+    request = _groups_query(
+        collection_name, vector, groups, group_size, precision, layout, query_filter, group_by, with_payload
+    )
+    found = _client().query_points_groups(**request).groups
+    if key:
+        _result_cache.put(key, found)
+    return list(found)
+
+
+async def asearch_groups(
+    *,
+    vector: List[float],
+    groups: int = 10,
+    group_size: int = 3,
+    collection: str | None = None,
+    precision: Precision | None = None,
+    query_filter: models.Filter | None = None,
+    group_by: str = GROUP_BY,
+    with_payload: Payload = True,
+) -> List[models.PointGroup]:
+    """Async `search_groups`."""
+    collection_name = _collection_name(collection)
+    version = await awrite_version(collection_name)
+    key = version and (
+        _cache_key(
+            collection_name, vector, groups, precision, query_filter, version, 0, with_payload
+        ),
+        group_by,
+        group_size,
+    )
+    if key and (cached := _result_cache.get(key)) is not None:
+        return list(cached)
+
+    layout = await _avector_layout(collection_name)
+    request = _groups_query(
+        collection_name, vector, groups, group_size, precision, layout, query_filter, group_by, with_payload
+    )
+    found = (await _aclient().query_points_groups(**request)).groups
+    if key:
+        _result_cache.put(key, found)
+    return list(found)
+
+
+def search_batch(
+    *,
+    vectors: List[List[float]],
+    limit: int = 5,
+    collection: str | None = None,
+    precision: Precision | None = None,
+    query_filter: models.Filter | None = None,
+    with_payload: Payload = True,
+) -> List[List[models.ScoredPoint]]:
+    """`search` for many vectors in one round trip; one hits list per vector, in order."""
+    collection_name = _collection_name(collection)
+    version = write_version(collection_name)
+    keys, cached, todo = _cached_batch(
+        collection_name, vectors, limit, precision, query_filter, version, with_payload
+    )
+    if not todo:
+        return _fill(cached, keys, todo, [])
+
+    layout = _vector_layout(collection_name)
+    requests = [
+        _as_request(
+            _query(
+                collection_name, vectors[i], limit, precision, layout, query_filter,
+                with_payload=with_payload,
+            )
+        )
+        for i in todo
+    ]
+    responses = _client().query_batch_points(collection_name=collection_name, requests=requests)
+    return _fill(cached, keys, todo, responses)
+
+
+async def asearch_batch(
+    *,
+    vectors: List[List[float]],
+    limit: int = 5,
+    collection: str | None = None,
+    precision: Precision | None = None,
+    query_filter: models.Filter | None = None,
+    with_payload: Payload = True,
+) -> List[List[models.ScoredPoint]]:
+    """Async `search_batch`."""
+    collection_name = _collection_name(collection)
+    version = await awrite_version(collection_name)
+    keys, cached, todo = _cached_batch(
+        collection_name, vectors, limit, precision, query_filter, version, with_payload
     )
+    if not todo:
+        return _fill(cached, keys, todo, [])
+
+    layout = await _avector_layout(collection_name)
+    requests = [
+        _as_request(
+            _query(
+                collection_name, vectors[i], limit, precision, layout, query_filter,
+                with_payload=with_payload,
+            )
+        )
+        for i in todo
+    ]
+    responses = await _aclient().query_batch_points(collection_name=collection_name, requests=requests)
+    return _fill(cached, keys, todo, responses)
+
 
+def _owned_vector(
+    points: List[models.Record], *, collection: str, user_id: str, entry_id: str
+) -> tuple[List[float], Dict[str, Any] | None]:
     if not points:
         raise ValueError(f"No entry found with ID {entry_id} in collection {collection}")
 
@@ -76,18 +663,60 @@ def fetch_embedding(
     if point.payload and point.payload.get("user_id") != user_id:
         raise ValueError(f"Entry {entry_id} does not belong to user {user_id}")
 
-    if not point.vector:
+    vector = full_vector(point.vector)
+    if not vector:
         raise ValueError(f"No vector found for entry {entry_id}")
 
-    return point.vector, point.payload
+    return vector, point.payload
 
 
-def fetch_all_video_embeddings(
-    *, collection: str, user_id: str, video_id: str
-) -> List[tuple[List[float], Dict[str, Any] | None]]:
-    """Fetch all embeddings for a specific video from the specified collection."""
-    client = _client()
+def fetch_embedding(
+    *, collection: str, user_id: str, entry_id: str
+) -> tuple[List[float], Dict[str, Any] | None]:
+    """Fetch a specific embedding vector and payload from the specified collection."""
+    points = _client().retrieve(
+        collection_name=collection, ids=[entry_id], with_payload=True, with_vectors=True
+    )
+    return _owned_vector(points, collection=collection, user_id=user_id, entry_id=entry_id)
+
+
+async def afetch_embedding(
+    *, collection: str, user_id: str, entry_id: str
+) -> tuple[List[float], Dict[str, Any] | None]:
+    """Async `fetch_embedding`."""
+    points = await _aclient().retrieve(
+        collection_name=collection, ids=[entry_id], with_payload=True, with_vectors=True
+    )
+    return _owned_vector(points, collection=collection, user_id=user_id, entry_id=entry_id)
 
+
+def _id_vectors(
+    points: List[models.Record],
+) -> Dict[str, tuple[List[float], Dict[str, Any] | None]]:
+    return {str(p.id): (full_vector(p.vector), p.payload) for p in points if full_vector(p.vector)}
+
+
+def retrieve_vectors(
+    *, collection: str, ids: List[int | str], with_payload: bool = False
+) -> Dict[str, tuple[List[float], Dict[str, Any] | None]]:
+    """Vectors (and payloads) of many points in one request, keyed by ``str(id)``; missing ids are absent."""
+    points = _client().retrieve(
+        collection_name=collection, ids=ids, with_payload=with_payload, with_vectors=True
+    )
+    return _id_vectors(points)
+
+
+async def aretrieve_vectors(
+    *, collection: str, ids: List[int | str], with_payload: bool = False
+) -> Dict[str, tuple[List[float], Dict[str, Any] | None]]:
+    """Async `retrieve_vectors`."""
+    points = await _aclient().retrieve(
+        collection_name=collection, ids=ids, with_payload=with_payload, with_vectors=True
+    )
+    return _id_vectors(points)
+
+
+def _video_scroll(collection: str, user_id: str, video_id: str) -> Dict[str, Any]:
     # Search for all points with the given video_id and user_id
     filter_condition = models.Filter(
         must=[
@@ -95,16 +724,18 @@ def fetch_all_video_embeddings(
             models.FieldCondition(key="video_id", match=models.MatchValue(value=video_id)),
         ]
     )
+    return {
+        "collection_name": collection,
+        "scroll_filter": filter_condition,
+        "with_payload": True,
+        "with_vectors": True,
+        "limit": 10000,  # Large limit to get all frames
+    }
 
-    # Scroll through all points that match the filter
-    points, _ = client.scroll(
-        collection_name=collection,
-        scroll_filter=filter_condition,
-        with_payload=True,
-        with_vectors=True,
-        limit=10000,  # Large limit to get all frames
-    )
 
+def _video_frames(
+    points: List[models.Record], *, collection: str, user_id: str, video_id: str
+) -> List[tuple[List[float], Dict[str, Any] | None]]:
     if not points:
         raise ValueError(
             f"No video frames found for video_id {video_id} and user_id {user_id} in collection {collection}"
@@ -113,4 +744,26 @@ def fetch_all_video_embeddings(
     # Sort by frame_number if available in payload
     points.sort(key=lambda p: p.payload.get("frame_number", 0) if p.payload else 0)
 
-    return [(point.vector, point.payload) for point in points if point.vector]
+    return [(full_vector(p.vector), p.payload) for p in points if full_vector(p.vector)]
+
+
+def fetch_all_video_embeddings(
+    *, collection: str, user_id: str, video_id: str
+) -> List[tuple[List[float], Dict[str, Any] | None]]:
+    """Fetch all embeddings for a specific video from the specified collection."""
+    points, _ = _client().scroll(**_video_scroll(collection, user_id, video_id))
+    return _video_frames(points, collection=collection, user_id=user_id, video_id=video_id)
+
+
+async def afetch_all_video_embeddings(
+    *, collection: str, user_id: str, video_id: str
+) -> List[tuple[List[float], Dict[str, Any] | None]]:
+    """Async `fetch_all_video_embeddings`."""
+    points, _ = await _aclient().scroll(**_video_scroll(collection, user_id, video_id))
+    return _video_frames(points, collection=collection, user_id=user_id, video_id=video_id)
+
+
+async def aupsert(*, collection: str, points: List[models.PointStruct]) -> None:
+    """Insert / replace *points* in *collection* without blocking the event loop."""
+    await _aclient().upsert(collection_name=collection, points=points)
+    await abump_write_version(collection)
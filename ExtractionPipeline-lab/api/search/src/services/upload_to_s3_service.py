@@ -5,9 +5,16 @@ from __future__ import annotations
 Provides thin convenience wrappers around the central S3 utilities
 that live under `core/py/pipeline/src` so that the API layer
 can stay agnostic of the underlying module layout.
+
+boto3 is blocking, so async routes use the ``a``-prefixed helpers, which
+run the same calls on a dedicated, bounded I/O pool (``S3_MAX_WORKERS``)
+instead of the event loop.
 """
 
+import asyncio
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from botocore.exceptions import ClientError
@@ -28,6 +35,14 @@ s3_client = boto3.client(
     region_name=settings.aws_region,
 )
 
+# boto3 clients are thread-safe; the pool only bounds concurrent transfers
+_s3_pool = ThreadPoolExecutor(max_workers=settings.s3_max_workers, thread_name_prefix="s3")
+
+
+async def _in_pool(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_s3_pool, functools.partial(fn, *args, **kwargs))
+
 
 def upload_file_to_s3(file_bytes: bytes, object_name: str, bucket_name: str = None) -> bool:
     """
@@ -156,3 +171,15 @@ def check_file_exists(object_name: str, bucket_name: str = None) -> bool:
     except Exception as e:
         logger.error(f"Unexpected error checking file existence: {e}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+async def aupload_file_to_s3(file_bytes: bytes, object_name: str, bucket_name: str = None) -> bool:
+    """Async `upload_file_to_s3` (runs on the S3 pool)."""
+    return await _in_pool(upload_file_to_s3, file_bytes, object_name, bucket_name)
+
+
+async def aupload_file_with_metadata(
+    file_bytes: bytes, object_name: str, metadata: dict = None, bucket_name: str = None
+) -> bool:
+    """Async `upload_file_with_metadata` (runs on the S3 pool)."""
+    return await _in_pool(upload_file_with_metadata, file_bytes, object_name, metadata, bucket_name)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+"""Compact vector transport
+
+A 512-d vector is ~5 KB as a JSON float array and costs a float parse per
+value on both ends.  The API can move vectors in two compact forms instead:
+
+* ``encoding="float32" | "float16"`` – each vector is a base64 string of its
+  little-endian values (2 KB / 1 KB for 512-d), still inside JSON.
+* ``application/octet-stream`` – a ``.npy`` file (``numpy.load`` reads it
+  back, shape ``(n, dim)``), the cheapest way to move thousands of vectors.
+  Raw little-endian float32 rows without the ``.npy`` header are accepted
+  on input too.
+
+``encoding="json"`` keeps the plain float arrays.
+"""
+
+import base64
+import binascii
+import io
+from typing import List, Literal, Sequence
+
+import numpy as np
+
+Encoding = Literal["json", "float32", "float16"]
+DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+OCTET_STREAM = "application/octet-stream"
+_NPY_MAGIC = b"\x93NUMPY"
+
+
+def _dtype(encoding: str) -> np.dtype:
+    if encoding not in DTYPES:
+        raise ValueError(f"Unknown vector encoding {encoding!r}; expected one of {tuple(DTYPES)}")
+    return np.dtype(DTYPES[encoding])
+
+
+def _rows(array: np.ndarray) -> List[List[float]]:
+    if not np.isfinite(array).all():
+        raise ValueError("vectors contain NaN or infinity")
+    return array.astype(np.float32).tolist()
+
+
+def wants_binary(accept: str | None) -> bool:
+    """True when the client's ``Accept`` header asks for octet-stream."""
+    return bool(accept) and OCTET_STREAM in accept
+
+
+def encode(vector: Sequence[float], encoding: Encoding) -> List[float] | str:
+    """One vector as a JSON float list or a base64 string."""
+    if encoding == "json":
+        return list(vector)
+    return base64.b64encode(np.asarray(vector, dtype=_dtype(encoding)).tobytes()).decode()
+
+
+def unpack(raw: bytes, encoding: Encoding, dim: int) -> List[List[float]]:
+    """Little-endian rows of *dim* values (``float32`` / ``float16``) → float lists."""
+    dtype = _dtype(encoding)
+    if not raw or len(raw) % (dtype.itemsize * dim):
+        raise ValueError(f"{len(raw)} bytes is not a whole number of {dim}-d {encoding} vectors")
+    return _rows(np.frombuffer(raw, dtype=dtype).reshape(-1, dim))
+
+
+def decode(data: str, encoding: Encoding, dim: int) -> List[List[float]]:
+    """A base64 string of one or more concatenated vectors → float lists."""
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except binascii.Error as exc:
+        raise ValueError(f"invalid base64: {exc}")
+    return unpack(raw, encoding, dim)
+
+
+def to_npy(
+    rows: Sequence[Sequence[float] | None], dim: int, encoding: Encoding = "float32"
+) -> bytes:
+    """``.npy`` bytes of shape ``(len(rows), dim)``; ``None`` rows are all-NaN."""
+    dtype = _dtype("float32" if encoding == "json" else encoding)
+    array = np.full((len(rows), dim), np.nan, dtype=dtype)
+    for i, row in enumerate(rows):
+        if row is not None:
+            array[i] = row
+    buf = io.BytesIO()
+    np.save(buf, array, allow_pickle=False)
+    return buf.getvalue()
+
+
+def from_bytes(raw: bytes, dim: int) -> List[List[float]]:
+    """An uploaded ``.npy`` array (``(dim,)`` or ``(n, dim)``) or raw float32 rows → float lists."""
+    if not raw.startswith(_NPY_MAGIC):
+        return unpack(raw, "float32", dim)
+    try:
+        array = np.load(io.BytesIO(raw), allow_pickle=False)
+    except (ValueError, EOFError, OSError) as exc:
+        raise ValueError(f"invalid .npy data: {exc}")
+    if array.dtype.kind != "f":
+        raise ValueError(f".npy dtype must be floating point, got {array.dtype}")
+    array = array.reshape(1, -1) if array.ndim == 1 else array
+    if array.ndim != 2 or array.shape[1] != dim:
+        raise ValueError(f".npy shape must be (n, {dim}), got {array.shape}")
+    return _rows(array)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+"""Video-level fusion of multi-frame search results
+
+A query video is searched frame by frame (one batched request); each frame
+returns frame-level hits from many indexed videos.  ``fuse_video_hits``
+collapses them into one ranking of indexed videos:
+
+* ``max``       – best single frame-to-frame score
+* ``mean_topk`` – mean of the ``top_k`` best per-query-frame scores, query
+  frames without a hit in the video counting as 0 (a video that matches many
+  query frames beats one lucky frame)
+* ``count``     – number of query frames whose best hit in the video scores
+  at least ``threshold``; ties broken by the best score
+
+Each query frame contributes its best hit per indexed video only, so a video
+with many near-duplicate frames is not counted twice for the same query frame.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Sequence
+
+Fusion = Literal["max", "mean_topk", "count"]
+FUSIONS: tuple[str, ...] = ("max", "mean_topk", "count")
+
+VIDEO_KEYS = ("video_code", "video_id", "video")  # payload fields naming the indexed video
+
+
+def video_of(hit: Any) -> str | None:
+    payload = hit.payload or {}
+    return next((str(payload[k]) for k in VIDEO_KEYS if payload.get(k) is not None), None)
+
+
+@dataclass
+class VideoMatch:
+    video: str
+    score: float = 0.0
+    frames: Dict[int, Any] = field(default_factory=dict)  # query frame index -> best hit
+
+
+def fuse_video_hits(
+    hits_per_frame: Sequence[Sequence[Any]],
+    *,
+    fusion: Fusion = "max",
+    top_k: int = 3,
+    threshold: float = 0.8,
+    limit: int = 10,
+) -> List[VideoMatch]:
+    """Rank indexed videos by fusing *hits_per_frame* (one hit list per query frame)."""
+    if fusion not in FUSIONS:
+        raise ValueError(f"Unknown fusion {fusion!r}; expected one of {FUSIONS}")
+
+    videos: Dict[str, VideoMatch] = {}
+    for frame, hits in enumerate(hits_per_frame):
+        for hit in hits:
+            video = video_of(hit)
+            if video is None:
+                continue
+            match = videos.setdefault(video, VideoMatch(video))
+            best = match.frames.get(frame)
+            if best is None or hit.score > best.score:
+                match.frames[frame] = hit
+
+    k = max(1, min(top_k, len(hits_per_frame)))
+    for match in videos.values():
+        scores = sorted((h.score for h in match.frames.values()), reverse=True)
+        if fusion == "max":
+            match.score = scores[0]
+        elif fusion == "mean_topk":
+            match.score = sum(scores[:k]) / k
+        else:
+            match.score = float(sum(s >= threshold for s in scores))
+
+    def rank(match: VideoMatch) -> tuple[float, float]:
+        return match.score, max(h.score for h in match.frames.values())
+
+    return sorted(videos.values(), key=rank, reverse=True)[:limit]
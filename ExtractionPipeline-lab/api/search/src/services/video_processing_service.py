@@ -308,6 +308,7 @@ class VideoProcessingService:
 
             # Batch insert into Qdrant
             client.upsert(collection_name="user_videos", points=points)
+            qdrant_service.bump_write_version("user_videos")
 
             logger.info(f"Stored {len(points)} embeddings in Qdrant user_videos collection")
             return len(points)
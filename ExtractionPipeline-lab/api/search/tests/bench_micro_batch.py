@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Load test for query-embedding micro-batching.
+
+Fires `--requests` single-query embeddings from N client threads (the
+threadpool serving the routes) at several concurrency levels, once without
+batching (max_batch=1) and once per --wait value, and prints throughput,
+p50 / p99 latency and the mean batch size actually formed.
+
+By default the encoder is simulated: a forward costs
+`--overhead-ms + n * --per-item-ms`, releases the GIL and holds a single
+"device" lock (forwards on one GPU run one after another) – the shape
+that makes batch-of-1 wasteful.  With --model the real CLIP text encoder
+from core/py/pipeline is used.
+
+    PYTHONPATH=src python tests/bench_micro_batch.py
+    PYTHONPATH=src python tests/bench_micro_batch.py --concurrency 1 8 32 --wait 2 5 10
+    PYTHONPATH=src python tests/bench_micro_batch.py --model --requests 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from services.micro_batch import MicroBatcher
+
+
+def simulated_encoder(overhead_ms: float, per_item_ms: float) -> Callable[[List[str]], List[List[float]]]:
+    device = threading.Lock()  # one GPU: forwards run one after another
+
+    def encode(prompts: List[str]) -> List[List[float]]:
+        with device:
+            time.sleep((overhead_ms + per_item_ms * len(prompts)) / 1000)
+        return [[float(len(p))] for p in prompts]
+
+    return encode
+
+
+def run(batcher: MicroBatcher, concurrency: int, requests: int) -> Dict[str, float]:
+    def one(i: int) -> float:
+        t0 = time.perf_counter()
+        batcher(f"query number {i}")
+        return (time.perf_counter() - t0) * 1000
+
+    before = batcher.stats()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, range(requests)))
+    wall = time.perf_counter() - t0
+    after = batcher.stats()
+    batches = after["batches"] - before["batches"]
+    return {
+        "qps": requests / wall,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))],
+        "mean_batch": (after["items"] - before["items"]) / batches if batches else 1.0,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    ap.add_argument("--requests", type=int, default=1024)
+    ap.add_argument("--max-batch", type=int, default=32)
+    ap.add_argument("--wait", type=float, nargs="+", default=[5.0], help="max wait in ms")
+    ap.add_argument("--overhead-ms", type=float, default=8.0, help="simulated fixed cost per forward")
+    ap.add_argument("--per-item-ms", type=float, default=0.5, help="simulated cost per item")
+    ap.add_argument("--model", action="store_true", help="use the real CLIP text encoder")
+    args = ap.parse_args()
+
+    if args.model:
+        from services.embeddings_service import _encode_texts as encode
+
+        encode(["warm-up"])
+    else:
+        encode = simulated_encoder(args.overhead_ms, args.per_item_ms)
+
+    configs = [("off", 1, 0.0)] + [(f"{w:g}ms", args.max_batch, w) for w in args.wait]
+    print(f"{'batching':<9} {'conc':>5} {'qps':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch':>6}")
+    for label, max_batch, wait in configs:
+        batcher = MicroBatcher(encode, max_batch=max_batch, max_wait_ms=wait, name=f"bench-{label}")
+        for conc in args.concurrency:
+            r = run(batcher, conc, args.requests)
+            print(
+                f"{label:<9} {conc:>5} {r['qps']:>9,.0f} {r['p50_ms']:>8.2f} "
+                f"{r['p99_ms']:>8.2f} {r['mean_batch']:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Tests for in-memory frame sampling of query clips (ffmpeg output is simulated)."""
+
+import asyncio
+import io
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from PIL import Image
+
+from services import clip_sampler
+
+
+def bmp(color, size=(8, 6)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buf, format="BMP")
+    return buf.getvalue()
+
+
+class TestBmpStream:
+    def test_split_concatenated_frames(self):
+        frames = [bmp("red"), bmp("green", (4, 4)), bmp("blue")]
+        assert clip_sampler.split_bmp_stream(b"".join(frames)) == frames
+
+    def test_truncated_stream_rejected(self):
+        with pytest.raises(clip_sampler.ClipError):
+            clip_sampler.split_bmp_stream(bmp("red")[:-5])
+
+    def test_garbage_rejected(self):
+        with pytest.raises(clip_sampler.ClipError):
+            clip_sampler.split_bmp_stream(b"not a bitmap")
+
+    def test_sample_times(self):
+        assert clip_sampler.sample_times(8.0, 4) == [0.0, 2.0, 4.0, 6.0]
+        assert clip_sampler.sample_times(0.0, 3) == [0.0, 1.0, 2.0]
+
+
+class TestSampleFrames:
+    def test_frames_come_back_as_rgb_images_with_times(self):
+        probe = json.dumps({"format": {"duration": "6.0"}}).encode()
+        stream = bmp("red") + bmp("blue")
+        with patch.object(clip_sampler, "_run", new=AsyncMock(side_effect=[probe, stream])) as run:
+            frames = asyncio.run(clip_sampler.asample_frames(b"\x00video", max_frames=3, side=224))
+
+        assert [t for t, _ in frames] == [0.0, 2.0]
+        assert frames[1][1].mode == "RGB" and frames[1][1].getpixel((0, 0)) == (0, 0, 255)
+        ffmpeg_args = run.call_args_list[1].args
+        assert "fps=0.500000" in ffmpeg_args[ffmpeg_args.index("-vf") + 1]
+        assert ffmpeg_args[ffmpeg_args.index("-frames:v") + 1] == "3"
+
+    def test_empty_upload_and_empty_stream(self):
+        with pytest.raises(clip_sampler.ClipError):
+            asyncio.run(clip_sampler.asample_frames(b"", max_frames=3, side=224))
+        with patch.object(clip_sampler, "_run", new=AsyncMock(side_effect=[b"{}", b""])):
+            with pytest.raises(clip_sampler.ClipError):
+                asyncio.run(clip_sampler.asample_frames(b"x", max_frames=3, side=224))
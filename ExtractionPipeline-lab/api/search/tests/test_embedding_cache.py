@@ -0,0 +1,110 @@
+"""Tests for the text embedding cache in the embeddings service."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services import embeddings_service
+from services.cache import DiskCache, TTLCache
+
+
+class FakeModel:
+    """Stands in for encode_text_batch; counts the texts it encodes."""
+
+    def __init__(self, delay=0.0):
+        self.encoded = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, texts):
+        time.sleep(self.delay)
+        with self.lock:
+            self.encoded.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.fixture
+def model():
+    fake = FakeModel()
+    embeddings_service._text_cache.clear()
+    with patch.object(embeddings_service._text_batcher, "fn", fake):
+        yield fake
+    embeddings_service._text_cache.clear()
+
+
+class TestTTLCache:
+    def test_lru_eviction_and_counters(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)  # evicts b, the least recently used
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=2, ttl=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestTextEmbeddingCache:
+    def test_hit_skips_the_model(self, model):
+        first = embeddings_service.get_text_embedding("nike  air max")
+        second = embeddings_service.get_text_embedding(" nike air max ")  # same after normalising
+        assert first == second
+        assert model.encoded == ["nike air max"]
+        assert embeddings_service.cache_stats()["memory"]["hits"] == 1
+
+    def test_async_path_uses_the_cache(self, model):
+        embeddings_service.get_text_embedding("adidas")
+        vec = asyncio.run(embeddings_service.aget_text_embedding("adidas"))
+        assert vec == [6.0, 1.0]
+        assert model.encoded == ["adidas"]
+
+    def test_case_is_part_of_the_key(self, model):
+        embeddings_service.get_text_embedding("Apple")
+        embeddings_service.get_text_embedding("apple")
+        assert model.encoded == ["Apple", "apple"]
+
+    def test_concurrent_misses_share_one_encode(self, model):
+        model.delay = 0.05
+        threads = [threading.Thread(target=embeddings_service.get_text_embedding, args=("gucci",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert model.encoded == ["gucci"]
+
+    def test_returned_vectors_are_copies(self, model):
+        embeddings_service.get_text_embedding("prada").append(99.0)
+        assert embeddings_service.get_text_embedding("prada") == [5.0, 1.0]
+
+
+class TestDiskCache:
+    def test_shared_between_instances(self, tmp_path):
+        writer = DiskCache(tmp_path / "embeds.sqlite")
+        writer.put("k", [0.5, 0.25])
+        reader = DiskCache(tmp_path / "embeds.sqlite")  # another worker process
+        assert reader.get("k") == [0.5, 0.25]
+        assert reader.get("missing") is None
+
+    def test_ttl(self, tmp_path):
+        cache = DiskCache(tmp_path / "embeds.sqlite", ttl=0.01)
+        cache.put("k", [1.0])
+        time.sleep(0.02)
+        assert cache.get("k") is None
+
+    def test_worker_reads_disk_before_the_model(self, tmp_path, model):
+        disk = DiskCache(tmp_path / "embeds.sqlite")
+        disk.put(embeddings_service._text_key("louis vuitton"), [7.0, 7.0])
+        with patch.object(embeddings_service, "_disk_cache", disk), patch.object(
+            embeddings_service._text_batcher, "fn", embeddings_service._encode_texts
+        ):
+            assert embeddings_service.get_text_embedding("louis vuitton") == [7.0, 7.0]
+        assert model.encoded == []
@@ -1,8 +1,11 @@
 """Tests for get-embeddings endpoint."""
 
+import base64
+import io
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -29,7 +32,7 @@ class TestGetEmbeddings:
             "embedding_id": "test-embedding-123",
         }
 
-    @patch("controllers.get_embeddings.embeddings.qdrant_service._client")
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
     @patch("auth.apikey.verify_api_key")
     def test_get_embeddings_success(self, mock_verify_api_key, mock_client):
         """Test successful embedding retrieval."""
@@ -41,7 +44,7 @@ class TestGetEmbeddings:
         mock_point.vector = [0.1, 0.2, 0.3, 0.4, 0.5]
         mock_point.payload = {"user_id": "test-user", "image_id": "img-123"}
 
-        mock_client_instance = Mock()
+        mock_client_instance = Mock(retrieve=AsyncMock())
         mock_client.return_value = mock_client_instance
         mock_client_instance.retrieve.return_value = [mock_point]
 
@@ -58,14 +61,14 @@ class TestGetEmbeddings:
         assert data["payload"] == {"user_id": "test-user", "image_id": "img-123"}
 
         # Verify Qdrant was called correctly
-        mock_client_instance.retrieve.assert_called_once_with(
+        mock_client_instance.retrieve.assert_awaited_once_with(
             collection_name="user_images",
             ids=["test-embedding-123"],
             with_payload=True,
             with_vectors=True,
         )
 
-    @patch("controllers.get_embeddings.embeddings.qdrant_service._client")
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
     @patch("auth.apikey.verify_api_key")
     def test_get_embeddings_not_found(self, mock_verify_api_key, mock_client):
         """Test when embedding is not found."""
@@ -73,7 +76,7 @@ class TestGetEmbeddings:
         mock_verify_api_key.return_value = True
 
         # Mock Qdrant client response - empty list
-        mock_client_instance = Mock()
+        mock_client_instance = Mock(retrieve=AsyncMock())
         mock_client.return_value = mock_client_instance
         mock_client_instance.retrieve.return_value = []
 
@@ -86,7 +89,7 @@ class TestGetEmbeddings:
         assert "No embedding found with ID test-embedding-123" in data["detail"]
         assert "user_images" in data["detail"]
 
-    @patch("controllers.get_embeddings.embeddings.qdrant_service._client")
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
     @patch("auth.apikey.verify_api_key")
     def test_get_embeddings_no_vector(self, mock_verify_api_key, mock_client):
         """Test when point exists but has no vector."""
@@ -98,7 +101,7 @@ class TestGetEmbeddings:
         mock_point.vector = None
         mock_point.payload = {"user_id": "test-user"}
 
-        mock_client_instance = Mock()
+        mock_client_instance = Mock(retrieve=AsyncMock())
         mock_client.return_value = mock_client_instance
         mock_client_instance.retrieve.return_value = [mock_point]
 
@@ -149,7 +152,7 @@ class TestGetEmbeddings:
         data = response.json()
         assert "Embedding ID must be a non-empty string" in data["detail"]
 
-    @patch("controllers.get_embeddings.embeddings.qdrant_service._client")
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
     @patch("auth.apikey.verify_api_key")
     def test_get_embeddings_qdrant_error(self, mock_verify_api_key, mock_client):
         """Test when Qdrant returns an error."""
@@ -157,7 +160,7 @@ class TestGetEmbeddings:
         mock_verify_api_key.return_value = True
 
         # Mock Qdrant client to raise exception
-        mock_client_instance = Mock()
+        mock_client_instance = Mock(retrieve=AsyncMock())
         mock_client.return_value = mock_client_instance
         mock_client_instance.retrieve.side_effect = Exception("Qdrant connection failed")
 
@@ -191,7 +194,7 @@ class TestGetEmbeddings:
         data = response.json()
         assert data["detail"] == "Invalid API key"
 
-    @patch("controllers.get_embeddings.embeddings.qdrant_service._client")
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
     @patch("auth.apikey.verify_api_key")
     def test_get_embeddings_all_valid_collections(self, mock_verify_api_key, mock_client):
         """Test that all allowed collections work."""
@@ -203,7 +206,7 @@ class TestGetEmbeddings:
         mock_point.vector = [0.1, 0.2, 0.3]
         mock_point.payload = {"test": "data"}
 
-        mock_client_instance = Mock()
+        mock_client_instance = Mock(retrieve=AsyncMock())
         mock_client.return_value = mock_client_instance
         mock_client_instance.retrieve.return_value = [mock_point]
 
@@ -217,7 +220,7 @@ class TestGetEmbeddings:
             data = response.json()
             assert data["collection_name"] == collection
 
-    @patch("controllers.get_embeddings.embeddings.qdrant_service._client")
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
     @patch("auth.apikey.verify_api_key")
     def test_get_embeddings_empty_payload(self, mock_verify_api_key, mock_client):
         """Test when point has empty payload."""
@@ -229,7 +232,7 @@ class TestGetEmbeddings:
         mock_point.vector = [0.1, 0.2, 0.3]
         mock_point.payload = None
 
-        mock_client_instance = Mock()
+        mock_client_instance = Mock(retrieve=AsyncMock())
         mock_client.return_value = mock_client_instance
         mock_client_instance.retrieve.return_value = [mock_point]
 
@@ -256,3 +259,79 @@ class TestGetEmbeddings:
         response = client.post("/get-embeddings/", json=incomplete_request, headers=self.headers)
 
         assert response.status_code == 422  # Pydantic validation error
+
+
+class TestBinaryEmbeddings:
+    """Compact encodings and bulk retrieval."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.headers = {"X-API-Key": "test_api_key_123"}
+
+    @patch("controllers.get_embeddings.embeddings.qdrant_service._aclient")
+    @patch("auth.apikey.verify_api_key")
+    def test_base64_float16(self, mock_verify_api_key, mock_client):
+        """encoding=float16 returns the vector as base64 half floats."""
+        mock_client.return_value.retrieve = AsyncMock(return_value=[Mock(vector=[0.5, -1.0], payload={})])
+
+        response = client.post(
+            "/get-embeddings/",
+            json={"collection_name": "user_images", "embedding_id": "x", "encoding": "float16"},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["encoding"] == "float16"
+        assert np.frombuffer(base64.b64decode(data["vector"]), dtype="<f2").tolist() == [0.5, -1.0]
+
+    @patch("controllers.get_embeddings.embeddings.qdrant_service.aretrieve_vectors", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_bulk_json_keeps_request_order(self, mock_verify_api_key, mock_retrieve):
+        """Found ids come back in request order, unknown ids under missing."""
+        uid = "9b2f5e0c-6a43-4d0e-8a51-1f7f3a6c2b10"
+        mock_retrieve.return_value = {"7": ([0.1, 0.2], {"a": 1}), uid: ([0.3, 0.4], None)}
+
+        response = client.post(
+            "/get-embeddings/bulk",
+            json={"collection_name": "watched_frames", "embedding_ids": [uid.upper(), "8", "7"]},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [e["embedding_id"] for e in data["embeddings"]] == [uid.upper(), "7"]
+        assert data["embeddings"][1]["vector"] == [0.1, 0.2]
+        assert data["embeddings"][1]["payload"] is None  # with_payload defaults to False
+        assert data["missing"] == ["8"]
+        assert mock_retrieve.call_args.kwargs["ids"] == [uid, 8, 7]
+
+    @patch("controllers.get_embeddings.embeddings.qdrant_service.aretrieve_vectors", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_bulk_octet_stream_is_npy(self, mock_verify_api_key, mock_retrieve):
+        """Accept: application/octet-stream returns an (n, dim) .npy, NaN rows for missing ids."""
+        mock_retrieve.return_value = {"1": ([0.5, 0.25], None)}
+
+        response = client.post(
+            "/get-embeddings/bulk",
+            json={"collection_name": "watched_frames", "embedding_ids": ["1", "2"]},
+            headers={**self.headers, "Accept": "application/octet-stream"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert response.headers["X-Missing-Count"] == "1"
+        array = np.load(io.BytesIO(response.content))
+        assert array.shape == (2, 2)
+        assert array[0].tolist() == [0.5, 0.25]
+        assert np.isnan(array[1]).all()
+
+    @patch("auth.apikey.verify_api_key")
+    def test_bulk_rejects_malformed_ids(self, mock_verify_api_key):
+        """Ids must be unsigned integers or UUIDs."""
+        response = client.post(
+            "/get-embeddings/bulk",
+            json={"collection_name": "watched_frames", "embedding_ids": ["not-an-id"]},
+            headers=self.headers,
+        )
+        assert response.status_code == 400
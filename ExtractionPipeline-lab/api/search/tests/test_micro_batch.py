@@ -0,0 +1,65 @@
+"""Tests for the micro-batching queue behind the embeddings service."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.micro_batch import MicroBatcher
+
+
+class RecordingEncoder:
+    """Doubles every item and records the batch sizes it was called with."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.calls.append(list(items))
+        if self.fail_on in items:
+            raise ValueError(f"bad item {self.fail_on}")
+        return [x * 2 for x in items]
+
+
+class TestMicroBatcher:
+    """Concurrent calls share one batched call; results go back to their callers."""
+
+    def test_concurrent_calls_are_coalesced(self):
+        enc = RecordingEncoder()
+        batcher = MicroBatcher(enc, max_batch=64, max_wait_ms=50)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(batcher, range(16)))
+        assert results == [x * 2 for x in range(16)]
+        assert len(enc.calls) < 16
+        assert batcher.stats()["items"] == 16
+
+    def test_max_batch_caps_the_batch(self):
+        enc = RecordingEncoder()
+        batcher = MicroBatcher(enc, max_batch=4, max_wait_ms=50)
+        futures = [batcher.submit(i) for i in range(10)]
+        assert [f.result() for f in futures] == [x * 2 for x in range(10)]
+        assert max(len(c) for c in enc.calls) <= 4
+
+    def test_max_batch_one_disables_batching(self):
+        enc = RecordingEncoder()
+        batcher = MicroBatcher(enc, max_batch=1, max_wait_ms=5)
+        futures = [batcher.submit(i) for i in range(3)]
+        assert [f.result() for f in futures] == [0, 2, 4]
+        assert enc.calls == [[0], [1], [2]]
+
+    def test_runs_off_the_calling_thread(self):
+        seen = []
+        batcher = MicroBatcher(lambda items: seen.append(threading.current_thread()) or items, max_wait_ms=0)
+        assert batcher("x") == "x"
+        assert seen[0] is not threading.current_thread()
+
+    def test_bad_item_only_fails_its_own_call(self):
+        enc = RecordingEncoder(fail_on=2)
+        batcher = MicroBatcher(enc, max_batch=8, max_wait_ms=50)
+        futures = [batcher.submit(i) for i in range(4)]
+        with pytest.raises(ValueError):
+            futures[2].result()
+        assert [futures[i].result() for i in (0, 1, 3)] == [0, 2, 6]
@@ -0,0 +1,390 @@
+"""Tests for the Qdrant service search helpers (precision profiles)."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+from services import qdrant_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_result_cache():
+    """Clients are rebuilt per test; cached hits and versions must not leak between tests."""
+    for state in (qdrant_service._result_cache, qdrant_service._versions, qdrant_service._local_writes):
+        state.clear()
+    yield
+
+
+@pytest.fixture
+def memory_client():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="watched_frames",
+        vectors_config=models.VectorParams(size=3, distance=models.Distance.COSINE),
+    )
+    client.upsert(
+        "watched_frames",
+        [
+            models.PointStruct(id=i, vector=v, payload={"video_code": f"V{i}"})
+            for i, v in enumerate(([1, 0, 0], [0.9, 0.1, 0], [0, 1, 0]))
+        ],
+    )
+    qdrant_service._vector_layout.cache_clear()
+    with patch.object(qdrant_service, "_client", return_value=client):
+        yield client
+    qdrant_service._vector_layout.cache_clear()
+
+
+@pytest.fixture
+def two_stage_client():
+    """Named full + mini layout; points 0 and 1 share a mini prefix, only full separates them."""
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="frames_v2",
+        vectors_config={
+            "full": models.VectorParams(size=4, distance=models.Distance.COSINE),
+            "mini": models.VectorParams(size=2, distance=models.Distance.COSINE),
+        },
+    )
+    full = {0: [1, 0, 1, 0], 1: [1, 0, 0, 1], 2: [0, 1, 0, 0]}
+    client.upsert(
+        "frames_v2",
+        [
+            models.PointStruct(id=i, vector={"full": v, "mini": qdrant_service._prefix(v, 2)})
+            for i, v in full.items()
+        ],
+    )
+    qdrant_service._vector_layout.cache_clear()
+    with patch.object(qdrant_service, "_client", return_value=client):
+        yield client
+    qdrant_service._vector_layout.cache_clear()
+
+
+class TestSearchParams:
+    """Precision profiles map to Qdrant search params."""
+
+    def test_fast_skips_rescoring(self):
+        params = qdrant_service.search_params("fast")
+        assert params.hnsw_ef == 32
+        assert params.quantization.rescore is False
+        assert not params.exact
+
+    def test_balanced_oversamples_and_rescores(self):
+        params = qdrant_service.search_params("balanced")
+        assert params.hnsw_ef == 128
+        assert params.quantization.rescore is True
+        assert params.quantization.oversampling == 2.0
+
+    def test_exact_uses_original_vectors(self):
+        params = qdrant_service.search_params("exact")
+        assert params.exact is True
+        assert params.quantization.ignore is True
+
+    def test_default_is_balanced(self):
+        assert qdrant_service.search_params(None) == qdrant_service.search_params("balanced")
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError):
+            qdrant_service.search_params("turbo")
+
+
+class TestSearch:
+    """search() forwards the profile and returns scored points."""
+
+    @pytest.mark.parametrize("precision", ["fast", "balanced", "exact", None])
+    def test_every_profile_returns_nearest_first(self, memory_client, precision):
+        hits = qdrant_service.search(vector=[1, 0, 0], limit=2, precision=precision)
+        assert [h.id for h in hits] == [0, 1]
+        assert hits[0].payload == {"video_code": "V0"}
+
+
+class TestTwoStageSearch:
+    """Collections with full + mini vectors: prefetch on mini, rerank on full."""
+
+    def test_layout_detection(self, two_stage_client):
+        assert qdrant_service._vector_layout("frames_v2") == ("full", "mini", 2)
+
+    def test_single_vector_collection_is_one_stage(self, memory_client):
+        assert qdrant_service._vector_layout("watched_frames") is None
+
+    @pytest.mark.parametrize("precision", ["fast", "balanced", "exact"])
+    def test_rerank_uses_full_vector(self, two_stage_client, precision):
+        hits = qdrant_service.search(
+            vector=[1, 0, 1, 0], limit=2, collection="frames_v2", precision=precision
+        )
+        assert [h.id for h in hits] == [0, 1]
+        assert hits[0].score == pytest.approx(1.0)
+
+    def test_prefix_is_normalised(self):
+        assert qdrant_service._prefix([3, 4, 12], 2) == pytest.approx([0.6, 0.8])
+
+    def test_full_vector_from_named_point(self):
+        assert qdrant_service.full_vector({"full": [1.0], "mini": [1.0]}) == [1.0]
+        assert qdrant_service.full_vector([0.5]) == [0.5]
+
+
+@pytest.fixture
+def async_client():
+    """AsyncQdrantClient with a two-stage collection and a user_videos collection."""
+
+    async def build():
+        client = AsyncQdrantClient(":memory:")
+        await client.create_collection(
+            collection_name="frames_v2",
+            vectors_config={
+                "full": models.VectorParams(size=4, distance=models.Distance.COSINE),
+                "mini": models.VectorParams(size=2, distance=models.Distance.COSINE),
+            },
+        )
+        full = {0: [1, 0, 1, 0], 1: [1, 0, 0, 1], 2: [0, 1, 0, 0]}
+        await client.upsert(
+            "frames_v2",
+            [
+                models.PointStruct(id=i, vector={"full": v, "mini": qdrant_service._prefix(v, 2)})
+                for i, v in full.items()
+            ],
+        )
+        await client.create_collection(
+            collection_name="user_videos",
+            vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+        )
+        await client.upsert(
+            "user_videos",
+            [
+                models.PointStruct(
+                    id=i, vector=[1, i], payload={"user_id": "u", "video_id": "v", "frame_number": 2 - i}
+                )
+                for i in range(3)
+            ],
+        )
+        return client
+
+    client = asyncio.run(build())
+    qdrant_service._alayouts.clear()
+    with patch.object(qdrant_service, "_aclient", return_value=client):
+        yield client
+    qdrant_service._alayouts.clear()
+
+
+class TestAsyncHelpers:
+    """The async twins build the same requests on AsyncQdrantClient."""
+
+    @pytest.mark.parametrize("precision", ["fast", "exact"])
+    def test_asearch_matches_search(self, async_client, precision):
+        hits = asyncio.run(
+            qdrant_service.asearch(vector=[1, 0, 1, 0], limit=2, collection="frames_v2", precision=precision)
+        )
+        assert [h.id for h in hits] == [0, 1]
+        assert qdrant_service._alayouts["frames_v2"] == ("full", "mini", 2)
+
+    def test_afetch_all_video_embeddings_sorted_by_frame(self, async_client):
+        frames = asyncio.run(
+            qdrant_service.afetch_all_video_embeddings(collection="user_videos", user_id="u", video_id="v")
+        )
+        assert [payload["frame_number"] for _, payload in frames] == [0, 1, 2]
+
+    def test_afetch_embedding_checks_owner(self, async_client):
+        vector, _ = asyncio.run(
+            qdrant_service.afetch_embedding(collection="user_videos", user_id="u", entry_id=1)
+        )
+        assert vector == pytest.approx([0.7071, 0.7071], abs=1e-4)
+        with pytest.raises(ValueError):
+            asyncio.run(qdrant_service.afetch_embedding(collection="user_videos", user_id="x", entry_id=1))
+
+
+class TestResultCache:
+    """Identical searches are served from the cache until the collection's write version changes."""
+
+    def test_repeat_search_is_served_from_cache(self, memory_client):
+        with patch.object(memory_client, "query_points", wraps=memory_client.query_points) as spy:
+            first = qdrant_service.search(vector=[1, 0, 0], limit=2)
+            second = qdrant_service.search(vector=[1, 0, 0], limit=2)
+            qdrant_service.search(vector=[1, 0, 0], limit=1)
+        assert [h.id for h in second] == [h.id for h in first]
+        assert second is not first
+        assert spy.call_count == 2
+        assert qdrant_service.search_cache_stats()["hits"] == 1
+
+    def test_filter_is_part_of_the_key(self, memory_client):
+        only_v1 = models.Filter(
+            must=[models.FieldCondition(key="video_code", match=models.MatchValue(value="V1"))]
+        )
+        assert [h.id for h in qdrant_service.search(vector=[1, 0, 0], limit=2)] == [0, 1]
+        hits = qdrant_service.search(vector=[1, 0, 0], limit=2, query_filter=only_v1)
+        assert [h.id for h in hits] == [1]
+
+    def test_local_write_invalidates(self, memory_client):
+        assert qdrant_service.search(vector=[0, 0, 1], limit=1)[0].id != 9
+        memory_client.upsert("watched_frames", [models.PointStruct(id=9, vector=[0, 0, 1])])
+        qdrant_service.bump_write_version("watched_frames")
+        assert qdrant_service.search(vector=[0, 0, 1], limit=1)[0].id == 9
+
+    def test_write_by_another_process_invalidates_after_poll(self, memory_client):
+        qdrant_service.bump_write_version("watched_frames")
+        qdrant_service.search(vector=[0, 0, 1], limit=1)
+        memory_client.upsert("watched_frames", [models.PointStruct(id=9, vector=[0, 0, 1])])
+        point, _ = qdrant_service._version_point("watched_frames")  # as lib.write_version.bump does
+        memory_client.upsert(qdrant_service.VERSIONS_COLLECTION, [point])
+        with patch.object(qdrant_service, "SEARCH_VERSION_POLL_S", 0.0):
+            assert qdrant_service.search(vector=[0, 0, 1], limit=1)[0].id == 9
+
+    def test_aupsert_invalidates_async_search(self, async_client):
+        async def scenario():
+            before = await qdrant_service.asearch(vector=[0, 0, 0, 1], limit=1, collection="frames_v2")
+            vec = [0, 0, 0, 1]
+            point = models.PointStruct(id=7, vector={"full": vec, "mini": qdrant_service._prefix(vec, 2)})
+            await qdrant_service.aupsert(collection="frames_v2", points=[point])
+            after = await qdrant_service.asearch(vector=[0, 0, 0, 1], limit=1, collection="frames_v2")
+            return before[0].id, after[0].id
+
+        assert asyncio.run(scenario()) == (1, 7)
+
+
+class TestBatchSearch:
+    """search_batch / asearch_batch: one request for many vectors, results in input order."""
+
+    def test_search_batch_matches_single_searches(self, memory_client):
+        vectors = [[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]]
+        with patch.object(memory_client, "query_batch_points", wraps=memory_client.query_batch_points) as spy:
+            batched = qdrant_service.search_batch(vectors=vectors, limit=2)
+        spy.assert_called_once()
+        qdrant_service._result_cache.clear()
+        assert [[h.id for h in hits] for hits in batched] == [
+            [h.id for h in qdrant_service.search(vector=v, limit=2)] for v in vectors
+        ]
+
+    def test_only_cache_misses_are_sent(self, memory_client):
+        qdrant_service.search(vector=[0, 1, 0], limit=2)
+        with patch.object(memory_client, "query_batch_points", wraps=memory_client.query_batch_points) as spy:
+            batched = qdrant_service.search_batch(vectors=[[1, 0, 0], [0, 1, 0]], limit=2)
+        assert len(spy.call_args.kwargs["requests"]) == 1
+        assert batched[1][0].id == 2
+
+    def test_payload_projection_is_part_of_the_cache_key(self, memory_client):
+        qdrant_service.search_batch(vectors=[[1, 0, 0]], limit=1)
+        (hits,) = qdrant_service.search_batch(vectors=[[1, 0, 0]], limit=1, with_payload=False)
+        assert not hits[0].payload
+
+    def test_asearch_batch_two_stage(self, async_client):
+        batched = asyncio.run(
+            qdrant_service.asearch_batch(
+                vectors=[[1, 0, 1, 0], [1, 0, 0, 1]], limit=1, collection="frames_v2", precision="balanced"
+            )
+        )
+        assert [hits[0].id for hits in batched] == [0, 1]
+
+
+@pytest.fixture
+def video_frames_client():
+    """Six frames of three videos: V1 has the two best matches for [1, 0, 0]."""
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="watched_frames",
+        vectors_config=models.VectorParams(size=3, distance=models.Distance.COSINE),
+    )
+    frames = {
+        1: ("V1", [1, 0, 0]), 2: ("V1", [0.95, 0.05, 0]), 3: ("V1", [0, 0, 1]),
+        4: ("V2", [0.9, 0.1, 0]), 5: ("V2", [0.8, 0.2, 0]), 6: ("V3", [0, 1, 0]),
+    }
+    client.upsert(
+        "watched_frames",
+        [models.PointStruct(id=i, vector=v, payload={"video_code": code}) for i, (code, v) in frames.items()],
+    )
+    qdrant_service._vector_layout.cache_clear()
+    with patch.object(qdrant_service, "_client", return_value=client):
+        yield client
+    qdrant_service._vector_layout.cache_clear()
+
+
+class TestGroupedSearch:
+    """search_groups returns whole videos, best first, each with its best frames."""
+
+    def test_top_videos_with_best_frames(self, video_frames_client):
+        groups = qdrant_service.search_groups(vector=[1, 0, 0], groups=2, group_size=2)
+        assert [g.id for g in groups] == ["V1", "V2"]
+        assert [h.id for h in groups[0].hits] == [1, 2]
+        assert [h.id for h in groups[1].hits] == [4, 5]
+
+    def test_group_size_is_part_of_the_cache_key(self, video_frames_client):
+        qdrant_service.search_groups(vector=[1, 0, 0], groups=2, group_size=2)
+        (group,) = qdrant_service.search_groups(vector=[1, 0, 0], groups=1, group_size=1)
+        assert [h.id for h in group.hits] == [1]
+        (group,) = qdrant_service.search_groups(vector=[1, 0, 0], groups=1, group_size=3)
+        assert len(group.hits) == 3
+
+
+class TestFiltersAndPaging:
+    """Payload filters, offset pages and payload projection run inside Qdrant."""
+
+    def test_payload_filter_conditions(self, video_frames_client):
+        only = qdrant_service.payload_filter(include_codes=["V2", "V3"])
+        hits = qdrant_service.search(vector=[1, 0, 0], limit=3, query_filter=only)
+        assert [h.id for h in hits] == [4, 5, 6]
+        without = qdrant_service.payload_filter(exclude_codes=["V1"])
+        hits = qdrant_service.search(vector=[1, 0, 0], limit=6, query_filter=without)
+        assert {h.payload["video_code"] for h in hits} == {"V2", "V3"}
+        assert qdrant_service.payload_filter() is None
+
+    def test_created_at_range(self):
+        from datetime import datetime
+
+        flt = qdrant_service.payload_filter(created_from=datetime(2024, 1, 1), platforms=["tiktok"])
+        keys = {c.key for c in flt.must}
+        assert keys == {"platform", "created_at"}
+        assert flt.must_not is None
+
+    def test_created_at_range_matches_pipeline_payloads(self, memory_client):
+        from datetime import datetime, timezone
+
+        # the shape VideoPipeline._make_points writes
+        memory_client.set_payload(
+            "watched_frames",
+            {
+                "platform": "instagram",
+                "video_code": "V0",
+                "frame_number": 1,
+                "frame_second": 0.5,
+                "created_at": "2024-06-01T12:00:00+00:00",
+                "path": "frames/V0/1_0.50.png",
+                "content_hash": "abc",
+            },
+            points=[0],
+        )
+        june = qdrant_service.payload_filter(
+            created_from=datetime(2024, 6, 1, tzinfo=timezone.utc),
+            created_to=datetime(2024, 6, 2, tzinfo=timezone.utc),
+        )
+        hits = qdrant_service.search(vector=[1, 0, 0], limit=3, query_filter=june)
+        assert [h.id for h in hits] == [0]
+        july = qdrant_service.payload_filter(created_from=datetime(2024, 7, 1, tzinfo=timezone.utc))
+        assert qdrant_service.search(vector=[1, 0, 0], limit=3, query_filter=july) == []
+
+    def test_offset_pages_do_not_overlap(self, video_frames_client):
+        first = qdrant_service.search(vector=[1, 0, 0], limit=2)
+        second = qdrant_service.search(vector=[1, 0, 0], limit=2, offset=2)
+        everything = qdrant_service.search(vector=[1, 0, 0], limit=4)
+        assert [h.id for h in first + second] == [h.id for h in everything]
+
+    def test_payload_projection(self, video_frames_client):
+        video_frames_client.set_payload("watched_frames", {"path": "s3://x.png"}, points=[1])
+        (hit,) = qdrant_service.search(vector=[1, 0, 0], limit=1, with_payload=["path"])
+        assert hit.payload == {"path": "s3://x.png"}
+        (full,) = qdrant_service.search(vector=[1, 0, 0], limit=1)
+        assert full.payload == {"video_code": "V1", "path": "s3://x.png"}
+
+
+class TestRetrieveVectors:
+    """retrieve_vectors: many ids in one request, keyed by str(id)."""
+
+    def test_missing_ids_are_absent(self, memory_client):
+        found = qdrant_service.retrieve_vectors(collection="watched_frames", ids=[2, 0, 99])
+        assert set(found) == {"0", "2"}
+        vector, payload = found["2"]
+        assert vector == pytest.approx([0, 1, 0])
+        assert payload is None  # payloads only on request
+
+    def test_named_layout_returns_the_full_vector(self, two_stage_client):
+        found = qdrant_service.retrieve_vectors(collection="frames_v2", ids=[1], with_payload=True)
+        assert len(found["1"][0]) == 4
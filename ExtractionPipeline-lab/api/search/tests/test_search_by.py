@@ -1,9 +1,12 @@
 """Tests for search-by endpoints (text and image)."""
 
+import base64
 import io
+import json
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 from PIL import Image
@@ -27,8 +30,8 @@ class TestSearchByText:
         self.headers = {"X-API-Key": self.api_key}
         self.valid_request = {"prompt": "a beautiful sunset over the ocean", "limit": 5}
 
-    @patch("controllers.search_by.text.qdrant_service.search")
-    @patch("controllers.search_by.text.embeddings_service.get_text_embedding")
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_text_success(self, mock_verify_api_key, mock_get_embedding, mock_search):
         """Test successful text search."""
@@ -68,7 +71,14 @@ class TestSearchByText:
 
         # Verify service calls
         mock_get_embedding.assert_called_once_with("a beautiful sunset over the ocean")
-        mock_search.assert_called_once_with(vector=mock_embedding, limit=5)
+        mock_search.assert_called_once_with(
+            vector=mock_embedding,
+            limit=5,
+            precision=None,
+            query_filter=None,
+            offset=0,
+            with_payload=True,
+        )
 
     @patch("auth.apikey.verify_api_key")
     def test_search_by_text_empty_prompt(self, mock_verify_api_key):
@@ -86,8 +96,8 @@ class TestSearchByText:
         data = response.json()
         assert "Prompt must not be empty" in data["detail"]
 
-    @patch("controllers.search_by.text.qdrant_service.search")
-    @patch("controllers.search_by.text.embeddings_service.get_text_embedding")
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_text_default_limit(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -110,9 +120,16 @@ class TestSearchByText:
         assert response.status_code == 200
 
         # Verify default limit was used
-        mock_search.assert_called_once_with(vector=[0.1, 0.2, 0.3], limit=5)
+        mock_search.assert_called_once_with(
+            vector=[0.1, 0.2, 0.3],
+            limit=5,
+            precision=None,
+            query_filter=None,
+            offset=0,
+            with_payload=True,
+        )
 
-    @patch("controllers.search_by.text.embeddings_service.get_text_embedding")
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_text_embedding_error(self, mock_verify_api_key, mock_get_embedding):
         """Test when embedding generation fails."""
@@ -131,8 +148,8 @@ class TestSearchByText:
         # Verify the exception message
         assert "Embedding model failed" in str(exc_info.value)
 
-    @patch("controllers.search_by.text.qdrant_service.search")
-    @patch("controllers.search_by.text.embeddings_service.get_text_embedding")
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_text_search_error(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -155,8 +172,8 @@ class TestSearchByText:
         data = response.json()
         assert "Qdrant search failed" in data["detail"]
 
-    @patch("controllers.search_by.text.qdrant_service.search")
-    @patch("controllers.search_by.text.embeddings_service.get_text_embedding")
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_text_empty_results(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -179,6 +196,31 @@ class TestSearchByText:
         data = response.json()
         assert len(data) == 0
 
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_search_by_text_precision(self, mock_verify_api_key, mock_get_embedding, mock_search):
+        """Test that the precision profile is forwarded and validated."""
+        mock_verify_api_key.return_value = True
+        mock_get_embedding.return_value = [0.1, 0.2, 0.3]
+        mock_search.return_value = []
+
+        request = {**self.valid_request, "precision": "exact"}
+        response = client.post("/search-by/text/", json=request, headers=self.headers)
+        assert response.status_code == 200
+        mock_search.assert_called_once_with(
+            vector=[0.1, 0.2, 0.3],
+            limit=5,
+            precision="exact",
+            query_filter=None,
+            offset=0,
+            with_payload=True,
+        )
+
+        request = {**self.valid_request, "precision": "turbo"}
+        response = client.post("/search-by/text/", json=request, headers=self.headers)
+        assert response.status_code == 422
+
     def test_search_by_text_no_api_key(self):
         """Test that API key is required."""
         # Make request without API key
@@ -204,8 +246,8 @@ class TestSearchByImage:
         self.test_image.save(self.test_image_bytes, format="PNG")
         self.test_image_bytes.seek(0)
 
-    @patch("controllers.search_by.image.qdrant_service.search")
-    @patch("controllers.search_by.image.embeddings_service.get_image_embedding")
+    @patch("controllers.search_by.image.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_success(self, mock_verify_api_key, mock_get_embedding, mock_search):
         """Test successful image search."""
@@ -248,7 +290,14 @@ class TestSearchByImage:
 
         # Verify service calls
         mock_get_embedding.assert_called_once()
-        mock_search.assert_called_once_with(vector=mock_embedding, limit=5)
+        mock_search.assert_called_once_with(
+            vector=mock_embedding,
+            limit=5,
+            precision=None,
+            query_filter=None,
+            offset=0,
+            with_payload=True,
+        )
 
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_invalid_file_type(self, mock_verify_api_key):
@@ -313,8 +362,8 @@ class TestSearchByImage:
         data = response.json()
         assert "Invalid image file" in data["detail"]
 
-    @patch("controllers.search_by.image.qdrant_service.search")
-    @patch("controllers.search_by.image.embeddings_service.get_image_embedding")
+    @patch("controllers.search_by.image.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_default_limit(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -343,10 +392,17 @@ class TestSearchByImage:
         assert response.status_code == 200
 
         # Verify default limit was used
-        mock_search.assert_called_once_with(vector=[0.1, 0.2, 0.3], limit=5)
+        mock_search.assert_called_once_with(
+            vector=[0.1, 0.2, 0.3],
+            limit=5,
+            precision=None,
+            query_filter=None,
+            offset=0,
+            with_payload=True,
+        )
 
-    @patch("controllers.search_by.image.qdrant_service.search")
-    @patch("controllers.search_by.image.embeddings_service.get_image_embedding")
+    @patch("controllers.search_by.image.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_rgb_conversion(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -381,7 +437,7 @@ class TestSearchByImage:
         called_image = mock_get_embedding.call_args[0][0]
         assert called_image.mode == "RGB"
 
-    @patch("controllers.search_by.image.embeddings_service.get_image_embedding")
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_embedding_error(self, mock_verify_api_key, mock_get_embedding):
         """Test when embedding generation fails."""
@@ -408,8 +464,8 @@ class TestSearchByImage:
         data = response.json()
         assert "Failed to generate image embedding" in data["detail"]
 
-    @patch("controllers.search_by.image.qdrant_service.search")
-    @patch("controllers.search_by.image.embeddings_service.get_image_embedding")
+    @patch("controllers.search_by.image.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_search_error(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -458,8 +514,8 @@ class TestSearchByImage:
         data = response.json()
         assert data["detail"] == "API key is required"
 
-    @patch("controllers.search_by.image.qdrant_service.search")
-    @patch("controllers.search_by.image.embeddings_service.get_image_embedding")
+    @patch("controllers.search_by.image.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_image_custom_limit(
         self, mock_verify_api_key, mock_get_embedding, mock_search
@@ -489,4 +545,319 @@ class TestSearchByImage:
         assert response.status_code == 200
 
         # Verify custom limit was used
-        mock_search.assert_called_once_with(vector=[0.1, 0.2, 0.3], limit=10)
+        mock_search.assert_called_once_with(
+            vector=[0.1, 0.2, 0.3],
+            limit=10,
+            precision=None,
+            query_filter=None,
+            offset=0,
+            with_payload=True,
+        )
+
+
+class TestSearchVideos:
+    """Grouped search: top videos, each with its best frames."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.headers = {"X-API-Key": "test_api_key_123"}
+        hit = Mock(id="frame-1", score=0.93, payload={"video_code": "ABC", "frame_number": 3})
+        second = Mock(id="frame-2", score=0.81, payload={"video_code": "ABC", "frame_number": 9})
+        self.groups = [Mock(id="ABC", hits=[hit, second])]
+
+    @patch("controllers.search_by.text.qdrant_service.asearch_groups", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_text_videos(self, mock_verify_api_key, mock_get_embedding, mock_groups):
+        """Groups come back as videos with their frames, best first."""
+        mock_get_embedding.return_value = [0.1, 0.2]
+        mock_groups.return_value = self.groups
+
+        response = client.post(
+            "/search-by/text/videos",
+            json={"prompt": "sunset", "videos": 4, "frames_per_video": 2},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        (video,) = response.json()
+        assert video["video_code"] == "ABC"
+        assert video["score"] == 0.93
+        assert [f["id"] for f in video["frames"]] == ["frame-1", "frame-2"]
+        mock_groups.assert_called_once_with(
+            vector=[0.1, 0.2],
+            groups=4,
+            group_size=2,
+            precision=None,
+            query_filter=None,
+            with_payload=True,
+        )
+
+    @patch("auth.apikey.verify_api_key")
+    def test_text_videos_rejects_oversized_groups(self, mock_verify_api_key):
+        """frames_per_video is bounded."""
+        response = client.post(
+            "/search-by/text/videos",
+            json={"prompt": "sunset", "frames_per_video": 500},
+            headers=self.headers,
+        )
+        assert response.status_code == 422
+
+    @patch("controllers.search_by.image.qdrant_service.asearch_groups", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embedding", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_image_videos(self, mock_verify_api_key, mock_get_embedding, mock_groups):
+        """The image variant takes the group parameters as query params."""
+        mock_get_embedding.return_value = [0.3, 0.4]
+        mock_groups.return_value = self.groups
+        image_bytes = io.BytesIO()
+        Image.new("RGB", (32, 32), color="blue").save(image_bytes, format="PNG")
+        image_bytes.seek(0)
+
+        response = client.post(
+            "/search-by/image/videos",
+            files={"file": ("test.png", image_bytes, "image/png")},
+            params={"videos": 5, "frames_per_video": 1},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["video_code"] == "ABC"
+        mock_groups.assert_called_once_with(
+            vector=[0.3, 0.4],
+            groups=5,
+            group_size=1,
+            precision=None,
+            query_filter=None,
+            with_payload=True,
+        )
+
+
+class TestSearchByClip:
+    """Query-by-clip: sampled in memory, nothing stored."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.headers = {"X-API-Key": "test_api_key_123"}
+
+    @patch("controllers.search_by.clip.qdrant_service.asearch_batch", new_callable=AsyncMock)
+    @patch("controllers.search_by.clip.embeddings_service.aget_image_embeddings", new_callable=AsyncMock)
+    @patch("controllers.search_by.clip.clip_sampler.asample_frames", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_clip_search_fuses_per_video(
+        self, mock_verify_api_key, mock_sample, mock_embed, mock_search
+    ):
+        """Two sampled frames, one batched search, one fused video."""
+        mock_sample.return_value = [(0.0, Image.new("RGB", (8, 8))), (2.5, Image.new("RGB", (8, 8)))]
+        mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
+        mock_search.return_value = [
+            [Mock(id="f1", score=0.9, payload={"video_code": "ABC"})],
+            [Mock(id="f2", score=0.7, payload={"video_code": "ABC"})],
+        ]
+
+        response = client.post(
+            "/search-by/clip/",
+            files={"file": ("clip.mp4", b"\x00\x00\x00\x18ftypmp42", "video/mp4")},
+            params={"fusion": "max", "limit": 3},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        (video,) = response.json()
+        assert video["video_code"] == "ABC"
+        assert video["score"] == 0.9
+        assert [f["query_second"] for f in video["frame_results"]] == [0.0, 2.5]
+        mock_search.assert_called_once()
+        assert mock_search.call_args.kwargs["vectors"] == [[0.1, 0.2], [0.3, 0.4]]
+
+    @patch("controllers.search_by.clip.qdrant_service.asearch_batch", new_callable=AsyncMock)
+    @patch("controllers.search_by.clip.embeddings_service.aget_image_embeddings", new_callable=AsyncMock)
+    @patch("controllers.search_by.clip.clip_sampler.asample_frames", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_clip_max_frames_is_capped(self, mock_verify_api_key, mock_sample, mock_embed, mock_search):
+        """max_frames above CLIP_MAX_FRAMES is clamped to it; omitted means the cap."""
+        cap = int(os.getenv("CLIP_MAX_FRAMES", 16))
+        mock_sample.return_value = [(0.0, Image.new("RGB", (8, 8)))]
+        mock_embed.return_value = [[0.1, 0.2]]
+        mock_search.return_value = [[]]
+        clip = {"file": ("clip.mp4", b"\x00\x00\x00\x18ftypmp42", "video/mp4")}
+
+        client.post("/search-by/clip/", files=clip, params={"max_frames": 10_000}, headers=self.headers)
+        assert mock_sample.call_args.kwargs["max_frames"] == cap
+        client.post("/search-by/clip/", files=clip, params={"max_frames": 1}, headers=self.headers)
+        assert mock_sample.call_args.kwargs["max_frames"] == 1
+
+    @patch("auth.apikey.verify_api_key")
+    def test_clip_search_rejects_non_video(self, mock_verify_api_key):
+        """Only video uploads are accepted."""
+        response = client.post(
+            "/search-by/clip/",
+            files={"file": ("a.txt", b"hello", "text/plain")},
+            headers=self.headers,
+        )
+        assert response.status_code == 400
+
+
+class TestSearchFiltersAndPaging:
+    """Filters, cursor pages and payload projection on /search-by/text."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.headers = {"X-API-Key": "test_api_key_123"}
+
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_filters_and_fields_reach_qdrant(self, mock_verify_api_key, mock_get_embedding, mock_search):
+        """Structured filters become one Qdrant filter; fields become the payload whitelist."""
+        mock_get_embedding.return_value = [0.1, 0.2]
+        mock_search.return_value = []
+
+        response = client.post(
+            "/search-by/text/",
+            json={
+                "prompt": "sunset",
+                "filters": {"platforms": ["tiktok"], "exclude_codes": ["ABC"]},
+                "fields": ["video_code", "path"],
+            },
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        kwargs = mock_search.call_args.kwargs
+        assert {c.key for c in kwargs["query_filter"].must} == {"platform"}
+        assert [c.key for c in kwargs["query_filter"].must_not] == ["video_code"]
+        assert kwargs["with_payload"] == ["video_code", "path"]
+
+    @patch("controllers.search_by.text.qdrant_service.asearch", new_callable=AsyncMock)
+    @patch("controllers.search_by.text.embeddings_service.aget_text_embedding", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_cursor_walks_pages(self, mock_verify_api_key, mock_get_embedding, mock_search):
+        """A full page returns X-Next-Cursor; sending it back asks for the next offset."""
+        mock_get_embedding.return_value = [0.1, 0.2]
+        mock_search.return_value = [Mock(id=i, score=0.9, payload={}) for i in range(2)]
+
+        first = client.post("/search-by/text/", json={"prompt": "sunset", "limit": 2}, headers=self.headers)
+        cursor = first.headers["X-Next-Cursor"]
+
+        mock_search.return_value = [Mock(id=9, score=0.5, payload={})]
+        second = client.post(
+            "/search-by/text/", json={"prompt": "sunset", "limit": 2, "cursor": cursor}, headers=self.headers
+        )
+
+        assert mock_search.call_args.kwargs["offset"] == 2
+        assert "X-Next-Cursor" not in second.headers  # short page: no more results
+
+    @patch("auth.apikey.verify_api_key")
+    def test_bad_cursor_rejected(self, mock_verify_api_key):
+        """Garbage cursors are a client error."""
+        response = client.post(
+            "/search-by/text/", json={"prompt": "sunset", "cursor": "!!"}, headers=self.headers
+        )
+        assert response.status_code == 400
+
+
+class TestSearchByImageBatch:
+    """Many images and / or vectors: one embedding batch, one Qdrant batch."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        self.headers = {"X-API-Key": "test_api_key_123"}
+        self.dim = int(os.getenv("QDRANT_DIM", 512))
+
+    def _png(self, color):
+        buf = io.BytesIO()
+        Image.new("RGB", (16, 16), color=color).save(buf, format="PNG")
+        return buf.getvalue()
+
+    @patch("controllers.search_by.image.qdrant_service.asearch_batch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embeddings", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_images_and_vectors_in_one_batch(self, mock_verify_api_key, mock_embed, mock_search):
+        """Images are embedded together; every query goes out in one search, results in order."""
+        vector = [0.5] * self.dim
+        mock_embed.return_value = [[0.1] * self.dim, [0.2] * self.dim]
+        mock_search.return_value = [
+            [Mock(id="a", score=0.9, payload={})],
+            [],
+            [Mock(id="c", score=0.7, payload={"video_code": "X"})],
+        ]
+
+        response = client.post(
+            "/search-by/image/batch",
+            files=[
+                ("files", ("red.png", self._png("red"), "image/png")),
+                ("files", ("blue.png", self._png("blue"), "image/png")),
+            ],
+            data={"vectors": json.dumps([vector])},
+            params={"limit": 3, "debug": "true"},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [q["source"] for q in data] == ["image", "image", "vector"]
+        assert [q["filename"] for q in data] == ["red.png", "blue.png", None]
+        assert [len(q["results"]) for q in data] == [1, 0, 1]
+        assert data[0]["debug"]["decode_ms"] >= 0
+        assert data[2]["debug"]["embed_ms"] is None
+        mock_embed.assert_called_once()
+        assert len(mock_embed.call_args.args[0]) == 2
+        mock_search.assert_called_once()
+        assert mock_search.call_args.kwargs["vectors"] == [[0.1] * self.dim, [0.2] * self.dim, vector]
+        assert mock_search.call_args.kwargs["limit"] == 3
+
+    @patch("controllers.search_by.image.qdrant_service.asearch_batch", new_callable=AsyncMock)
+    @patch("controllers.search_by.image.embeddings_service.aget_image_embeddings", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_vectors_only_skip_the_model(self, mock_verify_api_key, mock_embed, mock_search):
+        """Precomputed vectors never touch the embedding model; debug is off by default."""
+        mock_search.return_value = [[]]
+
+        response = client.post(
+            "/search-by/image/batch",
+            data={"vectors": json.dumps([[0.0] * self.dim])},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["debug"] is None
+        mock_embed.assert_not_called()
+
+    @patch("controllers.search_by.image.qdrant_service.asearch_batch", new_callable=AsyncMock)
+    @patch("auth.apikey.verify_api_key")
+    def test_binary_vectors(self, mock_verify_api_key, mock_search):
+        """Vectors can arrive as base64 float16 rows and as an uploaded .npy array."""
+        mock_search.return_value = [[], [], []]
+        rows = [[0.5] * self.dim, [0.25] * self.dim]
+        npy = io.BytesIO()
+        np.save(npy, np.full((1, self.dim), 0.125, dtype=np.float32))
+
+        response = client.post(
+            "/search-by/image/batch",
+            data={
+                "vectors": base64.b64encode(np.asarray(rows, dtype="<f2").tobytes()).decode(),
+                "vector_encoding": "float16",
+            },
+            files={"vectors_file": ("q.npy", npy.getvalue(), "application/octet-stream")},
+            headers=self.headers,
+        )
+
+        assert response.status_code == 200
+        assert mock_search.call_args.kwargs["vectors"] == [*rows, [0.125] * self.dim]
+
+    @patch("auth.apikey.verify_api_key")
+    def test_wrong_dimension_rejected(self, mock_verify_api_key):
+        """Vectors must match the collection dimension."""
+        response = client.post(
+            "/search-by/image/batch",
+            data={"vectors": json.dumps([[0.1, 0.2]])},
+            headers=self.headers,
+        )
+        assert response.status_code == 400
+
+    @patch("auth.apikey.verify_api_key")
+    def test_empty_request_rejected(self, mock_verify_api_key):
+        """At least one query is required."""
+        response = client.post("/search-by/image/batch", data={}, headers=self.headers)
+        assert response.status_code == 400
@@ -1,5 +1,5 @@
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -28,8 +28,8 @@ class TestUserContentSearch:
         self.image_id = "test-image-456"
         self.video_id = "test-video-789"
 
-    @patch("controllers.search_by_user_content.image.qdrant_service.fetch_embedding")
-    @patch("controllers.search_by_user_content.image.qdrant_service.search")
+    @patch("controllers.search_by_user_content.image.qdrant_service.afetch_embedding", new_callable=AsyncMock)
+    @patch("controllers.search_by_user_content.image.qdrant_service.asearch", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_user_image_success(
         self, mock_verify_api_key, mock_search, mock_fetch_embedding
@@ -70,11 +70,11 @@ class TestUserContentSearch:
             collection="user_images", user_id=self.user_id, entry_id=self.image_id
         )
         mock_search.assert_called_once_with(
-            vector=mock_embedding, limit=5, collection="watched_frames"
+            vector=mock_embedding, limit=5, collection="watched_frames", precision=None
         )
 
-    @patch("controllers.search_by_user_content.video.qdrant_service.fetch_all_video_embeddings")
-    @patch("controllers.search_by_user_content.video.qdrant_service.search")
+    @patch("controllers.search_by_user_content.video.qdrant_service.afetch_all_video_embeddings", new_callable=AsyncMock)
+    @patch("controllers.search_by_user_content.video.qdrant_service.asearch_batch", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_user_video_success(
         self, mock_verify_api_key, mock_search, mock_fetch_all_embeddings
@@ -104,8 +104,8 @@ class TestUserContentSearch:
         mock_hit2.score = 0.88
         mock_hit2.payload = {"video_id": "matched-video-1", "frame_number": 15}
 
-        # Return different results for each frame search
-        mock_search.side_effect = [[mock_hit1], [mock_hit2]]
+        # One batched search: a hit list per query frame
+        mock_search.return_value = [[mock_hit1], [mock_hit2]]
 
         # Make request
         response = client.post(
@@ -135,9 +135,11 @@ class TestUserContentSearch:
         mock_fetch_all_embeddings.assert_called_once_with(
             collection="user_videos", user_id=self.user_id, video_id=self.video_id
         )
-        assert mock_search.call_count == 2
+        mock_search.assert_called_once()
+        assert len(mock_search.call_args.kwargs["vectors"]) == 2
+        assert video_result["score"] == 0.95  # default fusion: max
 
-    @patch("controllers.search_by_user_content.image.qdrant_service.fetch_embedding")
+    @patch("controllers.search_by_user_content.image.qdrant_service.afetch_embedding", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_user_image_not_found(self, mock_verify_api_key, mock_fetch_embedding):
         """Test image search when embedding not found."""
@@ -158,7 +160,7 @@ class TestUserContentSearch:
         assert response.status_code == 500
         assert "Error retrieving image embedding" in response.json()["detail"]
 
-    @patch("controllers.search_by_user_content.video.qdrant_service.fetch_all_video_embeddings")
+    @patch("controllers.search_by_user_content.video.qdrant_service.afetch_all_video_embeddings", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_user_video_not_found(self, mock_verify_api_key, mock_fetch_all_embeddings):
         """Test video search when video not found."""
@@ -179,7 +181,7 @@ class TestUserContentSearch:
         assert response.status_code == 500
         assert "Error retrieving video embeddings" in response.json()["detail"]
 
-    @patch("controllers.search_by_user_content.video.qdrant_service.fetch_all_video_embeddings")
+    @patch("controllers.search_by_user_content.video.qdrant_service.afetch_all_video_embeddings", new_callable=AsyncMock)
     @patch("auth.apikey.verify_api_key")
     def test_search_by_user_video_empty_embeddings(
         self, mock_verify_api_key, mock_fetch_all_embeddings
@@ -0,0 +1,67 @@
+"""Tests for the compact vector encodings."""
+
+import base64
+import io
+
+import numpy as np
+import pytest
+
+from services import vector_codec
+
+VECTORS = [[0.25, -0.5, 1.0], [0.0, 0.125, -2.0]]
+
+
+class TestBase64:
+    @pytest.mark.parametrize("encoding", ["float32", "float16"])
+    def test_round_trip(self, encoding):
+        encoded = vector_codec.encode(VECTORS[0], encoding)
+        assert vector_codec.decode(encoded, encoding, dim=3) == [VECTORS[0]]
+
+    def test_float16_is_half_the_size(self):
+        f32 = base64.b64decode(vector_codec.encode(VECTORS[0], "float32"))
+        f16 = base64.b64decode(vector_codec.encode(VECTORS[0], "float16"))
+        assert (len(f32), len(f16)) == (12, 6)
+
+    def test_many_rows_in_one_string(self):
+        raw = np.asarray(VECTORS, dtype="<f4").tobytes()
+        assert vector_codec.decode(base64.b64encode(raw).decode(), "float32", dim=3) == VECTORS
+
+    def test_json_is_a_plain_list(self):
+        assert vector_codec.encode((1.0, 2.0), "json") == [1.0, 2.0]
+
+    def test_partial_vector_rejected(self):
+        raw = np.asarray([1.0, 2.0], dtype="<f4").tobytes()
+        with pytest.raises(ValueError, match="whole number"):
+            vector_codec.decode(base64.b64encode(raw).decode(), "float32", dim=3)
+
+    def test_bad_base64_rejected(self):
+        with pytest.raises(ValueError, match="base64"):
+            vector_codec.decode("not base64!", "float32", dim=3)
+
+
+class TestNpy:
+    def test_missing_rows_are_nan(self):
+        array = np.load(io.BytesIO(vector_codec.to_npy([VECTORS[0], None], dim=3)))
+        assert array.shape == (2, 3) and array.dtype == np.float32
+        assert array[0].tolist() == VECTORS[0]
+        assert np.isnan(array[1]).all()
+
+    def test_from_bytes_reads_npy_and_raw_rows(self):
+        buf = io.BytesIO()
+        np.save(buf, np.asarray(VECTORS, dtype=np.float16))
+        assert vector_codec.from_bytes(buf.getvalue(), dim=3) == VECTORS
+        assert vector_codec.from_bytes(np.asarray(VECTORS, dtype="<f4").tobytes(), dim=3) == VECTORS
+
+    def test_wrong_shape_and_nan_rejected(self):
+        buf = io.BytesIO()
+        np.save(buf, np.zeros((2, 4), dtype=np.float32))
+        with pytest.raises(ValueError, match="shape"):
+            vector_codec.from_bytes(buf.getvalue(), dim=3)
+        with pytest.raises(ValueError, match="NaN"):
+            vector_codec.from_bytes(vector_codec.to_npy([None], dim=3), dim=3)
+
+
+def test_wants_binary():
+    assert vector_codec.wants_binary("application/octet-stream")
+    assert not vector_codec.wants_binary("application/json")
+    assert not vector_codec.wants_binary(None)
@@ -0,0 +1,50 @@
+"""Tests for video-level fusion of multi-frame search hits."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services.video_fusion import fuse_video_hits
+
+
+def hit(video, score, point_id=None):
+    return SimpleNamespace(id=point_id or f"{video}-{score}", score=score, payload={"video_code": video})
+
+
+# three query frames: A matches one frame very well, B matches all of them well
+HITS = [
+    [hit("A", 0.99), hit("B", 0.85), hit("B", 0.84)],
+    [hit("B", 0.86), hit("C", 0.50)],
+    [hit("B", 0.83), hit("A", 0.40)],
+]
+
+
+class TestFuseVideoHits:
+    def test_max_keeps_the_best_frame(self):
+        ranked = fuse_video_hits(HITS, fusion="max")
+        assert [m.video for m in ranked] == ["A", "B", "C"]
+        assert ranked[0].score == 0.99
+
+    def test_mean_topk_rewards_consistent_matches(self):
+        ranked = fuse_video_hits(HITS, fusion="mean_topk", top_k=3)
+        assert [m.video for m in ranked][:2] == ["B", "A"]
+        assert ranked[0].score == pytest.approx((0.85 + 0.86 + 0.83) / 3)
+        assert ranked[1].score == pytest.approx((0.99 + 0.40) / 3)  # missing frame counts as 0
+
+    def test_count_over_threshold(self):
+        ranked = fuse_video_hits(HITS, fusion="count", threshold=0.8)
+        assert [(m.video, m.score) for m in ranked] == [("B", 3.0), ("A", 1.0), ("C", 0.0)]
+
+    def test_one_best_hit_per_query_frame(self):
+        (b,) = [m for m in fuse_video_hits(HITS) if m.video == "B"]
+        assert sorted(b.frames) == [0, 1, 2]
+        assert b.frames[0].score == 0.85
+
+    def test_limit_and_unknown_fusion(self):
+        assert len(fuse_video_hits(HITS, limit=1)) == 1
+        with pytest.raises(ValueError):
+            fuse_video_hits(HITS, fusion="median")
+
+    def test_hits_without_video_are_ignored(self):
+        anonymous = SimpleNamespace(id=1, score=1.0, payload={})
+        assert fuse_video_hits([[anonymous]]) == []
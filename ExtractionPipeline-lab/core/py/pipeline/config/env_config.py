@@ -24,6 +24,7 @@ class Settings:
     frames_dir: Path = _env_path("VP_FRAMES_DIR", output_root / "tmp" / "frames")
     logs_dir: Path = _env_path("VP_LOGS_DIR", output_root / "logs")
     reports_dir: Path = _env_path("VP_REPORTS_DIR", output_root / "reports")
+    spool_dir: Path = _env_path("VP_SPOOL_DIR", output_root / "spool")
 
     # ───────────── AWS / S3 ─────────────────────────────────────────
     aws_region: str = os.getenv("AWS_REGION", "us-east-1")
@@ -39,12 +40,29 @@ class Settings:
     # ───────────── feature switches ────────────────────────────────
     crop_enabled: bool = os.getenv("VP_ENABLE_CROP", "1") != "0"
     dedup_enabled: bool = os.getenv("VP_ENABLE_DEDUP", "1") != "0"
+    reclaim_frames: bool = os.getenv("VP_RECLAIM_FRAMES", "1") != "0"
+    spool_upserts: bool = os.getenv("VP_SPOOL_UPSERTS", "1") != "0"
+    incremental_reindex: bool = os.getenv("VP_INCREMENTAL_REINDEX", "1") != "0"
+
+    # ───────────── disk budget / back-pressure ─────────────────────
+    min_free_gb: float = float(os.getenv("VP_MIN_FREE_GB", 5.0))
+    disk_poll_secs: float = float(os.getenv("VP_DISK_POLL_SECS", 15.0))
+    disk_wait_timeout: float = float(os.getenv("VP_DISK_WAIT_TIMEOUT", 1800.0))
 
     # ───────────── Qdrant / vectors ────────────────────────────────
     qdrant_url: str = os.getenv("QDRANT_URL", "")
     qdrant_key: str = os.getenv("QDRANT_KEY", "")
     collection: str = os.getenv("QDRANT_COLLECTION", "watched_frames")
     dim: int = int(os.getenv("QDRANT_DIM", 512))
+    # Matryoshka prefix vector stored next to the full one (0 = single unnamed vector)
+    mini_dim: int = int(os.getenv("QDRANT_MINI_DIM", 0))
+    full_vector: str = os.getenv("QDRANT_FULL_VECTOR", "full")
+    mini_vector: str = os.getenv("QDRANT_MINI_VECTOR", "mini")
+    upsert_batch: int = int(os.getenv("QDRANT_UPSERT_BATCH", 256))  # points per request
+    upsert_parallel: int = int(os.getenv("QDRANT_UPSERT_PARALLEL", 4))  # requests in flight
+    # payload-only collection holding each collection's write version (search-cache invalidation)
+    versions_collection: str = os.getenv("QDRANT_VERSIONS_COLLECTION", "_write_versions")
+    spool_drain_batch: int = int(os.getenv("QDRANT_SPOOL_DRAIN_BATCH", 2048))  # points per replay step
 
     # ─────────────── ffmpeg cropping knobs ─────────────────────
     crop_probes: int = int(os.getenv("VP_CROP_PROBES", 3))
@@ -61,7 +79,13 @@ class Settings:
 
     # ─────────────── CV thresholds / filters ───────────────────
     scene_thresh: float = float(os.getenv("VP_SCENE_THRESH", 0.22))
+    extract_mode: str = os.getenv("VP_EXTRACT_MODE", "scene")  # scene | keyframes | sparse
+    sparse_every_n: int = int(os.getenv("VP_SPARSE_EVERY_N", 5))
+    score_width: int = int(os.getenv("VP_SCORE_WIDTH", 320))
     min_frames: int = int(os.getenv("VP_MIN_FRAMES", 3))
+    # per-video frame budget; 0 disables the bound and keeps the fixed threshold
+    min_frames_per_min: float = float(os.getenv("VP_MIN_FRAMES_PER_MIN", 0))
+    max_frames_per_min: float = float(os.getenv("VP_MAX_FRAMES_PER_MIN", 0))
     tolerance: int = int(os.getenv("VP_TOLERANCE", 5))
     edge_thresh: int = int(os.getenv("VP_EDGE_THRESH", 10))
     dhash_size: int = int(os.getenv("VP_DHASH_SIZE", 8))
@@ -85,6 +109,7 @@ class Settings:
                 self.frames_dir,
                 self.logs_dir,
                 self.reports_dir,
+                self.spool_dir,
             ),
         )
         for d in self._dirs:
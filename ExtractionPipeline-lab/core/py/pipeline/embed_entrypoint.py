@@ -22,11 +22,11 @@ import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List
-from uuid import uuid5, NAMESPACE_URL
 
 from config.env_config import settings
 from config.logging_config import configure_logging
-from src import infer_embeds, store_embeds
+from lib.point_ids import frame_point_id
+from src import disk_budget, infer_embeds, reindex, store_embeds, upsert_spool
 
 log = configure_logging()
 
@@ -92,17 +92,17 @@ def process_embedding_for_code(code: str) -> bool:
             frame_second = timestamp_s
             s3_path = f"{platform}/{code}/{frame_path.name}"
 
+            point_id = frame_point_id(platform, code, frame_number)
             payload = {
-                "uuid": str(uuid5(NAMESPACE_URL, f"{code}_{frame_number}_{frame_second}")),
+                "uuid": point_id,
                 "created_at": datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
                 "video_code": code,
                 "frame_number": frame_number,
                 "frame_second": frame_second,
                 "path": s3_path,
+                "content_hash": reindex.content_hash(frame_path),
             }
 
-            point_id = f"{code}_{frame_idx}"
-
             points.append(
                 {
                     "id": point_id,
@@ -113,10 +113,16 @@ def process_embedding_for_code(code: str) -> bool:
 
         # Store in Qdrant
         t0 = time.perf_counter()
-        store_embeds.upsert_embeddings(points)
+        if settings.spool_upserts:
+            stored = upsert_spool.upsert(points)
+        else:
+            store_embeds.upsert_embeddings(points)
+            stored = True
         store_time = time.perf_counter() - t0
 
-        log.info(f"[embed] Stored {len(points)} vectors in Qdrant in {store_time:.1f}s")
+        where = "in Qdrant" if stored else "in the local spool"
+        log.info(f"[embed] Stored {len(points)} vectors {where} in {store_time:.1f}s")
+        disk_budget.mark_upserted(frames_dir)
         log.info(f"[embed] ✅ Successfully processed embeddings for {code}")
         return True
 
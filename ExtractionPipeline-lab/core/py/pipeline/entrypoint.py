@@ -2,7 +2,7 @@
 """
 Video-pipeline job driver
 ─────────────────────────
-Reads JOB_INPUT (JSON list of {"platform","code"})
+Reads JOB_INPUT (JSON list of {"platform","code"[,"extract_mode"]})
 ┌── Phase 0 ── download video from S3  (or use existing local .mp4)
 ├── Phase 1-4 ─ process video through     video_pipeline.*
 └── Phase 5 ──  upload frames to S3  +  mark row in Aurora PG
@@ -39,6 +39,7 @@ from config.logging_config import configure_logging
 from dotenv import load_dotenv
 from psycopg2 import sql
 from psycopg2.errors import ForeignKeyViolation
+from src import disk_budget, upsert_spool
 from src.download_videos import download_video
 from src.pipeline import VideoPipeline
 from src.verify_embedded import mark_embedded_codes
@@ -143,6 +144,7 @@ def upload_frames(platform: str, code: str) -> int:
         uploaded += 1
 
     log.info(f"[upload] {uploaded} frames → s3://{S3_FRAMES_BUCKET}/{platform}/{code}/")
+    disk_budget.mark_uploaded(frame_dir)
     return uploaded
 
 
@@ -170,13 +172,17 @@ def process_item(item: Dict[str, Any], workdir: Path, item_idx: int, total_items
             local_mp4 = found
 
         # ----- 1-4) computer-vision pipeline -------------------------
-        VideoPipeline().run(local_mp4)
+        frames = VideoPipeline().run(local_mp4, extract_mode=item.get("extract_mode"))
 
         # ----- 5) upload frames & DB status -------------------------
-        frames = upload_frames(platform, code)
+        upload_frames(platform, code)
         cropped = (settings.tmp_dir / local_mp4.name).exists()
         mark_done(code, cropped, frames)
 
+        # vectors are in Qdrant (or spooled) and the row is written: the frame
+        # dir may go now, as soon as the async uploader has let go of it too
+        disk_budget.mark_upserted(settings.frames_dir / local_mp4.stem)
+
         log.info(f"✅ [ok] {code}: frames={frames}")
         return True
     except Exception as exc:
@@ -186,6 +192,17 @@ def process_item(item: Dict[str, Any], workdir: Path, item_idx: int, total_items
         return False
 
 
+def _drain_spool(why: str) -> None:
+    """Best-effort spool replay; leftovers wait for the next run or drainer."""
+    if not settings.spool_upserts or not upsert_spool.pending_bytes():
+        return
+    log.info(f"📤 [spool] {why}")
+    try:
+        upsert_spool.drain()
+    except Exception as e:
+        log.warning(f"⚠️ [spool] Qdrant still unavailable, keeping spool: {e}")
+
+
 # ───────────── entrypoint ───────────────────────────────────────────
 def main() -> None:
     # Parse CLI arguments for batch processing configuration
@@ -228,6 +245,10 @@ def main() -> None:
         f"LOCAL_MODE={LOCAL_MODE}  SKIP_UPLOAD={SKIP_UPLOAD}"
     )
 
+    # reclaim frame dirs a previous (crashed / killed) run left confirmed
+    disk_budget.sweep()
+    _drain_spool("replaying vectors spooled by an earlier run")
+
     # use a temp dir for videos; frames/tmp dirs are already configured in settings
     with tempfile.TemporaryDirectory() as td:
         workdir = Path(td)
@@ -240,6 +261,14 @@ def main() -> None:
                 failed_count += 1
                 continue
 
+            # Back-pressure: don't admit a new video while the disk is full;
+            # on timeout leave the rest of the batch to main.py's retry queue.
+            if not disk_budget.wait_for_headroom():
+                remaining = len(items) - idx
+                log.error(f"[disk] not enough free space – deferring {remaining} item(s)")
+                failed_count += remaining
+                break
+
             try:
                 success = process_item(itm, workdir, idx, len(items))
                 if success:
@@ -257,7 +286,8 @@ def main() -> None:
                 )
                 failed_count += 1
 
-        # Step 6: Embedded status verification
+        # Step 6: Embedded status verification (after flushing spooled vectors)
+        _drain_spool("flushing spooled vectors before verification")
         if processed_codes:
             log.info(
                 f"🔍 [verify] checking embedded status for {len(processed_codes)} processed codes"
@@ -0,0 +1,115 @@
+"""
+Bulk "is this video embedded?" checks
+─────────────────────────────────────
+embedded_counts(client, collection, codes) – {code: stored points} for many codes
+embedded_codes(client, collection, codes)  – the subset with ≥ min_points points
+
+One facet request on the `video_code` keyword index answers for a whole
+chunk of codes (`video_code ∈ chunk`), instead of one scroll per code.  Old
+servers without `/facet` (or a collection without that index) fall back to
+exact filtered counts, run concurrently on the *same* client – the caller's
+pooled connection is never re-created here.
+
+Depends on qdrant-client only, so the orchestrators under `qdrant/`, `api/`
+and the repo root can import it by putting `core/py/pipeline` on `sys.path`.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+__all__ = ["FACET_CHUNK", "code_filter", "embedded_counts", "embedded_codes"]
+
+FACET_CHUNK = 1000  # codes per facet request (keeps the MatchAny filter small)
+_COUNT_THREADS = 16
+
+
+def code_filter(codes: List[str], platform: Optional[str] = None) -> models.Filter:
+    must: List[models.Condition] = [
+        models.FieldCondition(key="video_code", match=models.MatchAny(any=codes))
+    ]
+    if platform:
+        must.append(models.FieldCondition(key="platform", match=models.MatchValue(value=platform)))
+    return models.Filter(must=must)
+
+
+def _facet(client: QdrantClient, collection: str, chunk: List[str], platform: Optional[str]):
+    hits = client.facet(
+        collection_name=collection,
+        key="video_code",
+        facet_filter=code_filter(chunk, platform),
+        limit=len(chunk),
+        exact=True,
+    ).hits
+    return {str(h.value): h.count for h in hits}
+
+
+def _facet_unsupported(exc: Exception) -> bool:
+    """Pre-1.12 server (no `/facet` → 404) or no keyword index on video_code (400)."""
+    if isinstance(exc, AttributeError):
+        return True
+    if not isinstance(exc, UnexpectedResponse):
+        return False
+    if exc.status_code == 404:
+        return True
+    return exc.status_code == 400 and b"index" in (exc.content or b"").lower()
+
+
+def _counts(client: QdrantClient, collection: str, chunk: List[str], platform: Optional[str]):
+    def one(code: str) -> int:
+        return client.count(
+            collection_name=collection, count_filter=code_filter([code], platform), exact=True
+        ).count
+
+    with ThreadPoolExecutor(max_workers=min(_COUNT_THREADS, len(chunk))) as pool:
+        return dict(zip(chunk, pool.map(one, chunk)))
+
+
+def embedded_counts(
+    client: QdrantClient,
+    collection: str,
+    codes: Iterable[str],
+    *,
+    platform: Optional[str] = None,
+    chunk: int = FACET_CHUNK,
+) -> Dict[str, int]:
+    """
+    Number of stored points per code (0 for codes with none).  Errors other
+    than a missing facet API or index (timeouts, 5xx, dropped connections)
+    propagate – the caller decides what "unknown" means for its own
+    bookkeeping.
+    """
+    todo = list(dict.fromkeys(codes))
+    out = dict.fromkeys(todo, 0)
+    use_facet = hasattr(client, "facet")
+    for i in range(0, len(todo), chunk):
+        part = todo[i : i + chunk]
+        if use_facet:
+            try:
+                found = _facet(client, collection, part, platform)
+            except Exception as e:
+                if not _facet_unsupported(e):
+                    raise
+                use_facet = False
+        if not use_facet:
+            found = _counts(client, collection, part, platform)
+        for code, n in found.items():
+            if code in out:
+                out[code] = n
+    return out
+
+
+def embedded_codes(
+    client: QdrantClient,
+    collection: str,
+    codes: Iterable[str],
+    *,
+    platform: Optional[str] = None,
+    min_points: int = 1,
+) -> Set[str]:
+    counts = embedded_counts(client, collection, codes, platform=platform)
+    return {c for c, n in counts.items() if n >= min_points}
@@ -1,6 +1,7 @@
 """
 Low-level ffmpeg helpers
 ────────────────────────
+probe_video(...)         – one ffprobe call → immutable, cached `VideoInfo`
 detect_crop_ffmpeg(...)  – probe three spots with cropdetect and union boxes
 run_ffmpeg_crop(...)     – NVENC (or CPU) crop-&-re-encode
 
@@ -10,40 +11,135 @@ so the caller can pass env-driven values from `video_pipeline.config.settings`.
 
 from __future__ import annotations
 
+import functools
+import json
 import re
 import shutil
+import statistics
 import subprocess
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 # discover binaries once
 FFMPEG = shutil.which("ffmpeg") or "ffmpeg"
 FFPROBE = shutil.which("ffprobe") or "ffprobe"
 
 
-# ───────────────────────── helpers ──────────────────────────
-def _ffprobe_val(src: str, key: str) -> str:
-    return (
-        subprocess.check_output(
-            [
-                FFPROBE,
-                "-v",
-                "quiet",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                f"stream={key}",
-                "-of",
-                "csv=p=0",
-                src,
-            ],
-            text=True,
-        )
-        .strip()
-        .lower()
+# ───────────────────────── video probe ──────────────────────
+@dataclass(slots=True, frozen=True)
+class VideoInfo:
+    """Everything later stages need to know about one video stream."""
+
+    path: str
+    duration: float  # seconds (0.0 when unknown)
+    fps: float
+    frame_count: int
+    width: int
+    height: int
+    rotation: int  # clockwise degrees: 0 | 90 | 180 | 270
+    codec: str
+    keyframe_interval: Optional[float]  # median GOP length in seconds
+
+    @property
+    def display_size(self) -> Tuple[int, int]:
+        """(width, height) after applying the rotation metadata."""
+        if self.rotation in (90, 270):
+            return self.height, self.width
+        return self.width, self.height
+
+
+def _ratio(val: str | None) -> float:
+    """Parse ffprobe rationals such as '30000/1001' (0.0 on garbage)."""
+    if not val:
+        return 0.0
+    num, _, den = val.partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _rotation(stream: dict) -> int:
+    rot = stream.get("tags", {}).get("rotate")
+    for sd in stream.get("side_data_list", []):
+        if "rotation" in sd:  # display matrix: counter-clockwise, often negative
+            rot = -float(sd["rotation"])
+    try:
+        return int(round(float(rot or 0))) % 360
+    except ValueError:
+        return 0
+
+
+def _keyframe_interval(packets: list[dict]) -> Optional[float]:
+    kts = sorted(
+        float(p["pts_time"])
+        for p in packets
+        if "K" in p.get("flags", "") and p.get("pts_time") not in (None, "N/A")
+    )
+    gaps = [b - a for a, b in zip(kts, kts[1:]) if b > a]
+    return statistics.median(gaps) if gaps else None
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_cached(src: str, size: int, mtime_ns: int, gop_secs: float) -> VideoInfo:
+    # size / mtime_ns are only part of the cache key: a rewritten file re-probes
+    cmd = [
+        FFPROBE,
+        "-v",
+        "quiet",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name,width,height,r_frame_rate,avg_frame_rate,nb_frames,duration"
+        ":stream_tags=rotate:stream_side_data=rotation"
+        ":format=duration:packet=pts_time,flags",
+        "-read_intervals",
+        f"%+{gop_secs:g}",
+        "-of",
+        "json",
+        src,
+    ]
+    data = json.loads(subprocess.check_output(cmd, text=True) or "{}")
+    streams = data.get("streams") or [{}]
+    st = streams[0]
+
+    fps = _ratio(st.get("avg_frame_rate")) or _ratio(st.get("r_frame_rate"))
+    duration = _ratio(st.get("duration")) or _ratio(data.get("format", {}).get("duration"))
+    try:
+        frame_count = int(st.get("nb_frames") or 0)
+    except ValueError:
+        frame_count = 0
+    if not frame_count and duration and fps:
+        frame_count = int(round(duration * fps))
+
+    return VideoInfo(
+        path=src,
+        duration=duration,
+        fps=fps,
+        frame_count=frame_count,
+        width=int(st.get("width") or 0),
+        height=int(st.get("height") or 0),
+        rotation=_rotation(st),
+        codec=str(st.get("codec_name") or "").lower(),
+        keyframe_interval=_keyframe_interval(data.get("packets", [])),
     )
 
 
+def probe_video(src: Union[str, Path], *, gop_secs: float = 30.0) -> VideoInfo:
+    """
+    Probe duration, fps, frame count, size, rotation, codec and GOP length in
+    a single ffprobe process.
+
+    Results are memoised on (path, size, mtime) so every stage can call this
+    freely; only the first `gop_secs` of packets are read for the keyframe
+    interval (no decoding happens).
+    """
+    p = Path(src).resolve()
+    st = p.stat()
+    return _probe_cached(str(p), st.st_size, st.st_mtime_ns, gop_secs)
+
+
 # ─────────────────────── public API ─────────────────────────
 def detect_crop_ffmpeg(
     src: str,
@@ -53,6 +149,7 @@ def detect_crop_ffmpeg(
     safe_margin_px: int = 4,
     hwaccel: str = "cuda",  # "cuda" | "vaapi" | "" (CPU)
     cropdetect_params: str = "24:16:0",
+    info: VideoInfo | None = None,
 ) -> Optional[Tuple[int, int, int, int]]:
     """
     Estimate crop rectangle.
@@ -71,12 +168,14 @@ def detect_crop_ffmpeg(
         ffmpeg `-hwaccel` value; empty string disables HW accel.
     cropdetect_params : str
         Value passed to cropdetect filter, e.g. "24:16:0".
+    info : VideoInfo, optional
+        Pre-computed probe; `probe_video(src)` is used when omitted.
 
     Returns
     -------
     (x, y, w, h) or None
     """
-    dur = float(_ffprobe_val(src, "duration") or 0)
+    dur = (info or probe_video(src)).duration
     if dur == 0:
         return None
 
@@ -0,0 +1,35 @@
+"""
+Matryoshka prefix vectors
+─────────────────────────
+prefix_vector(vec, dim)  – first `dim` components, L2-normalised again
+named_vectors(vec, ...)  – {full: vec, mini: prefix} for a named-vector point
+
+jina-clip-v2 is Matryoshka-trained: the leading components of its embedding
+carry most of the signal, so a 64/128-d prefix is a usable (coarser) vector
+of its own.  Stored as a second named vector it gives a cheap first search
+stage whose candidates are re-scored with the full vector.
+
+Standard library only, so the qdrant/ scripts can import it by putting
+`core/py/pipeline` on `sys.path`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Sequence
+
+__all__ = ["prefix_vector", "named_vectors"]
+
+
+def prefix_vector(vec: Sequence[float], dim: int) -> List[float]:
+    if dim <= 0 or dim > len(vec):
+        raise ValueError(f"prefix dim {dim} outside 1..{len(vec)}")
+    head = [float(x) for x in vec[:dim]]
+    norm = math.sqrt(sum(x * x for x in head)) or 1.0
+    return [x / norm for x in head]
+
+
+def named_vectors(
+    vec: Sequence[float], *, full: str, mini: str, mini_dim: int
+) -> Dict[str, List[float]]:
+    return {full: list(vec), mini: prefix_vector(vec, mini_dim)}
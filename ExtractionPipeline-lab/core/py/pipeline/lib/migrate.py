@@ -0,0 +1,268 @@
+"""
+Streaming, resumable collection migrations
+──────────────────────────────────────────
+migrate(src_client, src, transform=...)  – copy / rewrite every point, N shards at a time
+scan(client, collection, handle_page)    – the engine underneath: pages → handler, journaled deletes
+id_shards(workers, max_int=None)         – split the point-ID space into scroll ranges
+load_checkpoint / save_checkpoint        – JSON cursor file (atomic os.replace)
+
+The ID space is cut into `workers` contiguous ranges and each range is
+scrolled by its own thread with `next_page_offset`, so at most
+`workers × page` points are held in memory whatever the collection size.
+Every page is handled (for `migrate`: `transform(record) -> PointStruct |
+None`, None = skip, then one upsert with wait=True) *before* the shard's
+next offset is written to the checkpoint; killing the process and
+re-running it resumes each shard where its last acknowledged page ended.
+
+Qdrant orders integer IDs before UUIDs and UUIDs by their 128-bit value,
+which is what the shard bounds follow.  Without `max_int` the UUID space
+is split evenly (the shared frame IDs are uuid5, i.e. uniform) and any
+integer IDs fall into the first shard.
+
+Depends on qdrant-client only, so the scripts under `qdrant/` can import
+it by putting `core/py/pipeline` on `sys.path`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from qdrant_client import QdrantClient, models
+
+from lib import write_version
+
+__all__ = ["PageHandler", "Transform", "id_shards", "load_checkpoint", "save_checkpoint", "scan", "migrate"]
+
+PointId = Union[int, str]
+Transform = Callable[[models.Record], Optional[models.PointStruct]]
+PageHandler = Callable[[List[models.Record]], Dict[str, Any]]
+
+
+def _id_key(pid: PointId) -> Tuple[int, int]:
+    return (0, pid) if isinstance(pid, int) else (1, uuid.UUID(str(pid)).int)
+
+
+def id_shards(workers: int, max_int: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    `workers` scroll ranges [start, end) covering every ID.  With `max_int`
+    the integer range 0..max_int is split instead of the UUID space (the
+    last shard then also covers any UUIDs).
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be ≥ 1, got {workers}")
+    if max_int is None:
+        bounds: List[Optional[PointId]] = [
+            str(uuid.UUID(int=i * 2**128 // workers)) for i in range(1, workers)
+        ]
+    else:
+        bounds = sorted({max(1, i * (max_int + 1) // workers) for i in range(1, workers)})
+    starts = [None, *bounds]
+    ends = [*bounds, None]
+    return [{"start": s, "end": e, "offset": s, "done": False} for s, e in zip(starts, ends)]
+
+
+def load_checkpoint(path: Optional[Path]) -> Optional[Dict[str, Any]]:
+    if path is not None and path.exists():
+        return json.loads(path.read_text())
+    return None
+
+
+def save_checkpoint(path: Optional[Path], state: Dict[str, Any]) -> None:
+    if path is None:
+        return
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+def _clip(points: List[models.Record], next_offset, end) -> Tuple[List[models.Record], Any]:
+    """Drop points at or past the shard end; the shard is done once it is reached."""
+    if end is None:
+        return points, next_offset
+    stop = _id_key(end)
+    inside = [p for p in points if _id_key(p.id) < stop]
+    if len(inside) < len(points) or (next_offset is not None and _id_key(next_offset) >= stop):
+        next_offset = None
+    return inside, next_offset
+
+
+def _retry(fn, retries: int, delay: float, **kw):
+    for attempt in range(1, retries + 1):
+        try:
+            return fn(**kw)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(delay * attempt)
+
+
+def scan(
+    client: QdrantClient,
+    collection: str,
+    handle_page: PageHandler,
+    *,
+    checkpoint: Optional[Path] = None,
+    workers: int = 4,
+    page: int = 256,
+    max_int: Optional[int] = None,
+    scroll_filter: Optional[models.Filter] = None,
+    delete_every: int = 512,
+    retries: int = 3,
+    retry_delay: float = 2.0,
+    dry_run: bool = False,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Scroll `collection` shard by shard and hand every page to `handle_page`,
+    which does its own writes and returns counters to add to the state.  A
+    `"delete"` entry (list of IDs) is journaled in `pending_deletes` and
+    removed from `collection` once `delete_every` IDs are pending (and at
+    the end), so a crash never loses a delete: the journal is flushed again
+    on the next run.  Deleting already-scanned IDs is safe – a scroll offset
+    is an ID bound, not a cursor token.
+
+    An existing checkpoint keeps its own shard layout, so `workers` /
+    `max_int` only apply to a fresh run.  Errors propagate (after `retries`
+    for scroll and delete calls); the checkpoint then still points at the
+    last page that was fully handled.
+    """
+    state = load_checkpoint(checkpoint) or {
+        **(meta or {}),
+        "shards": id_shards(workers, max_int),
+        "seen": 0,
+        "pending_deletes": [],
+        "deleted": 0,
+        "elapsed_s": 0.0,
+        "done": False,
+    }
+    if state["done"]:
+        return state
+
+    lock = threading.Lock()
+    flushing = threading.Lock()  # one delete flush at a time
+    t0 = time.perf_counter()
+    base_elapsed = state["elapsed_s"]
+    base_seen = state["seen"]
+
+    def save() -> None:
+        state["elapsed_s"] = base_elapsed + time.perf_counter() - t0
+        if not dry_run:
+            save_checkpoint(checkpoint, state)
+
+    def flush_deletes(minimum: int) -> None:
+        with flushing:
+            with lock:
+                if len(state["pending_deletes"]) < max(minimum, 1):
+                    return
+                batch = list(state["pending_deletes"])
+            if not dry_run:
+                for i in range(0, len(batch), delete_every):
+                    _retry(
+                        client.delete,
+                        retries,
+                        retry_delay,
+                        collection_name=collection,
+                        points_selector=models.PointIdsList(points=batch[i : i + delete_every]),
+                        wait=True,
+                    )
+            with lock:
+                del state["pending_deletes"][: len(batch)]  # only appended to meanwhile
+                state["deleted"] += len(batch)
+                save()
+
+    def run_shard(shard: Dict[str, Any]) -> None:
+        while not shard["done"]:
+            points, next_offset = _retry(
+                client.scroll,
+                retries,
+                retry_delay,
+                collection_name=collection,
+                scroll_filter=scroll_filter,
+                limit=page,
+                offset=shard["offset"],
+                with_payload=True,
+                with_vectors=True,
+            )
+            points, next_offset = _clip(points, next_offset, shard["end"])
+            counts = handle_page(points) if points else {}
+            with lock:
+                state["seen"] += len(points)
+                for key, value in counts.items():
+                    if key == "delete":
+                        state["pending_deletes"].extend(value)
+                    else:
+                        state[key] = state.get(key, 0) + value
+                shard["offset"] = next_offset
+                shard["done"] = next_offset is None
+                save()
+                if progress:
+                    run_s = time.perf_counter() - t0
+                    progress({**state, "pts_per_s": (state["seen"] - base_seen) / max(run_s, 1e-6)})
+            flush_deletes(delete_every)
+
+    flush_deletes(1)  # leftovers journaled by an interrupted run
+    todo = [s for s in state["shards"] if not s["done"]]
+    with ThreadPoolExecutor(max_workers=max(1, len(todo))) as pool:
+        for fut in [pool.submit(run_shard, s) for s in todo]:
+            fut.result()
+    flush_deletes(1)
+
+    state["done"] = True
+    save()
+    return state
+
+
+def migrate(
+    src_client: QdrantClient,
+    src: str,
+    *,
+    transform: Optional[Transform] = None,
+    dst_client: Optional[QdrantClient] = None,
+    dst: Optional[str] = None,
+    checkpoint: Optional[Path] = None,
+    workers: int = 4,
+    page: int = 256,
+    max_int: Optional[int] = None,
+    scroll_filter: Optional[models.Filter] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Stream `src` through `transform` into `dst` (defaults: same client, same
+    collection – an in-place rewrite).  Returns the final state: per-shard
+    cursors plus `seen` / `written` / `skipped` counters (see `scan`).
+    """
+    dst_client = dst_client or src_client
+    dst = dst or src
+    transform = transform or (lambda p: models.PointStruct(id=p.id, vector=p.vector, payload=p.payload))
+
+    def handle_page(points: List[models.Record]) -> Dict[str, int]:
+        upserts = [u for u in map(transform, points) if u is not None]
+        if upserts and not dry_run:
+            dst_client.upsert(collection_name=dst, points=upserts, wait=True)
+        return {"written": len(upserts), "skipped": len(points) - len(upserts)}
+
+    state = scan(
+        src_client,
+        src,
+        handle_page,
+        checkpoint=checkpoint,
+        workers=workers,
+        page=page,
+        max_int=max_int,
+        scroll_filter=scroll_filter,
+        dry_run=dry_run,
+        progress=progress,
+        meta={"src": src, "dst": dst, "written": 0, "skipped": 0},
+    )
+    if not dry_run:
+        write_version.bump(dst_client, dst)  # drop the search API's cached results
+    return state
@@ -0,0 +1,67 @@
+"""
+Deterministic Qdrant point IDs for video frames
+───────────────────────────────────────────────
+frame_point_id(...)         – the one ID every frame writer must use
+frame_point_id_for(payload) – same, derived from a stored frame payload
+normalize_code(...)         – strip paths / extensions from a video code
+
+A frame is identified by *(platform, video code, frame number)* only.  The
+frame timestamp is deliberately left out: it is a float that different
+writers format differently ("1.5" vs "1.50"), which is exactly how the old
+per-writer schemes ended up with duplicates.  Re-processing a video
+therefore overwrites its points instead of adding new ones.
+
+Standard library only, so the qdrant/ and api/ scripts can import it by
+putting `core/py/pipeline` on `sys.path`.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any, Mapping, Optional
+
+__all__ = [
+    "FRAME_ID_NAMESPACE",
+    "DEFAULT_PLATFORM",
+    "normalize_code",
+    "frame_point_id",
+    "frame_point_id_for",
+]
+
+# Never change: every stored frame ID is derived from it.
+FRAME_ID_NAMESPACE = uuid.UUID("6787dd79-127c-42cb-a9c5-b4b9404221a8")
+DEFAULT_PLATFORM = "instagram"
+
+
+def normalize_code(code: str) -> str:
+    """'instagram/ABC.mp4' / 'ABC.mp4' / ' ABC ' → 'ABC'."""
+    code = str(code).strip().rsplit("/", 1)[-1]
+    stem, dot, ext = code.rpartition(".")
+    return stem if dot and ext.lower() in {"mp4", "mov", "webm", "mkv"} else code
+
+
+def frame_point_id(platform: str | None, code: str, frame_number: int | str) -> str:
+    """RFC-4122 UUIDv5 string for one frame of one video."""
+    platform = (platform or DEFAULT_PLATFORM).strip().lower()
+    name = f"{platform}/{normalize_code(code)}/{int(frame_number)}"
+    return str(uuid.uuid5(FRAME_ID_NAMESPACE, name))
+
+
+def frame_point_id_for(
+    payload: Mapping[str, Any], default_platform: str = DEFAULT_PLATFORM
+) -> Optional[str]:
+    """
+    Canonical ID for a stored frame payload, or None when it lacks a video
+    code / frame number.  Understands the legacy `video` / `frame_idx` /
+    `frame` keys used by older collections.
+    """
+    code = payload.get("video_code") or payload.get("video")
+    num = payload.get("frame_number")
+    if num is None:
+        num = payload.get("frame_idx", payload.get("frame"))
+    if not code or num is None:
+        return None
+    try:
+        return frame_point_id(payload.get("platform") or default_platform, code, num)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,62 @@
+"""
+Per-collection write versions
+─────────────────────────────
+bump(client, collection)   – record that `collection` changed, return the new token
+read(client, collection)   – current token ("" if the collection was never bumped)
+
+The search API caches query results and tags every entry with the write
+version of its collection; any writer (pipeline upserts, deletes, repairs)
+bumps the version afterwards so that no API worker serves results from
+before the write.  Versions live as payload-only points in one small
+collection (`VERSIONS_COLLECTION`), one point per data collection, so every
+writer and every API process sees the same value without a side channel.
+
+A token is random rather than a counter: concurrent writers never need to
+read-modify-write, and any change of the token invalidates.
+
+Standard library + qdrant-client only, so the qdrant/ scripts can import it.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+
+from qdrant_client import QdrantClient, models
+
+__all__ = ["VERSIONS_COLLECTION", "bump", "read"]
+
+VERSIONS_COLLECTION = os.getenv("QDRANT_VERSIONS_COLLECTION", "_write_versions")
+
+
+def _point_id(collection: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"qdrant-write-version/{collection}"))
+
+
+def _ensure(client: QdrantClient, versions: str) -> None:
+    if not client.collection_exists(versions):
+        client.create_collection(collection_name=versions, vectors_config={})
+
+
+def bump(client: QdrantClient, collection: str, *, versions: str = VERSIONS_COLLECTION) -> str:
+    token = f"{time.time_ns():x}-{uuid.uuid4().hex[:8]}"
+    point = models.PointStruct(
+        id=_point_id(collection), vector={}, payload={"collection": collection, "version": token}
+    )
+    try:
+        client.upsert(collection_name=versions, points=[point], wait=True)
+    except Exception:
+        _ensure(client, versions)
+        client.upsert(collection_name=versions, points=[point], wait=True)
+    return token
+
+
+def read(client: QdrantClient, collection: str, *, versions: str = VERSIONS_COLLECTION) -> str:
+    try:
+        recs = client.retrieve(collection_name=versions, ids=[_point_id(collection)], with_payload=True)
+    except Exception:
+        if client.collection_exists(versions):
+            raise
+        return ""  # nothing was ever bumped
+    return str((recs[0].payload or {}).get("version", "")) if recs else ""
@@ -8,6 +8,7 @@ This script handles batch processing with graceful error capture and retry logic
 • After full pass, retries failed items individually (size=1) up to N times
 • Failures inside entrypoint are already captured in extraction_errors via FK
 • Resource throttling: Sequential batch processing with sleep between batches
+• Disk back-pressure: a batch is only admitted once VP_MIN_FREE_GB is free
 """
 
 from __future__ import annotations
@@ -23,6 +24,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Set
 
 from config.logging_config import configure_logging
+from src import disk_budget
 
 # Configuration
 DEFAULT_MAX_RETRIES = 3
@@ -87,8 +89,19 @@ def main():
         default=DEFAULT_SLEEP_SECONDS,
         help="Seconds to sleep between batches",
     )
+    parser.add_argument(
+        "--extract-mode",
+        choices=["scene", "keyframes", "sparse"],
+        default=None,
+        help="Scene extraction profile for every batch (default: VP_EXTRACT_MODE or 'scene'); "
+        "'keyframes' trades some recall for much faster backfills",
+    )
     args = parser.parse_args()
 
+    # entrypoint.py subprocesses inherit the profile through the environment
+    if args.extract_mode:
+        os.environ["VP_EXTRACT_MODE"] = args.extract_mode
+
     batch_size = args.batch_size
     sleep_between_batches = args.sleep
     max_retries = int(os.getenv("MAX_RETRIES", str(DEFAULT_MAX_RETRIES)))
@@ -96,7 +109,8 @@ def main():
 
     log.info(f"[main] Starting pipeline orchestrator")
     log.info(
-        f"[main] Config: batch_size={batch_size}, sleep_between_batches={sleep_between_batches}, max_retries={max_retries}"
+        f"[main] Config: batch_size={batch_size}, sleep_between_batches={sleep_between_batches}, max_retries={max_retries}, "
+        f"extract_mode={os.getenv('VP_EXTRACT_MODE', 'scene')}"
     )
 
     # Get job input
@@ -133,7 +147,11 @@ def main():
             f"[main] Processing batch {batch_idx + 1}/{len(batches)} (codes: {', '.join(batch_codes)})"
         )
 
-        exit_status = run_entrypoint_batch(batch)
+        if disk_budget.wait_for_headroom():
+            exit_status = run_entrypoint_batch(batch)
+        else:
+            log.warning(f"[main] ⏸️ Batch {batch_idx + 1} deferred: disk budget exhausted")
+            exit_status = 1
 
         if exit_status == 0:
             log.info(f"[main] ✅ Batch {batch_idx + 1} completed successfully")
@@ -180,7 +198,10 @@ def main():
                     f"[main] Retry batch {retry_batch_idx + 1}/{len(retry_batches)} (codes: {', '.join(retry_codes)})"
                 )
 
-                exit_status = run_entrypoint_batch(retry_batch)
+                if disk_budget.wait_for_headroom():
+                    exit_status = run_entrypoint_batch(retry_batch)
+                else:
+                    exit_status = 1
 
                 if exit_status == 0:
                     log.info(f"[main] ✅ Retry batch succeeded - removing from retry set")
@@ -19,7 +19,7 @@ from typing import Iterable, List, Optional
 from config.env_config import settings
 from config.logging_config import configure_logging
 from config.profiler import profile
-from lib.ffmpeg_utils import detect_crop_ffmpeg, run_ffmpeg_crop
+from lib.ffmpeg_utils import VideoInfo, detect_crop_ffmpeg, run_ffmpeg_crop
 
 log = configure_logging()
 __all__ = ["crop_video", "batch_crop"]
@@ -39,11 +39,12 @@ def _copy(src: Path, dst: Path) -> None:
 
 # ─────────────────────── public API ──────────────────────
 @profile
-def crop_video(src: Path, dst: Path | None = None) -> Path:
+def crop_video(src: Path, dst: Path | None = None, *, info: VideoInfo | None = None) -> Path:
     """
     Detect crop rectangle and re-encode one video.
 
     • If detection fails, the original file is copied 1-to-1.
+    • `info` re-uses an existing `probe_video(src)` result.
     • Returns the path that now contains the processed clip.
     """
     dst = _dst_for(src) if dst is None else dst
@@ -59,6 +60,7 @@ def crop_video(src: Path, dst: Path | None = None) -> Path:
         safe_margin_px=settings.crop_safe_margin,
         hwaccel=settings.crop_hwaccel,
         cropdetect_params=settings.crop_detect_args,
+        info=info,
     )
 
     # 2) act on result ---------------------------------------------
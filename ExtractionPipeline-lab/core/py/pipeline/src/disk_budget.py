@@ -0,0 +1,196 @@
+"""
+Frame retention & disk budget
+─────────────────────────────
+Extracted PNGs are only needed until they are safely in S3 *and* their
+vectors are in Qdrant.  Each stage drops a marker file inside the frame
+directory once its side is confirmed; whoever confirms last reclaims it.
+
+    <frames_dir>/<code>/.uploading   – pid of an in-flight async uploader
+    <frames_dir>/<code>/.uploaded    – every PNG is in S3
+    <frames_dir>/<code>/.upserted    – every vector is in Qdrant (or its spool)
+
+Markers live on disk (not in memory) so a later `entrypoint.py` process can
+sweep directories left behind by a crashed or killed one.
+
+Public API
+──────────
+* `mark_uploading(frame_dir)` / `release_upload(frame_dir, ok=...)`
+* `mark_uploaded(frame_dir)` / `mark_upserted(frame_dir)`
+* `reclaim(frame_dir) -> int`             – bytes freed (0 if not yet safe)
+* `sweep(root=None) -> int`               – reclaim every confirmed dir
+* `free_bytes() -> int`                   – min free space of frames/tmp fs
+* `wait_for_headroom(...) -> bool`        – back-pressure for orchestrators
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+from config.env_config import settings
+from config.logging_config import configure_logging
+
+log = configure_logging()
+__all__ = [
+    "mark_uploading",
+    "release_upload",
+    "mark_uploaded",
+    "mark_upserted",
+    "reclaim",
+    "sweep",
+    "free_bytes",
+    "wait_for_headroom",
+]
+
+_UPLOADING = ".uploading"
+_UPLOADED = ".uploaded"
+_UPSERTED = ".upserted"
+_GIB = 1024**3
+
+
+# ───────────────────────── marker helpers ──────────────────────────
+def _touch(frame_dir: Path, name: str, text: str = "") -> None:
+    if not frame_dir.is_dir():
+        return
+    try:
+        (frame_dir / name).write_text(text)
+    except OSError as e:  # disk full is exactly when we end up here
+        log.warning(f"[disk] could not write {name} in {frame_dir}: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by someone else
+        return True
+    return True
+
+
+def _upload_in_flight(frame_dir: Path) -> bool:
+    """True while a live process still streams this directory to S3."""
+    lock = frame_dir / _UPLOADING
+    try:
+        pid = int(lock.read_text().strip() or 0)
+    except (OSError, ValueError):
+        return False
+    return pid > 0 and _pid_alive(pid)
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for p in path.rglob("*"):
+        try:
+            if p.is_file():
+                total += p.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def mark_uploading(frame_dir: Path) -> None:
+    """Flag `frame_dir` as being read by an async uploader in this process."""
+    _touch(frame_dir, _UPLOADING, str(os.getpid()))
+
+
+def release_upload(frame_dir: Path, *, ok: bool) -> int:
+    """
+    Drop the async uploader lock; when `ok`, every frame made it to S3.
+
+    Returns bytes reclaimed (another stage may already have confirmed).
+    """
+    if ok:
+        _touch(frame_dir, _UPLOADED)
+    (frame_dir / _UPLOADING).unlink(missing_ok=True)
+    return reclaim(frame_dir)
+
+
+def mark_uploaded(frame_dir: Path) -> int:
+    """Record that every frame in `frame_dir` is in S3; maybe reclaim."""
+    _touch(frame_dir, _UPLOADED)
+    return reclaim(frame_dir)
+
+
+def mark_upserted(frame_dir: Path) -> int:
+    """Record that every vector for `frame_dir` is in Qdrant or durably spooled."""
+    _touch(frame_dir, _UPSERTED)
+    return reclaim(frame_dir)
+
+
+# ───────────────────────── reclamation ─────────────────────────────
+def reclaim(frame_dir: Path) -> int:
+    """
+    Delete `frame_dir` iff upload *and* upsert are confirmed and no uploader
+    is still reading it.  Returns the number of bytes freed.
+    """
+    if not settings.reclaim_frames or not frame_dir.is_dir():
+        return 0
+    if not ((frame_dir / _UPLOADED).exists() and (frame_dir / _UPSERTED).exists()):
+        return 0
+    if _upload_in_flight(frame_dir):
+        return 0
+
+    freed = _dir_size(frame_dir)
+    shutil.rmtree(frame_dir, ignore_errors=True)
+    log.debug(f"🧹 [disk] reclaimed {frame_dir.name} ({freed / 1_048_576:.1f} MiB)")
+    return freed
+
+
+def sweep(root: Path | None = None) -> int:
+    """Reclaim every confirmed frame directory under `root`; returns bytes freed."""
+    root = root or settings.frames_dir
+    if not root.is_dir():
+        return 0
+    freed = sum(reclaim(d) for d in root.iterdir() if d.is_dir())
+    if freed:
+        log.info(f"🧹 [disk] sweep reclaimed {freed / 1_048_576:.1f} MiB under {root}")
+    return freed
+
+
+# ───────────────────────── back-pressure ───────────────────────────
+def free_bytes() -> int:
+    """Free bytes on the tightest filesystem holding frames or cropped clips."""
+    return min(shutil.disk_usage(p).free for p in (settings.frames_dir, settings.tmp_dir))
+
+
+def wait_for_headroom(
+    *,
+    min_free_gb: float | None = None,
+    poll_secs: float | None = None,
+    timeout: float | None = None,
+) -> bool:
+    """
+    Block admission of new work until `min_free_gb` is available.
+
+    Confirmed frame directories are swept before each wait so a backlog of
+    finished uploads frees space first.  Returns False once `timeout`
+    seconds pass without enough headroom; the caller decides what to do.
+    """
+    min_free = (settings.min_free_gb if min_free_gb is None else min_free_gb) * _GIB
+    poll_secs = settings.disk_poll_secs if poll_secs is None else poll_secs
+    timeout = settings.disk_wait_timeout if timeout is None else timeout
+    if min_free <= 0:
+        return True
+
+    deadline = time.monotonic() + timeout
+    while True:
+        if free_bytes() >= min_free:
+            return True
+        sweep()
+        free = free_bytes()
+        if free >= min_free:
+            return True
+        if time.monotonic() >= deadline:
+            log.error(
+                f"❌ [disk] still {free / _GIB:.2f} GiB free after {timeout:.0f}s "
+                f"(need {min_free / _GIB:.2f} GiB)"
+            )
+            return False
+        log.warning(
+            f"⏸️ [disk] {free / _GIB:.2f} GiB free < {min_free / _GIB:.2f} GiB – "
+            f"pausing admission for {poll_secs:.0f}s"
+        )
+        time.sleep(poll_secs)
@@ -1,22 +1,25 @@
 from __future__ import annotations
 
-import hashlib
 import math
 import re
 import time
-import uuid
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import src.border_cropping as border_cropping
 import src.deduplicate_frames as deduplicate_frames
 import src.infer_embeds as infer_embeds
+import src.reindex as reindex
 import src.scene_framing as scene_framing
 import src.store_embeds as store_embeds
 import src.upload_frames as upload_frames
+import src.upsert_spool as upsert_spool
 from config.env_config import settings
 from config.logging_config import configure_logging
 from config.profiler import profile
+from lib.ffmpeg_utils import probe_video
+from lib.point_ids import frame_point_id
 
 log = configure_logging()
 _FRAME_RE = re.compile(r"^(?P<idx>\d+)_(?P<sec>\d+\.\d+)\.png$")
@@ -27,7 +30,14 @@ class VideoPipeline:
 
     # ─────────────────── orchestrator ────────────────────
     @profile
-    def run(self, video: Path) -> None:
+    def run(self, video: Path, *, extract_mode: str | None = None) -> int:
+        """
+        Returns the number of frames kept.  `extract_mode` overrides
+        settings.extract_mode for this video.
+
+        The frame dir is left in place: the caller marks it upserted (and so
+        reclaimable) once its own upload and status write are done.
+        """
         t0 = time.perf_counter()
         log.info(f"[vid] ▶ {video.name}")
 
@@ -56,12 +66,15 @@ class VideoPipeline:
             step_emoji = step_emojis[step_num - 1] if step_num <= len(step_emojis) else "🔢"
             log.info(f"{step_emoji} ⏭️ {step_name} skipped ({progress_pct:.0f}%){reason_str}")
 
+        # one ffprobe for the whole run – shared by crop / scene / fallback
+        info = probe_video(video)
+
         # ---------- Phase 1: crop (optional) ----------
         current_step += 1
         if settings.crop_enabled:
             log_step_start("border cropping", current_step)
             work_clip = settings.tmp_dir / video.name
-            border_cropping.crop_video(video, work_clip)
+            border_cropping.crop_video(video, work_clip, info=info)
             log_step_success("border cropping", current_step)
         else:
             log_step_skip("border cropping", current_step, "VP_ENABLE_CROP=0")
@@ -71,11 +84,11 @@ class VideoPipeline:
         current_step += 1
         log_step_start("scene extraction", current_step)
         frame_dir = settings.frames_dir / video.stem
-        frames = scene_framing.extract_frames(work_clip, frame_dir)
+        frames = scene_framing.extract_frames(work_clip, frame_dir, info=info, mode=extract_mode)
 
         if not frames:
             log.warning(f"⚠️ [vid] {video.name}: 0 candidate frames – skipping")
-            return
+            return 0
         log_step_success("scene extraction", current_step, f"{len(frames)} frames")
 
         # ---------- Phase 3: deduplicate (optional) ----------
@@ -89,7 +102,7 @@ class VideoPipeline:
 
         if not frames:
             log.warning(f"⚠️ [vid] {video.name}: 0 frames after dedup – skipping")
-            return
+            return 0
 
         # ─── kick-off asynchronous S3 upload ───
         current_step += 1
@@ -104,18 +117,44 @@ class VideoPipeline:
 
         # ---------- Phase 4: CLIP embeddings (sequential batches) ----------
         current_step += 1
-        log_step_start("CLIP embeddings", current_step, f"{len(frames)} frames")
-        vectors = self._encode_frames_in_batches(frames)
-        log_step_success("CLIP embeddings", current_step, f"{len(vectors)} vectors")
+        to_embed, hashes, stale = frames, None, []
+        if settings.incremental_reindex:
+            diff = reindex.plan(video.stem, self._frame_ids(video, frames))
+            to_embed, hashes, stale = list(diff.changed.values()), diff.hashes, diff.vanished
+
+        stored = True
+        if to_embed:
+            log_step_start("CLIP embeddings", current_step, f"{len(to_embed)} frames")
+            vectors = self._encode_frames_in_batches(to_embed)
+            log_step_success("CLIP embeddings", current_step, f"{len(vectors)} vectors")
+
+            # ---------- Phase 5: Qdrant upsert ----------
+            current_step += 1
+            log_step_start("Qdrant upsert", current_step, f"{len(vectors)} vectors")
+            points = self._make_points(video, to_embed, vectors, hashes=hashes)
+            if settings.spool_upserts:
+                # vectors hit the local spool first; a Qdrant outage leaves them there
+                stored = upsert_spool.upsert(points)
+            else:
+                store_embeds.upsert_embeddings(points)
+            log_step_success(
+                "Qdrant upsert", current_step, f"{len(vectors)} vectors {'stored' if stored else 'spooled'}"
+            )
+        else:
+            log_step_skip("CLIP embeddings", current_step, "all frames unchanged")
+            current_step += 1
+            log_step_skip("Qdrant upsert", current_step, "all frames unchanged")
 
-        # ---------- Phase 5: Qdrant upsert ----------
-        current_step += 1
-        log_step_start("Qdrant upsert", current_step, f"{len(vectors)} vectors")
-        store_embeds.upsert_embeddings(self._make_points(video, frames, vectors))
-        log_step_success("Qdrant upsert", current_step, f"{len(vectors)} vectors stored")
+        # stale points go only once the new ones are in (spooled ones may not be yet)
+        if stale and stored:
+            try:
+                store_embeds.delete_points(stale)
+            except Exception as e:
+                log.warning(f"⚠️ [reindex] {video.stem}: could not delete {len(stale)} stale pts: {e}")
 
         duration = time.perf_counter() - t0
         log.info(f"[vid] ✅ {video.name} done in {duration:.1f}s  " f"(frames={len(frames)})")
+        return len(frames)
 
     # ─────────────────── resource throttling helpers ─────────────────────────
     def _encode_frames_in_batches(
@@ -177,14 +216,28 @@ class VideoPipeline:
         return all_vectors
 
     # ─────────────────── helper ─────────────────────────
+    def _frame_ids(
+        self, video: Path, frames: List[Path], platform: str = "instagram"
+    ) -> Dict[str, Path]:
+        """Point id → frame path, for frames that follow `<idx>_<sec>.png`."""
+        ids = {}
+        for fp in frames:
+            m = _FRAME_RE.match(fp.name)
+            if m:
+                ids[frame_point_id(platform, video.stem, int(m["idx"]))] = fp
+        return ids
+
     def _make_points(
         self,
         video: Path,
         frames: List[Path],
         vectors: List[List[float]],
         platform: str = "instagram",
+        *,
+        hashes: Dict[str, str] | None = None,
     ) -> List[dict]:
-        """Prepare Qdrant points with deterministic SHA-1 IDs."""
+        """Prepare Qdrant points keyed by `lib.point_ids.frame_point_id`."""
+        created_at = datetime.now(tz=timezone.utc).isoformat(timespec="seconds")
         items = []
         for fp, vec in zip(frames, vectors, strict=True):
             m = _FRAME_RE.match(fp.name)
@@ -192,8 +245,7 @@ class VideoPipeline:
                 continue
             idx = int(m["idx"])
             sec = float(m["sec"])
-            sha = hashlib.sha1(f"{video.stem}:{idx}".encode()).hexdigest()
-            point_id = str(uuid.UUID(sha[:32]))  # RFC-4122, deterministic
+            point_id = frame_point_id(platform, video.stem, idx)
             items.append(
                 {
                     "id": point_id,
@@ -203,7 +255,9 @@ class VideoPipeline:
                         "video_code": video.stem,
                         "frame_number": idx,
                         "frame_second": sec,
+                        "created_at": created_at,
                         "path": f"{settings.s3_frames_bucket}/{str(fp.relative_to(settings.frames_dir))}",
+                        "content_hash": (hashes or {}).get(point_id) or reindex.content_hash(fp),
                     },
                 }
             )
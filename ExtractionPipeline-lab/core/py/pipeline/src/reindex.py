@@ -0,0 +1,78 @@
+"""
+Phase 4a – Incremental re-index
+───────────────────────────────
+Re-running a video with other thresholds used to upsert the new frames and
+leave the previous run's extra points behind.  With a content hash stored in
+every payload, one filtered scroll over the video's points is enough to
+split the new frames into
+
+    unchanged – same id, same hash  → skip embedding *and* upsert
+    changed   – new id or new hash  → embed + upsert
+    vanished  – stored id not produced by this run → delete
+
+The hash covers the PNG bytes and its file name, so a frame that moved in
+time (same image, new timestamp) is rewritten too.
+
+Public API
+──────────
+* `content_hash(frame: Path) -> str`
+* `plan(video_code, frames_by_id) -> ReindexPlan`
+* `ReindexPlan.changed / .hashes / .vanished / .unchanged`
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from config.logging_config import configure_logging
+from config.profiler import profile
+from src import store_embeds
+
+log = configure_logging()
+__all__ = ["ReindexPlan", "content_hash", "plan"]
+
+
+@dataclass(slots=True)
+class ReindexPlan:
+    changed: Dict[str, Path]  # point id → frame that must be (re-)embedded
+    hashes: Dict[str, str]  # point id → content hash, for every current frame
+    vanished: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def content_hash(frame: Path) -> str:
+    h = hashlib.blake2b(frame.name.encode(), digest_size=16)
+    h.update(frame.read_bytes())
+    return h.hexdigest()
+
+
+@profile
+def plan(video_code: str, frames_by_id: Dict[str, Path]) -> ReindexPlan:
+    """
+    Diff this run's frames against what Qdrant holds for `video_code`.
+
+    If the stored points cannot be listed (Qdrant down) every frame counts
+    as changed and nothing is deleted – i.e. a plain full upsert.
+    """
+    hashes = {pid: content_hash(fp) for pid, fp in frames_by_id.items()}
+    try:
+        stored = store_embeds.existing_hashes(video_code)
+    except Exception as e:
+        log.warning(f"⚠️ [reindex] {video_code}: cannot list stored points ({e}) – full upsert")
+        return ReindexPlan(changed=dict(frames_by_id), hashes=hashes)
+
+    changed = {pid: fp for pid, fp in frames_by_id.items() if stored.get(pid) != hashes[pid]}
+    result = ReindexPlan(
+        changed=changed,
+        hashes=hashes,
+        vanished=sorted(pid for pid in stored if pid not in frames_by_id),
+        unchanged=len(frames_by_id) - len(changed),
+    )
+    log.info(
+        f"🔁 [reindex] {video_code}: {len(changed)} new/changed, "
+        f"{result.unchanged} unchanged, {len(result.vanished)} stale of {len(stored)} stored"
+    )
+    return result
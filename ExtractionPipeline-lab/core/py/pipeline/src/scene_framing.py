@@ -2,20 +2,33 @@
 Phase 2 – Scene-frame extraction
 ────────────────────────────────
 1. Use `ffmpeg` scene-change detection to grab candidate key-frames.
+   `mode` picks how much is decoded to score scene changes:
+     • "scene"      – every frame at full resolution (best recall)
+     • "keyframes"  – key-frames only, downscaled (bulk backfills)
+     • "sparse"     – every Nth frame, downscaled
+   The fast modes only decode the chosen timestamps at full resolution.
+   With a frame budget (VP_MIN/MAX_FRAMES_PER_MIN) the threshold adapts per
+   clip from the same single scoring pass, so cost per minute is bounded.
 2. Remove obvious black / solid-colour / letter-boxed frames.
-3. Guarantee ≥ settings.min_frames by falling back to uniform sampling.
+3. Guarantee ≥ settings.min_frames by falling back to uniform sampling
+   (one forward decode pass on long-GOP clips instead of per-candidate seeks).
 4. Crop inner borders per frame.
 5. Save cleaned PNGs in chronological order: `1_<sec>.png`, `2_<sec>.png`, …
 
 Public API
 ──────────
-* `extract_frames(video: Path, outdir: Path | None = None) -> list[Path]`
+* `extract_frames(video: Path, outdir: Path | None = None, *, info=None, mode=None) -> list[Path]`
+* `EXTRACT_MODES` – valid values for `mode` / `VP_EXTRACT_MODE`
+
+Timing (fps / frame count) comes from `lib.ffmpeg_utils.probe_video`, so a
+`VideoInfo` probed earlier in the pipeline is reused instead of re-opened.
 
 Returns the list of written frame paths (chronological order).
 """
 
 from __future__ import annotations
 
+import math
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
 
@@ -24,9 +37,12 @@ import numpy as np
 from config.env_config import settings
 from config.logging_config import configure_logging
 from config.profiler import profile
+from lib.ffmpeg_utils import VideoInfo, probe_video
 
 log = configure_logging()
-__all__ = ["extract_frames"]
+__all__ = ["extract_frames", "EXTRACT_MODES"]
+
+EXTRACT_MODES = ("scene", "keyframes", "sparse")
 
 
 # ────────────────────────── non-informational checks ───────────────────
@@ -128,6 +144,253 @@ def _ffmpeg_scene_frames(src: str, tmp: Path, thresh: float) -> List[Path]:
     return sorted(tmp.glob("*.png"), key=lambda p: int(p.stem))
 
 
+@profile
+def _ffmpeg_scene_scores(
+    src: str, *, keyframes_only: bool, every_n: int, width: int
+) -> List[Tuple[float, float]]:
+    """
+    Score scene changes on a cheap, downscaled decode (`width=0` keeps the
+    native size); returns (pts_time, score) for every frame that reached the
+    scene filter.  Nothing is written to disk – scores come back through
+    `metadata=print` on stdout.
+    """
+    import subprocess
+    from shutil import which
+
+    ffmpeg = which("ffmpeg") or "ffmpeg"
+
+    filters = []
+    if every_n > 1:
+        filters.append(f"select='not(mod(n\\,{every_n}))'")
+    if width > 0:
+        filters.append(f"scale={width}:-2")
+    filters += [
+        "select='gte(scene\\,0)'",
+        "metadata=print:key=lavfi.scene_score:file=-",
+    ]
+
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-nostats"]
+    if keyframes_only:
+        cmd += ["-skip_frame", "nokey"]  # decoder drops everything else
+    cmd += ["-i", src, "-an", "-sn", "-vf", ",".join(filters), "-f", "null", "-"]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+
+    scores: List[Tuple[float, float]] = []
+    ts: Optional[float] = None
+    for line in out.splitlines():
+        if "pts_time:" in line:
+            try:
+                ts = float(line.rsplit("pts_time:", 1)[1].split()[0])
+            except (IndexError, ValueError):
+                ts = None
+        elif line.startswith("lavfi.scene_score=") and ts is not None:
+            scores.append((ts, float(line.split("=", 1)[1])))
+            ts = None
+    return scores
+
+
+# ───────────────────────── uniform fallback sampler ─────────────────────
+def _sample_slots(need: int, total_frames: int, fps: float, spares: int) -> List[List[int]]:
+    """
+    `need` evenly spaced slots, each a primary frame index plus `spares`
+    alternates further into the slot (used when the primary is blank).
+    Unknown length → one slot per second from the start.
+    """
+    if total_frames > 0:
+        width = total_frames / (need + 1)
+        starts = [round((k + 1) * width) for k in range(need)]
+    else:
+        width = max(1.0, fps)
+        starts = [round(k * width) for k in range(need)]
+    hop = max(1, int(width // (spares + 1)))
+
+    slots = []
+    for start in starts:
+        idxs = [start + j * hop for j in range(spares + 1)]
+        if total_frames > 0:
+            idxs = [i for i in idxs if i < total_frames]
+        slots.append(idxs)
+    return slots
+
+
+def _frame_ts(idx: int, fps: float) -> float:
+    return idx / fps if fps > 0 else float(idx)
+
+
+def _informative(frame: np.ndarray | None) -> bool:
+    return frame is not None and not (_is_solid_color(frame) or _is_mono(frame))
+
+
+def _pass_sample(video: Path, slots: List[List[int]], fps: float) -> List[Tuple[float, np.ndarray]]:
+    """
+    One forward decode: every frame is decoded at most once, only wanted ones
+    are converted (`grab` vs `retrieve`) and reading stops after the last
+    wanted index.
+    """
+    wanted: dict[int, int] = {}  # frame index → slot
+    for slot, idxs in enumerate(slots):
+        for i in idxs:
+            wanted.setdefault(i, slot)
+    if not wanted:
+        return []
+
+    last = max(wanted)
+    filled: set[int] = set()
+    out: List[Tuple[float, np.ndarray]] = []
+    cap = cv2.VideoCapture(str(video))
+    try:
+        idx = 0
+        while idx <= last and len(filled) < len(slots):
+            if not cap.grab():
+                break
+            slot = wanted.get(idx)
+            if slot is not None and slot not in filled:
+                ok, frame = cap.retrieve()
+                if ok and _informative(frame):
+                    out.append((_frame_ts(idx, fps), frame))
+                    filled.add(slot)
+            idx += 1
+    finally:
+        cap.release()
+    return out
+
+
+def _seek_sample(video: Path, slots: List[List[int]], fps: float) -> List[Tuple[float, np.ndarray]]:
+    """One seek per tried index – cheap only while GOPs are short."""
+    out: List[Tuple[float, np.ndarray]] = []
+    cap = cv2.VideoCapture(str(video))
+    try:
+        for idxs in slots:
+            for idx in idxs:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+                ok, frame = cap.read()
+                if ok and _informative(frame):
+                    out.append((_frame_ts(idx, fps), frame))
+                    break
+    finally:
+        cap.release()
+    return out
+
+
+# A CAP_PROP_POS_FRAMES seek costs roughly half a GOP of decoding plus a fixed
+# demuxer/flush overhead worth ~30 frames (see test/bench_fallback_sampler.py).
+_SEEK_OVERHEAD_FRAMES = 30
+
+
+def _read_slots(
+    video: Path, slots: List[List[int]], fps: float, keyframe_interval: float | None
+) -> List[Tuple[float, np.ndarray]]:
+    """
+    Seeking decodes from the previous key-frame for every candidate
+    (≈ candidates × GOP), so long-GOP clips are read in a single forward
+    pass instead.  Short-GOP clips keep the cheaper seeks; with no known
+    GOP the single pass is used because its cost is bounded by clip length.
+    """
+    last = max((idxs[-1] for idxs in slots if idxs), default=0)
+    if keyframe_interval and fps > 0:
+        gop_frames = keyframe_interval * fps
+        seek_cost = len(slots) * (gop_frames / 2 + _SEEK_OVERHEAD_FRAMES)
+        if seek_cost < last + 1:
+            log.debug(f"[extract] {len(slots)} seeks (GOP={gop_frames:.0f} frames)")
+            return _seek_sample(video, slots, fps)
+
+    log.debug(f"[extract] single pass over ≤{last + 1} frames")
+    return _pass_sample(video, slots, fps)
+
+
+@profile
+def _uniform_sample(
+    video: Path,
+    need: int,
+    total_frames: int,
+    fps: float,
+    *,
+    keyframe_interval: float | None = None,
+    spares: int = 4,
+) -> List[Tuple[float, np.ndarray]]:
+    """Gather up to `need` informative frames, evenly spaced over the clip."""
+    slots = _sample_slots(need, total_frames, fps, spares)
+    if not slots:
+        return []
+    return _read_slots(video, slots, fps, keyframe_interval)
+
+
+# ───────────────────────── score-based candidates ───────────────────────
+def _frame_budget(info: VideoInfo) -> Tuple[int, int]:
+    """
+    (lo, hi) candidate count for this clip from the per-minute budget;
+    0 means unbounded on that side.  `min_frames` always fits under `hi`.
+    """
+    duration = info.duration or (info.frame_count / info.fps if info.fps else 0.0)
+    minutes = duration / 60
+    lo = math.ceil(settings.min_frames_per_min * minutes) if settings.min_frames_per_min > 0 else 0
+    hi = 0
+    if settings.max_frames_per_min > 0:
+        hi = max(lo, settings.min_frames, math.ceil(settings.max_frames_per_min * minutes))
+    return lo, hi
+
+
+def _budget_pick(
+    scores: List[Tuple[float, float]], thresh: float, lo: int, hi: int
+) -> Tuple[List[float], float]:
+    """
+    Pick timestamps from one pass of scene scores.
+
+    Everything above `thresh` is kept unless that breaks the budget: over
+    `hi` only the `hi` strongest cuts survive, under `lo` the next
+    strongest (non-zero) changes are promoted.  Returns the picked
+    timestamps and the effective threshold they imply.
+    """
+    ranked = sorted((sc for sc in scores if sc[1] > 0), key=lambda sc: sc[1], reverse=True)
+    over = sum(1 for _, score in ranked if score > thresh)
+    n = over
+    if hi and n > hi:
+        n = hi
+    elif lo and n < lo:
+        n = min(lo, len(ranked))
+    eff_thresh = thresh if n == over or n == 0 else ranked[n - 1][1]
+    return [ts for ts, _ in ranked[:n]], eff_thresh
+
+
+@profile
+def _scored_candidates(
+    video: Path, info: VideoInfo, mode: str, thresh: float
+) -> List[Tuple[float, np.ndarray]]:
+    """
+    Score scene changes without writing frames, choose the cut-off against
+    the frame budget, then decode only the winners at full resolution.
+
+    "keyframes" / "sparse" score a cheap, downscaled subset of frames;
+    "scene" lands here only when a frame budget is set and scores every
+    frame at native size so `thresh` keeps its usual meaning.
+    """
+    keyframes_only = mode == "keyframes"
+    scores = _ffmpeg_scene_scores(
+        str(video),
+        keyframes_only=keyframes_only,
+        every_n=settings.sparse_every_n if mode == "sparse" else 1,
+        width=0 if mode == "scene" else settings.score_width,
+    )
+    lo, hi = _frame_budget(info)
+    picked_ts, eff_thresh = _budget_pick(scores, thresh, lo, hi)
+    if eff_thresh != thresh:
+        log.info(
+            f"🎯 [extract] {video.name}: budget {lo}-{hi or '∞'} frames → "
+            f"threshold {thresh:.3f} ➜ {eff_thresh:.3f}"
+        )
+    fps = info.fps or 25.0
+    picked = sorted({round(ts * fps) for ts in picked_ts})
+    log.debug(f"[extract] {mode}: {len(picked)}/{len(scores)} scored frames kept")
+    if not picked:
+        return []
+
+    slots = [[idx] for idx in picked]
+    if keyframes_only:
+        # every target *is* a key-frame, so each seek decodes exactly one frame
+        return _seek_sample(video, slots, fps)
+    return _read_slots(video, slots, fps, info.keyframe_interval)
+
+
 # ───────────────────────── frame save helper ────────────────────────────
 def _process_and_save(img: np.ndarray, outdir: Path, ts: float, seq_idx: int) -> bool:
     """
@@ -166,15 +429,24 @@ def extract_frames(
     outdir: Path | None = None,
     min_frames: int | None = None,
     scene_thresh: float | None = None,
+    *,
+    info: VideoInfo | None = None,
+    mode: str | None = None,
 ) -> List[Path]:
     """
     Extract cleaned, chronological PNG frames for *one* video.
 
     • `outdir` defaults to settings.frames_dir / <video-stem>
+    • `info` is the cached probe of the *source* clip; cropping keeps the
+      timeline intact, so it is valid for the cropped work clip too.
+    • `mode` is one of EXTRACT_MODES (defaults to settings.extract_mode).
     • Returns list of written frame paths.
     """
     min_frames = min_frames or settings.min_frames
     scene_thresh = scene_thresh or settings.scene_thresh
+    mode = mode or settings.extract_mode
+    if mode not in EXTRACT_MODES:
+        raise ValueError(f"unknown extract mode {mode!r} (expected one of {EXTRACT_MODES})")
 
     outdir = outdir or (settings.frames_dir / video.stem)
     outdir.mkdir(parents=True, exist_ok=True)
@@ -184,25 +456,30 @@ def extract_frames(
     )
 
     # ------------------------------------------------------------------ #
-    # 1) initial candidate frames via ffmpeg scene detection             #
+    # 1) FPS / total frame probe                                         #
     # ------------------------------------------------------------------ #
-    log.debug(f"🔍 [extract] Initiating ffmpeg scene detection with threshold={scene_thresh}.")
-    tmp_scene = outdir / "_scene_tmp"
-    scene_paths = _ffmpeg_scene_frames(str(video), tmp_scene, scene_thresh)
-    log.debug(f"✅ [extract] ffmpeg identified {len(scene_paths)} potential scene changes.")
+    info = info or probe_video(video)
+    fps = info.fps or 25.0
+    total_frames = info.frame_count
 
     # ------------------------------------------------------------------ #
-    # 2) FPS / total frame probe                                         #
+    # 2) candidate frames via ffmpeg scene detection                     #
     # ------------------------------------------------------------------ #
-    cap_probe = cv2.VideoCapture(str(video))
-    fps = cap_probe.get(cv2.CAP_PROP_FPS) or 25.0
-    total_frames = int(cap_probe.get(cv2.CAP_PROP_FRAME_COUNT))
-    cap_probe.release()
+    log.debug(f"🔍 [extract] ffmpeg scene detection mode={mode} threshold={scene_thresh}.")
+    tmp_scene = outdir / "_scene_tmp"
+    candidates: List[Tuple[float, np.ndarray]] = []
+    budgeted = settings.min_frames_per_min > 0 or settings.max_frames_per_min > 0
+    if mode == "scene" and not budgeted:
+        scene_paths = _ffmpeg_scene_frames(str(video), tmp_scene, scene_thresh)
+        log.debug(f"✅ [extract] ffmpeg identified {len(scene_paths)} potential scene changes.")
+    else:
+        scene_paths = []
+        candidates = _scored_candidates(video, info, mode, scene_thresh)
+        log.debug(f"✅ [extract] {mode} scoring kept {len(candidates)} candidates.")
 
     # ------------------------------------------------------------------ #
     # 3) collect candidates (timestamp, image)                           #
     # ------------------------------------------------------------------ #
-    candidates: List[Tuple[float, np.ndarray]] = []
     for p in scene_paths:
         idx_raw = p.stem
         try:
@@ -220,23 +497,11 @@ def extract_frames(
     # ------------------------------------------------------------------ #
     if len(candidates) < min_frames:
         need = min_frames - len(candidates)
-        step = max(1, total_frames // (need + 1)) if total_frames else 1
-        cap = cv2.VideoCapture(str(video))
-        added = 0
-        attempts = 0
-        while added < need and attempts < need * 5:
-            pos = (attempts * step) % total_frames if total_frames else attempts
-            cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
-            ok, frame = cap.read()
-            attempts += 1
-            if not ok:
-                break
-            ts = pos / fps if fps > 0 else float(pos)
-            if _is_solid_color(frame) or _is_mono(frame):
-                continue
-            candidates.append((ts, frame))
-            added += 1
-        cap.release()
+        candidates.extend(
+            _uniform_sample(
+                video, need, total_frames, fps, keyframe_interval=info.keyframe_interval
+            )
+        )
 
     # ------------------------------------------------------------------ #
     # 5) chronological sort & save                                       #
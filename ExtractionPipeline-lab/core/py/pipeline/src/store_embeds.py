@@ -3,7 +3,26 @@ Phase 5 – Vector storage in Qdrant
 ──────────────────────────────────
 Public helpers
 ──────────────
-* `upsert_embeddings(items: list[dict])`
+* `upsert_embeddings(items: list[dict], *, batch=None, parallel=None)`
+
+    Points go out in `settings.upsert_batch`-sized requests (independent of
+    the GPU batch size) with up to `settings.upsert_parallel` in flight.
+    Intermediate requests use `wait=False`; the final one is sent with
+    `wait=True` only after every other request was acknowledged, so it is
+    the single consistency barrier for the video.  Qdrant orders updates
+    per shard only, so on a collection with `shard_number > 1` (or when the
+    shard count cannot be read) every request uses `wait=True` instead.
+
+* `existing_hashes(video_code) -> dict[id, content_hash | None]`
+* `delete_points(ids)`
+
+    Both bump the collection's write version (`lib.write_version`) once the
+    write is acknowledged, so the search API drops its cached results.
+
+    With `settings.mini_dim > 0` every point is written with two named
+    vectors: `settings.full_vector` (the full embedding) and
+    `settings.mini_vector` (its re-normalised Matryoshka prefix, see
+    `lib.matryoshka`).  Callers keep passing the plain list.
 
     Each *item* must have keys:
         • "id"        – int | str
@@ -28,16 +47,20 @@ from __future__ import annotations
 
 import itertools
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, Dict, Iterable, List
 
 from config.env_config import settings
 from config.logging_config import configure_logging
 from config.profiler import profile
+from lib import write_version
+from lib.matryoshka import prefix_vector
 from qdrant_client import QdrantClient, models
 
 log = configure_logging()
 
 _QD: QdrantClient | None = None  # singleton
+_SHARDS: Dict[str, int] = {}  # collection → shard_number
 
 
 def _client() -> QdrantClient:
@@ -64,10 +87,47 @@ def _ensure_collection() -> None:
         return
 
     log.info(f"[qdrant] creating collection '{settings.collection}'")
-    cl.create_collection(
-        collection_name=settings.collection,
-        vectors_config=models.VectorParams(size=settings.dim, distance=models.Distance.COSINE),
-    )
+    full = models.VectorParams(size=settings.dim, distance=models.Distance.COSINE)
+    vectors_config: models.VectorParams | Dict[str, models.VectorParams] = full
+    if settings.mini_dim:
+        vectors_config = {
+            settings.full_vector: full,
+            settings.mini_vector: models.VectorParams(
+                size=settings.mini_dim, distance=models.Distance.COSINE
+            ),
+        }
+    cl.create_collection(collection_name=settings.collection, vectors_config=vectors_config)
+
+
+def _shard_count(cl: QdrantClient) -> int | None:
+    """`shard_number` of the target collection (cached); None if it can't be read."""
+    if settings.collection not in _SHARDS:
+        try:
+            params = cl.get_collection(settings.collection).config.params
+        except Exception as exc:
+            log.warning(f"[qdrant] shard count unknown ({exc}); waiting on every upsert")
+            return None
+        _SHARDS[settings.collection] = params.shard_number or 1
+    return _SHARDS[settings.collection]
+
+
+def _bump_version() -> None:
+    """Invalidate search-API result caches; a failure only delays that to their TTL."""
+    try:
+        write_version.bump(_client(), settings.collection, versions=settings.versions_collection)
+    except Exception as exc:
+        log.warning(f"[qdrant] write version bump failed ({exc}); cached searches expire by TTL")
+
+
+def _batch_vectors(chunk: List[Dict[str, Any]]) -> List[Any] | Dict[str, List[Any]]:
+    """Plain embeddings → the (columnar) vectors the collection layout expects."""
+    vecs = [p["vector"] for p in chunk]
+    if not settings.mini_dim:
+        return vecs
+    return {
+        settings.full_vector: vecs,
+        settings.mini_vector: [prefix_vector(v, settings.mini_dim) for v in vecs],
+    }
 
 
 def _chunks(iterable: Iterable[Any], n: int) -> Iterable[List[Any]]:
@@ -80,33 +140,105 @@ def _chunks(iterable: Iterable[Any], n: int) -> Iterable[List[Any]]:
         yield chunk
 
 
+def _send(cl: QdrantClient, chunk: List[Dict[str, Any]], *, wait_ack: bool) -> int:
+    cl.upsert(
+        collection_name=settings.collection,
+        wait=wait_ack,
+        points=models.Batch(
+            ids=[p["id"] for p in chunk],
+            vectors=_batch_vectors(chunk),
+            payloads=[p["payload"] for p in chunk],
+        ),
+    )
+    return len(chunk)
+
+
 @profile
-def upsert_embeddings(points: List[Dict[str, Any]], *, batch: int | None = None) -> None:
+def upsert_embeddings(
+    points: List[Dict[str, Any]], *, batch: int | None = None, parallel: int | None = None
+) -> None:
     """
     Upsert `points` into Qdrant.
 
     `points` must be a list of dicts with keys **id**, **vector**, **payload**.
+    Returns once every point is applied; the first failed request re-raises
+    after the requests already in flight have settled.
     """
     if not points:
         log.warning("[qdrant] no points to upsert")
         return
 
     cl = _client()
-    batch = batch or settings.batch_size
+    batch = max(1, batch or settings.upsert_batch)
+    parallel = max(1, parallel or settings.upsert_parallel)
     total = len(points)
     pushed = 0
     t0 = time.perf_counter()
 
-    for chunk in _chunks(points, batch):
-        cl.upsert(
+    chunks = list(_chunks(points, batch))
+    *head, barrier = chunks
+    if head:
+        # one barrier only covers the shards it touches
+        ordered = _shard_count(cl) == 1
+        inflight: set[Future] = set()
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="qdrant-upsert") as pool:
+            for chunk in head:
+                if len(inflight) >= parallel:
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    pushed += sum(f.result() for f in done)
+                inflight.add(pool.submit(_send, cl, chunk, wait_ack=not ordered))
+            # leaving the pool joins whatever is still in flight, even on error
+        pushed += sum(f.result() for f in inflight)
+
+    # Qdrant applies a shard's updates in order, so on a single-shard
+    # collection waiting on the last request (sent after all others were
+    # acknowledged) covers the whole video.
+    pushed += _send(cl, barrier, wait_ack=True)
+    _bump_version()
+
+    dt = time.perf_counter() - t0
+    log.info(
+        f"✅ [qdrant] upserted {pushed}/{total} pts in {dt:.2f}s "
+        f"({pushed / dt if dt else 0:.0f} pts/s, {len(chunks)} req × ≤{batch}, ≤{parallel} in flight)"
+    )
+
+
+@profile
+def existing_hashes(video_code: str, *, page: int = 1024) -> Dict[str, str | None]:
+    """
+    Point id → payload `content_hash` for every point of `video_code`
+    (None for points written before hashes were stored).  Uses the
+    `video_code` payload index; no vectors are transferred.
+    """
+    cl = _client()
+    flt = models.Filter(
+        must=[models.FieldCondition(key="video_code", match=models.MatchValue(value=video_code))]
+    )
+    found: Dict[str, str | None] = {}
+    offset = None
+    while True:
+        recs, offset = cl.scroll(
             collection_name=settings.collection,
-            wait=True,
-            points=models.Batch(
-                ids=[p["id"] for p in chunk],
-                vectors=[p["vector"] for p in chunk],
-                payloads=[p["payload"] for p in chunk],
-            ),
+            scroll_filter=flt,
+            limit=page,
+            offset=offset,
+            with_payload=["content_hash"],
+            with_vectors=False,
         )
-        pushed += len(chunk)
+        for r in recs:
+            found[str(r.id)] = (r.payload or {}).get("content_hash")
+        if offset is None:
+            return found
+
 
-    log.info(f"✅ [qdrant] upserted {pushed}/{total} pts in {time.perf_counter() - t0:.2f}s")
+def delete_points(ids: List[str]) -> None:
+    """Delete `ids` in one acknowledged request."""
+    if not ids:
+        return
+    _client().delete(
+        collection_name=settings.collection,
+        points_selector=models.PointIdsList(points=list(ids)),
+        wait=True,
+    )
+    _bump_version()
+    log.info(f"🗑️ [qdrant] deleted {len(ids)} stale pts")
@@ -26,6 +26,7 @@ from botocore import UNSIGNED
 from botocore.client import Config
 from config.env_config import settings
 from config.logging_config import configure_logging
+from src import disk_budget
 
 log = configure_logging()
 
@@ -62,7 +63,7 @@ def _get_s3():
 # ---------------------------------------------------------------------
 # Internal helper – upload a single file
 # ---------------------------------------------------------------------
-def _upload_one(p: Path, bucket: str, key_prefix: str) -> None:
+def _upload_one(p: Path, bucket: str, key_prefix: str) -> bool:
     key = f"{key_prefix}/{p.name}"
     try:
         _get_s3().upload_file(
@@ -74,8 +75,10 @@ def _upload_one(p: Path, bucket: str, key_prefix: str) -> None:
                 "ACL": "bucket-owner-full-control",
             },
         )
+        return True
     except Exception as e:
         log.warning(f"[upload] {p.name} → {key} failed: {e}")
+        return False
 
 
 # ---------------------------------------------------------------------
@@ -93,7 +96,8 @@ def upload_frames_async(
 
         s3://{settings.s3_frames_bucket}/{platform}/{code}/
 
-    Returns immediately; caller should NOT await.
+    Returns immediately; caller should NOT await.  Once every frame is
+    confirmed in S3 the directory is handed to `disk_budget` for reclaim.
     """
     paths: List[Path] = [Path(f) for f in frames]
     if not paths:
@@ -103,15 +107,19 @@ def upload_frames_async(
     max_workers = max_workers or settings.max_workers
     bucket = settings.s3_frames_bucket
     prefix = f"{platform}/{code}"
+    frame_dir = paths[0].parent
+    disk_budget.mark_uploading(frame_dir)
 
     def _bg():
         log.info(f"🚀 [upload] → s3://{bucket}/{prefix}/  ({len(paths)} frames)")
         completed = 0
+        failed = 0
         with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3u") as pool:
             futures = [pool.submit(_upload_one, p, bucket, prefix) for p in paths]
             for future in futures:
                 try:
-                    future.result()  # Wait for completion and catch exceptions
+                    if not future.result():  # Wait for completion and catch exceptions
+                        failed += 1
                     completed += 1
                     if len(paths) > 5 and completed % max(1, len(paths) // 5) == 0:
                         progress = (completed / len(paths)) * 100
@@ -119,7 +127,9 @@ def upload_frames_async(
                             f"📤 [upload] progress: {completed}/{len(paths)} ({progress:.0f}%)"
                         )
                 except Exception as e:
+                    failed += 1
                     log.warning(f"❌ [upload] frame upload failed: {e}")
-        log.info(f"✅ [upload] done  {code}")
+        disk_budget.release_upload(frame_dir, ok=failed == 0)
+        log.info(f"✅ [upload] done  {code}" + (f" ({failed} failed)" if failed else ""))
 
     threading.Thread(target=_bg, name=f"uploader-{code}", daemon=True).start()
@@ -0,0 +1,317 @@
+"""
+Phase 5a – Write-ahead spool for vector upserts
+───────────────────────────────────────────────
+Vectors are appended (and fsync'ed) to a local log *before* they are sent to
+Qdrant, so a slow or unavailable vector store never throws away GPU work:
+the video still completes and its points are replayed later.
+
+    <spool_dir>/upserts.log      – append-only records
+    <spool_dir>/upserts.offset   – byte offset of the first un-acknowledged record
+    <spool_dir>/upserts.dead     – JSON lines of records Qdrant rejected (4xx)
+
+Record layout (little-endian):
+
+    b"VSP1" | u32 body length | u32 crc32(body) | body
+
+`body` is JSON `{"id", "payload", "vector"}` with the vector as base64
+float32.  A record torn by a crash fails its length / CRC check and is
+skipped up to the next magic, so later appends stay readable.
+
+Point ids are deterministic, so replaying a record twice (crash between
+the Qdrant ack and the offset commit) just overwrites the same point.
+
+Transient failures (connection errors, timeouts, 5xx, 408 / 429) leave the
+records spooled.  A 4xx rejection (wrong vector size, bad payload) would fail
+the same way forever, so the rejected batch is bisected down to the poison
+records; those go to the dead-letter file with the error and the offset
+moves past them.
+
+Public API
+──────────
+* `append(points) -> int`      – durably spool points; returns bytes written
+* `drain(*, batch=None) -> int` – replay pending records; returns points sent
+* `pending_bytes() -> int`     – bytes not yet acknowledged by Qdrant
+* `upsert(points) -> bool`     – append + drain; False if points stayed spooled
+
+CLI (cron / side-car drainer):
+
+    python -m src.upsert_spool [--loop SECS]
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import fcntl
+import json
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+from config.env_config import settings
+from config.logging_config import configure_logging
+
+log = configure_logging()
+__all__ = ["append", "drain", "pending_bytes", "upsert"]
+
+_MAGIC = b"VSP1"
+_HEADER = struct.Struct("<II")
+_HEAD_LEN = len(_MAGIC) + _HEADER.size
+_MAX_BODY = 16 * 1024 * 1024  # anything larger is a corrupt length field
+_WINDOW = 4 * _MAX_BODY  # bytes read per drain step
+
+
+# ───────────────────────── paths & locks ───────────────────────────
+def _log_path() -> Path:
+    return settings.spool_dir / "upserts.log"
+
+
+def _offset_path() -> Path:
+    return settings.spool_dir / "upserts.offset"
+
+
+def _dead_path() -> Path:
+    return settings.spool_dir / "upserts.dead"
+
+
+@contextlib.contextmanager
+def _flock(name: str, *, blocking: bool = True) -> Iterator[bool]:
+    """Inter-process lock on `<spool_dir>/<name>`; yields False if busy."""
+    settings.spool_dir.mkdir(parents=True, exist_ok=True)
+    with open(settings.spool_dir / name, "a+b") as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _read_offset() -> int:
+    try:
+        return int(_offset_path().read_text().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_offset(offset: int) -> None:
+    tmp = _offset_path().with_suffix(".tmp")
+    with open(tmp, "w") as fh:
+        fh.write(str(offset))
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, _offset_path())
+
+
+def _log_size() -> int:
+    try:
+        return _log_path().stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+# ───────────────────────── encoding ────────────────────────────────
+def _encode(point: Dict[str, Any]) -> bytes:
+    vec = np.asarray(point["vector"], dtype="<f4")
+    body = json.dumps(
+        {
+            "id": point["id"],
+            "payload": point["payload"],
+            "vector": base64.b64encode(vec.tobytes()).decode("ascii"),
+        },
+        separators=(",", ":"),
+    ).encode()
+    return _MAGIC + _HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode(body: bytes) -> Dict[str, Any]:
+    rec = json.loads(body)
+    vec = np.frombuffer(base64.b64decode(rec["vector"]), dtype="<f4")
+    return {"id": rec["id"], "payload": rec["payload"], "vector": vec.tolist()}
+
+
+def _scan(buf: bytes, base: int, *, limit: int, final: bool) -> Tuple[List[bytes], int]:
+    """
+    Parse up to `limit` intact records from `buf` (file offset `base`).
+
+    Returns the bodies and the file offset parsing stopped at.  Damaged
+    bytes are skipped up to the next magic; a record cut off by the end of
+    a non-`final` window is left for the next read.
+    """
+    bodies: List[bytes] = []
+    pos = 0
+    while pos + _HEAD_LEN <= len(buf) and len(bodies) < limit:
+        if buf[pos : pos + len(_MAGIC)] == _MAGIC:
+            length, crc = _HEADER.unpack_from(buf, pos + len(_MAGIC))
+            end = pos + _HEAD_LEN + length
+            if length <= _MAX_BODY and end > len(buf) and not final:
+                return bodies, base + pos
+            if length <= _MAX_BODY and end <= len(buf):
+                body = buf[pos + _HEAD_LEN : end]
+                if zlib.crc32(body) == crc:
+                    bodies.append(body)
+                    pos = end
+                    continue
+        nxt = buf.find(_MAGIC, pos + 1)
+        skip_to = nxt if nxt != -1 else len(buf)
+        log.warning(f"⚠️ [spool] skipping {skip_to - pos} damaged bytes at offset {base + pos}")
+        pos = skip_to
+    if final and len(bodies) < limit and pos < len(buf):
+        log.warning(f"⚠️ [spool] dropping {len(buf) - pos} torn bytes at offset {base + pos}")
+        pos = len(buf)
+    return bodies, base + pos
+
+
+# ───────────────────────── poison records ──────────────────────────
+_TRANSIENT_4XX = {408, 429}  # timeout / rate limit: retrying does help
+
+
+def _rejected(exc: Exception) -> bool:
+    """True for a Qdrant 4xx: the request itself is bad, a retry fails the same way."""
+    from qdrant_client.http.exceptions import UnexpectedResponse
+
+    status = getattr(exc, "status_code", None)
+    return (
+        isinstance(exc, UnexpectedResponse)
+        and status is not None
+        and 400 <= status < 500
+        and status not in _TRANSIENT_4XX
+    )
+
+
+def _dead_letter(body: bytes, exc: Exception) -> None:
+    line = json.dumps({"error": str(exc), "record": json.loads(body)}, separators=(",", ":"))
+    with open(_dead_path(), "a") as fh:
+        fh.write(line + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+    log.error(f"❌ [spool] Qdrant rejected a record – moved to {_dead_path().name}: {exc}")
+
+
+def _push(store_embeds, bodies: List[bytes]) -> int:
+    """Upsert `bodies`; returns points applied.  Rejected records are dead-lettered."""
+    try:
+        store_embeds.upsert_embeddings([_decode(b) for b in bodies])
+        return len(bodies)
+    except Exception as e:
+        if not _rejected(e):
+            raise
+        if len(bodies) == 1:
+            _dead_letter(bodies[0], e)
+            return 0
+    mid = len(bodies) // 2
+    return _push(store_embeds, bodies[:mid]) + _push(store_embeds, bodies[mid:])
+
+
+# ───────────────────────── public API ──────────────────────────────
+def append(points: List[Dict[str, Any]]) -> int:
+    """
+    Append `points` to the spool and fsync before returning.
+
+    Once this returns the points survive a crash of this process; they are
+    in Qdrant only after a successful `drain()`.
+    """
+    if not points:
+        return 0
+    data = b"".join(_encode(p) for p in points)
+    with _flock("upserts.lock"):
+        with open(_log_path(), "ab") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+    log.debug(f"[spool] +{len(points)} pts ({len(data) / 1024:.0f} KiB)")
+    return len(data)
+
+
+def pending_bytes() -> int:
+    """Spooled bytes Qdrant has not acknowledged yet."""
+    with _flock("upserts.lock"):
+        return max(0, _log_size() - _read_offset())
+
+
+def drain(*, batch: int | None = None) -> int:
+    """
+    Replay pending records to Qdrant, `batch` points per step, committing the
+    offset after each acknowledged step.  Only one drainer runs at a time
+    (others return 0 immediately).  Transient Qdrant errors propagate and
+    everything not yet committed stays spooled for the next call; records
+    Qdrant rejects (4xx) are dead-lettered and skipped.
+    """
+    from src import store_embeds  # qdrant client only when actually draining
+
+    batch = batch or settings.spool_drain_batch
+    pushed = 0
+    with _flock("drain.lock", blocking=False) as acquired:
+        if not acquired:
+            return 0
+        while True:
+            # records below the size seen under the append lock are complete
+            with _flock("upserts.lock"):
+                start, size = _read_offset(), _log_size()
+                if start >= size:
+                    if size:  # fully drained – start a fresh log
+                        open(_log_path(), "wb").close()
+                        _write_offset(0)
+                    break
+
+            window = min(size - start, _WINDOW)
+            with open(_log_path(), "rb") as fh:
+                fh.seek(start)
+                buf = fh.read(window)
+            bodies, end = _scan(buf, start, limit=batch, final=start + window >= size)
+            if bodies:
+                pushed += _push(store_embeds, bodies)
+            with _flock("upserts.lock"):
+                _write_offset(end)
+
+    if pushed:
+        log.info(f"📤 [spool] replayed {pushed} pts to Qdrant")
+    return pushed
+
+
+def upsert(points: List[Dict[str, Any]]) -> bool:
+    """
+    Spool `points`, then try to drain.  Returns True when the spool is empty
+    (everything reached Qdrant); on a Qdrant error the points stay spooled,
+    a warning is logged and False is returned instead of raising.
+    """
+    append(points)
+    try:
+        drain()
+    except Exception as e:
+        log.warning(
+            f"⚠️ [spool] Qdrant unavailable – {pending_bytes() / 1024:.0f} KiB stay spooled: {e}"
+        )
+        return False
+    return pending_bytes() == 0
+
+
+# ───────────────────────── CLI drainer ─────────────────────────────
+def main() -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Replay spooled vector upserts to Qdrant")
+    ap.add_argument("--loop", type=float, default=0, help="keep draining every SECS (0 = once)")
+    args = ap.parse_args()
+
+    while True:
+        try:
+            drain()
+        except Exception as e:
+            log.error(f"❌ [spool] drain failed: {e}")
+            if not args.loop:
+                raise SystemExit(1)
+        if not args.loop:
+            return
+        time.sleep(args.loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,9 @@ Phase 6 – Embedded status verification
 After pipeline finishes for a batch, check that each `code` now exists in
 Qdrant `watched_frames` (vector count ≥1).
 
-Use the Python Qdrant client with absolute URL from env.
+The whole batch is answered by `lib.embed_status` (one facet request per
+1 000 codes) on the pooled Qdrant client; the DB engine is created once per
+process and its connection pool reused.
 Only if present: add id to `mark_embedded()`, otherwise leave untouched for a later re-run.
 
 Public functions:
@@ -25,6 +27,7 @@ from typing import Dict, List
 from config.env_config import settings
 from config.logging_config import configure_logging
 from config.profiler import profile
+from lib.embed_status import embedded_counts
 from qdrant_client import QdrantClient
 
 log = configure_logging()
@@ -39,7 +42,6 @@ try:
     from db import mark_embedded, next_batch
     from models import InstaContent
     from sqlalchemy import create_engine, text
-    from sqlalchemy.orm import sessionmaker
 except ImportError as e:
     log.warning(f"Database dependencies not available: {e}")
 
@@ -53,6 +55,7 @@ except ImportError as e:
 
 
 _QD: QdrantClient | None = None  # singleton
+_ENGINE = None  # SQLAlchemy engine (owns the DB connection pool)
 
 
 def _client() -> QdrantClient:
@@ -71,6 +74,18 @@ def _client() -> QdrantClient:
     return _QD
 
 
+def _engine():
+    """Lazy, process-wide SQLAlchemy engine; None when no DB URL is set."""
+    global _ENGINE
+    if _ENGINE is None:
+        db_url = os.getenv("ORIANE_ADMIN_DB_URL")
+        if not db_url:
+            log.warning("ORIANE_ADMIN_DB_URL not set, cannot look up content IDs")
+            return None
+        _ENGINE = create_engine(db_url, pool_size=2, max_overflow=2, pool_pre_ping=True)
+    return _ENGINE
+
+
 def _get_content_ids_by_codes(codes: List[str]) -> Dict[str, int]:
     """
     Get InstaContent IDs for the given codes.
@@ -85,24 +100,19 @@ def _get_content_ids_by_codes(codes: List[str]) -> Dict[str, int]:
         return {}
 
     try:
-        # Get database URL from environment
-        db_url = os.getenv("ORIANE_ADMIN_DB_URL")
-        if not db_url:
-            log.warning("ORIANE_ADMIN_DB_URL not set, cannot look up content IDs")
+        engine = _engine()
+        if engine is None:
             return {}
 
-        engine = create_engine(db_url)
-        Session = sessionmaker(bind=engine)
-
-        with Session() as session:
-            result = session.execute(
+        with engine.connect() as conn:
+            result = conn.execute(
                 text(
                     """
                     SELECT code, id FROM public.insta_content
                     WHERE code = ANY(:codes)
                 """
                 ),
-                {"codes": codes},
+                {"codes": list(codes)},
             )
 
             return {row.code: row.id for row in result}
@@ -130,42 +140,20 @@ def verify_batch_embedded(codes: List[str]) -> Dict[str, bool]:
     log.info(f"[verify] checking {len(codes)} codes for embedded vectors")
 
     try:
-        client = _client()
-        results = {}
-
-        for code in codes:
-            try:
-                # Search for vectors with this video_code in payload
-                search_result = client.scroll(
-                    collection_name=settings.collection,
-                    scroll_filter={"must": [{"key": "video_code", "match": {"value": code}}]},
-                    limit=1,  # We only need to know if at least 1 exists
-                    with_payload=False,  # Don't need payload data, just count
-                    with_vectors=False,  # Don't need vectors, just count
-                )
-
-                # Check if we found any vectors for this code
-                has_vectors = len(search_result[0]) > 0
-                results[code] = has_vectors
-
-                if has_vectors:
-                    log.info(f"✅ [verify] {code}: vectors found")
-                else:
-                    log.warning(f"⚠️ [verify] {code}: no vectors found")
-
-            except Exception as e:
-                log.error(f"❌ [verify] {code}: error checking vectors - {e}")
-                results[code] = False
-
-        embedded_count = sum(results.values())
-        log.info(f"[verify] {embedded_count}/{len(codes)} codes have embedded vectors")
-
-        return results
-
+        counts = embedded_counts(_client(), settings.collection, codes)
     except Exception as e:
         log.error(f"Failed to verify embedded status: {e}")
         return {code: False for code in codes}
 
+    results = {code: counts.get(code, 0) > 0 for code in codes}
+    missing = [code for code, ok in results.items() if not ok]
+    if missing:
+        log.warning(f"⚠️ [verify] no vectors for {len(missing)} codes: {missing[:20]}")
+
+    embedded_count = len(results) - len(missing)
+    log.info(f"✅ [verify] {embedded_count}/{len(results)} codes have embedded vectors")
+    return results
+
 
 @profile
 def mark_embedded_codes(codes: List[str]) -> None:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark – uniform fallback sampler on long-GOP clips
+──────────────────────────────────────────────────────
+Synthesises H.264 clips with increasing key-frame intervals and times the
+old per-candidate `CAP_PROP_POS_FRAMES` seek loop against the single forward
+pass and against `scene_framing._uniform_sample`, which picks between the two
+from the probed key-frame interval.
+
+    python test/bench_fallback_sampler.py
+    python test/bench_fallback_sampler.py --secs 120 --gop 30 300 1200 --need 6 12 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cv2
+from lib.ffmpeg_utils import FFMPEG, probe_video
+from src.scene_framing import (
+    _is_mono,
+    _is_solid_color,
+    _pass_sample,
+    _sample_slots,
+    _uniform_sample,
+)
+
+
+def make_clip(dst: Path, secs: int, gop: int, fps: int = 30, size: str = "640x360") -> Path:
+    subprocess.run(
+        [
+            FFMPEG,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size={size}:rate={fps}",
+            "-t",
+            str(secs),
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            str(gop),
+            "-keyint_min",
+            str(gop),
+            "-sc_threshold",
+            "0",
+            "-pix_fmt",
+            "yuv420p",
+            "-y",
+            str(dst),
+        ],
+        check=True,
+    )
+    return dst
+
+
+def seek_sample(video: Path, need: int, total_frames: int, fps: float) -> int:
+    """The pre-single-pass fallback: one seek per candidate."""
+    step = max(1, total_frames // (need + 1)) if total_frames else 1
+    cap = cv2.VideoCapture(str(video))
+    added = attempts = 0
+    while added < need and attempts < need * 5:
+        pos = (attempts * step) % total_frames if total_frames else attempts
+        cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+        ok, frame = cap.read()
+        attempts += 1
+        if not ok:
+            break
+        if _is_solid_color(frame) or _is_mono(frame):
+            continue
+        added += 1
+    cap.release()
+    return added
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--secs", type=int, default=60, help="clip length in seconds")
+    ap.add_argument("--gop", type=int, nargs="+", default=[30, 300, 900], help="key-frame intervals")
+    ap.add_argument("--need", type=int, nargs="+", default=[3, 12, 24], help="frames to sample")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    args = ap.parse_args()
+
+    print(f"{'gop':>6} {'need':>5} {'seek s':>9} {'1-pass s':>9} {'auto s':>9} {'speed-up':>9}")
+    with tempfile.TemporaryDirectory() as td:
+        for gop in args.gop:
+            clip = make_clip(Path(td) / f"gop{gop}.mp4", args.secs, gop)
+            info = probe_video(clip)
+            for need in args.need:
+                slots = _sample_slots(need, info.frame_count, info.fps, 4)
+                t_seek = _time(lambda: seek_sample(clip, need, info.frame_count, info.fps), args.repeat)
+                t_pass = _time(lambda: _pass_sample(clip, slots, info.fps), args.repeat)
+                t_auto = _time(
+                    lambda: _uniform_sample(
+                        clip,
+                        need,
+                        info.frame_count,
+                        info.fps,
+                        keyframe_interval=info.keyframe_interval,
+                    ),
+                    args.repeat,
+                )
+                print(
+                    f"{gop:>6} {need:>5} {t_seek:>9.3f} {t_pass:>9.3f} {t_auto:>9.3f} "
+                    f"{t_seek / t_auto:>8.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark – Qdrant upsert throughput
+────────────────────────────────────
+Times the old write path (serial `wait=True` requests of VP_BATCH_SIZE points)
+against `store_embeds.upsert_embeddings` (pipelined `wait=False` requests, one
+barrier per video) and reports points/sec.
+
+Runs against Qdrant's local in-memory mode by default; pass `--url` to hit a
+real server (a throw-away collection is created and dropped).  In-memory mode
+has no network, so `--rtt-ms` adds a simulated round trip to every request.
+
+    python test/bench_upsert.py --rtt-ms 5
+    python test/bench_upsert.py --url http://localhost:6333 --videos 20 --frames 60
+    python test/bench_upsert.py --batch 64 256 --parallel 1 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import uuid
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from config.env_config import settings
+from qdrant_client import QdrantClient, models
+from src import store_embeds
+
+
+def make_videos(n_videos: int, frames: int, dim: int) -> list[list[dict]]:
+    rng = np.random.default_rng(0)
+    videos = []
+    for v in range(n_videos):
+        vecs = rng.standard_normal((frames, dim), dtype=np.float32)
+        videos.append(
+            [
+                {
+                    "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"bench/{v}/{i}")),
+                    "vector": vecs[i].tolist(),
+                    "payload": {"video_code": f"V{v}", "frame_number": i + 1},
+                }
+                for i in range(frames)
+            ]
+        )
+    return videos
+
+
+class _DelayedClient:
+    """Adds a fixed round trip to every upsert of a local client."""
+
+    def __init__(self, cl: QdrantClient, rtt: float):
+        self._cl, self._rtt = cl, rtt
+
+    def upsert(self, **kw):
+        time.sleep(self._rtt)
+        return self._cl.upsert(**kw)
+
+    def __getattr__(self, name):
+        return getattr(self._cl, name)
+
+
+def serial_upsert(cl: QdrantClient, collection: str, points: list[dict], batch: int) -> None:
+    """The pre-pipelining write path: one acknowledged request per chunk."""
+    for chunk in store_embeds._chunks(points, batch):
+        cl.upsert(
+            collection_name=collection,
+            wait=True,
+            points=models.Batch(
+                ids=[p["id"] for p in chunk],
+                vectors=[p["vector"] for p in chunk],
+                payloads=[p["payload"] for p in chunk],
+            ),
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--url", default=":memory:", help="Qdrant URL or ':memory:'")
+    ap.add_argument("--api-key", default=None)
+    ap.add_argument("--dim", type=int, default=settings.dim)
+    ap.add_argument("--rtt-ms", type=float, default=0.0, help="simulated round trip per request")
+    ap.add_argument("--videos", type=int, default=10)
+    ap.add_argument("--frames", type=int, default=120, help="points per video")
+    ap.add_argument("--legacy-batch", type=int, default=settings.batch_size)
+    ap.add_argument("--batch", type=int, nargs="+", default=[settings.upsert_batch])
+    ap.add_argument("--parallel", type=int, nargs="+", default=[1, settings.upsert_parallel])
+    args = ap.parse_args()
+
+    if args.url == ":memory:":
+        cl = QdrantClient(":memory:")
+    else:
+        cl = QdrantClient(url=args.url, api_key=args.api_key, prefer_grpc=True)
+    collection = f"bench_upsert_{uuid.uuid4().hex[:8]}"
+    cl.create_collection(
+        collection_name=collection,
+        vectors_config=models.VectorParams(size=args.dim, distance=models.Distance.COSINE),
+    )
+    if args.rtt_ms > 0:
+        cl = _DelayedClient(cl, args.rtt_ms / 1000)
+    store_embeds._QD = cl
+    store_embeds.settings = replace(settings, collection=collection, dim=args.dim)
+
+    videos = make_videos(args.videos, args.frames, args.dim)
+    total = args.videos * args.frames
+
+    def run(label: str, fn) -> None:
+        t0 = time.perf_counter()
+        for pts in videos:
+            fn(pts)
+        dt = time.perf_counter() - t0
+        print(f"{label:<28} {dt:>8.2f}s {total / dt:>10.0f} pts/s")
+
+    print(f"{args.url}  {args.videos} videos × {args.frames} pts  dim={args.dim}  rtt={args.rtt_ms}ms")
+    try:
+        run(
+            f"serial wait=True b={args.legacy_batch}",
+            lambda pts: serial_upsert(cl, collection, pts, args.legacy_batch),
+        )
+        for batch in args.batch:
+            for parallel in args.parallel:
+                run(
+                    f"pipelined b={batch} p={parallel}",
+                    lambda pts: store_embeds.upsert_embeddings(pts, batch=batch, parallel=parallel),
+                )
+    finally:
+        cl.delete_collection(collection)
+
+
+if __name__ == "__main__":
+    main()
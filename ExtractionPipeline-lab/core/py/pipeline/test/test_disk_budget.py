@@ -0,0 +1,100 @@
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.env_config import settings
+from src import disk_budget
+
+
+class TestDiskBudget(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.settings = replace(
+            settings,
+            frames_dir=self.root / "frames",
+            tmp_dir=self.root / "videos",
+            reclaim_frames=True,
+            min_free_gb=1.0,
+        )
+        patcher = patch.object(disk_budget, "settings", self.settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def make_frame_dir(self, code: str, n: int = 3) -> Path:
+        d = self.settings.frames_dir / code
+        d.mkdir(parents=True)
+        for i in range(1, n + 1):
+            (d / f"{i}_{i * 1.5:.2f}.png").write_bytes(b"\x89PNG" + b"0" * 128)
+        return d
+
+    def test_reclaim_requires_upload_and_upsert(self):
+        d = self.make_frame_dir("ABC")
+        self.assertEqual(disk_budget.mark_upserted(d), 0)
+        self.assertTrue(d.exists())
+        self.assertGreater(disk_budget.mark_uploaded(d), 0)
+        self.assertFalse(d.exists())
+
+    def test_in_flight_upload_blocks_reclaim(self):
+        d = self.make_frame_dir("ABC")
+        disk_budget.mark_uploading(d)
+        disk_budget.mark_uploaded(d)  # e.g. the synchronous upload in entrypoint
+        disk_budget.mark_upserted(d)
+        self.assertTrue(d.exists())
+        disk_budget.release_upload(d, ok=True)
+        self.assertFalse(d.exists())
+
+    def test_failed_upload_keeps_frames(self):
+        d = self.make_frame_dir("ABC")
+        disk_budget.mark_uploading(d)
+        disk_budget.mark_upserted(d)
+        self.assertEqual(disk_budget.release_upload(d, ok=False), 0)
+        self.assertTrue(d.exists())
+
+    def test_sweep_ignores_stale_lock_of_dead_process(self):
+        done = self.make_frame_dir("DONE")
+        pending = self.make_frame_dir("PENDING")
+        for name in (".uploaded", ".upserted"):
+            (done / name).touch()
+        (done / ".uploading").write_text("999999999")
+        (pending / ".upserted").touch()
+
+        self.assertGreater(disk_budget.sweep(), 0)
+        self.assertFalse(done.exists())
+        self.assertTrue(pending.exists())
+
+    def test_reclaim_disabled(self):
+        d = self.make_frame_dir("ABC")
+        with patch.object(disk_budget, "settings", replace(self.settings, reclaim_frames=False)):
+            disk_budget.mark_uploaded(d)
+            disk_budget.mark_upserted(d)
+        self.assertTrue(d.exists())
+
+    def test_wait_for_headroom_sweeps_before_pausing(self):
+        d = self.make_frame_dir("ABC")
+        (d / ".uploaded").touch()
+        (d / ".upserted").touch()
+        free = iter([0, 2 * 1024**3])
+        with patch.object(disk_budget, "free_bytes", lambda: next(free)), patch.object(
+            disk_budget.time, "sleep"
+        ) as sleep:
+            self.assertTrue(disk_budget.wait_for_headroom(timeout=10))
+        self.assertFalse(d.exists())
+        sleep.assert_not_called()
+
+    def test_wait_for_headroom_times_out(self):
+        with patch.object(disk_budget, "free_bytes", return_value=0), patch.object(
+            disk_budget.time, "sleep"
+        ) as sleep:
+            self.assertFalse(disk_budget.wait_for_headroom(poll_secs=0, timeout=0))
+        sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from config.env_config import settings
+from lib import embed_status
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+from src import verify_embedded
+
+
+class NoFacetClient:
+    """Proxy for a pre-1.12 server: `/facet` fails, everything else works."""
+
+    def __init__(self, inner, status=404, content=b"404 page not found"):
+        self.inner = inner
+        self.error = UnexpectedResponse(status, "", content, httpx.Headers())
+        self.counts = 0
+
+    def facet(self, **kw):
+        raise self.error
+
+    def count(self, **kw):
+        self.counts += 1
+        return self.inner.count(**kw)
+
+
+class TestEmbedStatus(unittest.TestCase):
+    def setUp(self):
+        self.qdrant = QdrantClient(":memory:")
+        self.qdrant.create_collection(
+            collection_name="test_frames",
+            vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+        )
+        layout = {("instagram", "A"): 3, ("instagram", "B"): 1, ("tiktok", "C"): 2}
+        points, pid = [], 0
+        for (platform, code), n in layout.items():
+            for i in range(n):
+                pid += 1
+                payload = {"platform": platform, "video_code": code, "frame_number": i}
+                points.append(models.PointStruct(id=pid, vector=[1.0, float(i)], payload=payload))
+        self.qdrant.upsert("test_frames", points)
+
+    def test_facet_counts_every_code(self):
+        codes = ["A", "B", "C", "missing", "A"]
+        counts = embed_status.embedded_counts(self.qdrant, "test_frames", codes, chunk=2)
+        self.assertEqual(counts, {"A": 3, "B": 1, "C": 2, "missing": 0})
+        self.assertEqual(
+            embed_status.embedded_codes(self.qdrant, "test_frames", codes, platform="instagram"),
+            {"A", "B"},
+        )
+        self.assertEqual(
+            embed_status.embedded_codes(self.qdrant, "test_frames", codes, min_points=2), {"A", "C"}
+        )
+
+    def test_falls_back_to_counts_without_facet(self):
+        client = NoFacetClient(self.qdrant)
+        counts = embed_status.embedded_counts(client, "test_frames", ["A", "B", "missing"])
+        self.assertEqual(counts, {"A": 3, "B": 1, "missing": 0})
+        self.assertEqual(client.counts, 3)
+
+    def test_falls_back_without_keyword_index(self):
+        body = b'{"status":{"error":"Bad request: Index required but not found for \\"video_code\\""}}'
+        client = NoFacetClient(self.qdrant, status=400, content=body)
+        counts = embed_status.embedded_counts(client, "test_frames", ["A", "C"])
+        self.assertEqual(counts, {"A": 3, "C": 2})
+
+    def test_transient_facet_error_raises_instead_of_falling_back(self):
+        for status in (500, 503):
+            client = NoFacetClient(self.qdrant, status=status, content=b"overloaded")
+            with self.assertRaises(UnexpectedResponse):
+                embed_status.embedded_counts(client, "test_frames", ["A", "B"])
+            self.assertEqual(client.counts, 0)
+
+        client = NoFacetClient(self.qdrant)
+        client.error = TimeoutError("timed out")
+        with self.assertRaises(TimeoutError):
+            embed_status.embedded_counts(client, "test_frames", ["A"])
+        self.assertEqual(client.counts, 0)
+
+    def test_verify_batch_embedded_uses_shared_client(self):
+        with (
+            patch.object(verify_embedded, "_QD", self.qdrant),
+            patch.object(verify_embedded, "settings", replace(settings, collection="test_frames")),
+        ):
+            result = verify_embedded.verify_batch_embedded(["A", "nope"])
+        self.assertEqual(result, {"A": True, "nope": False})
+
+    def test_verify_reports_unknown_as_not_embedded(self):
+        with (
+            patch.object(verify_embedded, "_QD", self.qdrant),
+            patch.object(verify_embedded, "settings", replace(settings, collection="absent")),
+        ):
+            result = verify_embedded.verify_batch_embedded(["A"])
+        self.assertEqual(result, {"A": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
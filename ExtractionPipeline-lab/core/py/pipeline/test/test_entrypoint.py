@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.env_config import settings
+from src import disk_budget
+
+HAS_TORCH = importlib.util.find_spec("torch") is not None  # src.pipeline loads the CLIP model module
+
+
+@unittest.skipUnless(HAS_TORCH, "entrypoint imports the embedding stack (torch)")
+class TestProcessItemFrameRetention(unittest.TestCase):
+    """process_item: the frame dir outlives the async uploader until the item is recorded."""
+
+    def setUp(self):
+        os.environ["LOCAL_MODE"] = "1"  # no Aurora connection at import
+        import entrypoint
+        from src import pipeline
+
+        self.entrypoint, self.pipeline = entrypoint, pipeline
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = Path(self._tmp.name)
+        self.settings = replace(
+            settings,
+            frames_dir=root / "frames",
+            tmp_dir=root / "videos",
+            crop_enabled=False,
+            dedup_enabled=False,
+            incremental_reindex=False,
+            spool_upserts=False,
+            reclaim_frames=True,
+        )
+        self.video = root / "ABC.mp4"
+        self.video.write_bytes(b"\x00")
+        self.frame_dir = self.settings.frames_dir / "ABC"
+
+        for target in (entrypoint, pipeline, disk_budget):
+            p = patch.object(target, "settings", self.settings)
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _extract(self, clip, frame_dir, **kwargs):
+        frame_dir.mkdir(parents=True)
+        frames = [frame_dir / f"{i}_{i * 2.0:.2f}.png" for i in range(1, 4)]
+        for fp in frames:
+            fp.write_bytes(b"\x89PNG" + bytes([len(fp.name)]) * 64)
+        return frames
+
+    def _async_upload_finishes_at_once(self, frames, **kwargs):
+        # the background uploader typically finishes before embedding does
+        disk_budget.mark_uploading(self.frame_dir)
+        disk_budget.release_upload(self.frame_dir, ok=True)
+
+    def test_frames_survive_until_the_item_is_recorded(self):
+        uploaded = []
+
+        def upload_file(path, bucket, key, **kwargs):
+            self.assertTrue(Path(path).exists(), f"{path} deleted under the sync upload")
+            uploaded.append(key)
+
+        pl = self.pipeline
+        with patch.object(pl, "probe_video", return_value=None), patch.object(
+            pl.scene_framing, "extract_frames", side_effect=self._extract
+        ), patch.object(
+            pl.upload_frames, "upload_frames_async", side_effect=self._async_upload_finishes_at_once
+        ), patch.object(
+            pl.VideoPipeline, "_encode_frames_in_batches", side_effect=lambda fs: [[0.1, 0.2]] * len(fs)
+        ), patch.object(pl.store_embeds, "upsert_embeddings") as upsert, patch.object(
+            self.entrypoint, "s3", Mock(upload_file=Mock(side_effect=upload_file))
+        ), patch.object(self.entrypoint, "SKIP_UPLOAD", False), patch.object(
+            self.entrypoint, "mark_done"
+        ) as mark_done:
+            ok = self.entrypoint.process_item(
+                {"platform": "instagram", "code": "ABC"}, self.video.parent, 0, 1
+            )
+
+        self.assertTrue(ok)
+        self.assertEqual(len(upsert.call_args.args[0]), 3)
+        self.assertIn("created_at", upsert.call_args.args[0][0]["payload"])  # for range filters
+        self.assertEqual(len(uploaded), 3)
+        mark_done.assert_called_once_with("ABC", False, 3)
+        self.assertFalse(self.frame_dir.exists())  # reclaimed only after mark_done
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from config.env_config import settings
+from lib.ffmpeg_utils import VideoInfo
+from src import scene_framing
+
+METADATA_OUT = """\
+frame:0    pts:0       pts_time:0
+lavfi.scene_score=0.000000
+frame:1    pts:30720   pts_time:2
+lavfi.scene_score=0.031000
+frame:2    pts:61440   pts_time:4
+lavfi.scene_score=0.640000
+frame:3    pts:92160   pts_time:6.5
+lavfi.scene_score=0.210000
+"""
+
+INFO = VideoInfo(
+    path="clip.mp4",
+    duration=8.0,
+    fps=10.0,
+    frame_count=80,
+    width=64,
+    height=48,
+    rotation=0,
+    codec="h264",
+    keyframe_interval=2.0,
+)
+
+
+class TestSceneScores(unittest.TestCase):
+    def run_scores(self, **kw):
+        done = subprocess.CompletedProcess([], 0, stdout=METADATA_OUT, stderr="")
+        with patch.object(subprocess, "run", return_value=done) as run:
+            scores = scene_framing._ffmpeg_scene_scores("clip.mp4", **kw)
+        return scores, run.call_args.args[0]
+
+    def test_parses_metadata_print(self):
+        scores, _ = self.run_scores(keyframes_only=True, every_n=1, width=320)
+        self.assertEqual(scores, [(0.0, 0.0), (2.0, 0.031), (4.0, 0.64), (6.5, 0.21)])
+
+    def test_keyframes_only_skips_non_key_decode(self):
+        _, cmd = self.run_scores(keyframes_only=True, every_n=1, width=320)
+        self.assertEqual(cmd[cmd.index("-skip_frame") + 1], "nokey")
+        vf = cmd[cmd.index("-vf") + 1]
+        self.assertIn("scale=320:-2", vf)
+        self.assertNotIn("mod(n", vf)
+
+    def test_sparse_selects_every_nth(self):
+        _, cmd = self.run_scores(keyframes_only=False, every_n=5, width=160)
+        self.assertNotIn("-skip_frame", cmd)
+        self.assertTrue(cmd[cmd.index("-vf") + 1].startswith("select='not(mod(n\\,5))'"))
+
+
+class TestFastCandidates(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(scene_framing, "settings", replace(settings, sparse_every_n=5))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scores = [(0.0, 0.0), (2.0, 0.031), (4.0, 0.64), (6.5, 0.21)]
+        self.frame = np.full((48, 64, 3), 128, np.uint8)
+
+    def test_keyframes_seek_only_winners(self):
+        with patch.object(scene_framing, "_ffmpeg_scene_scores", return_value=self.scores), patch.object(
+            scene_framing, "_seek_sample", return_value=[(4.0, self.frame)]
+        ) as seek, patch.object(scene_framing, "_read_slots") as read:
+            out = scene_framing._scored_candidates(Path("clip.mp4"), INFO, "keyframes", 0.12)
+        seek.assert_called_once_with(Path("clip.mp4"), [[40], [65]], 10.0)
+        read.assert_not_called()
+        self.assertEqual(len(out), 1)
+
+    def test_sparse_uses_gop_aware_reader(self):
+        with patch.object(scene_framing, "_ffmpeg_scene_scores", return_value=self.scores) as scores, patch.object(
+            scene_framing, "_read_slots", return_value=[]
+        ) as read:
+            scene_framing._scored_candidates(Path("clip.mp4"), INFO, "sparse", 0.5)
+        self.assertEqual(scores.call_args.kwargs["every_n"], 5)
+        self.assertFalse(scores.call_args.kwargs["keyframes_only"])
+        read.assert_called_once_with(Path("clip.mp4"), [[40]], 10.0, 2.0)
+
+    def test_nothing_over_threshold(self):
+        with patch.object(scene_framing, "_ffmpeg_scene_scores", return_value=self.scores), patch.object(
+            scene_framing, "_seek_sample"
+        ) as seek:
+            self.assertEqual(scene_framing._scored_candidates(Path("clip.mp4"), INFO, "keyframes", 0.9), [])
+        seek.assert_not_called()
+
+
+class TestFrameBudget(unittest.TestCase):
+    SCORES = [(float(t), s) for t, s in enumerate([0.0, 0.5, 0.05, 0.3, 0.9, 0.15, 0.0, 0.25])]
+
+    def test_within_budget_keeps_threshold(self):
+        picked, thresh = scene_framing._budget_pick(self.SCORES, 0.2, lo=2, hi=6)
+        self.assertEqual(sorted(picked), [1.0, 3.0, 4.0, 7.0])
+        self.assertEqual(thresh, 0.2)
+
+    def test_over_budget_keeps_strongest_cuts(self):
+        picked, thresh = scene_framing._budget_pick(self.SCORES, 0.1, lo=0, hi=2)
+        self.assertEqual(sorted(picked), [1.0, 4.0])
+        self.assertEqual(thresh, 0.5)
+
+    def test_under_budget_lowers_threshold_but_skips_static_frames(self):
+        picked, thresh = scene_framing._budget_pick(self.SCORES, 0.8, lo=3, hi=0)
+        self.assertEqual(sorted(picked), [1.0, 3.0, 4.0])
+        self.assertEqual(thresh, 0.3)
+        picked, _ = scene_framing._budget_pick(self.SCORES, 0.8, lo=50, hi=0)
+        self.assertEqual(len(picked), 6)
+
+    def test_budget_scales_with_duration(self):
+        budget = replace(settings, min_frames=3, min_frames_per_min=6, max_frames_per_min=30)
+        with patch.object(scene_framing, "settings", budget):
+            self.assertEqual(scene_framing._frame_budget(replace(INFO, duration=90.0)), (9, 45))
+            self.assertEqual(scene_framing._frame_budget(replace(INFO, duration=4.0)), (1, 3))
+        with patch.object(scene_framing, "settings", replace(settings, min_frames_per_min=0, max_frames_per_min=0)):
+            self.assertEqual(scene_framing._frame_budget(INFO), (0, 0))
+
+    def test_scene_mode_with_budget_scores_once_at_native_size(self):
+        budget = replace(settings, max_frames_per_min=10)
+        with tempfile.TemporaryDirectory() as td, patch.object(scene_framing, "settings", budget), patch.object(
+            scene_framing, "_ffmpeg_scene_scores", return_value=self.SCORES
+        ) as scores, patch.object(scene_framing, "_ffmpeg_scene_frames") as frames, patch.object(
+            scene_framing, "_read_slots", return_value=[]
+        ) as read, patch.object(scene_framing, "_uniform_sample", return_value=[]):
+            scene_framing.extract_frames(Path(td) / "clip.mp4", Path(td) / "out", info=INFO, mode="scene")
+        frames.assert_not_called()
+        scores.assert_called_once()
+        self.assertEqual(scores.call_args.kwargs["width"], 0)
+        # 8 s clip at 10 frames/min → hi = max(min_frames, 2)
+        self.assertEqual(len(read.call_args.args[1]), max(settings.min_frames, 2))
+
+
+class TestExtractMode(unittest.TestCase):
+    def test_unknown_mode_rejected(self):
+        with tempfile.TemporaryDirectory() as td:
+            with self.assertRaises(ValueError):
+                scene_framing.extract_frames(Path(td) / "clip.mp4", Path(td) / "out", info=INFO, mode="fast")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cv2
+import numpy as np
+from src import scene_framing
+from src.scene_framing import _pass_sample, _sample_slots, _seek_sample, _uniform_sample
+
+FPS = 10
+TOTAL = 100
+BLANK = {25, 50}  # primary indices of two slots are solid black
+
+
+def _write_clip(path: Path) -> Path:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (64, 48))
+    rng = np.random.default_rng(0)
+    for i in range(TOTAL):
+        if i in BLANK:
+            frame = np.zeros((48, 64, 3), np.uint8)
+        else:
+            frame = rng.integers(0, 255, (48, 64, 3), dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+class TestFallbackSampler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.clip = _write_clip(Path(cls._tmp.name) / "clip.avi")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def test_slots_are_evenly_spaced_with_spares(self):
+        slots = _sample_slots(3, TOTAL, FPS, spares=4)
+        self.assertEqual([s[0] for s in slots], [25, 50, 75])
+        self.assertEqual(slots[0], [25, 30, 35, 40, 45])
+        self.assertTrue(all(i < TOTAL for s in slots for i in s))
+
+    def test_slots_without_frame_count(self):
+        slots = _sample_slots(3, 0, FPS, spares=1)
+        self.assertEqual(slots, [[0, 5], [10, 15], [20, 25]])
+
+    def test_single_pass_matches_seeks_and_skips_blank_frames(self):
+        slots = _sample_slots(3, TOTAL, FPS, spares=4)
+        passed = _pass_sample(self.clip, slots, FPS)
+        seeked = _seek_sample(self.clip, slots, FPS)
+        self.assertEqual([ts for ts, _ in passed], [3.0, 5.5, 7.5])
+        self.assertEqual([ts for ts, _ in passed], [ts for ts, _ in seeked])
+
+    def test_single_pass_never_seeks(self):
+        real_capture = cv2.VideoCapture
+
+        class NoSeek:
+            def __init__(self, path):
+                self._cap = real_capture(path)
+
+            def set(self, *_):
+                raise AssertionError("seek in single-pass sampler")
+
+            def __getattr__(self, name):
+                return getattr(self._cap, name)
+
+        with patch.object(scene_framing.cv2, "VideoCapture", NoSeek):
+            out = _uniform_sample(self.clip, 3, TOTAL, FPS, keyframe_interval=None)
+        self.assertEqual(len(out), 3)
+
+    def test_short_gop_uses_seeks(self):
+        with patch.object(scene_framing, "_seek_sample", return_value=[]) as seek, patch.object(
+            scene_framing, "_pass_sample", return_value=[]
+        ) as one_pass:
+            _uniform_sample(self.clip, 2, 10_000, 30.0, keyframe_interval=1.0)
+            seek.assert_called_once()
+            _uniform_sample(self.clip, 24, 10_000, 30.0, keyframe_interval=30.0)
+            one_pass.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import math
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.matryoshka import named_vectors, prefix_vector
+
+
+class TestMatryoshka(unittest.TestCase):
+    def test_prefix_is_truncated_and_normalised(self):
+        self.assertEqual(prefix_vector([3, 4, 12, 1], 2), [0.6, 0.8])
+        v = prefix_vector([0.1 * i for i in range(1, 65)], 16)
+        self.assertEqual(len(v), 16)
+        self.assertAlmostEqual(math.fsum(x * x for x in v), 1.0)
+
+    def test_zero_prefix_does_not_divide_by_zero(self):
+        self.assertEqual(prefix_vector([0, 0, 1], 2), [0.0, 0.0])
+
+    def test_bad_dim(self):
+        for dim in (0, 5):
+            with self.assertRaises(ValueError):
+                prefix_vector([1, 2, 3], dim)
+
+    def test_named_vectors_keep_full(self):
+        vec = [1.0, 0.0, 2.0]
+        out = named_vectors(vec, full="full", mini="mini", mini_dim=1)
+        self.assertEqual(out, {"full": vec, "mini": [1.0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
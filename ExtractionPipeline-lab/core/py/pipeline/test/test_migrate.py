@@ -0,0 +1,124 @@
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.migrate import id_shards, load_checkpoint, migrate, save_checkpoint, scan
+from qdrant_client import QdrantClient, models
+
+
+class FlakyClient:
+    """Proxy whose upsert fails once after `fail_after` successful calls."""
+
+    def __init__(self, inner, fail_after):
+        self.inner = inner
+        self.fail_after = fail_after
+
+    def scroll(self, **kw):
+        return self.inner.scroll(**kw)
+
+    def upsert(self, **kw):
+        if self.fail_after == 0:
+            self.fail_after = -1
+            raise RuntimeError("connection reset")
+        self.fail_after -= 1
+        return self.inner.upsert(**kw)
+
+
+class TestMigrate(unittest.TestCase):
+    def setUp(self):
+        self.qdrant = QdrantClient(":memory:")
+        for name in ("src", "dst"):
+            self.qdrant.create_collection(
+                collection_name=name,
+                vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+            )
+        ids = [str(uuid.uuid5(uuid.NAMESPACE_URL, str(i))) for i in range(97)] + [1, 2, 3]
+        self.qdrant.upsert(
+            "src",
+            [models.PointStruct(id=pid, vector=[1, 0], payload={"n": i}) for i, pid in enumerate(ids)],
+        )
+        self.ids = {str(pid) for pid in ids}
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint = Path(self.tmp.name) / "cp.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def dst_ids(self):
+        points, _ = self.qdrant.scroll("dst", limit=1000)
+        return {str(p.id) for p in points}
+
+    def test_shards_cover_the_id_space(self):
+        shards = id_shards(4)
+        self.assertIsNone(shards[0]["start"])
+        self.assertIsNone(shards[-1]["end"])
+        for a, b in zip(shards, shards[1:]):
+            self.assertEqual(a["end"], b["start"])
+        self.assertEqual([s["start"] for s in id_shards(3, max_int=8)], [None, 3, 6])
+
+    def test_copies_every_point_once_across_workers(self):
+        seen = []
+        state = migrate(
+            self.qdrant, "src", dst="dst", workers=5, page=7, progress=lambda s: seen.append(s["seen"])
+        )
+        self.assertEqual(self.dst_ids(), self.ids)
+        self.assertEqual((state["seen"], state["written"], state["skipped"]), (100, 100, 0))
+        self.assertEqual(seen[-1], 100)
+
+    def test_transform_rewrites_and_skips(self):
+        def transform(p):
+            if p.payload["n"] % 2:
+                return None
+            return models.PointStruct(id=p.id, vector=p.vector, payload={"n": p.payload["n"], "even": True})
+
+        state = migrate(self.qdrant, "src", transform=transform, workers=3, page=10)
+        self.assertEqual((state["written"], state["skipped"]), (50, 50))
+        count = self.qdrant.count(
+            "src", count_filter=models.Filter(must=[models.FieldCondition(key="even", match=models.MatchValue(value=True))])
+        ).count
+        self.assertEqual(count, 50)
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        flaky = FlakyClient(self.qdrant, fail_after=3)
+        with self.assertRaises(RuntimeError):
+            migrate(flaky, "src", dst="dst", checkpoint=self.checkpoint, workers=1, page=10)
+        partial = load_checkpoint(self.checkpoint)
+        self.assertEqual(partial["written"], 30)
+        self.assertFalse(partial["done"])
+
+        state = migrate(self.qdrant, "src", dst="dst", checkpoint=self.checkpoint, workers=8, page=10)
+        self.assertTrue(state["done"])
+        self.assertEqual(state["seen"], 100)
+        self.assertEqual(len(state["shards"]), 1)  # the checkpoint's layout wins
+        self.assertEqual(self.dst_ids(), self.ids)
+
+    def test_dry_run_writes_nothing(self):
+        state = migrate(self.qdrant, "src", dst="dst", checkpoint=self.checkpoint, dry_run=True)
+        self.assertEqual(state["written"], 100)
+        self.assertEqual(self.dst_ids(), set())
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_scan_journals_and_flushes_deletes(self):
+        def handle_page(points):
+            return {"delete": [p.id for p in points if p.payload["n"] % 2]}
+
+        state = scan(self.qdrant, "src", handle_page, checkpoint=self.checkpoint, workers=3, page=9, delete_every=8)
+        self.assertEqual((state["deleted"], state["pending_deletes"]), (50, []))
+        self.assertEqual(self.qdrant.count("src").count, 50)
+
+    def test_scan_flushes_deletes_left_in_the_journal(self):
+        leftover = [1, 2]
+        state = {"shards": [], "seen": 0, "pending_deletes": leftover, "deleted": 0, "elapsed_s": 0.0, "done": False}
+        save_checkpoint(self.checkpoint, state)
+        state = scan(self.qdrant, "src", lambda points: {}, checkpoint=self.checkpoint)
+        self.assertEqual(state["deleted"], 2)
+        self.assertEqual(self.qdrant.count("src").count, 98)
+        self.assertEqual(load_checkpoint(self.checkpoint)["pending_deletes"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.point_ids import FRAME_ID_NAMESPACE, frame_point_id, frame_point_id_for, normalize_code
+
+
+class TestPointIds(unittest.TestCase):
+    def test_stable_value(self):
+        # pinned: changing this orphans every stored point
+        self.assertEqual(frame_point_id("instagram", "ABC", 3), "5f1ae158-fc86-52f8-b018-4a83bb47f1db")
+        self.assertEqual(
+            frame_point_id("instagram", "ABC", 3),
+            str(uuid.uuid5(FRAME_ID_NAMESPACE, "instagram/ABC/3")),
+        )
+
+    def test_equivalent_inputs_share_an_id(self):
+        ref = frame_point_id("instagram", "ABC", 3)
+        for args in (
+            ("Instagram", "ABC", "3"),
+            (None, "ABC.mp4", 3),
+            ("instagram", "instagram/ABC", 3),
+            (" instagram ", " ABC ", 3),
+        ):
+            self.assertEqual(frame_point_id(*args), ref, args)
+
+    def test_distinct_frames_videos_and_platforms(self):
+        ids = {
+            frame_point_id("instagram", "ABC", 3),
+            frame_point_id("instagram", "ABC", 4),
+            frame_point_id("instagram", "abc", 3),
+            frame_point_id("tiktok", "ABC", 3),
+        }
+        self.assertEqual(len(ids), 4)
+
+    def test_code_with_dots_is_kept(self):
+        self.assertEqual(normalize_code("C.x_Y"), "C.x_Y")
+        self.assertEqual(normalize_code("C.x_Y.mp4"), "C.x_Y")
+
+    def test_from_payload(self):
+        ref = frame_point_id("instagram", "ABC", 3)
+        self.assertEqual(frame_point_id_for({"video_code": "ABC", "frame_number": 3}), ref)
+        self.assertEqual(frame_point_id_for({"video": "ABC.mp4", "frame_idx": 3}), ref)
+        self.assertEqual(frame_point_id_for({"platform": "instagram", "video": "ABC", "frame": "3"}), ref)
+        self.assertIsNone(frame_point_id_for({"video_code": "ABC"}))
+        self.assertIsNone(frame_point_id_for({"video_code": "ABC", "frame_number": "n/a"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.env_config import settings
+from lib.point_ids import frame_point_id
+from qdrant_client import QdrantClient, models
+from src import reindex, store_embeds
+
+DIM = 4
+
+
+class TestIncrementalReindex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = Path(self._tmp.name)
+        self.qdrant = QdrantClient(":memory:")
+        self.qdrant.create_collection(
+            collection_name="test_frames",
+            vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+        )
+        for patcher in (
+            patch.object(store_embeds, "settings", replace(settings, collection="test_frames", dim=DIM)),
+            patch.object(store_embeds, "_QD", self.qdrant),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def frame(self, name: str, data: bytes) -> Path:
+        fp = self.dir / name
+        fp.write_bytes(data)
+        return fp
+
+    def store(self, code: str, idx: int, content_hash=None):
+        payload = {"video_code": code, "frame_number": idx}
+        if content_hash:
+            payload["content_hash"] = content_hash
+        self.qdrant.upsert(
+            "test_frames",
+            [models.PointStruct(id=frame_point_id("instagram", code, idx), vector=[1, 0, 0, idx], payload=payload)],
+        )
+
+    def test_diff_against_previous_run(self):
+        same = self.frame("1_0.50.png", b"frame-one")
+        edited = self.frame("2_1.50.png", b"frame-two-v2")
+        new = self.frame("3_2.50.png", b"frame-three")
+        self.store("ABC", 1, reindex.content_hash(same))
+        self.store("ABC", 2, "old-hash")
+        self.store("ABC", 4)  # produced by the previous run only
+        self.store("ABC", 5)
+        self.store("XYZ", 1)  # another video is never touched
+
+        frames = {frame_point_id("instagram", "ABC", i): fp for i, fp in ((1, same), (2, edited), (3, new))}
+        diff = reindex.plan("ABC", frames)
+
+        self.assertEqual(set(diff.changed.values()), {edited, new})
+        self.assertEqual(diff.unchanged, 1)
+        self.assertEqual(
+            diff.vanished, sorted(frame_point_id("instagram", "ABC", i) for i in (4, 5))
+        )
+        self.assertEqual(set(diff.hashes), set(frames))
+
+        store_embeds.delete_points(diff.vanished)
+        left = {str(p.id) for p in self.qdrant.scroll("test_frames", limit=10)[0]}
+        self.assertEqual(
+            left, {frame_point_id("instagram", c, i) for c, i in (("ABC", 1), ("ABC", 2), ("XYZ", 1))}
+        )
+
+    def test_hash_tracks_timestamp_in_name(self):
+        a = self.frame("1_0.50.png", b"same")
+        b = self.frame("1_0.90.png", b"same")
+        self.assertNotEqual(reindex.content_hash(a), reindex.content_hash(b))
+
+    def test_first_run_and_hashless_points_are_changed(self):
+        fp = self.frame("1_0.50.png", b"x")
+        self.store("ABC", 1)  # legacy point without content_hash
+        diff = reindex.plan("ABC", {frame_point_id("instagram", "ABC", 1): fp})
+        self.assertEqual(list(diff.changed.values()), [fp])
+        self.assertEqual(diff.vanished, [])
+
+    def test_qdrant_down_falls_back_to_full_upsert(self):
+        fp = self.frame("1_0.50.png", b"x")
+        self.store("ABC", 7)
+        with patch.object(store_embeds, "existing_hashes", side_effect=ConnectionError("down")):
+            diff = reindex.plan("ABC", {"id-1": fp})
+        self.assertEqual(diff.changed, {"id-1": fp})
+        self.assertEqual(diff.vanished, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import sys
+import threading
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.env_config import settings
+from lib import write_version
+from qdrant_client import QdrantClient, models
+from src import store_embeds
+
+DIM = 8
+
+
+def _points(n: int, offset: int = 0):
+    return [
+        {
+            "id": offset + i + 1,
+            "vector": [float((offset + i) % 7 + 1)] * DIM,
+            "payload": {"video_code": "ABC", "frame_number": offset + i + 1},
+        }
+        for i in range(n)
+    ]
+
+
+class RecordingClient:
+    """Stands in for QdrantClient; tracks wait flags and concurrency."""
+
+    def __init__(self, delay: float = 0.01, fail_on: int | None = None, shards: int = 1):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.shards = shards
+        self.calls = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_collection(self, collection_name):
+        params = models.CollectionParams(shard_number=self.shards)
+        return SimpleNamespace(config=SimpleNamespace(params=params))
+
+    def upsert(self, collection_name, wait, points):
+        if collection_name == settings.versions_collection:
+            return  # write-version bump, not a data request
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append((wait, list(points.ids)))
+            n = len(self.calls)
+        try:
+            time.sleep(self.delay)
+            if n == self.fail_on:
+                raise RuntimeError("qdrant unavailable")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestUpsertEmbeddings(unittest.TestCase):
+    def setUp(self):
+        self.settings = replace(settings, collection="test_frames", dim=DIM, upsert_batch=10, upsert_parallel=3)
+        for patcher in (
+            patch.object(store_embeds, "settings", self.settings),
+            patch.object(store_embeds, "_QD", None),
+            patch.object(store_embeds, "_SHARDS", {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_single_barrier_after_intermediate_requests(self):
+        client = RecordingClient()
+        store_embeds._QD = client
+        store_embeds.upsert_embeddings(_points(95))
+
+        waits = [w for w, _ in client.calls]
+        self.assertEqual(len(waits), 10)
+        self.assertEqual(waits.count(True), 1)
+        self.assertTrue(client.calls[-1][0])
+        self.assertEqual(sorted(i for _, ids in client.calls for i in ids), list(range(1, 96)))
+
+    def test_multi_shard_collection_waits_on_every_request(self):
+        client = RecordingClient(shards=3)
+        store_embeds._QD = client
+        store_embeds.upsert_embeddings(_points(35))
+        self.assertEqual([w for w, _ in client.calls], [True] * 4)
+
+    def test_in_flight_requests_are_bounded(self):
+        client = RecordingClient(delay=0.02)
+        store_embeds._QD = client
+        store_embeds.upsert_embeddings(_points(200), parallel=3)
+        self.assertGreater(client.peak, 1)
+        self.assertLessEqual(client.peak, 3)
+
+    def test_small_video_is_one_waited_request(self):
+        client = RecordingClient()
+        store_embeds._QD = client
+        store_embeds.upsert_embeddings(_points(4))
+        self.assertEqual(client.calls, [(True, [1, 2, 3, 4])])
+
+    def test_failure_raises_without_sending_barrier(self):
+        client = RecordingClient(fail_on=2)
+        store_embeds._QD = client
+        with self.assertRaises(RuntimeError):
+            store_embeds.upsert_embeddings(_points(60))
+        self.assertFalse(any(w for w, _ in client.calls))
+
+    def test_local_qdrant_roundtrip(self):
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            collection_name=self.settings.collection,
+            vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+        )
+        store_embeds._QD = client
+        store_embeds.upsert_embeddings(_points(57))
+        store_embeds.upsert_embeddings(_points(57))  # idempotent ids
+        self.assertEqual(client.count(self.settings.collection, exact=True).count, 57)
+
+    def test_writes_bump_the_collection_version(self):
+        client = QdrantClient(":memory:")
+        store_embeds._QD = client
+        store_embeds._ensure_collection()
+        store_embeds.upsert_embeddings(_points(3))
+        after_upsert = write_version.read(client, self.settings.collection)
+        self.assertTrue(after_upsert)
+        store_embeds.delete_points([1])
+        self.assertNotEqual(write_version.read(client, self.settings.collection), after_upsert)
+
+    def test_matryoshka_layout_stores_full_and_mini(self):
+        client = QdrantClient(":memory:")
+        store_embeds._QD = client
+        with patch.object(store_embeds, "settings", replace(self.settings, mini_dim=2)):
+            store_embeds._ensure_collection()
+            store_embeds.upsert_embeddings(_points(3))
+        (point,) = client.retrieve(self.settings.collection, ids=[2], with_vectors=True)
+        self.assertEqual(len(point.vector["full"]), DIM)
+        self.assertEqual(len(point.vector["mini"]), 2)
+        self.assertAlmostEqual(sum(x * x for x in point.vector["mini"]), 1.0, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
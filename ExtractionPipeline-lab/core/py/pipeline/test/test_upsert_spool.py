@@ -0,0 +1,196 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from config.env_config import settings
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+from src import store_embeds, upsert_spool
+
+ROOT = Path(__file__).parent.parent
+DIM = 8
+
+
+def _points(n: int, offset: int = 0):
+    return [
+        {
+            "id": offset + i + 1,
+            "vector": [float(offset + i + 1)] + [0.5] * (DIM - 1),
+            "payload": {"video_code": "ABC", "frame_number": offset + i + 1},
+        }
+        for i in range(n)
+    ]
+
+
+class DownClient:
+    def upsert(self, **kw):
+        raise ConnectionError("qdrant unavailable")
+
+
+class RejectingClient:
+    """Forwards to `inner` but answers `status` for any batch holding a poison id."""
+
+    def __init__(self, inner, poison, status=400):
+        self.inner, self.poison, self.status = inner, set(poison), status
+
+    def upsert(self, **kw):
+        if self.poison & set(kw["points"].ids):
+            body = b'{"status":{"error":"wrong vector size"}}'
+            raise UnexpectedResponse(self.status, "Bad Request", body, httpx.Headers())
+        return self.inner.upsert(**kw)
+
+
+class TestUpsertSpool(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.spool = Path(self._tmp.name) / "spool"
+        self.settings = replace(
+            settings,
+            spool_dir=self.spool,
+            collection="test_frames",
+            dim=DIM,
+            upsert_batch=16,
+            spool_drain_batch=10,
+        )
+        self.qdrant = QdrantClient(":memory:")
+        self.qdrant.create_collection(
+            collection_name="test_frames",
+            vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+        )
+        for patcher in (
+            patch.object(upsert_spool, "settings", self.settings),
+            patch.object(store_embeds, "settings", self.settings),
+            patch.object(store_embeds, "_QD", self.qdrant),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def count(self) -> int:
+        return self.qdrant.count("test_frames", exact=True).count
+
+    def test_roundtrip_preserves_vectors_and_payload(self):
+        self.assertTrue(upsert_spool.upsert(_points(25)))
+        self.assertEqual(self.count(), 25)
+        self.assertEqual(upsert_spool.pending_bytes(), 0)
+        self.assertEqual((self.spool / "upserts.log").stat().st_size, 0)
+
+        [pt] = self.qdrant.retrieve("test_frames", [7], with_vectors=True)
+        self.assertEqual(pt.payload["frame_number"], 7)
+        self.assertGreater(pt.vector[0], pt.vector[1])
+
+    def test_outage_keeps_points_spooled(self):
+        with patch.object(store_embeds, "_QD", DownClient()):
+            self.assertFalse(upsert_spool.upsert(_points(12)))
+            self.assertFalse(upsert_spool.upsert(_points(5, offset=12)))
+        self.assertGreater(upsert_spool.pending_bytes(), 0)
+        self.assertEqual(self.count(), 0)
+
+        self.assertEqual(upsert_spool.drain(), 17)
+        self.assertEqual(self.count(), 17)
+        self.assertEqual(upsert_spool.pending_bytes(), 0)
+
+    def test_rejected_record_is_dead_lettered_and_does_not_block(self):
+        upsert_spool.append(_points(25))
+        with patch.object(store_embeds, "_QD", RejectingClient(self.qdrant, poison={7, 18})):
+            self.assertEqual(upsert_spool.drain(), 23)
+        self.assertEqual(self.count(), 23)
+        self.assertEqual(upsert_spool.pending_bytes(), 0)
+
+        dead = [json.loads(line) for line in (self.spool / "upserts.dead").read_text().splitlines()]
+        self.assertEqual([d["record"]["id"] for d in dead], [7, 18])
+        self.assertIn("400", dead[0]["error"])
+
+        upsert_spool.append(_points(2, offset=25))
+        self.assertEqual(upsert_spool.drain(), 2)
+        self.assertEqual(self.count(), 25)
+
+    def test_transient_error_status_stays_spooled(self):
+        upsert_spool.append(_points(5))
+        for status in (429, 503):
+            with patch.object(store_embeds, "_QD", RejectingClient(self.qdrant, poison={3}, status=status)):
+                with self.assertRaises(UnexpectedResponse):
+                    upsert_spool.drain()
+        self.assertFalse((self.spool / "upserts.dead").exists())
+        self.assertEqual(upsert_spool.drain(), 5)
+
+    def test_replay_after_process_crash(self):
+        script = textwrap.dedent(
+            f"""
+            import os, sys
+            sys.path.insert(0, {str(ROOT)!r})
+            from src import upsert_spool
+            upsert_spool.append({_points(30)!r})
+            os._exit(1)  # die before any drain
+            """
+        )
+        env = dict(os.environ, VP_SPOOL_DIR=str(self.spool), VP_OUTPUT_DIR=self._tmp.name)
+        proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env)
+        self.assertEqual(proc.returncode, 1)
+
+        self.assertEqual(upsert_spool.drain(), 30)
+        self.assertEqual(self.count(), 30)
+
+    def test_torn_record_is_skipped_and_later_appends_survive(self):
+        upsert_spool.append(_points(3))
+        record = upsert_spool._encode(_points(1, offset=3)[0])
+        with open(self.spool / "upserts.log", "ab") as fh:
+            fh.write(record[: len(record) // 2])  # crash mid-write
+        upsert_spool.append(_points(2, offset=4))
+
+        self.assertEqual(upsert_spool.drain(), 5)
+        ids = sorted(p.id for p in self.qdrant.scroll("test_frames", limit=10)[0])
+        self.assertEqual(ids, [1, 2, 3, 5, 6])
+
+    def test_torn_tail_is_dropped(self):
+        upsert_spool.append(_points(3))
+        with open(self.spool / "upserts.log", "ab") as fh:
+            fh.write(upsert_spool._encode(_points(1, offset=3)[0])[:20])
+        self.assertEqual(upsert_spool.drain(), 3)
+        self.assertEqual(upsert_spool.pending_bytes(), 0)
+
+    def test_crash_before_offset_commit_replays_idempotently(self):
+        upsert_spool.append(_points(20))
+        with patch.object(upsert_spool, "_write_offset", side_effect=OSError("killed")):
+            with self.assertRaises(OSError):
+                upsert_spool.drain()
+        self.assertEqual(self.count(), 10)  # first step reached Qdrant, offset did not move
+
+        self.assertEqual(upsert_spool.drain(), 20)
+        self.assertEqual(self.count(), 20)
+
+    def test_small_read_window(self):
+        upsert_spool.append(_points(40))
+        with patch.object(upsert_spool, "_WINDOW", 700):
+            self.assertEqual(upsert_spool.drain(), 40)
+        self.assertEqual(self.count(), 40)
+
+    def test_single_drainer(self):
+        upsert_spool.append(_points(4))
+        with upsert_spool._flock("drain.lock"):
+            script = textwrap.dedent(
+                f"""
+                import sys
+                sys.path.insert(0, {str(ROOT)!r})
+                from src import upsert_spool
+                sys.exit(upsert_spool.drain())
+                """
+            )
+            env = dict(os.environ, VP_SPOOL_DIR=str(self.spool), VP_OUTPUT_DIR=self._tmp.name)
+            proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env)
+        self.assertEqual(proc.returncode, 0)  # busy → returned without draining
+        self.assertGreater(upsert_spool.pending_bytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
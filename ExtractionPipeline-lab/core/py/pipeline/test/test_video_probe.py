@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib import ffmpeg_utils
+from lib.ffmpeg_utils import VideoInfo, probe_video
+
+FFPROBE_JSON = {
+    "packets": [
+        {"pts_time": "0.000000", "flags": "K__"},
+        {"pts_time": "0.033367", "flags": "___"},
+        {"pts_time": "2.002000", "flags": "K__"},
+        {"pts_time": "4.004000", "flags": "K__"},
+        {"pts_time": "6.006000", "flags": "K__"},
+    ],
+    "streams": [
+        {
+            "codec_name": "H264",
+            "width": 1080,
+            "height": 1920,
+            "r_frame_rate": "30000/1001",
+            "avg_frame_rate": "30000/1001",
+            "nb_frames": "450",
+            "duration": "15.015000",
+            "side_data_list": [{"rotation": -90}],
+        }
+    ],
+    "format": {"duration": "15.050000"},
+}
+
+
+class TestProbeVideo(unittest.TestCase):
+    def setUp(self):
+        ffmpeg_utils._probe_cached.cache_clear()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.video = Path(self._tmp.name) / "ABC.mp4"
+        self.video.write_bytes(b"\x00" * 64)
+
+    def probe(self, payload=FFPROBE_JSON):
+        with patch.object(
+            ffmpeg_utils.subprocess, "check_output", return_value=json.dumps(payload)
+        ) as check_output:
+            info = probe_video(self.video)
+        return info, check_output
+
+    def test_single_call_parses_everything(self):
+        info, check_output = self.probe()
+        check_output.assert_called_once()
+        self.assertIsInstance(info, VideoInfo)
+        self.assertAlmostEqual(info.fps, 29.97, places=2)
+        self.assertEqual(info.frame_count, 450)
+        self.assertAlmostEqual(info.duration, 15.015)
+        self.assertEqual((info.width, info.height), (1080, 1920))
+        self.assertEqual(info.rotation, 90)
+        self.assertEqual(info.display_size, (1920, 1080))
+        self.assertEqual(info.codec, "h264")
+        self.assertAlmostEqual(info.keyframe_interval, 2.002)
+
+    def test_missing_fields_fall_back(self):
+        payload = {
+            "streams": [{"codec_name": "vp9", "r_frame_rate": "25/1", "avg_frame_rate": "0/0"}],
+            "format": {"duration": "4.0"},
+        }
+        info, _ = self.probe(payload)
+        self.assertEqual(info.fps, 25.0)
+        self.assertEqual(info.duration, 4.0)
+        self.assertEqual(info.frame_count, 100)
+        self.assertEqual(info.rotation, 0)
+        self.assertIsNone(info.keyframe_interval)
+
+    def test_cached_by_path_size_and_mtime(self):
+        first, _ = self.probe()
+        second, check_output = self.probe()
+        self.assertIs(first, second)
+        check_output.assert_not_called()
+
+        self.video.write_bytes(b"\x00" * 128)
+        os.utime(self.video, ns=(1, 1))
+        _, check_output = self.probe()
+        check_output.assert_called_once()
+
+    def test_info_is_immutable(self):
+        info, _ = self.probe()
+        with self.assertRaises(Exception):
+            info.fps = 60.0
+
+    def test_detect_crop_reuses_info(self):
+        info, _ = self.probe({"streams": [{}], "format": {}})
+        with patch.object(ffmpeg_utils.subprocess, "check_output") as check_output, patch.object(
+            ffmpeg_utils.subprocess, "run"
+        ) as run:
+            self.assertIsNone(ffmpeg_utils.detect_crop_ffmpeg(str(self.video), info=info))
+        check_output.assert_not_called()
+        run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
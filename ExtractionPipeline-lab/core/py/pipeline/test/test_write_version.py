@@ -0,0 +1,36 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib import write_version
+from qdrant_client import QdrantClient
+
+
+class TestWriteVersion(unittest.TestCase):
+    def setUp(self):
+        self.client = QdrantClient(":memory:")
+
+    def test_unbumped_collection_reads_empty(self):
+        self.assertEqual(write_version.read(self.client, "frames"), "")
+
+    def test_bump_changes_only_its_collection(self):
+        write_version.bump(self.client, "other")
+        first = write_version.bump(self.client, "frames")
+        self.assertEqual(write_version.read(self.client, "frames"), first)
+        other = write_version.read(self.client, "other")
+
+        second = write_version.bump(self.client, "frames")
+        self.assertNotEqual(second, first)
+        self.assertEqual(write_version.read(self.client, "frames"), second)
+        self.assertEqual(write_version.read(self.client, "other"), other)
+
+    def test_one_point_per_collection(self):
+        for _ in range(3):
+            write_version.bump(self.client, "frames", versions="_v")
+        self.assertEqual(self.client.count("_v", exact=True).count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
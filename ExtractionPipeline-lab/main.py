@@ -11,7 +11,8 @@ Implements batch processing orchestrator following the specified algorithm:
    c. Build job_input = [{"platform": r.platform, "code": r.code} for r in rows]
    d. Invoke pipeline through subprocess.run with JOB_INPUT=json.dumps(job_input)
    e. After success, call mark_extracted([r.id …]);
-      Qdrant upsert from pipeline will be polled and then mark_embedded
+      the batch's codes are polled in Qdrant (bulk facet on video_code) and
+      only the rows whose code has vectors are passed to mark_embedded
    f. Update checkpoint with highest id
    g. Sleep small delay to avoid DB hammering
 3. Catch subprocess.CalledProcessError — log and continue (do not advance checkpoint)
@@ -33,6 +34,10 @@ from dotenv import load_dotenv
 from psycopg2.extras import DictCursor
 from qdrant_client import QdrantClient
 
+# bulk embedded-status checks are shared with the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parent / "core" / "py" / "pipeline"))
+from lib.embed_status import embedded_codes  # noqa: E402
+
 # Load environment variables
 load_dotenv(".env")
 
@@ -61,6 +66,8 @@ BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
 SLEEP_DELAY = float(os.getenv("SLEEP_DELAY", "0.5"))
 CHECKPOINT_FILE = os.getenv("CHECKPOINT_FILE", "checkpoint.txt")
 PIPELINE_SCRIPT = os.getenv("PIPELINE_SCRIPT", "core/py/pipeline/entrypoint.py")
+# Backfills default to the fast key-frame profile; the realtime API keeps "scene"
+EXTRACT_MODE = os.getenv("BACKFILL_EXTRACT_MODE", "keyframes")
 
 # Ensure required environment variables are set
 if not all([DB_HOST, DB_NAME, DB_USER, DB_PASSWORD]):
@@ -76,6 +83,7 @@ class BatchOrchestrator:
     def __init__(self):
         self.db_conn = None
         self.qdrant_client = None
+        self._has_embedded_column: Optional[bool] = None
         self.checkpoint_id = 0
         self.total_processed = 0
         self.setup_connections()
@@ -195,17 +203,19 @@ class BatchOrchestrator:
 
         try:
             with self.db_conn.cursor() as cur:
-                # Check if we have an is_embedded column, if not, we'll skip this step
-                cur.execute(
+                # Check once whether we have an is_embedded column, if not, we'll skip this step
+                if self._has_embedded_column is None:
+                    cur.execute(
+                        """
+                        SELECT column_name
+                        FROM information_schema.columns
+                        WHERE table_name = 'insta_content'
+                          AND column_name = 'is_embedded'
                     """
-                    SELECT column_name
-                    FROM information_schema.columns
-                    WHERE table_name = 'insta_content'
-                      AND column_name = 'is_embedded'
-                """
-                )
+                    )
+                    self._has_embedded_column = cur.fetchone() is not None
 
-                if cur.fetchone():
+                if self._has_embedded_column:
                     cur.execute(
                         """
                         UPDATE insta_content
@@ -221,43 +231,48 @@ class BatchOrchestrator:
         except Exception as e:
             log.error(f"❌ Failed to mark rows as embedded: {e}")
 
-    def wait_for_qdrant_upsert(self, expected_count: int, timeout: int = 60) -> bool:
+    def wait_for_qdrant_upsert(self, codes: List[str], timeout: int = 60) -> set:
         """
-        Poll Qdrant to verify that embeddings have been upserted.
+        Poll Qdrant until every code of the batch has vectors (or timeout).
+
+        Each poll is one bulk facet request for the codes still missing, so
+        concurrent writers to the collection cannot fake or hide progress the
+        way a collection-wide count() did.
 
         Args:
-            expected_count: Expected number of new points
+            codes: Video codes of the batch
             timeout: Maximum time to wait in seconds
 
         Returns:
-            True if upsert verified, False if timeout
+            The codes verified as embedded (all of them without a Qdrant client)
         """
         if not self.qdrant_client:
             log.debug("⚠️ No Qdrant client, skipping upsert verification")
-            return True
+            return set(codes)
 
+        done: set = set()
+        pending = list(dict.fromkeys(codes))
+        deadline = time.time() + timeout
+        delay = 0.5
         try:
-            initial_count = self.qdrant_client.count(collection_name=QDRANT_COLLECTION).count
-            start_time = time.time()
-
-            while time.time() - start_time < timeout:
-                current_count = self.qdrant_client.count(collection_name=QDRANT_COLLECTION).count
-                new_points = current_count - initial_count
-
-                if new_points >= expected_count:
-                    log.debug(f"✅ Qdrant upsert verified: {new_points} new points")
-                    return True
-
-                time.sleep(1)  # Poll every second
+            while True:
+                done |= embedded_codes(self.qdrant_client, QDRANT_COLLECTION, pending)
+                pending = [c for c in pending if c not in done]
+                if not pending:
+                    log.debug(f"✅ Qdrant upsert verified for all {len(done)} codes")
+                    return done
+                if time.time() + delay > deadline:
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, 8.0)
 
             log.warning(
-                f"⚠️ Qdrant upsert timeout: expected {expected_count}, got {current_count - initial_count}"
+                f"⚠️ Qdrant upsert timeout: {len(done)}/{len(done) + len(pending)} codes embedded, "
+                f"missing e.g. {pending[:10]}"
             )
-            return False
-
         except Exception as e:
             log.error(f"❌ Failed to verify Qdrant upsert: {e}")
-            return False
+        return done
 
     def run_pipeline(self, job_input: List[Dict[str, str]]) -> bool:
         """
@@ -276,6 +291,7 @@ class BatchOrchestrator:
             # Prepare environment with JOB_INPUT
             env = os.environ.copy()
             env["JOB_INPUT"] = job_input_json
+            env.setdefault("VP_EXTRACT_MODE", EXTRACT_MODE)
 
             # Construct command
             cmd = [sys.executable, PIPELINE_SCRIPT]
@@ -310,7 +326,10 @@ class BatchOrchestrator:
     def run(self):
         """Main orchestrator loop."""
         log.info("🎬 Starting batch orchestrator")
-        log.info(f"📊 Configuration: batch_size={BATCH_SIZE}, sleep_delay={SLEEP_DELAY}s")
+        log.info(
+            f"📊 Configuration: batch_size={BATCH_SIZE}, sleep_delay={SLEEP_DELAY}s, "
+            f"extract_mode={os.getenv('VP_EXTRACT_MODE', EXTRACT_MODE)}"
+        )
 
         # Initialize progress bar
         pbar = tqdm.tqdm(desc="Processing batches", unit="items", initial=self.total_processed)
@@ -341,9 +360,9 @@ class BatchOrchestrator:
                     # Mark as extracted
                     self.mark_extracted(row_ids)
 
-                    # Wait for Qdrant upsert and mark as embedded
-                    if self.wait_for_qdrant_upsert(len(rows)):
-                        self.mark_embedded(row_ids)
+                    # Wait for Qdrant upsert and mark the verified rows as embedded
+                    embedded = self.wait_for_qdrant_upsert([row["code"] for row in rows])
+                    self.mark_embedded([row["id"] for row in rows if row["code"] in embedded])
 
                     # Update checkpoint
                     self.save_checkpoint(highest_id)
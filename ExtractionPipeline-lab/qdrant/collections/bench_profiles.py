@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Recall / latency / RAM benchmark for the tuning profiles in create.py.
+
+For every profile a scratch collection `bench_<profile>` is filled with the
+same vectors, then each query is run at several `hnsw_ef` values and
+compared with brute-force ground truth (numpy, cosine):
+
+    recall@k  – overlap with the exact top-k
+    p50 / p99 – client-side query latency
+    est. RAM  – vectors + quantized copies + HNSW links that the profile
+                keeps in memory (payload and WAL not included)
+
+With --mini-dim N the collections use the named `full` + `mini` layout
+and queries run in two stages (prefetch on the N-d Matryoshka prefix,
+rerank on the full vector), as the search API does for such collections.
+
+Vectors are synthetic, clustered and L2-normalised (CLIP-like) unless a
+`.npy` matrix of real embeddings is given.
+
+    python bench_profiles.py                                # in-memory stand-in
+    python bench_profiles.py --url http://localhost:6333 --n 100000
+    python bench_profiles.py --url http://localhost:6333 --vectors frames.npy --ef 32 64 128
+    python bench_profiles.py --url http://localhost:6333 --n 100000 --mini-dim 128
+
+The in-memory stand-in ignores HNSW and quantization (it always searches
+exactly), so it only validates the harness and the RAM estimate; recall
+and latency numbers are meaningful against a real Qdrant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+from create import PROFILES, build_hnsw, build_optimizers, build_quantization, resolve_config
+
+
+def synthetic_vectors(n: int, dim: int, *, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    x = centres[rng.integers(0, clusters, n)] + 0.35 * rng.normal(size=(n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def prefix(x: np.ndarray, dim: int) -> np.ndarray:
+    head = x[..., :dim]
+    return head / np.linalg.norm(head, axis=-1, keepdims=True)
+
+
+def estimate_ram(n: int, dim: int, cfg: Dict[str, Any], mini_dim: int = 0) -> int:
+    """Bytes the profile keeps resident for `n` vectors of `dim` floats."""
+    ram = 0 if cfg["vector_params"].get("on_disk") else n * dim * 4
+    if mini_dim:  # mini vector (float32, RAM) with its own graph
+        ram += n * mini_dim * 4 + n * (cfg.get("hnsw_config") or {}).get("m", 16) * 2 * 4
+    quant = cfg.get("quantization_config")
+    if isinstance(quant, dict):
+        section = next(iter(quant.values()))
+        if section.get("always_ram", True):
+            ram += n * dim if "scalar" in quant else n * dim // 8
+    hnsw = cfg.get("hnsw_config") or {}
+    if not hnsw.get("on_disk"):
+        ram += n * hnsw.get("m", 16) * 2 * 4  # layer-0 links dominate: 2m ids of 4 bytes
+    return ram
+
+
+def build_collection(
+    client: QdrantClient, name: str, cfg: Dict[str, Any], vectors: np.ndarray, batch: int, mini_dim: int
+):
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    quantization = build_quantization(cfg.get("quantization_config"))
+    vectors_config = models.VectorParams(
+        size=vectors.shape[1],
+        distance=models.Distance.COSINE,
+        on_disk=cfg["vector_params"].get("on_disk"),
+    )
+    if mini_dim:
+        vectors_config = {
+            "full": vectors_config,
+            "mini": models.VectorParams(size=mini_dim, distance=models.Distance.COSINE, on_disk=False),
+        }
+    client.create_collection(
+        collection_name=name,
+        vectors_config=vectors_config,
+        hnsw_config=build_hnsw(cfg.get("hnsw_config")),
+        optimizers_config=build_optimizers(cfg.get("optimizers_config")),
+        quantization_config=None if quantization == models.Disabled.DISABLED else quantization,
+        on_disk_payload=cfg.get("on_disk_payload"),
+    )
+    for i in range(0, len(vectors), batch):
+        chunk = vectors[i : i + batch]
+        columns = {"full": chunk.tolist(), "mini": prefix(chunk, mini_dim).tolist()} if mini_dim else chunk.tolist()
+        client.upsert(
+            collection_name=name,
+            points=models.Batch(ids=list(range(i, i + len(chunk))), vectors=columns),
+            wait=True,
+        )
+    # wait until the optimizer has built the index / quantized copies
+    deadline = time.time() + 600
+    while time.time() < deadline:
+        info = client.get_collection(name)
+        if info.status == models.CollectionStatus.GREEN:
+            break
+        time.sleep(1)
+
+
+def run_queries(client, name, queries, truth, *, k, ef, oversampling, mini_dim, prefetch) -> Dict[str, float]:
+    params = models.SearchParams(
+        hnsw_ef=ef,
+        quantization=models.QuantizationSearchParams(rescore=True, oversampling=oversampling),
+    )
+    latencies: List[float] = []
+    hits = 0
+    for q, expected in zip(queries, truth):
+        kw: Dict[str, Any] = {}
+        if mini_dim:
+            kw = {
+                "using": "full",
+                "prefetch": models.Prefetch(
+                    query=prefix(q, mini_dim).tolist(), using="mini", limit=max(prefetch, k), params=params
+                ),
+            }
+        t0 = time.perf_counter()
+        res = client.query_points(name, query=q.tolist(), limit=k, search_params=params, with_payload=False, **kw)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len({p.id for p in res.points} & set(expected))
+    latencies.sort()
+    return {
+        "recall": hits / (len(queries) * k),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--url", default=":memory:", help="Qdrant URL or ':memory:'")
+    ap.add_argument("--api-key", default=None)
+    ap.add_argument("--vectors", type=Path, help=".npy matrix of real embeddings")
+    ap.add_argument("--n", type=int, default=20000, help="synthetic vectors (ignored with --vectors)")
+    ap.add_argument("--dim", type=int, default=512)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--ef", type=int, nargs="+", default=[64, 128])
+    ap.add_argument("--oversampling", type=float, default=2.0)
+    ap.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES))
+    ap.add_argument("--batch", type=int, default=512)
+    ap.add_argument("--mini-dim", type=int, default=0, help="two-stage: Matryoshka prefix size (0 = off)")
+    ap.add_argument("--prefetch", type=int, default=100, help="two-stage: candidates from the mini vector")
+    ap.add_argument("--keep", action="store_true", help="keep the bench_* collections")
+    ap.add_argument("--json", type=Path, help="also write the results here")
+    args = ap.parse_args()
+
+    if args.vectors:
+        vectors = np.load(args.vectors).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    else:
+        vectors = synthetic_vectors(args.n, args.dim)
+    n, dim = vectors.shape
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(n, size=min(args.queries, n), replace=False)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, : args.k].tolist()
+
+    client = QdrantClient(args.url) if args.url == ":memory:" else QdrantClient(url=args.url, api_key=args.api_key)
+    if args.url == ":memory:":
+        print("⚠️  in-memory stand-in: HNSW / quantization are ignored, recall is always exact")
+
+    stages = f", two-stage mini={args.mini_dim} prefetch={args.prefetch}" if args.mini_dim else ""
+    print(f"{n} vectors × {dim} dims, {len(queries)} queries, k={args.k}{stages}\n")
+    print(f"{'profile':<10} {'ef':>5} {'recall':>8} {'p50 ms':>8} {'p99 ms':>8} {'est. RAM':>10}")
+    results = []
+    for profile in args.profiles:
+        cfg = resolve_config({"vector_params": {"size": dim, "distance": "Cosine"}}, profile)
+        name = f"bench_{profile}"
+        t0 = time.perf_counter()
+        build_collection(client, name, cfg, vectors, args.batch, args.mini_dim)
+        build_s = time.perf_counter() - t0
+        ram = estimate_ram(n, dim, cfg, args.mini_dim)
+        for ef in args.ef:
+            row = run_queries(
+                client,
+                name,
+                queries,
+                truth,
+                k=args.k,
+                ef=ef,
+                oversampling=args.oversampling,
+                mini_dim=args.mini_dim,
+                prefetch=args.prefetch,
+            )
+            row.update(profile=profile, ef=ef, est_ram_mb=ram / 2**20, build_s=build_s, mini_dim=args.mini_dim)
+            results.append(row)
+            print(
+                f"{profile:<10} {ef:>5} {row['recall']:>8.3f} {row['p50_ms']:>8.2f} "
+                f"{row['p99_ms']:>8.2f} {row['est_ram_mb']:>8.1f}MB"
+            )
+        if not args.keep:
+            client.delete_collection(name)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 results → {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,40 @@
 #!/usr/bin/env python3
 """
-A generic, configuration-driven script to create a Qdrant collection.
+A generic, configuration-driven script to create (and tune) a Qdrant collection.
 
 This script reads all necessary parameters from a JSON configuration file,
 making it reusable for any collection. It is idempotent and safe to run
 multiple times.
 
+Besides size, distance and payload indexes a config may carry storage /
+index tuning, either as a named profile or as explicit sections (explicit
+sections override the profile key by key):
+
+    "profile": "balanced",                       # memory | balanced | compact
+    "vector_params": {"size": 512, "distance": "Cosine", "on_disk": true},
+    "hnsw_config": {"m": 16, "ef_construct": 128, "on_disk": false},
+    "quantization_config": {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": true}},
+                       # or {"binary": {"always_ram": true}} or "disabled"
+    "optimizers_config": {"indexing_threshold": 20000, "memmap_threshold": 50000},
+    "on_disk_payload": true
+
+Named vectors: give the main vector a "name" and list further vectors under
+"extra_vectors" – e.g. a Matryoshka prefix kept in RAM for a cheap first
+search stage (tuning options above apply to the main vector):
+
+    "vector_params": {"name": "full", "size": 512, "distance": "Cosine"},
+    "extra_vectors": {"mini": {"size": 128, "distance": "Cosine", "on_disk": false}}
+
+An existing collection is only tuned with --update: the live config is
+diffed against the file and the differences are applied with a single
+update_collection call (Qdrant rebuilds indexes / quantized vectors in
+the background).  Size and distance cannot be changed that way.
+
 Usage:
-    python create_collection.py path/to/your_collection_config.json
+    python create.py path/to/your_collection_config.json
+    python create.py watched_frames.json --update            # apply tuning changes
+    python create.py watched_frames.json --update --dry-run  # only show the diff
+    python create.py watched_frames.json --profile compact   # override the profile
 """
 
 from __future__ import annotations
@@ -17,6 +44,7 @@ import json
 import os
 import sys
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient, models
@@ -41,54 +69,252 @@ SCHEMA_TYPE_MAP = {
     "DATETIME": models.PayloadSchemaType.DATETIME,
 }
 
+# --- Tuning profiles ---
+# memory   – Qdrant defaults: float32 vectors, graph and payload in RAM.
+# balanced – float32 originals on disk, int8 copies in RAM (~4x less RAM),
+#            searched with rescoring; the default for watched_frames.
+# compact  – 1-bit copies in RAM (~32x less), graph on disk too.  Needs
+#            oversampling + rescoring at query time to keep recall.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "memory": {
+        "vector_params": {"on_disk": False},
+        "quantization_config": "disabled",
+        "on_disk_payload": False,
+    },
+    "balanced": {
+        "vector_params": {"on_disk": True},
+        "hnsw_config": {"m": 16, "ef_construct": 128},
+        "quantization_config": {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}},
+        "optimizers_config": {"indexing_threshold": 20000, "memmap_threshold": 20000},
+        "on_disk_payload": True,
+    },
+    "compact": {
+        "vector_params": {"on_disk": True},
+        "hnsw_config": {"m": 16, "ef_construct": 128, "on_disk": True},
+        "quantization_config": {"binary": {"always_ram": True}},
+        "optimizers_config": {"indexing_threshold": 20000, "memmap_threshold": 20000},
+        "on_disk_payload": True,
+    },
+}
+
+
+def resolve_config(config: Dict[str, Any], profile: Optional[str] = None) -> Dict[str, Any]:
+    """Merge the selected profile under the explicit sections of `config`."""
+    name = profile or config.get("profile", "memory")
+    if name not in PROFILES:
+        sys.exit(f"❌  Unknown profile '{name}'. Choose one of: {', '.join(PROFILES)}")
+    resolved = dict(config, profile=name)
+    for key, value in PROFILES[name].items():
+        if isinstance(value, dict) and key != "quantization_config":
+            resolved[key] = {**value, **config.get(key, {})}
+        elif key not in config:
+            resolved[key] = value
+    return resolved
+
+
+# --- Builders: JSON sections → qdrant_client models ---
+
+
+def build_vector_params(vp: Dict[str, Any]) -> models.VectorParams:
+    distance_enum = DISTANCE_MAP.get(vp["distance"].upper())
+    if not distance_enum:
+        sys.exit(f"❌ Invalid distance metric: {vp['distance']}")
+    return models.VectorParams(size=vp["size"], distance=distance_enum, on_disk=vp.get("on_disk"))
+
+
+def build_vectors_config(cfg: Dict[str, Any]):
+    """Single unnamed VectorParams, or {name: VectorParams} with "extra_vectors"."""
+    main = build_vector_params(cfg["vector_params"])
+    name = cfg["vector_params"].get("name")
+    if not name:
+        if cfg.get("extra_vectors"):
+            sys.exit("❌ extra_vectors need a named main vector (vector_params.name)")
+        return main
+    extra = {k: build_vector_params(v) for k, v in cfg.get("extra_vectors", {}).items()}
+    return {name: main, **extra}
+
+
+def _main_vector(params: models.CollectionParams, cfg: Dict[str, Any]):
+    vectors = params.vectors
+    if isinstance(vectors, dict):
+        return vectors.get(cfg["vector_params"].get("name") or "")
+    return vectors
+
+
+def build_hnsw(cfg: Optional[Dict[str, Any]]) -> Optional[models.HnswConfigDiff]:
+    return models.HnswConfigDiff(**cfg) if cfg else None
+
+
+def build_optimizers(cfg: Optional[Dict[str, Any]]) -> Optional[models.OptimizersConfigDiff]:
+    return models.OptimizersConfigDiff(**cfg) if cfg else None
+
+
+def build_quantization(cfg: Any):
+    """{"scalar": {...}} | {"binary": {...}} | "disabled" | None → Qdrant model."""
+    if not cfg:
+        return None
+    if cfg == "disabled":
+        return models.Disabled.DISABLED
+    if "scalar" in cfg:
+        sc = dict(cfg["scalar"])
+        sc["type"] = models.ScalarType(sc.get("type", "int8").lower())
+        return models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(**sc))
+    if "binary" in cfg:
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(**cfg["binary"]))
+    sys.exit(f"❌ Invalid quantization_config: {cfg}")
+
+
+# --- Diff against a live collection ---
+
+
+def _quant_summary(q) -> Optional[Dict[str, Any]]:
+    if q is None or q == models.Disabled.DISABLED:
+        return None
+    if isinstance(q, models.ScalarQuantization):
+        s = q.scalar
+        return {"scalar": {"type": s.type.value, "quantile": s.quantile, "always_ram": s.always_ram}}
+    if isinstance(q, models.BinaryQuantization):
+        return {"binary": {"always_ram": q.binary.always_ram}}
+    return {"other": str(q)}
 
-def create_collection_from_config(config_path: Path):
+
+def tuning_diff(info: models.CollectionInfo, cfg: Dict[str, Any]) -> List[Tuple[str, Any, Any]]:
+    """(setting, live value, wanted value) for every tuning setting that differs."""
+    changes: List[Tuple[str, Any, Any]] = []
+    live = info.config
+
+    vectors = _main_vector(live.params, cfg)
+    want_on_disk = cfg["vector_params"].get("on_disk")
+    if vectors is not None and want_on_disk is not None and bool(vectors.on_disk) != want_on_disk:
+        changes.append(("vectors.on_disk", vectors.on_disk, want_on_disk))
+
+    for key, value in (cfg.get("hnsw_config") or {}).items():
+        current = getattr(live.hnsw_config, key, None)
+        if current != value:
+            changes.append((f"hnsw_config.{key}", current, value))
+
+    for key, value in (cfg.get("optimizers_config") or {}).items():
+        current = getattr(live.optimizer_config, key, None)
+        if current != value:
+            changes.append((f"optimizers_config.{key}", current, value))
+
+    if "quantization_config" in cfg:
+        current = _quant_summary(live.quantization_config)
+        wanted = _quant_summary(build_quantization(cfg["quantization_config"]))
+        if current != wanted:
+            changes.append(("quantization_config", current, wanted))
+
+    want_payload = cfg.get("on_disk_payload")
+    if want_payload is not None and bool(live.params.on_disk_payload) != want_payload:
+        changes.append(("on_disk_payload", live.params.on_disk_payload, want_payload))
+    return changes
+
+
+def apply_tuning(client: QdrantClient, name: str, cfg: Dict[str, Any], changes) -> None:
+    """One update_collection call carrying every changed section."""
+    changed = {c[0].split(".")[0] for c in changes}
+    kwargs: Dict[str, Any] = {}
+    if "vectors" in changed:
+        vector_name = cfg["vector_params"].get("name") or ""
+        kwargs["vectors_config"] = {
+            vector_name: models.VectorParamsDiff(on_disk=cfg["vector_params"]["on_disk"])
+        }
+    if "hnsw_config" in changed:
+        kwargs["hnsw_config"] = build_hnsw(cfg["hnsw_config"])
+    if "optimizers_config" in changed:
+        kwargs["optimizers_config"] = build_optimizers(cfg["optimizers_config"])
+    if "quantization_config" in changed:
+        kwargs["quantization_config"] = build_quantization(cfg["quantization_config"]) or models.Disabled.DISABLED
+    if "on_disk_payload" in changed:
+        kwargs["collection_params"] = models.CollectionParamsDiff(on_disk_payload=cfg["on_disk_payload"])
+    client.update_collection(collection_name=name, **kwargs)
+
+
+def create_collection_from_config(
+    config_path: Path,
+    *,
+    profile: Optional[str] = None,
+    update: bool = False,
+    dry_run: bool = False,
+    client: Optional[QdrantClient] = None,
+):
     """
     Connects to Qdrant and creates a collection based on a JSON config file.
+    With `update=True` an existing collection is tuned to match the file.
     """
     # --- 1. Load Configuration ---
     print(f"📄 Loading configuration from: {config_path}")
     try:
         with open(config_path, "r") as f:
-            config = json.load(f)
+            config = resolve_config(json.load(f), profile)
         collection_name = config["collection_name"]
         vector_params = config["vector_params"]
         payload_indexes = config.get("payload_indexes", [])
     except (FileNotFoundError, KeyError, json.JSONDecodeError) as e:
         sys.exit(f"❌  Error loading or parsing config file: {e}")
+    print(f"🎛️  Tuning profile: {config['profile']}")
 
     # --- 2. Connect to Qdrant ---
-    qdrant_url = os.getenv("QDRANT_URL")
-    qdrant_key = os.getenv("QDRANT_KEY")
+    if client is None:
+        qdrant_url = os.getenv("QDRANT_URL")
+        qdrant_key = os.getenv("QDRANT_KEY")
 
-    if not qdrant_url or not qdrant_key:
-        sys.exit("❌  QDRANT_URL and QDRANT_KEY must be set in your .env file")
+        if not qdrant_url or not qdrant_key:
+            sys.exit("❌  QDRANT_URL and QDRANT_KEY must be set in your .env file")
 
-    print(f"Connecting to Qdrant at {qdrant_url}...")
-    try:
-        client = QdrantClient(url=qdrant_url, api_key=qdrant_key)
-        client.get_collections()
-        print("✅  Connection successful.")
-    except Exception as e:
-        sys.exit(f"❌  Could not connect to Qdrant. Error: {e}")
+        print(f"Connecting to Qdrant at {qdrant_url}...")
+        try:
+            client = QdrantClient(url=qdrant_url, api_key=qdrant_key)
+            client.get_collections()
+            print("✅  Connection successful.")
+        except Exception as e:
+            sys.exit(f"❌  Could not connect to Qdrant. Error: {e}")
 
-    # --- 3. Create Collection (if it doesn't exist) ---
+    # --- 3. Create Collection (if it doesn't exist) or tune it ---
     try:
         existing_collections = [c.name for c in client.get_collections().collections]
         if collection_name in existing_collections:
             print(f"✅  Collection '{collection_name}' already exists.")
+            info = client.get_collection(collection_name=collection_name)
+            live = _main_vector(info.config.params, config)
+            if live is None:
+                print(
+                    f"⚠️  Live vector layout {info.config.params.vectors} does not match the config; "
+                    "that needs a migration, not an update."
+                )
+            elif (
+                live.size != vector_params["size"]
+                or live.distance != DISTANCE_MAP.get(vector_params["distance"].upper())
+            ):
+                print(
+                    f"⚠️  Live size/distance ({live.size}, {live.distance}) differ from the config; "
+                    "those need a migration, not an update."
+                )
+            changes = tuning_diff(info, config)
+            for setting, current, wanted in changes:
+                print(f"    ~ {setting}: {current} → {wanted}")
+            if not changes:
+                print("    Tuning matches the config.")
+            elif not update:
+                print("    Run with --update to apply these changes.")
+            elif dry_run:
+                print("    --dry-run: nothing applied.")
+            else:
+                apply_tuning(client, collection_name, config, changes)
+                print(f"    Applied {len(changes)} change(s); Qdrant re-optimizes in the background.")
         else:
             print(f"➕  Creating collection '{collection_name}'...")
-            distance_enum = DISTANCE_MAP.get(vector_params["distance"].upper())
-            if not distance_enum:
-                sys.exit(f"❌ Invalid distance metric: {vector_params['distance']}")
-
+            quantization = build_quantization(config.get("quantization_config"))
+            if dry_run:
+                print("    --dry-run: nothing created.")
+                return
             client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=vector_params["size"],
-                    distance=distance_enum,
-                ),
+                vectors_config=build_vectors_config(config),
+                hnsw_config=build_hnsw(config.get("hnsw_config")),
+                optimizers_config=build_optimizers(config.get("optimizers_config")),
+                quantization_config=None if quantization == models.Disabled.DISABLED else quantization,
+                on_disk_payload=config.get("on_disk_payload"),
             )
             print("    Collection created successfully.")
 
@@ -113,6 +339,8 @@ def create_collection_from_config(config_path: Path):
                     f"⚠️  Warning: Invalid schema type '{index_config['field_schema']}' for field '{field_name}'. Skipping."
                 )
                 continue
+            if dry_run:
+                continue
 
             client.create_payload_index(
                 collection_name=collection_name,
@@ -127,9 +355,17 @@ def create_collection_from_config(config_path: Path):
     # --- 5. Final Summary ---
     print("\n─ Final Collection Summary ─")
     final_info = client.get_collection(collection_name=collection_name)
+    final = final_info.config
     print(f"  Name          : {collection_name}")
-    print(f"  Vector size   : {final_info.config.params.vectors.size}")
-    print(f"  Distance      : {final_info.config.params.vectors.distance}")
+    main = _main_vector(final.params, config) or final.params.vectors
+    if isinstance(final.params.vectors, dict):
+        print(f"  Vectors       : { {k: v.size for k, v in final.params.vectors.items()} }")
+    print(f"  Vector size   : {getattr(main, 'size', '?')}")
+    print(f"  Distance      : {getattr(main, 'distance', '?')}")
+    print(f"  Vectors on disk : {bool(getattr(main, 'on_disk', False))}")
+    print(f"  HNSW m / ef_construct : {final.hnsw_config.m} / {final.hnsw_config.ef_construct}")
+    print(f"  Quantization  : {_quant_summary(final.quantization_config)}")
+    print(f"  Payload on disk : {bool(final.params.on_disk_payload)}")
     print(f"  Points count  : {final_info.points_count}")
     print(f"  Payload indexes : {list(final_info.payload_schema.keys())}")
     print("\n🎉  Process complete.")
@@ -144,9 +380,26 @@ if __name__ == "__main__":
         type=Path,
         help="Path to the JSON file defining the collection.",
     )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        help="Tuning profile (overrides the 'profile' key of the config).",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Apply tuning differences to an existing collection.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print what would be created / changed.",
+    )
     args = parser.parse_args()
 
     if not args.config_file.is_file():
         sys.exit(f"❌  Configuration file not found at: {args.config_file}")
 
-    create_collection_from_config(args.config_file)
+    create_collection_from_config(
+        args.config_file, profile=args.profile, update=args.update, dry_run=args.dry_run
+    )
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+add_mini_vectors.py – copy a single-vector frame collection into the
+named `full` + `mini` layout.
+
+Qdrant cannot add a named vector to an existing collection, so the new
+layout lives in its own collection (create it first from
+qdrant/collections/watched_frames_v2.json).  Every source point is
+upserted unchanged (same ID, same payload) with
+
+    full – the stored vector
+    mini – its first --mini-dim components, re-normalised
+           (`lib.matryoshka.prefix_vector`)
+
+Each scroll page is upserted with wait=True before the next offset is
+written to the checkpoint, so the copy can be killed and re-run.  Once it
+is done, point the pipeline and the search API at the new collection
+(QDRANT_COLLECTION) and set QDRANT_MINI_DIM to the same value.
+
+    python qdrant/scripts/add_mini_vectors.py --src watched_frames --dst watched_frames_v2
+    python qdrant/scripts/add_mini_vectors.py --mini-dim 64 --reset
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient, models
+
+# shared with the pipeline writers – lives in the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline"))
+from lib.matryoshka import named_vectors  # noqa: E402
+
+load_dotenv(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline" / ".env")
+
+
+def load_checkpoint(path: Path) -> Dict[str, Any]:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"offset": None, "copied": 0, "skipped": 0, "done": False}
+
+
+def save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+def run(
+    client: QdrantClient,
+    src: str,
+    dst: str,
+    checkpoint: Path,
+    *,
+    mini_dim: int = 128,
+    full: str = "full",
+    mini: str = "mini",
+    batch: int = 256,
+) -> Dict[str, Any]:
+    state = load_checkpoint(checkpoint)
+    if state.get("done"):
+        print(f"✅ {src} → {dst} already copied (delete {checkpoint} or pass --reset to re-run)")
+        return state
+
+    t0 = time.perf_counter()
+    start = state["copied"]
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=src,
+            limit=batch,
+            offset=state["offset"],
+            with_payload=True,
+            with_vectors=True,
+        )
+        upserts = []
+        for p in points:
+            if not isinstance(p.vector, list):  # already named / missing
+                state["skipped"] += 1
+                continue
+            vectors = named_vectors(p.vector, full=full, mini=mini, mini_dim=mini_dim)
+            upserts.append(models.PointStruct(id=p.id, vector=vectors, payload=p.payload))
+        if upserts:
+            client.upsert(collection_name=dst, points=upserts, wait=True)
+        state["copied"] += len(upserts)
+        state["offset"] = next_offset
+        state["done"] = next_offset is None
+        save_checkpoint(checkpoint, state)
+
+        rate = (state["copied"] - start) / max(time.perf_counter() - t0, 1e-6)
+        print(f"copied {state['copied']:>9} | skipped {state['skipped']:>6} | {rate:,.0f} pts/s")
+        if state["done"]:
+            return state
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--src", default=os.getenv("QDRANT_COLLECTION", "watched_frames"))
+    ap.add_argument("--dst", default="watched_frames_v2")
+    ap.add_argument("--mini-dim", type=int, default=int(os.getenv("QDRANT_MINI_DIM") or 128))
+    ap.add_argument("--full-name", default=os.getenv("QDRANT_FULL_VECTOR", "full"))
+    ap.add_argument("--mini-name", default=os.getenv("QDRANT_MINI_VECTOR", "mini"))
+    ap.add_argument("--batch", type=int, default=256, help="points per scroll page")
+    ap.add_argument("--checkpoint", type=Path, default=None, help="default: .mini_<src>_<dst>.json")
+    ap.add_argument("--reset", action="store_true", help="ignore an existing checkpoint")
+    args = ap.parse_args()
+
+    url = os.getenv("QDRANT_URL", "http://localhost:6333")
+    client = QdrantClient(url=url, api_key=os.getenv("QDRANT_KEY") or None, timeout=120)
+    if not client.collection_exists(args.dst):
+        sys.exit(f"❌ {args.dst} does not exist – create it from qdrant/collections first")
+    dst_vectors = client.get_collection(args.dst).config.params.vectors
+    if not isinstance(dst_vectors, dict) or {args.full_name, args.mini_name} - set(dst_vectors):
+        sys.exit(f"❌ {args.dst} lacks named vectors '{args.full_name}' / '{args.mini_name}'")
+    if dst_vectors[args.mini_name].size != args.mini_dim:
+        sys.exit(f"❌ {args.dst}.{args.mini_name} is {dst_vectors[args.mini_name].size}-d, not {args.mini_dim}")
+
+    checkpoint = args.checkpoint or Path(f".mini_{args.src}_{args.dst}.json")
+    if args.reset:
+        checkpoint.unlink(missing_ok=True)
+
+    print(f"Copying {args.src} → {args.dst} at {url} (mini_dim={args.mini_dim}, batch={args.batch})")
+    state = run(
+        client,
+        args.src,
+        args.dst,
+        checkpoint,
+        mini_dim=args.mini_dim,
+        full=args.full_name,
+        mini=args.mini_name,
+        batch=args.batch,
+    )
+    print(f"\n🎉 done={state['done']} copied={state['copied']} skipped={state['skipped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,52 @@
 #!/usr/bin/env python3
 """fix_wrong_points.py – Repair malformed points in the `watched_frames` Qdrant collection.
 
-V4 – **defer deletions to the very end** (so we no longer mutate the collection
-while scrolling) and adds an _aggressive_ fallback that walks IDs one‑by‑one if
-scroll keeps failing.
-
-Why defer deletes?
-------------------
-Deleting points mid‑scroll can make the `offset` token stale; on some Qdrant
-set‑ups that leads to the connection being closed (the *Server disconnected
-without sending a response* you’re seeing). Now we:
-
-1. **Upsert** any corrected record immediately (safe – adds data but doesn’t
-   change existing offsets).
-2. **Collect IDs to delete** in memory.
-3. After the full scan completes (or on graceful Ctrl‑C) we bulk‑delete them in
-   chunks.
-
-Extra hardening:
-* If `scroll` still fails after retries all the way down to `MIN_SCROLL`, we
-  fall back to getting **all point IDs via /collections/{name}/points/ids** and
-  iterate them individually (never touches `scroll`). That is slow, but keeps
-  you from being stuck.
+V5 – **segmented parallel scan with a progress journal** (`lib.migrate.scan`).
+
+The point-ID space is split into WORKERS disjoint ranges, each scrolled by
+its own thread.  For every page we
+
+1. **Upsert** the corrected records (wait=True) under their canonical ID
+   (`lib.point_ids.frame_point_id`), with the missing / wrong payload
+   fields filled in.  A canonical point that already exists wins: its
+   legacy copy is only deleted, never written over it.
+2. **Journal** the legacy IDs that were re-keyed; they are deleted in
+   batches of DELETE_CHUNK while the scan runs (a scroll offset is an ID
+   bound, so deleting already-scanned IDs does not disturb it).
+3. Write the shard cursor, counters and pending deletes to the journal
+   (`--journal`, atomic replace).
+
+A crash or Ctrl-C loses nothing: re-running resumes every shard from its
+last handled page and flushes the journaled deletes first.  Progress lines
+report seen / fixed / deleted counts, points per second and an ETA.
+
+    python fix_wrong_points.py                       # resume or start
+    python fix_wrong_points.py --workers 8 --reset   # start over
+    python fix_wrong_points.py --dry-run             # count only, write nothing
 """
 
 from __future__ import annotations
 
-import atexit
+import argparse
 import datetime as _dt
 import itertools
-import math
 import os
 import sys
 import time
-import uuid
-from typing import Iterable, List
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
 from qdrant_client.http.exceptions import ResponseHandlingException
 from qdrant_client.http.models import PointStruct
 
+# one frame-ID scheme for every writer – lives in the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline"))
+from lib import write_version  # noqa: E402
+from lib.migrate import scan  # noqa: E402
+from lib.point_ids import frame_point_id  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Config helpers
 # ---------------------------------------------------------------------------
@@ -63,14 +69,14 @@ UPSERT_CHUNK = int(os.getenv("UPSERT_CHUNK", "256"))
 DELETE_CHUNK = int(os.getenv("DELETE_CHUNK", "512"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 RETRY_DELAY = float(os.getenv("RETRY_DELAY", "2.0"))
-MIN_SCROLL = int(os.getenv("MIN_SCROLL", "100"))
+WORKERS = int(os.getenv("WORKERS", "8"))
 
 # ---------------------------------------------------------------------------
 # Utilities
 # ---------------------------------------------------------------------------
 
-def deterministic_uuid(code: str, num: int, sec: float) -> str:
-    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{code}_{num}_{sec}"))
+def deterministic_uuid(platform_: str, code: str, num: int) -> str:
+    return frame_point_id(platform_, code, num)
 
 
 def correct_path(platform_: str, code: str, n: int, sec: float) -> str:
@@ -97,32 +103,22 @@ def _with_retry(fn, *args, **kwargs):
             print(f"[WARN] {exc}; retry {attempt}/{MAX_RETRIES}")
             time.sleep(RETRY_DELAY * attempt)
 
-# ---------------------------------------------------------------------------
-# Global deletion bucket (filled during scan, flushed at exit)
-# ---------------------------------------------------------------------------
-
-delete_bucket: List[str | int] = []
-
-def _flush_deletes(client: QdrantClient):
-    if not delete_bucket:
-        return
-    print(f"\nFlushing {len(delete_bucket)} deletions…")
-    for i in range(0, len(delete_bucket), DELETE_CHUNK):
-        _with_retry(
-            client.delete,
-            collection_name=COLLECTION,
-            points_selector=delete_bucket[i : i + DELETE_CHUNK],
-        )
-    print("Deletions complete.")
-
 # ---------------------------------------------------------------------------
 # Repair helpers
 # ---------------------------------------------------------------------------
 
-def prepare_repairs(points) -> List[PointStruct]:
-    """Return upserts and extend global delete list."""
+def prepare_repairs(
+    client: QdrantClient, collection: str, points
+) -> Tuple[List[PointStruct], List[str | int]]:
+    """Return (upserts, legacy IDs to delete) for one page.
+
+    Legacy points whose canonical ID already exists are only deleted, so a
+    newer canonical point is never overwritten by its stale copy.
+    """
 
     upserts: List[PointStruct] = []
+    deletes: List[str | int] = []
+    moves: Dict[str, PointStruct] = {}
 
     for p in points:
         pl = p.payload or {}
@@ -137,7 +133,7 @@ def prepare_repairs(points) -> List[PointStruct]:
             sec_f = float(sec)
         except (TypeError, ValueError):
             continue
-        expect_id = deterministic_uuid(code, num_i, sec_f)
+        expect_id = deterministic_uuid(platform, code, num_i)
         expect_path = correct_path(platform, code, num_i, sec_f)
 
         new_pl = pl.copy()
@@ -154,13 +150,22 @@ def prepare_repairs(points) -> List[PointStruct]:
                 sec_f if fld == "frame_second" else None
             ); repaired = True
 
-        id_fix = str(p.id) != expect_id
-        if id_fix or repaired:
-            upserts.append(PointStruct(id=expect_id if id_fix else p.id, vector=p.vector, payload=new_pl))
-            if id_fix:
-                delete_bucket.append(p.id)
+        if str(p.id) != expect_id:
+            deletes.append(p.id)
+            moves.setdefault(expect_id, PointStruct(id=expect_id, vector=p.vector, payload=new_pl))
+        elif repaired:
+            upserts.append(PointStruct(id=p.id, vector=p.vector, payload=new_pl))
+
+    if moves:
+        existing = {
+            str(r.id)
+            for r in _with_retry(
+                client.retrieve, collection, ids=list(moves), with_payload=False, with_vectors=False
+            )
+        }
+        upserts.extend(pt for cid, pt in moves.items() if cid not in existing)
 
-    return upserts
+    return upserts, deletes
 
 
 def chunked(iterable: Iterable, size: int):
@@ -171,104 +176,74 @@ def chunked(iterable: Iterable, size: int):
             return
         yield batch
 
-# ---------------------------------------------------------------------------
-# Fallback – iterate explicit IDs (never uses scroll)
-# ---------------------------------------------------------------------------
-
-def id_walk_mode(client: QdrantClient):
-    print("Switching to ID‑walk fallback – this will be slower but robust.")
-    collection_info = _with_retry(client.get_collection, COLLECTION)
-    total_points = collection_info.points_count
-    print(f"Collection has {total_points} points; fetching all IDs…")
-    
-    # Get all point IDs using scroll with a large limit
-    all_ids = []
-    offset = None
-    while True:
-        points, offset = _with_retry(
-            client.scroll,
-            collection_name=COLLECTION,
-            limit=10000,  # Large batch to get all IDs quickly
-            offset=offset,
-            with_payload=False,
-            with_vectors=False,
-        )
-        if not points:
-            break
-        all_ids.extend([p.id for p in points])
-    
-    print(f"Retrieved {len(all_ids)} point IDs")
-
-    total_fixed = total_seen = 0
-    for id_chunk in chunked(all_ids, BATCH_SIZE):
-        pts = _with_retry(client.retrieve, COLLECTION, ids=id_chunk, with_payload=True, with_vectors=True)
-        upserts = prepare_repairs(pts)
-        for up_chunk in chunked(upserts, UPSERT_CHUNK):
-            _with_retry(client.upsert, collection_name=COLLECTION, points=up_chunk)
-        total_fixed += len(upserts)
-        total_seen += len(pts)
-        print(f"IDs {total_seen}/{len(all_ids)} processed – fixed {total_fixed}")
-
-    return total_fixed
-
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
-    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_KEY)
-    atexit.register(_flush_deletes, client)
+def repair(
+    client: QdrantClient,
+    collection: str,
+    journal: Path | None,
+    *,
+    workers: int = WORKERS,
+    page: int = BATCH_SIZE,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    total = client.get_collection(collection).points_count or 0
+
+    def handle_page(points) -> Dict[str, Any]:
+        upserts, deletes = prepare_repairs(client, collection, points)
+        if not dry_run:
+            for up_chunk in chunked(upserts, UPSERT_CHUNK):
+                _with_retry(client.upsert, collection_name=collection, points=up_chunk, wait=True)
+        return {"fixed": len(upserts), "delete": deletes}
+
+    def report(s: Dict[str, Any]) -> None:
+        rate = s["pts_per_s"]
+        eta = max(total - s["seen"], 0) / max(rate, 1e-6)
+        print(
+            f"Seen {s['seen']}/{total} | Fixed {s['fixed']} | Deleted {s['deleted']} "
+            f"(+{len(s['pending_deletes'])} pending) | {rate:,.0f} pts/s | ETA {eta / 60:.1f} min"
+        )
 
-    # Get collection info to know total points
-    collection_info = _with_retry(client.get_collection, COLLECTION)
-    total_points = collection_info.points_count
-    print(f"Collection {COLLECTION} has {total_points} points")
+    state = scan(
+        client,
+        collection,
+        handle_page,
+        checkpoint=journal,
+        workers=workers,
+        page=page,
+        delete_every=DELETE_CHUNK,
+        retries=MAX_RETRIES,
+        retry_delay=RETRY_DELAY,
+        dry_run=dry_run,
+        progress=report,
+        meta={"collection": collection, "fixed": 0},
+    )
+    if not dry_run:
+        write_version.bump(client, collection)  # drop the search API's cached results
+    return state
 
-    offset = None
-    batch = BATCH_SIZE
-    total_fixed = total_seen = 0
 
-    print(f"Scanning {COLLECTION} at {QDRANT_URL} (scroll={batch})…")
-    while True:
-        # Safety check: if we've processed more points than exist, something is wrong
-        if total_seen >= total_points * 2:  # Allow some buffer for duplicates/retries
-            print(f"[ERROR] Processed {total_seen} points but collection only has {total_points}. Switching to ID walk mode.")
-            total_fixed = id_walk_mode(client)
-            break
-            
-        try:
-            points, offset = _with_retry(
-                client.scroll,
-                collection_name=COLLECTION,
-                limit=batch,
-                offset=offset,
-                with_payload=True,
-                with_vectors=True,
-            )
-        except ResponseHandlingException as exc:
-            if batch > MIN_SCROLL:
-                batch = max(MIN_SCROLL, batch // 2)
-                print(f"[WARN] Scroll still failing. Reduce batch → {batch} and retry…")
-                continue
-            else:
-                print(f"[ERROR] Scroll unusable even at {batch}; {exc}")
-                break
-
-        if not points:
-            break
-
-        total_seen += len(points)
-        upserts = prepare_repairs(points)
-        for up_chunk in chunked(upserts, UPSERT_CHUNK):
-            _with_retry(client.upsert, collection_name=COLLECTION, points=up_chunk)
-        total_fixed += len(upserts)
-        print(f"Seen {total_seen}/{total_points} | Fixed {total_fixed} | scroll={batch}")
-
-    # If scroll fell apart entirely – walk IDs
-    if total_seen == 0:
-        total_fixed = id_walk_mode(client)
-
-    print("\nPASS COMPLETE – please wait for delete flush…")
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--workers", type=int, default=WORKERS, help="concurrent scroll shards")
+    ap.add_argument("--page", type=int, default=BATCH_SIZE, help="points per scroll page")
+    ap.add_argument("--journal", type=Path, default=Path(f".repair_{COLLECTION}.json"))
+    ap.add_argument("--reset", action="store_true", help="ignore an existing journal")
+    ap.add_argument("--dry-run", action="store_true", help="scan and count, write nothing")
+    args = ap.parse_args()
+
+    if args.reset:
+        args.journal.unlink(missing_ok=True)
+
+    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_KEY, timeout=120)
+    print(f"Scanning {COLLECTION} at {QDRANT_URL} ({args.workers} workers, scroll={args.page}, journal {args.journal})…")
+    state = repair(client, COLLECTION, args.journal, workers=args.workers, page=args.page, dry_run=args.dry_run)
+    print(
+        f"\nPASS COMPLETE – seen {state['seen']}, fixed {state['fixed']}, deleted {state['deleted']} "
+        f"in {state['elapsed_s'] / 60:.1f} min"
+    )
 
 
 if __name__ == "__main__":
@@ -9,9 +9,10 @@ and upserts vectors + metadata to a local Qdrant instance.
 import gc
 import io
 import os
+import sys
 import time
-import uuid
 from functools import partial
+from pathlib import Path
 
 from dotenv import load_dotenv
 
@@ -24,6 +25,10 @@ from PIL import Image
 from qdrant_client import QdrantClient, models
 from tqdm import tqdm
 
+# one frame-ID scheme for every writer – lives in the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline"))
+from lib.point_ids import frame_point_id  # noqa: E402
+
 # ── Config ────────────────────────────────────────────────────────────────
 BUCKET = os.getenv("AWS_S3_BUCKET", "oriane-frames")
 BATCH_SIZE = 8  # ← fits a 6 GB RTX 2060
@@ -79,7 +84,7 @@ def upsert_batch(batch):
 
     points = [
         models.PointStruct(
-            id=str(uuid.uuid4()),
+            id=frame_point_id(b["platform"], b["video"], b["frame"]),
             vector=v.tolist(),
             payload={
                 "platform": b["platform"],
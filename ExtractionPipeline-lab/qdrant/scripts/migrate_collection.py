@@ -1,12 +1,35 @@
 #!/usr/bin/env python3
-import json
+"""
+migrate_collection.py – copy a collection from the local Qdrant to the
+remote one.
+
+Streams the source with `lib.migrate.migrate`: the ID space is split over
+--workers concurrent scrolls, every page is upserted (wait=True) before its
+cursor is checkpointed, so memory stays at workers × page points and an
+interrupted copy resumes where it stopped.
+
+A fresh run (no checkpoint) DESTRUCTIVELY drops and recreates the remote
+collection with the local collection's vector params; a resumed run keeps
+what is already there.
+
+    python qdrant/scripts/migrate_collection.py
+    python qdrant/scripts/migrate_collection.py --collection watched_frames --workers 8 --page 1000
+    python qdrant/scripts/migrate_collection.py --reset      # start over
+"""
+
+from __future__ import annotations
+
+import argparse
 import os
 import sys
+from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.http import models as rest
+
+# shared migration engine – lives in the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline"))
+from lib.migrate import load_checkpoint, migrate  # noqa: E402
 
 # ─── Load env ────────────────────────────────────────────────────────
 HERE = os.path.dirname(__file__)
@@ -16,73 +39,70 @@ LOCAL_URL = "http://localhost:6333"
 REMOTE_URL = os.getenv("QDRANT_URL")  # e.g. http://qdrant.admin.oriane.xyz:6333
 API_KEY = os.getenv("QDRANT_KEY")
 COLLECTION = "video_frames"
-VECTOR_DIM = 512
-DISTANCE = rest.Distance.COSINE  # or rest.Distance.Euclid, etc.
-BATCH_SIZE = 500
-SCROLL_LIMIT = 1_000_000  # fetch all locally in one go
-
-if not REMOTE_URL or not API_KEY:
-    print("❌ QDRANT_URL and QDRANT_KEY must be set in env or .env", file=sys.stderr)
-    sys.exit(1)
-
-remote = QdrantClient(url=REMOTE_URL, api_key=API_KEY)
-
-# ─── 0) Confirmation ────────────────────────────────────────────────
-print(f"\n⚠️  You are about to DESTRUCTIVELY reset the remote collection “{COLLECTION}”.")
-print("   This will DELETE all existing data in that collection,")
-print("   then RECREATE it and UPLOAD your entire *local* data.\n")
-resp = input("   Are you absolutely sure you want to proceed? [y/N] ").strip().lower()
-if resp != "y":
-    print("Aborted. No changes made.")
-    sys.exit(0)
-
-# ─── 1) Drop & recreate ─────────────────────────────────────────────
-print(f"\n🛑 Deleting remote collection “{COLLECTION}” (if it exists)…")
-remote.delete_collection(collection_name=COLLECTION)
-print("  → deleted (or did not exist)")
-
-print(f"🆕 Recreating remote collection “{COLLECTION}” …")
-remote.create_collection(
-    collection_name=COLLECTION,
-    vectors_config=rest.VectorParams(size=VECTOR_DIM, distance=DISTANCE),
-)
-print("  → created")
-
-# ─── 2) Scroll local in one shot ────────────────────────────────────
-print(f"\n📥 Fetching all points from local Qdrant (limit={SCROLL_LIMIT})…")
-r = requests.post(
-    f"{LOCAL_URL}/collections/{COLLECTION}/points/scroll",
-    headers={"Content-Type": "application/json"},
-    json={
-        "with_payload": True,
-        "with_vectors": True,
-        "limit": SCROLL_LIMIT,
-    },
-    timeout=120,
-)
-r.raise_for_status()
-all_points = r.json()["result"]["points"]
-print(f"  → fetched {len(all_points)} points locally")
-
-# ─── 3) Chunk & upsert ──────────────────────────────────────────────
-print(f"\n🚚 Uploading in batches of {BATCH_SIZE} …")
-total = 0
-for i in range(0, len(all_points), BATCH_SIZE):
-    chunk = all_points[i : i + BATCH_SIZE]
-    pts = [
-        rest.PointStruct(
-            id=p["id"],
-            vector=p["vector"],
-            payload=p.get("payload", {}),
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--collection", default=COLLECTION)
+    ap.add_argument("--local-url", default=LOCAL_URL)
+    ap.add_argument("--workers", type=int, default=4, help="concurrent scroll shards")
+    ap.add_argument("--page", type=int, default=500, help="points per scroll page / upsert")
+    ap.add_argument("--checkpoint", type=Path, default=None, help="default: .migrate_<collection>.json")
+    ap.add_argument("--reset", action="store_true", help="ignore an existing checkpoint")
+    ap.add_argument("--yes", action="store_true", help="skip the confirmation prompt")
+    args = ap.parse_args()
+
+    if not REMOTE_URL or not API_KEY:
+        print("❌ QDRANT_URL and QDRANT_KEY must be set in env or .env", file=sys.stderr)
+        sys.exit(1)
+
+    local = QdrantClient(url=args.local_url, timeout=120)
+    remote = QdrantClient(url=REMOTE_URL, api_key=API_KEY, timeout=120)
+    name = args.collection
+    checkpoint = args.checkpoint or Path(f".migrate_{name}.json")
+    if args.reset:
+        checkpoint.unlink(missing_ok=True)
+    resuming = load_checkpoint(checkpoint) is not None
+
+    # ─── 0) Confirmation + drop & recreate (fresh runs only) ──────────
+    if resuming:
+        print(f"\n↩️  Resuming “{name}” from {checkpoint}")
+    else:
+        print(f"\n⚠️  You are about to DESTRUCTIVELY reset the remote collection “{name}”.")
+        print("   This will DELETE all existing data in that collection,")
+        print("   then RECREATE it and UPLOAD your entire *local* data.\n")
+        if not args.yes:
+            resp = input("   Are you absolutely sure you want to proceed? [y/N] ").strip().lower()
+            if resp != "y":
+                print("Aborted. No changes made.")
+                sys.exit(0)
+
+        print(f"\n🛑 Deleting remote collection “{name}” (if it exists)…")
+        remote.delete_collection(collection_name=name)
+        print(f"🆕 Recreating remote collection “{name}” …")
+        remote.create_collection(
+            collection_name=name,
+            vectors_config=local.get_collection(name).config.params.vectors,
         )
-        for p in chunk
-    ]
-    remote.upsert(
-        collection_name=COLLECTION,
-        points=pts,
-        wait=True,
+
+    # ─── 1) Stream & upsert ───────────────────────────────────────────
+    print(f"\n🚚 Copying with {args.workers} workers, {args.page} points per page …")
+
+    def report(s):
+        rate = s["written"] / max(s["elapsed_s"], 1e-6)
+        print(f"  • upserted {s['written']:>9}  ({rate:,.0f} pts/s)", end="\r")
+
+    state = migrate(
+        local,
+        name,
+        dst_client=remote,
+        checkpoint=checkpoint,
+        workers=args.workers,
+        page=args.page,
+        progress=report,
     )
-    total += len(pts)
-    print(f"  • upserted {len(pts):4d}  (running total: {total})")
+    print(f"\n\n✅ All done! Copied {state['written']} points into remote “{name}”.\n")
+
 
-print(f"\n✅ All done! Remote “{COLLECTION}” now has {total} points.\n")
+if __name__ == "__main__":
+    main()
@@ -4,37 +4,44 @@ Migrate points from the remote ‘video_frames’ collection to ‘watched_frame
 
 Highlights
 ----------
-• Deterministic SHA-1 IDs on
-  “{platform}:{video_code}:{frame_number}:{frame_second}”.
+• Deterministic IDs from `lib.point_ids.frame_point_id`
+  (platform, video_code, frame_number) – shared with every other writer.
 • ID duplicated in payload for easy filtering.
 • Path auto-prefixed with platform (“instagram” default).
 • created_at timestamp added (UTC ISO-8601).
 • Vector-length guard (default 512-dim).
-• Pure remote streaming:  client.scroll(...) → transform → upsert,
-  so it handles any existing ID type (int, UUID, hex, etc.).
+• Pure remote streaming via `lib.migrate`: WORKERS concurrent scroll
+  shards → transform → upsert, checkpointed per page so a re-run resumes;
+  handles any existing ID type (int, UUID, hex, etc.).
 • Points missing either frame index **or** timestamp are skipped
   (and the script tells you how many).
 """
 
 from __future__ import annotations
 
-import hashlib
 import os
 import sys
-import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient, models
 from tqdm import tqdm  # pip install tqdm
 
+# one frame-ID scheme for every writer – lives in the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline"))
+from lib.migrate import migrate  # noqa: E402
+from lib.point_ids import frame_point_id  # noqa: E402
+
 # ─── Config ──────────────────────────────────────────────────────────────
 SRC = "video_frames"
 DST = "watched_frames"
 BATCH_SIZE = 256
 VECTOR_DIM = 512
 DEFAULT_PLATFORM = "instagram"
+WORKERS = 4  # concurrent scroll shards
+CHECKPOINT = Path(f".migrate_{SRC}_{DST}.json")  # delete to start over
 
 # ─── Connection ─────────────────────────────────────────────────────────
 load_dotenv("../../core/py/pipeline/.env", override=True)
@@ -53,11 +60,10 @@ def deterministic_id(
     platform: str, video_code: str, frame_number: int | str, frame_second: float | str
 ) -> str:
     """
-    Returns a UUID-v5 generated from the 4 identifying fields.
-    The result is deterministic and Qdrant-compatible.
+    Shared frame ID (see lib/point_ids.py).  `frame_second` is accepted for
+    call-site compatibility but is not part of the identity.
     """
-    name = f"{platform}:{video_code}:{frame_number}:{frame_second}"
-    return str(uuid.uuid5(uuid.NAMESPACE_DNS, name))  # 36-char UUID
+    return frame_point_id(platform, video_code, frame_number)
 
 
 def transform_payload(raw: Dict[str, Any], now_iso: str) -> tuple[str, Dict[str, Any]] | None:
@@ -92,51 +98,42 @@ def transform_payload(raw: Dict[str, Any], now_iso: str) -> tuple[str, Dict[str,
 
 
 # ─── Migration ──────────────────────────────────────────────────────────
-def run_migration() -> None:
-    print(f"🚀  Migrating ‘{SRC}’ → ‘{DST}’ …")
+def transform_point(pt: models.Record, now_iso: str) -> Optional[models.PointStruct]:
+    if len(pt.vector) != VECTOR_DIM:
+        raise ValueError(f"Vector length {len(pt.vector)} ≠ expected {VECTOR_DIM} " f"(src id {pt.id})")
+    transformed = transform_payload(pt.payload, now_iso)
+    if transformed is None:
+        return None
+    new_id, new_payload = transformed
+    return models.PointStruct(id=new_id, vector=pt.vector, payload=new_payload)
+
+
+def run_migration(*, workers: int = WORKERS, checkpoint: Path = CHECKPOINT) -> None:
+    print(f"🚀  Migrating ‘{SRC}’ → ‘{DST}’ with {workers} workers (checkpoint {checkpoint}) …")
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    total_upserted = 0
-    total_skipped = 0
-    offset: Optional[models.PointId] = None
-
     pbar = tqdm(unit="pts", ncols=90)
-    while True:
-        batch, offset = client.scroll(
-            collection_name=SRC,
-            limit=BATCH_SIZE,
-            offset=offset,
-            with_payload=True,
-            with_vectors=True,
-        )
-        if not batch:
-            break
-
-        upserts: List[models.PointStruct] = []
-        for pt in batch:
-            if len(pt.vector) != VECTOR_DIM:
-                raise ValueError(
-                    f"Vector length {len(pt.vector)} ≠ expected {VECTOR_DIM} " f"(src id {pt.id})"
-                )
-            transformed = transform_payload(pt.payload, now_iso)
-            if transformed is None:
-                total_skipped += 1
-                continue
-            new_id, new_payload = transformed
-            upserts.append(models.PointStruct(id=new_id, vector=pt.vector, payload=new_payload))
-
-        if upserts:
-            client.upsert(collection_name=DST, points=upserts, wait=True)
-            total_upserted += len(upserts)
-
-        pbar.update(len(batch))
+
+    def report(state: Dict[str, Any]) -> None:
+        pbar.update(state["seen"] - pbar.n)
+
+    state = migrate(
+        client,
+        SRC,
+        dst=DST,
+        transform=lambda pt: transform_point(pt, now_iso),
+        checkpoint=checkpoint,
+        workers=workers,
+        page=BATCH_SIZE,
+        progress=report,
+    )
     pbar.close()
 
-    print(f"\n🎉  Done: {total_upserted} upserted, {total_skipped} skipped " f"(to ‘{DST}’).")
+    print(f"\n🎉  Done: {state['written']} upserted, {state['skipped']} skipped " f"(to ‘{DST}’).")
 
 
 if __name__ == "__main__":
     try:
         run_migration()
     except Exception as exc:
-        sys.exit(f"\n❌  Migration aborted: {exc}")
+        sys.exit(f"\n❌  Migration aborted (re-run to resume): {exc}")
@@ -7,13 +7,14 @@ to use "instagram/" prefix instead, and updates the payload structure accordingl
 
 Algorithm:
 1. Connect via existing store_embeds._client()
-2. Scroll all points where payload.path LIKE "oriane-frames/%"
+2. Stream all points (lib.migrate: concurrent scroll shards, checkpointed
+   cursor) and pick those where payload.path LIKE "oriane-frames/%"
 3. For each point build a new payload:
    - path: replace the leading string with "instagram/"
    - uuid: generate new UUID
    - created_at: use current UTC time
    - Rename frame_idx → frame_number, timestamp_s → frame_second if present
-4. Upsert the corrected points in chunks (same size as settings.batch_size)
+4. Upsert the corrected points page by page, in place
 5. Log summary of fixed items
 """
 
@@ -22,21 +23,24 @@ from __future__ import annotations
 import datetime
 import logging
 import sys
+import threading
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 # Add the core pipeline to Python path for imports
 script_dir = Path(__file__).parent
 core_path = script_dir.parent.parent.parent / "core" / "py" / "pipeline" / "src"
-if str(core_path) not in sys.path:
-    sys.path.insert(0, str(core_path))
+for p in (core_path, core_path.parent):  # src modules + lib/
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
 
 try:
     from config.env_config import settings
     from config.logging_config import configure_logging
     import store_embeds
+    from lib.migrate import migrate
 except ImportError as e:
     print(f"❌ Failed to import required modules: {e}")
     print("Make sure you're running this script from the correct directory")
@@ -45,11 +49,17 @@ except ImportError as e:
 # Configure logging
 log = configure_logging()
 
+CHECKPOINT = Path(".migrate_fix_paths.json")  # delete to start over
 
-def fix_qdrant_paths() -> Dict[str, Any]:
+
+def fix_qdrant_paths(*, workers: int = 4, checkpoint: Path = CHECKPOINT) -> Dict[str, Any]:
     """
     Main function to fix Qdrant paths from oriane-frames/% to instagram/%.
 
+    Streams the collection through `lib.migrate.migrate` (in place, `workers`
+    concurrent scroll shards, cursor checkpointed after every upserted page),
+    so it runs in bounded memory and resumes after an interruption.
+
     Returns:
         Dict with summary statistics
     """
@@ -69,108 +79,60 @@ def fix_qdrant_paths() -> Dict[str, Any]:
 
     start_time = time.perf_counter()
 
+    lock = threading.Lock()  # transform runs on the migration worker threads
+
+    def transform(point):
+        path = (point.payload or {}).get("path")
+        wanted = isinstance(path, str) and path.startswith("oriane-frames/")
+        fixed = _fix_point_payload(point) if wanted else None
+        with lock:
+            stats["points_processed"] += 1
+            if wanted:
+                stats["total_points_found"] += 1
+                if fixed is None:
+                    stats["errors"].append(f"❌ Failed to fix point {point.id}")
+                else:
+                    stats["points_fixed"] += 1
+        return fixed
+
+    def report(state: Dict[str, Any]) -> None:
+        stats["batch_count"] += 1
+        log.info(f"📊 Scanned {state['seen']} points, fixed {state['written']} so far")
+
     try:
-        # Scroll through all points to find ones with oriane-frames/ paths
         log.info(f"🔍 Searching for points with 'oriane-frames/*' paths in collection '{settings.collection}'")
-
-        points_to_fix = []
-        offset = None
-        batch_size = min(settings.batch_size * 10, 1000)  # Use larger batches for scrolling
-
-        while True:
-            # Scroll through points
-            scroll_result = client.scroll(
-                collection_name=settings.collection,
-                limit=batch_size,
-                offset=offset,
-                with_payload=True,
-                with_vectors=True
-            )
-
-            points, next_offset = scroll_result
-
-            if not points:
-                break
-
-            # Filter points that need fixing
-            for point in points:
-                if (point.payload and
-                    "path" in point.payload and
-                    isinstance(point.payload["path"], str) and
-                    point.payload["path"].startswith("oriane-frames/")):
-
-                    points_to_fix.append(point)
-                    stats["total_points_found"] += 1
-
-            log.info(f"📊 Scanned {len(points)} points, found {len([p for p in points if p.payload and 'path' in p.payload and isinstance(p.payload['path'], str) and p.payload['path'].startswith('oriane-frames/')])} with oriane-frames/* paths")
-
-            offset = next_offset
-            if offset is None:
-                break
-
-        log.info(f"🎯 Found {stats['total_points_found']} points that need path fixing")
-
-        if stats["total_points_found"] == 0:
-            log.info("✅ No points found with oriane-frames/* paths. Migration not needed.")
-            return stats
-
-        # Process points in chunks
-        log.info(f"🔄 Processing {len(points_to_fix)} points in batches of {settings.batch_size}")
-
-        for i in range(0, len(points_to_fix), settings.batch_size):
-            chunk = points_to_fix[i:i + settings.batch_size]
-
-            try:
-                fixed_points = []
-
-                for point in chunk:
-                    fixed_point = _fix_point_payload(point)
-                    if fixed_point:
-                        fixed_points.append(fixed_point)
-                        stats["points_fixed"] += 1
-
-                    stats["points_processed"] += 1
-
-                # Upsert the fixed points
-                if fixed_points:
-                    client.upsert(
-                        collection_name=settings.collection,
-                        points=fixed_points,
-                        wait=True
-                    )
-
-                    stats["batch_count"] += 1
-                    log.info(f"✅ Batch {stats['batch_count']}: Fixed {len(fixed_points)}/{len(chunk)} points")
-
-            except Exception as e:
-                error_msg = f"❌ Error processing batch {stats['batch_count'] + 1}: {e}"
-                log.error(error_msg)
-                stats["errors"].append(error_msg)
-                continue
-
-        # Final summary
-        elapsed_time = time.perf_counter() - start_time
-        log.info(f"🎉 Migration completed in {elapsed_time:.2f}s")
-        log.info(f"📊 Summary:")
-        log.info(f"   • Total points found: {stats['total_points_found']}")
-        log.info(f"   • Points processed: {stats['points_processed']}")
-        log.info(f"   • Points fixed: {stats['points_fixed']}")
-        log.info(f"   • Batches processed: {stats['batch_count']}")
-        log.info(f"   • Errors: {len(stats['errors'])}")
-
-        if stats["errors"]:
-            log.warning("⚠️  Errors encountered:")
-            for error in stats["errors"]:
-                log.warning(f"   {error}")
-
-        return stats
-
+        migrate(
+            client,
+            settings.collection,
+            transform=transform,
+            checkpoint=checkpoint,
+            workers=workers,
+            page=min(settings.batch_size * 10, 1000),  # larger pages for scrolling
+            progress=report,
+        )
     except Exception as e:
-        error_msg = f"❌ Fatal error during migration: {e}"
+        error_msg = f"❌ Fatal error during migration (re-run to resume): {e}"
         log.error(error_msg)
         stats["errors"].append(error_msg)
         raise
 
+    # Final summary
+    elapsed_time = time.perf_counter() - start_time
+    log.info(f"🎉 Migration completed in {elapsed_time:.2f}s")
+    log.info(f"📊 Summary:")
+    log.info(f"   • Total points found: {stats['total_points_found']}")
+    log.info(f"   • Points processed: {stats['points_processed']}")
+    log.info(f"   • Points fixed: {stats['points_fixed']}")
+    log.info(f"   • Batches processed: {stats['batch_count']}")
+    log.info(f"   • Errors: {len(stats['errors'])}")
+
+    if stats["errors"]:
+        log.warning("⚠️  Errors encountered:")
+        for error in stats["errors"]:
+            log.warning(f"   {error}")
+
+    return stats
+
 
 def _fix_point_payload(point) -> Any:
     """
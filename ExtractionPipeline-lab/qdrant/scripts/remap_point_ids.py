@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+remap_point_ids.py – one-time move of frame points onto the shared ID scheme.
+
+Every frame writer now derives its point ID from
+`lib.point_ids.frame_point_id(platform, video_code, frame_number)`.  Points
+written under the older schemes (SHA-1 of "stem:idx", "code_idx" strings,
+uuid5 of "code_num_sec", random uuid4) are re-keyed here:
+
+• canonical ID already present → the legacy point is a duplicate, delete it
+  (the canonical one is the newer write and wins)
+• otherwise                    → upsert under the canonical ID, then delete
+  the legacy point
+• payload without video code / frame number → left alone, counted as skipped
+
+Each scroll page is upserted (wait=True), then its legacy IDs deleted, and
+only then is the next offset written to the checkpoint file, so the script
+can be killed at any point and re-run: already moved points are canonical
+and simply skipped.
+
+    python qdrant/scripts/remap_point_ids.py --dry-run
+    python qdrant/scripts/remap_point_ids.py --collection watched_frames --batch 512
+    python qdrant/scripts/remap_point_ids.py --reset        # start over
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient, models
+
+# one frame-ID scheme for every writer – lives in the pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline"))
+from lib import write_version  # noqa: E402
+from lib.point_ids import DEFAULT_PLATFORM, frame_point_id_for  # noqa: E402
+
+load_dotenv(Path(__file__).resolve().parents[2] / "core" / "py" / "pipeline" / ".env")
+
+
+# ─── Checkpoint ─────────────────────────────────────────────────────────
+def load_checkpoint(path: Path) -> Dict[str, Any]:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"offset": None, "seen": 0, "moved": 0, "duplicates": 0, "skipped": 0, "done": False}
+
+
+def save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+# ─── Core ───────────────────────────────────────────────────────────────
+def remap_page(
+    client: QdrantClient,
+    collection: str,
+    points: List[models.Record],
+    *,
+    platform: str = DEFAULT_PLATFORM,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Re-key one scroll page; returns counters for the page."""
+    stats = {"moved": 0, "duplicates": 0, "skipped": 0}
+    targets: Dict[str, models.Record] = {}
+    legacy: List[models.ExtendedPointId] = []
+    for p in points:
+        canonical = frame_point_id_for(p.payload or {}, platform)
+        if canonical is None:
+            stats["skipped"] += 1
+            continue
+        if str(p.id) == canonical:
+            continue
+        legacy.append(p.id)
+        targets.setdefault(canonical, p)  # several legacy copies → keep the first
+
+    if not legacy:
+        return stats
+
+    existing = {
+        str(r.id)
+        for r in client.retrieve(collection, ids=list(targets), with_payload=False, with_vectors=False)
+    }
+    upserts = [
+        models.PointStruct(id=cid, vector=p.vector, payload={**(p.payload or {}), "uuid": cid})
+        for cid, p in targets.items()
+        if cid not in existing
+    ]
+    stats["moved"] = len(upserts)
+    stats["duplicates"] = len(legacy) - len(upserts)
+
+    if not dry_run:
+        if upserts:
+            client.upsert(collection_name=collection, points=upserts, wait=True)
+        client.delete(
+            collection_name=collection,
+            points_selector=models.PointIdsList(points=legacy),
+            wait=True,
+        )
+    return stats
+
+
+def run(
+    client: QdrantClient,
+    collection: str,
+    checkpoint: Path,
+    *,
+    batch: int = 256,
+    platform: str = DEFAULT_PLATFORM,
+    dry_run: bool = False,
+    max_pages: int | None = None,
+) -> Dict[str, Any]:
+    """Scroll the whole collection (from the checkpoint) and re-key it."""
+    state = load_checkpoint(checkpoint)
+    if state.get("done"):
+        print(f"✅ {collection} already remapped (delete {checkpoint} or pass --reset to re-run)")
+        return state
+
+    pages = 0
+    t0 = time.perf_counter()
+    while max_pages is None or pages < max_pages:
+        points, next_offset = client.scroll(
+            collection_name=collection,
+            limit=batch,
+            offset=state["offset"],
+            with_payload=True,
+            with_vectors=True,
+        )
+        page = remap_page(client, collection, points, platform=platform, dry_run=dry_run)
+        state["seen"] += len(points)
+        for k, v in page.items():
+            state[k] += v
+        state["offset"] = next_offset
+        state["done"] = next_offset is None
+        if not dry_run:
+            save_checkpoint(checkpoint, state)
+        pages += 1
+
+        rate = state["seen"] / max(time.perf_counter() - t0, 1e-6)
+        print(
+            f"seen {state['seen']:>9} | moved {state['moved']:>8} | "
+            f"dupes {state['duplicates']:>7} | skipped {state['skipped']:>6} | {rate:,.0f} pts/s"
+        )
+        if state["done"]:
+            break
+    if not dry_run and pages:
+        write_version.bump(client, collection)  # drop the search API's cached results
+    return state
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--collection", default=os.getenv("QDRANT_COLLECTION", "watched_frames"))
+    ap.add_argument("--batch", type=int, default=256, help="points per scroll page")
+    ap.add_argument("--platform", default=DEFAULT_PLATFORM, help="platform for payloads without one")
+    ap.add_argument("--checkpoint", type=Path, default=None, help="default: .remap_<collection>.json")
+    ap.add_argument("--dry-run", action="store_true", help="count only; no writes, no checkpoint")
+    ap.add_argument("--reset", action="store_true", help="ignore an existing checkpoint")
+    args = ap.parse_args()
+
+    url = os.getenv("QDRANT_URL", "http://localhost:6333")
+    client = QdrantClient(url=url, api_key=os.getenv("QDRANT_KEY") or None, timeout=120)
+    checkpoint = args.checkpoint or Path(f".remap_{args.collection}.json")
+    if args.reset:
+        checkpoint.unlink(missing_ok=True)
+
+    print(f"Remapping {args.collection} at {url} (batch={args.batch}, dry_run={args.dry_run})")
+    state = run(
+        client,
+        args.collection,
+        checkpoint,
+        batch=args.batch,
+        platform=args.platform,
+        dry_run=args.dry_run,
+    )
+    print(
+        f"\n🎉 done={state['done']} seen={state['seen']} moved={state['moved']} "
+        f"duplicates removed={state['duplicates']} skipped={state['skipped']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
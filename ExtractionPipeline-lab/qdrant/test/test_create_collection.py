@@ -0,0 +1,132 @@
+"""
+Unit tests for collections/create.py against an in-memory Qdrant.
+
+Local mode keeps whatever tuning it is given out of `get_collection`, so
+`update_collection` is spied on to see what --update would send.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "collections"))
+
+from qdrant_client import QdrantClient  # noqa: E402
+
+import create  # noqa: E402
+
+
+class CreateCollectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.client = QdrantClient(":memory:")
+
+    def config(self, **overrides) -> Path:
+        cfg = {
+            "collection_name": "frames",
+            "vector_params": {"size": 4, "distance": "Cosine"},
+            "payload_indexes": [{"field_name": "video_code", "field_schema": "keyword"}],
+            **overrides,
+        }
+        path = Path(self._tmp.name) / f"{len(list(Path(self._tmp.name).iterdir()))}.json"
+        path.write_text(json.dumps(cfg))
+        return path
+
+    def run_create(self, path: Path, **kwargs) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            create.create_collection_from_config(path, client=self.client, **kwargs)
+        return out.getvalue()
+
+
+class TestResolveConfig(unittest.TestCase):
+    def test_explicit_sections_override_the_profile_key_by_key(self):
+        cfg = create.resolve_config(
+            {
+                "profile": "balanced",
+                "vector_params": {"size": 4, "distance": "Cosine"},
+                "hnsw_config": {"m": 32},
+            }
+        )
+        self.assertEqual(cfg["hnsw_config"], {"m": 32, "ef_construct": 128})
+        self.assertTrue(cfg["vector_params"]["on_disk"])
+        self.assertEqual(cfg["vector_params"]["size"], 4)
+
+    def test_cli_profile_wins_and_unknown_profiles_exit(self):
+        cfg = create.resolve_config({"profile": "balanced", "vector_params": {}}, "compact")
+        self.assertEqual(cfg["quantization_config"], {"binary": {"always_ram": True}})
+        with self.assertRaises(SystemExit):
+            create.resolve_config({"vector_params": {}}, "tiny")
+
+
+class TestUpdateExisting(CreateCollectionTestCase):
+    def test_no_diff_no_update_call(self):
+        path = self.config(profile="memory")
+        self.run_create(path)
+        info = self.client.get_collection("frames")
+        wanted = create.resolve_config(json.loads(path.read_text()))
+        self.assertEqual(create.tuning_diff(info, wanted), [])
+
+        with patch.object(self.client, "update_collection") as spy:
+            out = self.run_create(path, update=True)
+        spy.assert_not_called()
+        self.assertIn("Tuning matches the config.", out)
+
+    def test_hnsw_and_optimizer_diff_is_one_update(self):
+        self.run_create(self.config(profile="memory"))
+        tuned = self.config(
+            profile="memory",
+            hnsw_config={"m": 32},
+            optimizers_config={"indexing_threshold": 12345},
+        )
+        with patch.object(self.client, "update_collection", wraps=self.client.update_collection) as spy:
+            self.run_create(tuned, update=True)
+
+        spy.assert_called_once()
+        kwargs = spy.call_args.kwargs
+        self.assertEqual(kwargs["hnsw_config"].m, 32)
+        self.assertEqual(kwargs["optimizers_config"].indexing_threshold, 12345)
+        self.assertNotIn("vectors_config", kwargs)  # only changed sections are sent
+
+    def test_diff_without_update_or_with_dry_run_changes_nothing(self):
+        self.run_create(self.config(profile="memory"))
+        tuned = self.config(profile="memory", hnsw_config={"m": 32})
+        with patch.object(self.client, "update_collection") as spy:
+            self.assertIn("Run with --update", self.run_create(tuned))
+            self.assertIn("--dry-run: nothing applied", self.run_create(tuned, update=True, dry_run=True))
+        spy.assert_not_called()
+
+    def test_update_moves_unnamed_vectors_on_disk(self):
+        self.run_create(self.config(profile="memory"))
+        with patch.object(self.client, "update_collection", wraps=self.client.update_collection) as spy:
+            out = self.run_create(self.config(profile="balanced"), update=True)
+
+        self.assertIn("Applied", out)
+        spy.assert_called_once()
+        kwargs = spy.call_args.kwargs
+        self.assertEqual(kwargs["collection_name"], "frames")
+        self.assertEqual(list(kwargs["vectors_config"]), [""])
+        self.assertTrue(kwargs["vectors_config"][""].on_disk)
+
+    def test_update_named_vectors_keeps_the_collection_name(self):
+        layout = {
+            "vector_params": {"name": "full", "size": 4, "distance": "Cosine"},
+            "extra_vectors": {"mini": {"size": 2, "distance": "Cosine", "on_disk": False}},
+        }
+        self.run_create(self.config(profile="memory", **layout))
+        with patch.object(self.client, "update_collection", wraps=self.client.update_collection) as spy:
+            self.run_create(self.config(profile="balanced", **layout), update=True)
+
+        kwargs = spy.call_args.kwargs
+        self.assertEqual(kwargs["collection_name"], "frames")
+        self.assertEqual(list(kwargs["vectors_config"]), ["full"])
+
+
+if __name__ == "__main__":
+    unittest.main()
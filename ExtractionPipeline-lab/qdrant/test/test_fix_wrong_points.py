@@ -0,0 +1,124 @@
+"""Unit tests for scripts/fix_wrong_points.py against an in-memory Qdrant."""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from qdrant_client import QdrantClient, models  # noqa: E402
+
+import fix_wrong_points as fwp  # noqa: E402
+from lib.point_ids import frame_point_id  # noqa: E402  (on sys.path via fix_wrong_points)
+
+COLLECTION = "watched_frames"
+
+
+def make_client(points):
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=models.VectorParams(size=2, distance=models.Distance.DOT),
+    )
+    client.upsert(COLLECTION, points=points, wait=True)
+    return client
+
+
+def frame(point_id, code, num, vector=(1.0, 0.0), **extra):
+    payload = {
+        "platform": "instagram",
+        "video_code": code,
+        "frame_number": num,
+        "frame_second": float(num),
+        "created_at": "2024-01-01T00:00:00.000000Z",
+        "path": fwp.correct_path("instagram", code, num, float(num)),
+        **extra,
+    }
+    return models.PointStruct(id=point_id, vector=list(vector), payload=payload)
+
+
+def get(client, point_id):
+    (point,) = client.retrieve(COLLECTION, [point_id], with_payload=True, with_vectors=True)
+    return point
+
+
+class TestPrepareRepairs(unittest.TestCase):
+    def prepare(self, client):
+        points, _ = client.scroll(COLLECTION, limit=100, with_payload=True, with_vectors=True)
+        return fwp.prepare_repairs(client, COLLECTION, points)
+
+    def test_existing_canonical_is_not_overwritten(self):
+        canonical = frame_point_id("instagram", "A", 1)
+        client = make_client(
+            [
+                frame(1, "A", 1, vector=(1.0, 0.0), marker="legacy"),
+                frame(canonical, "A", 1, vector=(0.0, 1.0), marker="newer"),
+            ]
+        )
+        upserts, deletes = self.prepare(client)
+        self.assertEqual(upserts, [])
+        self.assertEqual(deletes, [1])
+
+    def test_missing_canonical_is_moved_with_repaired_payload(self):
+        canonical = frame_point_id("instagram", "B", 2)
+        legacy = frame(2, "B", 2, vector=(0.5, 0.5), path="wrong.png")
+        del legacy.payload["created_at"]
+        client = make_client([legacy])
+
+        upserts, deletes = self.prepare(client)
+
+        self.assertEqual(deletes, [2])
+        (moved,) = upserts
+        self.assertEqual(str(moved.id), canonical)
+        self.assertEqual(moved.payload["path"], "instagram/B/2_2.0.png")
+        self.assertIn("created_at", moved.payload)
+
+    def test_canonical_point_with_bad_payload_is_repaired_in_place(self):
+        canonical = frame_point_id("instagram", "C", 3)
+        client = make_client([frame(canonical, "C", 3, path="wrong.png")])
+
+        upserts, deletes = self.prepare(client)
+
+        self.assertEqual(deletes, [])
+        self.assertEqual(
+            [(str(p.id), p.payload["path"]) for p in upserts], [(canonical, "instagram/C/3_3.0.png")]
+        )
+
+
+class TestRepair(unittest.TestCase):
+    def test_repair_keeps_the_newer_canonical_point(self):
+        kept = frame_point_id("instagram", "A", 1)
+        moved = frame_point_id("instagram", "B", 2)
+        client = make_client(
+            [
+                frame(1, "A", 1, vector=(1.0, 0.0), marker="legacy"),
+                frame(kept, "A", 1, vector=(0.0, 1.0), marker="newer"),
+                frame(2, "B", 2, vector=(0.5, 0.5)),
+            ]
+        )
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            state = fwp.repair(client, COLLECTION, Path(tmp) / "journal.json", workers=2, page=2)
+
+        self.assertEqual((state["fixed"], state["deleted"]), (1, 2))
+        points, _ = client.scroll(COLLECTION, limit=100)
+        self.assertEqual({str(p.id) for p in points}, {kept, moved})
+        self.assertEqual(get(client, kept).payload["marker"], "newer")
+        self.assertEqual(get(client, kept).vector, [0.0, 1.0])
+        self.assertEqual(get(client, moved).vector, [0.5, 0.5])
+
+    def test_dry_run_writes_nothing(self):
+        client = make_client([frame(1, "A", 1), frame(2, "B", 2)])
+        with patch.object(client, "upsert") as upsert, patch.object(client, "delete") as delete:
+            with contextlib.redirect_stdout(io.StringIO()):
+                state = fwp.repair(client, COLLECTION, None, workers=1, dry_run=True)
+        self.assertEqual(state["fixed"], 2)
+        upsert.assert_not_called()
+        delete.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Unit tests for scripts/remap_point_ids.py against an in-memory Qdrant."""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from qdrant_client import QdrantClient, models  # noqa: E402
+
+import remap_point_ids as remap  # noqa: E402
+from lib import write_version  # noqa: E402  (on sys.path via remap_point_ids)
+from lib.point_ids import frame_point_id  # noqa: E402
+
+COLLECTION = "watched_frames"
+
+
+def make_client(points):
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=models.VectorParams(size=2, distance=models.Distance.DOT),
+    )
+    client.upsert(COLLECTION, points=points, wait=True)
+    return client
+
+
+def legacy(point_id, code, frame, vector=(1.0, 0.0), **extra):
+    payload = {"platform": "instagram", "video_code": code, "frame_number": frame, **extra}
+    return models.PointStruct(id=point_id, vector=list(vector), payload=payload)
+
+
+def ids(client):
+    points, _ = client.scroll(COLLECTION, limit=1000)
+    return {str(p.id) for p in points}
+
+
+class TestRemapPage(unittest.TestCase):
+    def remap_all(self, client):
+        points, _ = client.scroll(COLLECTION, limit=100, with_payload=True, with_vectors=True)
+        return remap.remap_page(client, COLLECTION, points)
+
+    def test_legacy_duplicate_is_deleted_and_canonical_kept(self):
+        canonical = frame_point_id("instagram", "A", 1)
+        client = make_client(
+            [
+                legacy(1, "A", 1, vector=(1.0, 0.0), uuid="legacy"),
+                legacy(canonical, "A", 1, vector=(0.0, 1.0), uuid=canonical, marker="newer"),
+            ]
+        )
+        with patch.object(client, "upsert", wraps=client.upsert) as upsert:
+            stats = self.remap_all(client)
+
+        self.assertEqual(stats, {"moved": 0, "duplicates": 1, "skipped": 0})
+        upsert.assert_not_called()
+        self.assertEqual(ids(client), {canonical})
+        (kept,) = client.retrieve(COLLECTION, [canonical], with_payload=True, with_vectors=True)
+        self.assertEqual(kept.payload["marker"], "newer")
+        self.assertEqual(kept.vector, [0.0, 1.0])
+
+    def test_legacy_without_canonical_is_moved(self):
+        canonical = frame_point_id("instagram", "B", 2)
+        client = make_client([legacy(2, "B", 2, vector=(0.5, 0.5), uuid="old-uuid")])
+
+        stats = self.remap_all(client)
+
+        self.assertEqual(stats, {"moved": 1, "duplicates": 0, "skipped": 0})
+        self.assertEqual(ids(client), {canonical})
+        (moved,) = client.retrieve(COLLECTION, [canonical], with_payload=True, with_vectors=True)
+        self.assertEqual(moved.payload["uuid"], canonical)
+        self.assertEqual(moved.payload["video_code"], "B")
+        self.assertEqual(moved.vector, [0.5, 0.5])
+
+    def test_payload_without_code_or_frame_is_skipped(self):
+        client = make_client(
+            [
+                models.PointStruct(id=3, vector=[1.0, 0.0], payload={"video_code": "C"}),
+                models.PointStruct(id=4, vector=[1.0, 0.0], payload={"frame_number": 4}),
+            ]
+        )
+
+        stats = self.remap_all(client)
+
+        self.assertEqual(stats, {"moved": 0, "duplicates": 0, "skipped": 2})
+        self.assertEqual(ids(client), {"3", "4"})
+
+
+class TestRun(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.points = [legacy(i, f"V{i % 4}", i) for i in range(1, 11)]
+        self.points.append(legacy(frame_point_id("instagram", "V1", 1), "V1", 1))  # dupe of id 1
+
+    def checkpoint(self, name):
+        return Path(self._tmp.name) / f"{name}.json"
+
+    def quiet_run(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return remap.run(*args, **kwargs)
+
+    def test_killed_run_resumes_without_double_counting(self):
+        straight = make_client(self.points)
+        expected = self.quiet_run(straight, COLLECTION, self.checkpoint("straight"), batch=3)
+
+        resumed = make_client(self.points)
+        path = self.checkpoint("resumed")
+        first = self.quiet_run(resumed, COLLECTION, path, batch=3, max_pages=2)
+        self.assertFalse(first["done"])
+        self.assertEqual(remap.load_checkpoint(path)["offset"], first["offset"])
+        final = self.quiet_run(resumed, COLLECTION, path, batch=3)
+
+        self.assertTrue(final["done"])
+        self.assertEqual(final, expected)  # every counter, `seen` included
+        self.assertEqual((final["moved"], final["duplicates"]), (9, 1))
+        self.assertEqual(ids(resumed), ids(straight))
+        self.assertEqual(len(ids(resumed)), 10)
+        self.assertTrue(write_version.read(resumed, COLLECTION))  # cached searches dropped
+
+    def test_dry_run_writes_nothing(self):
+        client = make_client(self.points)
+        before = ids(client)
+        path = self.checkpoint("dry")
+
+        state = self.quiet_run(client, COLLECTION, path, batch=3, dry_run=True)
+
+        self.assertEqual((state["moved"], state["duplicates"]), (9, 1))
+        self.assertEqual(ids(client), before)
+        self.assertFalse(path.exists())
+        self.assertFalse(client.collection_exists(write_version.VERSIONS_COLLECTION))
+
+
+if __name__ == "__main__":
+    unittest.main()